@@ -0,0 +1,125 @@
+"""Discord Webhook 送信のベンチマーク (送信ごとの httpx.post 対 接続プール).
+
+ローカルに立てた Webhook の代役 (204 を返すだけの HTTP/1.1 サーバー) に
+通知を送り、1 件あたりの時間を比べる。TLS も遠くの相手もないため、
+本物の Discord との差はこれより大きい。
+
+    uv run python benchmarks/bench_discord_client.py
+"""
+
+import sys
+import threading
+import time
+from collections.abc import Callable
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler
+from http.server import ThreadingHTTPServer
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+import httpx
+
+from common.infrastructure.factories.logger import LoggerFactoryImpl
+from notifications.infrastructure.adapters.discord import DiscordClientConfig
+from notifications.infrastructure.adapters.discord import (
+    DiscordWebhookNotifierImpl,
+)
+from notifications.infrastructure.adapters.discord import build_discord_client
+
+_MESSAGES = 500
+_REPEAT = 3
+
+
+class _WebhookStandIn(BaseHTTPRequestHandler):
+    """本文を読み捨てて 204 を返す Webhook の代役."""
+
+    protocol_version = "HTTP/1.1"
+    connections = 0
+
+    def setup(self) -> None:
+        super().setup()
+        type(self).connections += 1
+
+    def do_POST(self) -> None:
+        self.rfile.read(int(self.headers["Content-Length"]))
+        self.send_response(HTTPStatus.NO_CONTENT)
+        self.end_headers()
+
+    def log_message(
+        self,
+        format: str,
+        *args: object,
+    ) -> None:
+        """アクセスログを出さない."""
+
+
+class _PerCallNotifier:
+    """比較用: 従来どおり送信ごとに httpx.post を呼ぶ."""
+
+    def __init__(self, webhook_url: str) -> None:
+        self._webhook_url = webhook_url
+
+    def send(self, message: str) -> None:
+        httpx.post(
+            url=self._webhook_url,
+            json={"content": message},
+            timeout=10.0,
+        ).raise_for_status()
+
+
+def _best_ms(send: Callable[[str], None]) -> float:
+    timings = []
+    for _ in range(_REPEAT):
+        started = time.perf_counter()
+        for number in range(_MESSAGES):
+            send(f"本が登録されました: 本{number}")
+        timings.append(time.perf_counter() - started)
+    return min(timings) / _MESSAGES * 1000
+
+
+def main() -> None:
+    """両方式の 1 件あたりの時間と張った接続数を表示する."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _WebhookStandIn)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/api/webhooks/bench"
+
+    per_call = _best_ms(_PerCallNotifier(webhook_url=url).send)
+    per_call_connections = _WebhookStandIn.connections
+
+    _WebhookStandIn.connections = 0
+    client = build_discord_client(
+        config=DiscordClientConfig(
+            max_connections=10,
+            max_keepalive_connections=5,
+            keepalive_expiry=30.0,
+            http2=False,
+            connect_timeout=3.0,
+            read_timeout=10.0,
+        ),
+    )
+    notifier = DiscordWebhookNotifierImpl(
+        webhook_url=url,
+        client=client,
+        logger_factory=LoggerFactoryImpl(),
+    )
+    pooled = _best_ms(notifier.send)
+    pooled_connections = _WebhookStandIn.connections
+    client.close()
+    server.shutdown()
+
+    sent = _MESSAGES * _REPEAT
+    print(f"{_MESSAGES} webhook posts (best of {_REPEAT})")
+    print(
+        f"  httpx.post  {per_call:8.3f} ms/msg"
+        f"  {per_call_connections} connections / {sent} posts"
+    )
+    print(
+        f"  pooled      {pooled:8.3f} ms/msg"
+        f"  {pooled_connections} connections / {sent} posts"
+        f"  ({per_call / pooled:.1f}x)"
+    )
+
+
+if __name__ == "__main__":
+    main()
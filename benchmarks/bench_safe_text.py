@@ -0,0 +1,85 @@
+"""タイトル検証のベンチマーク (SafeText.validate_many 対 1 件ずつ).
+
+取り込み 1 チャンク分 (10,000 件、1% は禁止文字入り) のタイトルを
+検証する時間を比べる。1 件ずつの方は SafeText を作り、失敗は ValueError
+で受ける (BookSerializer.validate_title の従来の経路)。
+
+    uv run python benchmarks/bench_safe_text.py
+"""
+
+import os
+import sys
+import timeit
+from collections.abc import Callable
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings.dev")
+
+import django
+
+django.setup()
+
+from books.entities import TITLE_MAX_LENGTH  # noqa: E402
+from books.entities import TITLE_MIN_LENGTH  # noqa: E402
+from books.entities.safe_text import SafeText  # noqa: E402
+
+_CHUNK_SIZE = 10_000
+_REPEAT = 5
+_NUMBER = 10
+
+
+def _titles() -> list[str]:
+    return [
+        f"吾輩は猫である<{i}>" if i % 100 == 0 else f"吾輩は猫である 第{i}版"
+        for i in range(_CHUNK_SIZE)
+    ]
+
+
+def _per_value(titles: list[str]) -> list[str | None]:
+    errors: list[str | None] = []
+    for title in titles:
+        try:
+            SafeText(
+                value=title,
+                min_length=TITLE_MIN_LENGTH,
+                max_length=TITLE_MAX_LENGTH,
+            )
+        except ValueError as e:
+            errors.append(str(e))
+        else:
+            errors.append(None)
+    return errors
+
+
+def _batch(titles: list[str]) -> list[str | None]:
+    return SafeText.validate_many(
+        values=titles,
+        min_length=TITLE_MIN_LENGTH,
+        max_length=TITLE_MAX_LENGTH,
+    )
+
+
+def _best_ms(validate: Callable[[list[str]], list[str | None]]) -> float:
+    titles = _titles()
+    timings = timeit.repeat(
+        lambda: validate(titles),
+        repeat=_REPEAT,
+        number=_NUMBER,
+    )
+    return min(timings) / _NUMBER * 1000
+
+
+def main() -> None:
+    """両方式の 1 チャンクあたりの時間を表示する."""
+    titles = _titles()
+    assert _per_value(titles) == _batch(titles)  # noqa: S101
+    per_value = _best_ms(_per_value)
+    batch = _best_ms(_batch)
+    print(f"chunk of {_CHUNK_SIZE} titles (best of {_REPEAT})")
+    print(f"  per-value  {per_value:8.3f} ms")
+    print(f"  batch      {batch:8.3f} ms  ({per_value / batch:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
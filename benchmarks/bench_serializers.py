@@ -0,0 +1,70 @@
+"""出力シリアライザのベンチマーク (CompiledSerializer 対 DRF 標準).
+
+100 行の著者ページを many=True で整形する時間を比べる。
+
+    uv run python benchmarks/bench_serializers.py
+"""
+
+import os
+import sys
+import timeit
+from pathlib import Path
+from typing import Any
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings.dev")
+
+import django
+
+django.setup()
+
+from django.utils import timezone  # noqa: E402
+from rest_framework import serializers  # noqa: E402
+
+from authors.domain.entities.author import Author  # noqa: E402
+from authors.interfaces.serializers.author import AuthorSerializer  # noqa: E402
+
+_PAGE_SIZE = 100
+_REPEAT = 5
+_NUMBER = 200
+
+
+class _DrfAuthorSerializer(serializers.Serializer[Any]):
+    """比較用: 同じフィールド宣言の DRF 標準シリアライザ."""
+
+    id = serializers.UUIDField(read_only=True)
+    name = serializers.CharField(read_only=True)
+    bio = serializers.CharField(read_only=True)
+    created_at = serializers.DateTimeField(read_only=True)
+    updated_at = serializers.DateTimeField(read_only=True)
+
+
+def _best_ms(serializer_class: type[serializers.Serializer[Any]]) -> float:
+    now = timezone.now()
+    page = [
+        Author(name=f"著者{i}", bio="紹介", created_at=now, updated_at=now)
+        for i in range(_PAGE_SIZE)
+    ]
+    assert (  # noqa: S101
+        AuthorSerializer(instance=page, many=True).data
+        == _DrfAuthorSerializer(instance=page, many=True).data
+    )
+    timings = timeit.repeat(
+        lambda: serializer_class(instance=page, many=True).data,
+        repeat=_REPEAT,
+        number=_NUMBER,
+    )
+    return min(timings) / _NUMBER * 1000
+
+
+def main() -> None:
+    """両方式の 1 ページあたりの時間を表示する."""
+    drf = _best_ms(_DrfAuthorSerializer)
+    compiled = _best_ms(AuthorSerializer)
+    print(f"page of {_PAGE_SIZE} authors (best of {_REPEAT})")
+    print(f"  drf       {drf:8.3f} ms")
+    print(f"  compiled  {compiled:8.3f} ms  ({drf / compiled:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
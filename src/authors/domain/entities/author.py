@@ -14,9 +14,12 @@ class Author(Entity):
     """著者を表すドメインエンティティ.
 
     id は基底クラス Entity が持つ uuid.UUID を継承する。
-    created_at は永続層からの復元時にのみ設定される (新規生成時は None)。
+    created_at/updated_at/version は永続層からの復元時にのみ設定される
+    (新規生成時は None)。version は更新ごとに 1 ずつ増える楽観的排他制御の版。
     """
 
     name: str = attrs.field(validator=[not_empty, validate_not_empty])
     bio: str = ""
     created_at: datetime | None = None
+    updated_at: datetime | None = None
+    version: int | None = None
@@ -1,13 +1,21 @@
 """テスト用: メモリ上で著者を保持する Fake リポジトリ.
 
 DI で本物の ORM リポジトリと差し替えて使う (AuthorRepository を満たす)。
+fields (投影) は最適化のためのヒントなので、メモリ上では無視して全項目を返す。
 """
 
+from collections.abc import Iterator
+from typing import Any
 from uuid import UUID
 
+import attrs
+
 from authors.domain.entities.author import Author
 from authors.usecases.protocols import AuthorRepository
 from common.domain.entities.exceptions import EntityDoesNotExistError
+from common.domain.entities.exceptions import EntityVersionConflictError
+from common.domain.pagination import CountStrategy
+from common.domain.pagination import Cursor
 
 
 class FakeAuthorRepository(AuthorRepository):
@@ -22,7 +30,15 @@ class FakeAuthorRepository(AuthorRepository):
         self._store[entity.id] = entity
         return entity
 
-    def get(self, entity_id: UUID) -> Author:
+    def create_many(self, entities: list[Author]) -> list[Author]:
+        self._store.update({entity.id: entity for entity in entities})
+        return list(entities)
+
+    def get(
+        self,
+        entity_id: UUID,
+        fields: frozenset[str] | None = None,  # noqa: ARG002
+    ) -> Author:
         try:
             return self._store[entity_id]
         except KeyError as exc:
@@ -33,18 +49,73 @@ class FakeAuthorRepository(AuthorRepository):
         *,
         page: int,
         page_size: int,
-    ) -> tuple[list[Author], int]:
+        count: CountStrategy = CountStrategy.EXACT,
+        fields: frozenset[str] | None = None,  # noqa: ARG002
+    ) -> tuple[list[Author], int | None]:
         items = list(self._store.values())
         start = (page - 1) * page_size
+        if count is CountStrategy.NONE:
+            return items[start : start + page_size + 1], None
         return items[start : start + page_size], len(items)
 
-    def update(self, entity: Author) -> Author:
-        if entity.id not in self._store:
-            raise EntityDoesNotExistError(str(entity.id))
-        self._store[entity.id] = entity
-        return entity
+    def find_after(
+        self,
+        *,
+        cursor: Cursor | None,
+        page_size: int,
+        fields: frozenset[str] | None = None,  # noqa: ARG002
+    ) -> tuple[list[Author], bool]:
+        items = sorted(
+            self._store.values(),
+            key=lambda author: (author.name, author.id),
+        )
+        if cursor is not None:
+            position = (cursor.key, UUID(cursor.tiebreaker))
+            if cursor.backward:
+                items = [
+                    author
+                    for author in items
+                    if (author.name, author.id) < position
+                ]
+                page = items[-page_size:]
+                return page, len(items) > page_size
+            items = [
+                author
+                for author in items
+                if (author.name, author.id) > position
+            ]
+        return items[:page_size], len(items) > page_size
+
+    # lint-fixme: ParamLineBreak: 79文字制限で改行が必要
+    def count(
+        self,
+        strategy: CountStrategy = CountStrategy.EXACT,  # noqa: ARG002
+    ) -> int:
+        # メモリ上では厳密な件数が常に安いため strategy によらず数える。
+        return len(self._store)
+
+    def stream(self, chunk_size: int) -> Iterator[Author]:  # noqa: ARG002
+        yield from sorted(self._store.values(), key=lambda author: author.id)
+
+    def update(
+        self,
+        entity_id: UUID,
+        *,
+        changes: dict[str, Any],
+        expected_versions: frozenset[int] | None = None,
+    ) -> Author:
+        current = self._store.get(entity_id)
+        if current is None:
+            raise EntityDoesNotExistError(str(entity_id))
+        version = current.version or 1
+        if expected_versions is not None and version not in expected_versions:
+            raise EntityVersionConflictError(str(entity_id))
+        updated = attrs.evolve(current, **changes, version=version + 1)
+        self._store[entity_id] = updated
+        return updated
 
-    def delete(self, entity_id: UUID) -> None:
+    def delete(self, entity_id: UUID) -> int:
         if entity_id not in self._store:
             raise EntityDoesNotExistError(str(entity_id))
         del self._store[entity_id]
+        return 1
@@ -3,8 +3,11 @@
 from typing import Any
 
 import injector
+from django.conf import settings
+from django.core.cache import caches
 
 from authors.interfaces.repositories.author import AuthorRepositoryImpl
+from authors.interfaces.repositories.cached import CachedAuthorRepository
 from authors.usecases.crud import AuthorCrudUseCaseImpl
 from authors.usecases.protocols import AuthorCrudUseCase
 from authors.usecases.protocols import AuthorRepository
@@ -14,6 +17,7 @@ from common.infrastructure.containers.di import ContainerHolder
 class AuthorModule(injector.Module):
     """著者の DI を構成するモジュール.
 
+    既定では ORM リポジトリを読み取りキャッシュで包んで束縛する。
     テストでは repository_override に Fake を渡して差し替える。
     """
 
@@ -22,7 +26,20 @@ class AuthorModule(injector.Module):
         self,
         repository_override: AuthorRepository | None = None,
     ) -> None:
-        self._repository: Any = repository_override or AuthorRepositoryImpl()
+        self._repository: Any = (
+            repository_override or self._build_cached_repository()
+        )
+
+    @staticmethod
+    def _build_cached_repository() -> CachedAuthorRepository:
+        return CachedAuthorRepository(
+            inner=AuthorRepositoryImpl(),
+            shared=caches["default"],
+            local_maxsize=settings.AUTHOR_CACHE_LOCAL_MAXSIZE,
+            local_ttl=settings.AUTHOR_CACHE_LOCAL_TTL,
+            ttl=settings.AUTHOR_CACHE_TTL,
+            negative_ttl=settings.AUTHOR_CACHE_NEGATIVE_TTL,
+        )
 
     def configure(self, binder: injector.Binder) -> None:
         binder.bind(
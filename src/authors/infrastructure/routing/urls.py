@@ -1,16 +1,41 @@
 """著者の URL ルーティング (composition root)."""
 
+from django.urls import path
 from rest_framework.routers import DefaultRouter
 
 from authors.infrastructure.containers.author import container
+from authors.interfaces.repositories.cached import CachedAuthorRepository
 from authors.interfaces.views.author import AuthorViewSet
+from authors.interfaces.views.cache_stats import AuthorCacheStatsView
 from authors.usecases.protocols import AuthorCrudUseCase
+from authors.usecases.protocols import AuthorRepository
+from common.interfaces.repositories.cache import CacheStats
 
 AuthorViewSet.use_case_resolver = lambda: container.injector.get(
     AuthorCrudUseCase,  # type: ignore[type-abstract]
 )
 
+
+def _cache_stats() -> CacheStats | None:
+    repository = container.injector.get(
+        AuthorRepository,  # type: ignore[type-abstract]
+    )
+    if isinstance(repository, CachedAuthorRepository):
+        return repository.stats()
+    return None
+
+
+AuthorCacheStatsView.stats_resolver = _cache_stats
+
 router = DefaultRouter()
 router.register(r"authors", AuthorViewSet, basename="author")
 
-urlpatterns = router.urls
+urlpatterns = [
+    # authors/<pk>/ より先に置く。
+    path(
+        "authors/cache/",
+        AuthorCacheStatsView.as_view(),
+        name="author-cache-stats",
+    ),
+    *router.urls,
+]
@@ -1,12 +1,34 @@
 """著者リポジトリ (Django ORM)."""
 
+from collections.abc import Iterator
+from typing import Any
 from uuid import UUID
 
+from django.db import transaction
+from django.db.models import Q
+from django.db.models import QuerySet
+from django.utils import timezone
+
 from authors.domain.entities.author import Author as AuthorEntity
+from authors.interfaces.signals import author_changed
 from authors.models import Author as AuthorModel
 from authors.usecases.protocols import AuthorRepository
 from common.domain.entities.exceptions import EntityDoesNotExistError
+from common.domain.entities.exceptions import EntityVersionConflictError
+from common.domain.pagination import CountStrategy
+from common.domain.pagination import Cursor
+from common.interfaces.repositories.count import count_queryset
+from common.interfaces.repositories.delete import delete_returning
 from common.interfaces.repositories.supertype import Repository
+from common.interfaces.repositories.update import update_returning
+
+# bulk_create の 1 文あたりの行数 (10k 行でも 10 往復で済む)。
+_BULK_CREATE_BATCH_SIZE = 1000
+
+# fields 指定 (投影) 時も常に読む列 (エンティティの必須項目と ETag の版) と、
+# 指定がなければ読まない任意列 (bio は上限なしの TEXT で TOAST され得る)。
+_REQUIRED_FIELDS = frozenset({"id", "name", "version"})
+_OPTIONAL_FIELDS = ("bio", "created_at", "updated_at")
 
 
 class AuthorRepositoryImpl(Repository, AuthorRepository):
@@ -21,50 +43,187 @@ class AuthorRepositoryImpl(Repository, AuthorRepository):
         )
         return self._to_entity(model)
 
-    def get(self, entity_id: UUID) -> AuthorEntity:
+    def create_many(self, entities: list[AuthorEntity]) -> list[AuthorEntity]:
+        """bulk_create で一括永続化する (単一トランザクション)."""
+        models = [
+            AuthorModel(id=entity.id, name=entity.name, bio=entity.bio)
+            for entity in entities
+        ]
+        with transaction.atomic():
+            created = AuthorModel.objects.bulk_create(
+                models,
+                batch_size=_BULK_CREATE_BATCH_SIZE,
+            )
+        return [self._to_entity(model) for model in created]
+
+    def get(
+        self,
+        entity_id: UUID,
+        fields: frozenset[str] | None = None,
+    ) -> AuthorEntity:
         """ID で取得する (不在時 EntityDoesNotExistError)."""
-        return self._to_entity(self._get_model(entity_id))
+        return self._to_entity(self._get_model(entity_id, fields=fields))
 
     def find_all(
         self,
         *,
         page: int,
         page_size: int,
-    ) -> tuple[list[AuthorEntity], int]:
-        """ページネーション付きの一覧と総件数を返す."""
+        count: CountStrategy = CountStrategy.EXACT,
+        fields: frozenset[str] | None = None,
+    ) -> tuple[list[AuthorEntity], int | None]:
+        """ページネーション付きの一覧と総件数を返す.
+
+        count=NONE では COUNT(*) を発行せず、次ページ判定用に 1 件多く返す。
+        """
         queryset = AuthorModel.objects.all()
-        total = queryset.count()
         start = (page - 1) * page_size
-        models = queryset[start : start + page_size]
+        projected = self._project(queryset, fields=fields)
+        if count is CountStrategy.NONE:
+            models = projected[start : start + page_size + 1]
+            return [self._to_entity(model) for model in models], None
+        total = count_queryset(queryset, strategy=count)
+        models = projected[start : start + page_size]
         return [self._to_entity(model) for model in models], total
 
-    def update(self, entity: AuthorEntity) -> AuthorEntity:
-        """name/bio を更新する (不在時 EntityDoesNotExistError)."""
-        updated = AuthorModel.objects.filter(pk=entity.id).update(
-            name=entity.name,
-            bio=entity.bio,
+    def find_after(
+        self,
+        *,
+        cursor: Cursor | None,
+        page_size: int,
+        fields: frozenset[str] | None = None,
+    ) -> tuple[list[AuthorEntity], bool]:
+        """(name, id) の keyset で cursor の次/前の一覧を返す.
+
+        (name, id) 複合インデックスの範囲走査になり、OFFSET のように
+        読み飛ばす行を走査しない。続きの有無は 1 件多く読んで判定する。
+        """
+        queryset = self._project(
+            AuthorModel.objects.order_by("name", "id"),
+            fields=fields,
         )
-        if updated == 0:
-            msg = f"著者が見つかりません: id={entity.id}"
-            raise EntityDoesNotExistError(msg)
-        return entity
+        if cursor is not None:
+            name, pk = cursor.key, UUID(cursor.tiebreaker)
+            if cursor.backward:
+                # name 単独条件はプランナにインデックス範囲を示すため。
+                queryset = (
+                    queryset.filter(name__lte=name)
+                    .filter(Q(name__lt=name) | Q(id__lt=pk))
+                    .order_by("-name", "-id")
+                )
+            else:
+                queryset = queryset.filter(name__gte=name).filter(
+                    Q(name__gt=name) | Q(id__gt=pk)
+                )
+        models = list(queryset[: page_size + 1])
+        has_more = len(models) > page_size
+        models = models[:page_size]
+        if cursor is not None and cursor.backward:
+            models.reverse()
+        return [self._to_entity(model) for model in models], has_more
+
+    def count(self, strategy: CountStrategy = CountStrategy.EXACT) -> int:
+        """総件数を返す (ESTIMATE はプランナ統計による概算)."""
+        return count_queryset(AuthorModel.objects.all(), strategy=strategy)
 
-    def delete(self, entity_id: UUID) -> None:
-        """ID で削除する (不在時 EntityDoesNotExistError)."""
-        self._get_model(entity_id).delete()
+    def stream(self, chunk_size: int) -> Iterator[AuthorEntity]:
+        """サーバサイドカーソルで chunk_size 件ずつ読みながら返す."""
+        models = AuthorModel.objects.order_by("id").iterator(
+            chunk_size=chunk_size,
+        )
+        for model in models:
+            yield self._to_entity(model)
 
-    def _get_model(self, entity_id: UUID) -> AuthorModel:
+    def update(
+        self,
+        entity_id: UUID,
+        *,
+        changes: dict[str, Any],
+        expected_versions: frozenset[int] | None = None,
+    ) -> AuthorEntity:
+        """UPDATE ... RETURNING の 1 文で更新し、更新後の著者を返す.
+
+        成功時は 1 往復。該当行がないときだけ不在か版の不一致かを
+        確かめるためにもう 1 往復する。
+        """
+        model = update_returning(
+            AuthorModel,
+            pk=entity_id,
+            # 生 SQL では auto_now が効かないため明示的に設定する。
+            changes={**changes, "updated_at": timezone.now()},
+            expected_versions=expected_versions,
+        )
+        if model is not None:
+            if "name" in changes:
+                author_changed.send(
+                    sender=AuthorModel,
+                    author_id=entity_id,
+                    deleted=False,
+                )
+            return self._to_entity(model)
+        if (
+            expected_versions is not None
+            and AuthorModel.objects.filter(pk=entity_id).exists()
+        ):
+            msg = f"著者は他で更新されています: id={entity_id}"
+            raise EntityVersionConflictError(msg)
+        msg = f"著者が見つかりません: id={entity_id}"
+        raise EntityDoesNotExistError(msg)
+
+    def delete(self, entity_id: UUID) -> int:
+        """DELETE ... RETURNING の 1 文で削除し、削除行数を返す.
+
+        書籍は DB の ON DELETE CASCADE で消えるため、Collector のように
+        関連行を読み込まない。行数は連鎖で消えた書籍を含む。
+        """
+        deleted, _ = delete_returning(AuthorModel, pk=entity_id)
+        if deleted == 0:
+            msg = f"著者が見つかりません: id={entity_id}"
+            raise EntityDoesNotExistError(msg)
+        author_changed.send(
+            sender=AuthorModel,
+            author_id=entity_id,
+            deleted=True,
+        )
+        return deleted
+
+    def _get_model(
+        self,
+        entity_id: UUID,
+        fields: frozenset[str] | None = None,
+    ) -> AuthorModel:
+        queryset = self._project(AuthorModel.objects.all(), fields=fields)
         try:
-            return AuthorModel.objects.get(pk=entity_id)
+            return queryset.get(pk=entity_id)
         except AuthorModel.DoesNotExist as exc:
             msg = f"著者が見つかりません: id={entity_id}"
             raise EntityDoesNotExistError(msg) from exc
 
+    @staticmethod
+    def _project(
+        queryset: QuerySet[AuthorModel],
+        *,
+        fields: frozenset[str] | None,
+    ) -> QuerySet[AuthorModel]:
+        """fields 指定時は必要な列だけを SELECT する (.only)."""
+        if fields is None:
+            return queryset
+        columns = _REQUIRED_FIELDS | (fields & set(_OPTIONAL_FIELDS))
+        return queryset.only(*sorted(columns))
+
     @staticmethod
     def _to_entity(model: AuthorModel) -> AuthorEntity:
+        # 読まなかった (deferred) 列に触れると追加クエリになるため、
+        # 任意項目はエンティティの既定値に任せる。
+        deferred = model.get_deferred_fields()
+        optional = {
+            name: getattr(model, name)
+            for name in _OPTIONAL_FIELDS
+            if name not in deferred
+        }
         return AuthorEntity(
             id=model.id,
             name=model.name,
-            bio=model.bio,
-            created_at=model.created_at,
+            version=model.version,
+            **optional,
         )
@@ -0,0 +1,246 @@
+"""著者リポジトリの読み取りキャッシュ (デコレータ).
+
+``GET /authors/{id}`` は最も呼ばれる経路で、対象はほとんど変わらない。
+AuthorRepository を包み、get をプロセス内 LRU → Django キャッシュ →
+内側のリポジトリ (DB) の順に引く read-through キャッシュにする。
+存在しない ID も短い TTL で覚え、同じ 404 で DB を叩き続けない。
+
+update/delete は内側に委譲した後で両段から取り除く。他プロセスの
+プロセス内の段はこの無効化を受け取れないため、その TTL は共有段より
+十分短くする (古い値が見える時間の上限になる)。
+
+DB を読んでから段に書き戻すまでの間に update/delete が挟まると、
+読んだ古い値で無効化を上書きしてしまう。共有段では ID ごとの世代
+(無効化のたびに新しい値) を読み取り前に控えて値に添え、引くときに
+現在の世代と違う値は捨てる。プロセス内の段は無効化の回数を控え、
+読み取り中に変わっていたら書き戻さない。
+"""
+
+import threading
+import uuid
+from collections import Counter
+from collections.abc import Iterator
+from typing import Any
+from uuid import UUID
+
+from django.core.cache.backends.base import BaseCache
+
+from authors.domain.entities.author import Author as AuthorEntity
+from authors.usecases.protocols import AuthorRepository
+from common.domain.entities.exceptions import EntityDoesNotExistError
+from common.domain.pagination import CountStrategy
+from common.domain.pagination import Cursor
+from common.interfaces.repositories.cache import CacheStats
+from common.interfaces.repositories.cache import LocalCache
+from common.interfaces.repositories.supertype import Repository
+
+# キャッシュ上の表現が変わったら版を上げ、旧形式の値を読まないようにする。
+_KEY_PREFIX = "authors:author:v3:"
+
+# ID ごとの世代を置くキーの接頭辞。
+_GENERATION_PREFIX = "authors:author-generation:"
+
+# 不在を表す印 (共有段で pickle されても同値比較できるよう文字列にする)。
+_NOT_FOUND = "__not_found__"
+
+
+class CachedAuthorRepository(Repository, AuthorRepository):
+    """get を 2 段キャッシュで包む著者リポジトリ (AuthorRepository ポート)."""
+
+    def __init__(
+        self,
+        *,
+        inner: AuthorRepository,
+        shared: BaseCache,
+        local_maxsize: int,
+        local_ttl: float,
+        ttl: int,
+        negative_ttl: int,
+    ) -> None:
+        self._inner = inner
+        self._shared = shared
+        self._local: LocalCache[AuthorEntity | str] = LocalCache(
+            maxsize=local_maxsize,
+            ttl=local_ttl,
+        )
+        self._ttl = ttl
+        self._negative_ttl = negative_ttl
+        self._counts: Counter[str] = Counter()
+        self._counts_lock = threading.Lock()
+        # プロセス内での無効化の回数 (書き戻しとの競合を検出する)。
+        self._invalidations = 0
+        self._fill_lock = threading.Lock()
+
+    def create(self, entity: AuthorEntity) -> AuthorEntity:
+        # id はドメインで新規採番されるため、不在の記録と衝突しない。
+        return self._inner.create(entity)
+
+    def create_many(self, entities: list[AuthorEntity]) -> list[AuthorEntity]:
+        return self._inner.create_many(entities)
+
+    def get(
+        self,
+        entity_id: UUID,
+        fields: frozenset[str] | None = None,  # noqa: ARG002
+    ) -> AuthorEntity:
+        """ID で取得する (不在時 EntityDoesNotExistError).
+
+        キャッシュには常に全項目を持つ。fields は読む列を減らしてよい
+        というヒントなので、全項目を返しても契約を満たす。
+        """
+        key = f"{_KEY_PREFIX}{entity_id}"
+        cached = self._local.get(key)
+        if cached is not None:
+            self._count("local_hits")
+            return self._unwrap(cached, entity_id=entity_id)
+        generation_key = f"{_GENERATION_PREFIX}{entity_id}"
+        found = self._shared.get_many([key, generation_key])
+        generation = found.get(generation_key, "")
+        entry = found.get(key)
+        if entry is not None and entry[0] == generation:
+            self._count("shared_hits")
+            self._local.set(key, entry[1])
+            return self._unwrap(entry[1], entity_id=entity_id)
+        self._count("misses")
+        invalidations = self._invalidations
+        try:
+            entity = self._inner.get(entity_id)
+        except EntityDoesNotExistError:
+            self._store(
+                key,
+                value=_NOT_FOUND,
+                ttl=self._negative_ttl,
+                generation=generation,
+                invalidations=invalidations,
+            )
+            raise
+        self._store(
+            key,
+            value=entity,
+            ttl=self._ttl,
+            generation=generation,
+            invalidations=invalidations,
+        )
+        return entity
+
+    def find_all(
+        self,
+        *,
+        page: int,
+        page_size: int,
+        count: CountStrategy = CountStrategy.EXACT,
+        fields: frozenset[str] | None = None,
+    ) -> tuple[list[AuthorEntity], int | None]:
+        return self._inner.find_all(
+            page=page,
+            page_size=page_size,
+            count=count,
+            fields=fields,
+        )
+
+    def find_after(
+        self,
+        *,
+        cursor: Cursor | None,
+        page_size: int,
+        fields: frozenset[str] | None = None,
+    ) -> tuple[list[AuthorEntity], bool]:
+        return self._inner.find_after(
+            cursor=cursor,
+            page_size=page_size,
+            fields=fields,
+        )
+
+    def count(self, strategy: CountStrategy = CountStrategy.EXACT) -> int:
+        return self._inner.count(strategy)
+
+    def stream(self, chunk_size: int) -> Iterator[AuthorEntity]:
+        # 全件走査はキャッシュを通さず、LRU も汚さない。
+        return self._inner.stream(chunk_size=chunk_size)
+
+    def update(
+        self,
+        entity_id: UUID,
+        *,
+        changes: dict[str, Any],
+        expected_versions: frozenset[int] | None = None,
+    ) -> AuthorEntity:
+        """内側で更新した後、両段のキャッシュを無効化する."""
+        try:
+            return self._inner.update(
+                entity_id,
+                changes=changes,
+                expected_versions=expected_versions,
+            )
+        finally:
+            self._invalidate(entity_id)
+
+    def delete(self, entity_id: UUID) -> int:
+        """内側で削除した後、両段のキャッシュを無効化する."""
+        try:
+            return self._inner.delete(entity_id)
+        finally:
+            self._invalidate(entity_id)
+
+    def stats(self) -> CacheStats:
+        """このプロセスでの命中状況を返す."""
+        with self._counts_lock:
+            return CacheStats(
+                local_hits=self._counts["local_hits"],
+                shared_hits=self._counts["shared_hits"],
+                misses=self._counts["misses"],
+                local_size=len(self._local),
+            )
+
+    def clear(self) -> None:
+        """プロセス内の段と計数を空にする (共有段は触らない)."""
+        self._local.clear()
+        with self._counts_lock:
+            self._counts.clear()
+
+    def _store(
+        self,
+        key: str,
+        *,
+        value: AuthorEntity | str,
+        ttl: int,
+        generation: str,
+        invalidations: int,
+    ) -> None:
+        """読み取り前に控えた世代を添えて両段に書き戻す.
+
+        世代が古ければ共有段の値は次に引かれたときに捨てられる。
+        プロセス内の段は、読み取り中に無効化があれば書き戻さない。
+        """
+        self._shared.set(key, (generation, value), timeout=ttl)
+        with self._fill_lock:
+            if self._invalidations == invalidations:
+                self._local.set(key, value)
+
+    def _invalidate(self, entity_id: UUID) -> None:
+        key = f"{_KEY_PREFIX}{entity_id}"
+        with self._fill_lock:
+            self._invalidations += 1
+            self._local.delete(key)
+        # 世代は値より長く残す (消えると古い世代の値が有効に戻る)。
+        self._shared.set(
+            f"{_GENERATION_PREFIX}{entity_id}",
+            uuid.uuid4().hex,
+            timeout=None,
+        )
+        self._shared.delete(key)
+
+    def _count(self, name: str) -> None:
+        with self._counts_lock:
+            self._counts[name] += 1
+
+    @staticmethod
+    def _unwrap(
+        cached: AuthorEntity | str,
+        *,
+        entity_id: UUID,
+    ) -> AuthorEntity:
+        if isinstance(cached, str):
+            msg = f"著者が見つかりません: id={entity_id}"
+            raise EntityDoesNotExistError(msg)
+        return cached
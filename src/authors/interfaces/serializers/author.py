@@ -1,14 +1,15 @@
 """著者の出力シリアライザ."""
 
-from typing import Any
-
 from rest_framework import serializers
 
+from common.interfaces.compiled_serializer import CompiledSerializer
+
 
-class AuthorSerializer(serializers.Serializer[Any]):
+class AuthorSerializer(CompiledSerializer):
     """著者シリアライザ (read-only)."""
 
     id = serializers.UUIDField(read_only=True)
     name = serializers.CharField(read_only=True)
     bio = serializers.CharField(read_only=True)
     created_at = serializers.DateTimeField(read_only=True)
+    updated_at = serializers.DateTimeField(read_only=True)
@@ -0,0 +1,15 @@
+"""著者読み取りキャッシュの命中状況のシリアライザ."""
+
+from typing import Any
+
+from rest_framework import serializers
+
+
+class CacheStatsSerializer(serializers.Serializer[Any]):
+    """読み取りキャッシュの命中状況のシリアライザ (read-only)."""
+
+    local_hits = serializers.IntegerField(read_only=True)
+    shared_hits = serializers.IntegerField(read_only=True)
+    misses = serializers.IntegerField(read_only=True)
+    local_size = serializers.IntegerField(read_only=True)
+    hit_ratio = serializers.FloatField(read_only=True)
@@ -0,0 +1,12 @@
+"""著者の変更を他のアプリへ知らせるシグナル.
+
+リポジトリは UPDATE/DELETE ... RETURNING の 1 文で書き込むため、Django の
+post_save / post_delete は送られない。著者名を写し持つ側 (書籍の検索
+インデックス等) はこちらを購読する。
+"""
+
+from django.dispatch import Signal
+
+# 著者名の変更または削除の後に送る (kwargs: author_id, deleted)。
+# 受け手はトランザクションのコミット後に処理すること。
+author_changed = Signal()
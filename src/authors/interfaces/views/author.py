@@ -2,10 +2,12 @@
 
 import logging
 from collections.abc import Callable
+from collections.abc import Iterator
 from typing import Any
 from typing import ClassVar
 from uuid import UUID
 
+from django.db import transaction
 from drf_spectacular.types import OpenApiTypes
 from drf_spectacular.utils import OpenApiParameter
 from drf_spectacular.utils import OpenApiResponse
@@ -19,11 +21,14 @@ from authors.interfaces.deserializers.author import AuthorDeserializer
 from authors.interfaces.serializers.author import AuthorSerializer
 from authors.usecases.protocols import AuthorCrudUseCase
 from common.domain.entities.exceptions import EntityDoesNotExistError
+from common.domain.pagination import CountStrategy
+from common.domain.pagination import Cursor
+from common.interfaces.ndjson import NDJSON_CONTENT_TYPE
 from common.interfaces.views.crud import CrudViewSet
 from notifications.domain.events import AuthorCreated
-from notifications.domain.results import NotificationProblem
+from notifications.domain.events import AuthorsBulkCreated
 from notifications.infrastructure.containers.notificaton import container
-from notifications.usecases.protocols import NotifyAuthorCreatedUseCase
+from notifications.usecases.protocols import NotificationDispatcher
 
 logger = logging.getLogger(__name__)
 
@@ -32,6 +37,17 @@ logger = logging.getLogger(__name__)
 # many=False で list アクションの配列ラップ (heuristic) を抑止する。
 @extend_schema_serializer(many=False, component_name="AuthorListResponse")
 class _AuthorListResponse(serializers.Serializer[Any]):
+    # count=none のときは count の代わりに has_next を返す。
+    count = serializers.IntegerField(required=False)
+    has_next = serializers.BooleanField(required=False)
+    # cursor モードでのみ返す keyset ページングのリンク。
+    next = serializers.URLField(required=False, allow_null=True)
+    previous = serializers.URLField(required=False, allow_null=True)
+    results = AuthorSerializer(many=True)
+
+
+@extend_schema_serializer(many=False, component_name="AuthorBulkResponse")
+class _AuthorBulkResponse(serializers.Serializer[Any]):
     count = serializers.IntegerField()
     results = AuthorSerializer(many=True)
 
@@ -50,8 +66,54 @@ _PAGE_PARAMS = [
         location=OpenApiParameter.QUERY,
         description="1 ページあたりの件数 (1 以上)",
     ),
+    OpenApiParameter(
+        name="cursor",
+        type=OpenApiTypes.STR,
+        location=OpenApiParameter.QUERY,
+        description=(
+            "keyset ページングの位置 (不透明トークン)。"
+            "空文字で先頭ページ、以降は next/previous のリンクを辿る"
+        ),
+    ),
+    OpenApiParameter(
+        name="count",
+        type=OpenApiTypes.STR,
+        location=OpenApiParameter.QUERY,
+        enum=[strategy.value for strategy in CountStrategy],
+        description=(
+            "総件数の求め方 (exact: 厳密 / estimate: 統計による概算 / "
+            "none: 総件数を返さず has_next のみ)"
+        ),
+    ),
 ]
 
+# 返す項目を絞る sparse fieldset (一覧・単一取得で共通)。
+_FIELDS_PARAM = OpenApiParameter(
+    name="fields",
+    type=OpenApiTypes.STR,
+    location=OpenApiParameter.QUERY,
+    description=(
+        "返す項目のカンマ区切り (例: id,name)。"
+        "省略時は全項目。指定外の列は DB からも読まない"
+    ),
+)
+
+# 楽観的排他制御 (GET で得た ETag を渡すと版の一致時のみ更新する)。
+_IF_MATCH_PARAM = OpenApiParameter(
+    name="If-Match",
+    type=OpenApiTypes.STR,
+    location=OpenApiParameter.HEADER,
+    description=(
+        "単一取得 (fields 指定なし) で得た ETag。"
+        "現在の版と一致しなければ 412 を返す"
+    ),
+)
+
+# 412 (版の不一致) の応答。
+_PRECONDITION_FAILED = OpenApiResponse(
+    description="If-Match が現在の版と一致しない",
+)
+
 # 単一資源を指すパスパラメータ (UUID) を明示する。
 _ID_PARAM = OpenApiParameter(
     name="id",
@@ -64,7 +126,7 @@ _ID_PARAM = OpenApiParameter(
 @extend_schema_view(
     list=extend_schema(
         summary="著者一覧",
-        parameters=_PAGE_PARAMS,
+        parameters=[*_PAGE_PARAMS, _FIELDS_PARAM],
         responses=_AuthorListResponse,
     ),
     create=extend_schema(
@@ -72,22 +134,44 @@ _ID_PARAM = OpenApiParameter(
         request=AuthorDeserializer,
         responses={201: AuthorSerializer},
     ),
+    bulk_create=extend_schema(
+        summary="著者一括作成",
+        description=(
+            "著者の配列を一括作成する。1 件でも不正なら何も作成せず、"
+            "要素ごとのエラーを入力順の配列で 400 として返す。"
+        ),
+        request=AuthorDeserializer(many=True),
+        responses={201: _AuthorBulkResponse},
+    ),
     retrieve=extend_schema(
         summary="著者取得",
-        parameters=[_ID_PARAM],
+        parameters=[_ID_PARAM, _FIELDS_PARAM],
         responses=AuthorSerializer,
     ),
     update=extend_schema(
         summary="著者更新",
-        parameters=[_ID_PARAM],
+        parameters=[_ID_PARAM, _IF_MATCH_PARAM],
         request=AuthorDeserializer,
-        responses=AuthorSerializer,
+        responses={200: AuthorSerializer, 412: _PRECONDITION_FAILED},
     ),
     partial_update=extend_schema(
         summary="著者部分更新",
-        parameters=[_ID_PARAM],
+        parameters=[_ID_PARAM, _IF_MATCH_PARAM],
         request=AuthorDeserializer,
-        responses=AuthorSerializer,
+        responses={200: AuthorSerializer, 412: _PRECONDITION_FAILED},
+    ),
+    export=extend_schema(
+        summary="著者の全件エクスポート",
+        description=(
+            "全著者を NDJSON (1 行 1 著者) でストリーミングする。"
+            "Accept-Encoding: gzip なら gzip 圧縮して返す。"
+        ),
+        responses={
+            (200, NDJSON_CONTENT_TYPE): OpenApiResponse(
+                response=AuthorSerializer,
+                description="1 行ごとに 1 著者の JSON",
+            ),
+        },
     ),
     destroy=extend_schema(
         summary="著者削除",
@@ -100,40 +184,86 @@ class AuthorViewSet(CrudViewSet):
 
     output_serializer_class = AuthorSerializer
     input_deserializer_class = AuthorDeserializer
+    cursor_key_field = "name"
+    cursor_tiebreaker_type = UUID
 
     use_case_resolver: ClassVar[Callable[[], AuthorCrudUseCase]]
 
     def perform_create(self, data: dict[str, Any]) -> Author:
-        author = self._use_case().create(
-            name=data["name"],
-            bio=data.get("bio", ""),
-        )
-        self._notify_created(author)
+        # 通知は著者と同じトランザクションで積む。
+        with transaction.atomic():
+            author = self._use_case().create(
+                name=data["name"],
+                bio=data.get("bio", ""),
+            )
+            self._notify_created(author)
         return author
 
-    def perform_get(self, pk: str) -> Author:
-        return self._use_case().get(author_id=self._to_uuid(pk))
+    def perform_create_many(self, data: list[dict[str, Any]]) -> list[Author]:
+        with transaction.atomic():
+            authors = self._use_case().create_many(items=data)
+            self._notify_bulk_created(authors)
+        return authors
+
+    def perform_get(
+        self,
+        pk: str,
+        fields: frozenset[str] | None = None,
+    ) -> Author:
+        return self._use_case().get(
+            author_id=self._to_uuid(pk),
+            fields=fields,
+        )
 
     def perform_list(
         self,
         *,
         page: int,
         page_size: int,
-    ) -> tuple[list[Author], int]:
-        return self._use_case().find_all(page=page, page_size=page_size)
+        count: CountStrategy,
+        fields: frozenset[str] | None = None,
+    ) -> tuple[list[Author], int | None]:
+        return self._use_case().find_all(
+            page=page,
+            page_size=page_size,
+            count=count,
+            fields=fields,
+        )
+
+    def perform_list_after(
+        self,
+        *,
+        cursor: Cursor | None,
+        page_size: int,
+        fields: frozenset[str] | None = None,
+    ) -> tuple[list[Author], bool]:
+        return self._use_case().find_after(
+            cursor=cursor,
+            page_size=page_size,
+            fields=fields,
+        )
+
+    def perform_count(self, strategy: CountStrategy) -> int:
+        return self._use_case().count(strategy=strategy)
+
+    def perform_stream(self, chunk_size: int) -> Iterator[Author]:
+        return self._use_case().stream(chunk_size=chunk_size)
 
     def perform_update(
         self,
         pk: str,
         data: dict[str, Any],
+        expected_versions: frozenset[int] | None = None,
     ) -> Author:
         return self._use_case().update(
             author_id=self._to_uuid(pk),
             fields=data,
+            expected_versions=expected_versions,
         )
 
     def perform_delete(self, pk: str) -> None:
-        self._use_case().delete(author_id=self._to_uuid(pk))
+        deleted = self._use_case().delete(author_id=self._to_uuid(pk))
+        logger.info("著者を削除しました: id=%s rows=%d", pk, deleted)
 
     def _use_case(self) -> AuthorCrudUseCase:
         return type(self).use_case_resolver()
@@ -148,10 +278,18 @@ class AuthorViewSet(CrudViewSet):
             raise EntityDoesNotExistError(msg) from exc
 
     def _notify_created(self, author: Author) -> None:
-        """作成時に AuthorCreated 通知を送る (失敗しても作成は成功)."""
-        event = AuthorCreated(name=author.name)
-        result = container.injector.get(
-            NotifyAuthorCreatedUseCase,  # type: ignore[type-abstract]
-        ).execute(event=event)
-        if isinstance(result, NotificationProblem):
-            logger.warning("通知送信に失敗しました: %s", result.detail)
+        """作成時に AuthorCreated 通知を積む (送信は待たない)."""
+        self._dispatcher().dispatch(event=AuthorCreated(name=author.name))
+
+    def _notify_bulk_created(self, authors: list[Author]) -> None:
+        """一括作成時に 1 通へ集約した通知を積む (送信は待たない)."""
+        event = AuthorsBulkCreated(
+            names=tuple(author.name for author in authors),
+        )
+        self._dispatcher().dispatch(event=event)
+
+    @staticmethod
+    def _dispatcher() -> NotificationDispatcher:
+        return container.injector.get(
+            NotificationDispatcher,  # type: ignore[type-abstract]
+        )
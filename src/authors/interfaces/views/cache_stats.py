@@ -0,0 +1,37 @@
+"""著者読み取りキャッシュの状態 API ビュー."""
+
+from collections.abc import Callable
+from typing import ClassVar
+
+from drf_spectacular.utils import OpenApiResponse
+from drf_spectacular.utils import extend_schema
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from authors.interfaces.serializers.cache_stats import CacheStatsSerializer
+from common.domain.entities.exceptions import EntityDoesNotExistError
+from common.interfaces.repositories.cache import CacheStats
+
+
+class AuthorCacheStatsView(APIView):
+    """著者取得キャッシュの命中状況を返す API (応答したプロセスの値)."""
+
+    # キャッシュを挟んでいない構成 (テストの Fake など) では None。
+    stats_resolver: ClassVar[Callable[[], CacheStats | None]]
+
+    @extend_schema(
+        operation_id="authors_cache_stats",
+        summary="著者キャッシュの命中状況",
+        responses={
+            200: CacheStatsSerializer,
+            404: OpenApiResponse(description="キャッシュが無効"),
+        },
+    )
+    def get(self, _request: Request) -> Response:
+        """各段の命中数・読みに行った回数・命中率を返す."""
+        stats = type(self).stats_resolver()
+        if stats is None:
+            msg = "著者キャッシュは無効です"
+            raise EntityDoesNotExistError(msg)
+        return Response(CacheStatsSerializer(instance=stats).data)
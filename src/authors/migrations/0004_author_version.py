@@ -0,0 +1,17 @@
+# Generated by Django 6.0.2 on 2026-10-18 10:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("authors", "0003_author_updated_at"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="author",
+            name="version",
+            field=models.PositiveIntegerField(default=1),
+        ),
+    ]
@@ -12,9 +12,18 @@ class Author(models.Model):
     name = models.CharField(max_length=255)
     bio = models.TextField(blank=True, default="")
     created_at = models.DateTimeField(auto_now_add=True)
+    # QuerySet.update() では auto_now が効かないため
+    # リポジトリが明示的に設定する。
+    updated_at = models.DateTimeField(auto_now=True)
+    # 楽観的排他制御の版 (ETag / If-Match)。更新のたびに 1 増やす。
+    version = models.PositiveIntegerField(default=1)
 
     class Meta:
         ordering = ["name"]
+        indexes = [
+            # keyset ページング (name, id) の範囲走査用。
+            models.Index(fields=["name", "id"], name="author_name_id_idx"),
+        ]
 
     def __str__(self) -> str:
         return self.name
@@ -1,13 +1,16 @@
 """著者 CRUD ユースケース."""
 
+from collections.abc import Iterator
 from typing import Any
 from uuid import UUID
 
-import attrs
 import injector
 
 from authors.domain.entities.author import Author
 from authors.usecases.protocols import AuthorRepository
+from common.domain.pagination import CountStrategy
+from common.domain.pagination import Cursor
+from common.domain.validators import validate_changes
 
 
 class AuthorCrudUseCaseImpl:
@@ -27,31 +30,80 @@ class AuthorCrudUseCaseImpl:
         author = Author(name=name, bio=bio)
         return self._repository.create(author)
 
-    def get(self, author_id: UUID) -> Author:
+    def create_many(self, items: list[dict[str, Any]]) -> list[Author]:
+        """検証済み入力から著者を一括作成する (全件成功か全件失敗)."""
+        authors = [
+            Author(name=item["name"], bio=item.get("bio", ""))
+            for item in items
+        ]
+        return self._repository.create_many(authors)
+
+    def get(
+        self,
+        author_id: UUID,
+        fields: frozenset[str] | None = None,
+    ) -> Author:
         """著者を取得する."""
-        return self._repository.get(author_id)
+        return self._repository.get(author_id, fields=fields)
 
     def find_all(
         self,
         *,
         page: int,
         page_size: int,
-    ) -> tuple[list[Author], int]:
-        """著者一覧と総件数を返す."""
-        return self._repository.find_all(page=page, page_size=page_size)
+        count: CountStrategy = CountStrategy.EXACT,
+        fields: frozenset[str] | None = None,
+    ) -> tuple[list[Author], int | None]:
+        """著者一覧と総件数を返す (count=NONE では総件数 None)."""
+        return self._repository.find_all(
+            page=page,
+            page_size=page_size,
+            count=count,
+            fields=fields,
+        )
+
+    def find_after(
+        self,
+        *,
+        cursor: Cursor | None,
+        page_size: int,
+        fields: frozenset[str] | None = None,
+    ) -> tuple[list[Author], bool]:
+        """cursor 以降の著者一覧と続きの有無を返す (keyset)."""
+        return self._repository.find_after(
+            cursor=cursor,
+            page_size=page_size,
+            fields=fields,
+        )
+
+    def count(self, strategy: CountStrategy = CountStrategy.EXACT) -> int:
+        """著者の総件数を返す."""
+        return self._repository.count(strategy=strategy)
+
+    def stream(self, chunk_size: int) -> Iterator[Author]:
+        """全著者を id 順に逐次返す (全件エクスポート用)."""
+        return self._repository.stream(chunk_size=chunk_size)
 
     def update(
         self,
         *,
         author_id: UUID,
         fields: dict[str, Any],
+        expected_versions: frozenset[int] | None = None,
     ) -> Author:
-        """既存著者に検証済みフィールドを反映して更新する."""
-        # 不在なら get が EntityDoesNotExistError を送出する (-> 404)。
-        current = self._repository.get(author_id)
-        updated = attrs.evolve(current, **fields)
-        return self._repository.update(updated)
-
-    def delete(self, author_id: UUID) -> None:
-        """著者を削除する."""
-        self._repository.delete(author_id)
+        """既存著者に検証済みフィールドを反映して更新する.
+
+        現在値を読まずにリポジトリの 1 往復で更新する。expected_versions
+        を渡すと版が一致するときだけ更新する (楽観的排他制御)。
+        """
+        # 読まずに更新するため、evolve が行う属性検証をここで行う。
+        validate_changes(Author, fields)
+        return self._repository.update(
+            author_id,
+            changes=fields,
+            expected_versions=expected_versions,
+        )
+
+    def delete(self, author_id: UUID) -> int:
+        """著者を削除し、連鎖削除された書籍を含む削除行数を返す."""
+        return self._repository.delete(author_id)
@@ -1,11 +1,14 @@
 """著者ユースケースのポート."""
 
+from collections.abc import Iterator
 from typing import Any
 from typing import Protocol
 from typing import runtime_checkable
 from uuid import UUID
 
 from authors.domain.entities.author import Author
+from common.domain.pagination import CountStrategy
+from common.domain.pagination import Cursor
 from common.usecases.crud import CrudRepository
 
 
@@ -27,7 +30,15 @@ class AuthorCrudUseCase(Protocol):
         """著者を作成する."""
         ...
 
-    def get(self, author_id: UUID) -> Author:
+    def create_many(self, items: list[dict[str, Any]]) -> list[Author]:
+        """検証済み入力から著者を一括作成する (全件成功か全件失敗)."""
+        ...
+
+    def get(
+        self,
+        author_id: UUID,
+        fields: frozenset[str] | None = None,
+    ) -> Author:
         """著者を取得する (不在時 EntityDoesNotExistError)."""
         ...
 
@@ -36,8 +47,28 @@ class AuthorCrudUseCase(Protocol):
         *,
         page: int,
         page_size: int,
-    ) -> tuple[list[Author], int]:
-        """著者一覧と総件数を返す."""
+        count: CountStrategy = CountStrategy.EXACT,
+        fields: frozenset[str] | None = None,
+    ) -> tuple[list[Author], int | None]:
+        """著者一覧と総件数を返す (count=NONE では総件数 None)."""
+        ...
+
+    def find_after(
+        self,
+        *,
+        cursor: Cursor | None,
+        page_size: int,
+        fields: frozenset[str] | None = None,
+    ) -> tuple[list[Author], bool]:
+        """cursor 以降の著者一覧と続きの有無を返す (keyset)."""
+        ...
+
+    def count(self, strategy: CountStrategy = CountStrategy.EXACT) -> int:
+        """著者の総件数を返す."""
+        ...
+
+    def stream(self, chunk_size: int) -> Iterator[Author]:
+        """全著者を id 順に逐次返す."""
         ...
 
     def update(
@@ -45,10 +76,18 @@ class AuthorCrudUseCase(Protocol):
         *,
         author_id: UUID,
         fields: dict[str, Any],
+        expected_versions: frozenset[int] | None = None,
     ) -> Author:
-        """著者を更新する (不在時 EntityDoesNotExistError)."""
+        """著者を更新する (不在時 EntityDoesNotExistError).
+
+        expected_versions を渡し現在の版が含まれなければ
+        EntityVersionConflictError を送出する。
+        """
         ...
 
-    def delete(self, author_id: UUID) -> None:
-        """著者を削除する (不在時 EntityDoesNotExistError)."""
+    def delete(self, author_id: UUID) -> int:
+        """著者を削除し、連鎖削除された書籍を含む削除行数を返す.
+
+        不在時は EntityDoesNotExistError を送出する。
+        """
         ...
@@ -4,3 +4,13 @@ from django.apps import AppConfig
 class BooksConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "books"
+
+    def ready(self) -> None:
+        """著者名の変更を書籍の検索インデックスへ反映させる."""
+        from authors.interfaces.signals import author_changed
+        from books.search import on_author_changed
+
+        author_changed.connect(
+            on_author_changed,
+            dispatch_uid="books.search.on_author_changed",
+        )
@@ -2,6 +2,7 @@ from django.core.validators import MinLengthValidator
 from django.db import models
 
 from books.entities.safe_text import SafeText
+from books.storage import COVER_PREFIX
 
 TITLE_MIN_LENGTH = 1
 TITLE_MAX_LENGTH = 255
@@ -9,26 +10,70 @@ ISBN_LENGTH = 13
 
 
 class Book(models.Model):
+    # 照合順序 "C" にして、前方一致 (LIKE 'prefix%') と title の並びを
+    # 同じ (title, id) の索引で返せるようにする (並びはコードポイント順)。
     title = models.CharField(
         max_length=TITLE_MAX_LENGTH,
+        db_collation="C",
         validators=[MinLengthValidator(TITLE_MIN_LENGTH)],
     )
     isbn = models.CharField(max_length=ISBN_LENGTH, unique=True)
     published_date = models.DateField()
+    # 連鎖削除は DB (ON DELETE CASCADE) に任せ、著者削除時に Django の
+    # Collector が書籍を Python に読み込まないようにする (ORM 側は
+    # DO_NOTHING、制約はマイグレーション 0010 の SQL で付ける)。この
+    # 項目を AlterField すると制約が作り直されて CASCADE が外れるため、
+    # その後に 0010 と同じ SQL を流すこと。表紙ファイルは
+    # purge_orphan_covers が後でまとめて消す。
+    # author_id 単独の索引は作らない (先頭が author_id の複合索引で足りる)。
     author = models.ForeignKey(
         "authors.Author",
-        on_delete=models.CASCADE,
+        on_delete=models.DO_NOTHING,
         related_name="books",
+        db_index=False,
     )
     cover_image = models.ImageField(
-        upload_to="books/covers/",
+        upload_to=COVER_PREFIX,
         blank=True,
         default="",
     )
+    # 派生画像 (books.thumbnails) を作り終えた表紙の名前。cover_image と
+    # 一致するときだけ cover_thumbnails を返す。
+    cover_thumbnails_source = models.CharField(
+        max_length=100,
+        blank=True,
+        default="",
+        editable=False,
+    )
     created_at = models.DateTimeField(auto_now_add=True)
 
     class Meta:
-        ordering = ["-published_date"]
+        ordering = ["-published_date", "-id"]
+        # 一覧の絞り込み/並び替え (books.filters) の組み合わせごとの索引。
+        # 昇順の並びは同じ索引を逆向きに走査する。
+        indexes = [
+            # 既定の並び・keyset ページング (published_date DESC, id DESC)・
+            # 出版日の範囲指定用。
+            models.Index(
+                fields=["-published_date", "-id"],
+                name="book_published_id_idx",
+            ),
+            models.Index(
+                fields=["author", "-published_date", "-id"],
+                name="book_author_published_id_idx",
+            ),
+            models.Index(
+                fields=["author", "title", "id"],
+                name="book_author_title_id_idx",
+            ),
+            models.Index(fields=["title", "id"], name="book_title_id_idx"),
+            # 共有される表紙 (内容のハッシュのキー) の参照数を引く用。
+            models.Index(
+                fields=["cover_image"],
+                name="book_cover_image_idx",
+                condition=~models.Q(cover_image=""),
+            ),
+        ]
 
     def __str__(self) -> str:
         return self.title
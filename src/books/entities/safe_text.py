@@ -1,14 +1,25 @@
+import re
+from collections.abc import Iterable
+
 import attrs
 from django.core.exceptions import ValidationError
 from django.core.validators import RegexValidator
 
 from common.domain.entities.supertype import ValueObject
 
+_ALLOWED_TEXT = re.compile(
+    r"^[\w\s\u3000-\u303F\u30FC\u30FB\u3001\u3002\uFF01\uFF1F\-,.!?'\"()&+:;/]+$"
+)
+_UNSAFE_CHARS_MESSAGE = "使用できない文字が含まれています"
+
 _allowed_text_validator = RegexValidator(
-    regex=r"^[\w\s\u3000-\u303F\u30FC\u30FB\u3001\u3002\uFF01\uFF1F\-,.!?'\"()&+:;/]+$",
-    message="使用できない文字が含まれています",
+    regex=_ALLOWED_TEXT,
+    message=_UNSAFE_CHARS_MESSAGE,
 )
 
+_DEFAULT_MIN_LENGTH = 1
+_DEFAULT_MAX_LENGTH = 255
+
 
 def _validate_length(
     instance: "SafeText",
@@ -41,5 +52,34 @@ class SafeText(ValueObject):
     value: str = attrs.field(
         validator=[_validate_length, _validate_safe_chars]
     )
-    min_length: int = 1
-    max_length: int = 255
+    min_length: int = _DEFAULT_MIN_LENGTH
+    max_length: int = _DEFAULT_MAX_LENGTH
+
+    @classmethod
+    def validate_many(
+        cls,
+        values: Iterable[str],
+        *,
+        min_length: int = _DEFAULT_MIN_LENGTH,
+        max_length: int = _DEFAULT_MAX_LENGTH,
+    ) -> list[str | None]:
+        """値ごとのエラーメッセージ (問題なければ None) を入力順に返す.
+
+        SafeText を作ったときと同じ規則・同じメッセージで判定するが、
+        値ごとにオブジェクトも例外も作らない (大量の取り込み用)。
+        """
+        too_short = f"{min_length}文字以上で入力してください"
+        too_long = f"{max_length}文字以下で入力してください"
+        match = _ALLOWED_TEXT.match
+        errors: list[str | None] = []
+        for value in values:
+            size = len(value)
+            if size < min_length:
+                errors.append(too_short)
+            elif size > max_length:
+                errors.append(too_long)
+            elif match(value) is None:
+                errors.append(_UNSAFE_CHARS_MESSAGE)
+            else:
+                errors.append(None)
+        return errors
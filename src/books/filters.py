@@ -0,0 +1,103 @@
+"""本一覧の絞り込みと並び替え.
+
+クライアントがページを落として手元で絞り込まなくて済むよう、一覧に
+サーバ側の絞り込みを設ける。受け付ける条件と並び順は下の許可リストに
+限り、受け付けた組み合わせはどれも Book.Meta.indexes の B-tree 索引の
+範囲走査だけで (Sort を挟まずに) 返す。順序は常に id で確定させ、索引の
+並びと揃える。title 列は照合順序 "C" なので、前方一致も (title, id) の
+範囲になる。
+
+- published_date の並び (既定): author と published_date の範囲で絞れる
+  ((author_id, published_date, id) / (published_date, id))。
+- title の並び (title 指定時の既定): author と title の前方一致で絞れる
+  ((author_id, title, id) / (title, id))。
+- isbn の完全一致: 一意索引で高々 1 件を引くため、他の条件とは併用しない。
+
+一つの索引で返せない組み合わせ (title の前方一致 + published_date の並び、
+published_date の範囲 + title の並び) は、表全体を並べ替えることになる
+ため 400 で断る。
+"""
+
+from typing import Any
+
+from django.db.models import QuerySet
+from rest_framework import serializers
+
+from books.entities import ISBN_LENGTH
+from books.entities import TITLE_MAX_LENGTH
+from books.entities import Book
+
+SORT_QUERY_PARAM = "sort"
+
+# 並び替えキー → ORDER BY。
+SORT_ORDERINGS: dict[str, tuple[str, ...]] = {
+    "-published_date": ("-published_date", "-id"),
+    "published_date": ("published_date", "id"),
+    "-title": ("-title", "-id"),
+    "title": ("title", "id"),
+}
+DEFAULT_SORT = "-published_date"
+# title の前方一致を指定したときの既定の並び。
+TITLE_DEFAULT_SORT = "title"
+
+
+class BookFilterSerializer(serializers.Serializer[Any]):
+    """一覧のクエリパラメータ (すべて任意)."""
+
+    author = serializers.UUIDField(required=False)
+    published_from = serializers.DateField(required=False)
+    published_to = serializers.DateField(required=False)
+    isbn = serializers.CharField(required=False, max_length=ISBN_LENGTH)
+    title = serializers.CharField(
+        required=False,
+        max_length=TITLE_MAX_LENGTH,
+        help_text="タイトルの前方一致",
+    )
+    sort = serializers.ChoiceField(
+        required=False,
+        choices=list(SORT_ORDERINGS),
+        help_text="既定は -published_date (title 指定時は title)",
+    )
+
+    def validate(self, attrs: dict[str, Any]) -> dict[str, Any]:
+        start = attrs.get("published_from")
+        end = attrs.get("published_to")
+        if start is not None and end is not None and start > end:
+            msg = "published_from は published_to 以前の日付にしてください"
+            raise serializers.ValidationError({"published_from": [msg]})
+        if "isbn" in attrs and attrs.keys() - {"isbn", "sort"}:
+            msg = "isbn は他の絞り込みと併用できません"
+            raise serializers.ValidationError({"isbn": [msg]})
+        title = attrs.get("title")
+        sort = attrs.setdefault(
+            "sort",
+            DEFAULT_SORT if title is None else TITLE_DEFAULT_SORT,
+        )
+        by_title = sort.removeprefix("-") == "title"
+        if title is not None and not by_title:
+            msg = "title を指定したときの並びは title / -title のみです"
+            raise serializers.ValidationError({"sort": [msg]})
+        if by_title and (start is not None or end is not None):
+            msg = "published_from/published_to は title の並びと併用できません"
+            raise serializers.ValidationError({"sort": [msg]})
+        return attrs
+
+
+def filter_books(
+    *,
+    queryset: QuerySet[Book],
+    params: dict[str, Any],
+) -> QuerySet[Book]:
+    """検証済みの params で絞り込み、並び替えた QuerySet を返す."""
+    lookups = {
+        "author_id": params.get("author"),
+        "published_date__gte": params.get("published_from"),
+        "published_date__lte": params.get("published_to"),
+        "isbn": params.get("isbn"),
+        "title__startswith": params.get("title"),
+    }
+    conditions = {
+        lookup: value for lookup, value in lookups.items() if value is not None
+    }
+    ordering = SORT_ORDERINGS[params.get("sort", DEFAULT_SORT)]
+    return queryset.filter(**conditions).order_by(*ordering)
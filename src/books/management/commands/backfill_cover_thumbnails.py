@@ -0,0 +1,76 @@
+"""派生画像 (books.thumbnails) のない表紙について生成する.
+
+表紙を持ち、cover_thumbnails_source が cover_image と一致しない書籍を
+--batch-size 件ずつ読み、同じプロセスプール (COVER_THUMBNAIL_WORKERS) で
+並行に生成する。生成し終えた書籍は対象から外れるため、途中で止めても
+再実行すれば続きから埋まる。--force なら生成済みの書籍も作り直す。
+"""
+
+import functools
+from concurrent.futures import as_completed
+from typing import Any
+
+from django.core.management.base import BaseCommand
+from django.core.management.base import CommandParser
+from django.db.models import F
+
+from books.entities import Book
+from books.thumbnails import generate_thumbnails
+from books.thumbnails import thumbnail_executor
+
+
+class Command(BaseCommand):
+    help = "派生画像のない表紙についてサムネイルを生成する"
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=100,
+            help="1 回に読み込んでプールへ投げる書籍の件数",
+        )
+        parser.add_argument(
+            "--force",
+            action="store_true",
+            help="生成済みの書籍も作り直す",
+        )
+
+    def handle(self, **options: Any) -> None:
+        books = Book.objects.exclude(cover_image="")
+        if not options["force"]:
+            books = books.exclude(cover_thumbnails_source=F("cover_image"))
+        executor = thumbnail_executor()
+        done = failed = 0
+        last_pk = 0
+        # pk の keyset で 1 バッチずつ読み切ってから投げる (カーソルを
+        # 開いたまま子プロセスに同じ行を更新させない)。
+        while batch := list(
+            books.filter(pk__gt=last_pk)
+            .order_by("pk")
+            .values_list("pk", "cover_image")[: options["batch_size"]]
+        ):
+            last_pk = batch[-1][0]
+            futures = {
+                executor.submit(
+                    functools.partial(
+                        generate_thumbnails,
+                        book_id=pk,
+                        cover_name=cover_name,
+                        force=options["force"],
+                    )
+                ): pk
+                for pk, cover_name in batch
+            }
+            for future in as_completed(futures):
+                error = future.exception()
+                if error is None:
+                    done += 1
+                    continue
+                failed += 1
+                self.stderr.write(f"book={futures[future]}: {error}")
+            self.stdout.write(f"{done + failed} 件処理 (失敗 {failed} 件)")
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"サムネイルを {done} 件生成しました (失敗 {failed} 件)。"
+            )
+        )
@@ -0,0 +1,139 @@
+"""出版社フィード (CSV / JSONL) から書籍を一括で取り込む.
+
+入力は --chunk-size 件ずつ読み、チャンクごとに books.imports.import_chunk
+で検証・著者の解決・COPY・``INSERT ... ON CONFLICT (isbn)`` を行う。
+入力全体はメモリに載せない。
+
+チャンクを終えるたびに進捗 (件数と行/秒) を表示し、取り込めなかった行は
+--error-dir に chunk-<番号>.jsonl (1 行 1 件、行番号・理由・元の値) として
+書き出す。チャンクは個別にコミットするため、途中で止めても再実行すれば
+同じ ISBN は追加ではなく更新 (値が同じなら何もしない) になる。
+"""
+
+import itertools
+import json
+import sys
+import time
+from collections.abc import Iterator
+from pathlib import Path
+from typing import IO
+from typing import Any
+
+import attrs
+from django.core.management.base import BaseCommand
+from django.core.management.base import CommandError
+from django.core.management.base import CommandParser
+
+from books.imports import IMPORT_FORMATS
+from books.imports import NumberedRecord
+from books.imports import RowError
+from books.imports import import_chunk
+from books.imports import read_records
+
+
+class Command(BaseCommand):
+    help = "CSV / JSONL の出版社フィードから書籍を一括で取り込む"
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "path",
+            help="入力ファイル (- なら標準入力)。列は title, isbn, "
+            "published_date, author (著者名)",
+        )
+        parser.add_argument(
+            "--format",
+            choices=IMPORT_FORMATS,
+            help="入力の形式 (省略時は拡張子から決める)",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=10_000,
+            help="1 回に検証・書き込みする行数",
+        )
+        parser.add_argument(
+            "--skip-existing",
+            action="store_true",
+            help="既にある ISBN の書籍は更新しない",
+        )
+        parser.add_argument(
+            "--error-dir",
+            type=Path,
+            default=Path("import_books_errors"),
+            help="取り込めなかった行をチャンクごとに書き出すディレクトリ",
+        )
+
+    def handle(self, **options: Any) -> None:
+        path: str = options["path"]
+        fmt = options["format"] or Path(path).suffix.removeprefix(".")
+        if fmt not in IMPORT_FORMATS:
+            msg = "--format に csv か jsonl を指定してください"
+            raise CommandError(msg)
+        error_dir: Path = options["error_dir"]
+        error_dir.mkdir(parents=True, exist_ok=True)
+        totals = {"rows": 0, "inserted": 0, "updated": 0, "errors": 0}
+        started = time.monotonic()
+        with _open(path) as stream:
+            records = read_records(stream=stream, fmt=fmt)
+            chunks = itertools.batched(records, options["chunk_size"])
+            for number, chunk in enumerate(_checked(chunks), start=1):
+                result = import_chunk(
+                    records=chunk,
+                    skip_existing=options["skip_existing"],
+                )
+                totals["rows"] += result.rows
+                totals["inserted"] += result.inserted
+                totals["updated"] += result.updated
+                totals["errors"] += len(result.errors)
+                if result.errors:
+                    _write_errors(
+                        error_dir / f"chunk-{number:05d}.jsonl",
+                        errors=result.errors,
+                    )
+                elapsed = time.monotonic() - started
+                self.stdout.write(
+                    f"chunk {number}: {chunk[0][0]}〜{chunk[-1][0]} 行目 "
+                    f"追加 {result.inserted} 更新 {result.updated} "
+                    f"変更なし {result.unchanged} "
+                    f"エラー {len(result.errors)} "
+                    f"(累計 {totals['rows']} 行, "
+                    f"{totals['rows'] / elapsed:,.0f} 行/秒)"
+                )
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{totals['rows']} 行を処理しました (追加 "
+                f"{totals['inserted']} 更新 {totals['updated']} "
+                f"エラー {totals['errors']})。"
+            )
+        )
+        if totals["errors"]:
+            self.stderr.write(f"取り込めなかった行は {error_dir} にあります")
+
+
+type _Chunk = tuple[NumberedRecord, ...]
+
+
+def _checked(chunks: Iterator[_Chunk]) -> Iterator[_Chunk]:
+    """入力の形の誤り (CSV の見出しの不足等) をコマンドのエラーにする."""
+    try:
+        yield from chunks
+    except ValueError as e:
+        raise CommandError(str(e)) from e
+
+
+def _open(path: str) -> IO[str]:
+    if path == "-":
+        return sys.stdin
+    # csv モジュールは改行を自分で扱うため newline="" で開く。
+    return Path(path).open(encoding="utf-8-sig", newline="")
+
+
+def _write_errors(
+    path: Path,
+    *,
+    errors: list[RowError],
+) -> None:
+    with path.open("w", encoding="utf-8") as file:
+        for error in errors:
+            file.write(json.dumps(attrs.asdict(error), ensure_ascii=False))
+            file.write("\n")
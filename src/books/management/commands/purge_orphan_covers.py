@@ -0,0 +1,106 @@
+"""どの書籍からも参照されなくなった表紙画像をまとめて削除する.
+
+著者の削除は書籍を DB の ON DELETE CASCADE で消すため、表紙ファイルは
+リクエスト中には消さない (書籍ごとに S3 へ往復しない)。このコマンドを
+定期実行し、表紙の接頭辞配下を一覧 1 ページ (最大 1000 件) ごとに
+1 クエリで Book と照合して、参照のないものを DeleteObjects 1 回で消す。
+
+表紙は内容のハッシュをキーにして複数の書籍で共有するため、キーを参照する
+書籍の行数がそのまま参照数になる (book_cover_image_idx で引く)。別に
+数を持つと DB のカスケード削除で食い違うため持たず、最後の書籍が消えて
+参照数が 0 になったものだけを消す。途中で止まったアップロードが残す
+staging/ 配下の一時オブジェクトも、どの書籍も指さないため同じく消える。
+
+アップロード直後でまだ行がコミットされていないファイルを消さないよう、
+--min-age 分より新しいオブジェクトは対象にしない。既にある表紙を指すだけの
+アップロードも、books.uploads がその表紙の LastModified を更新するため
+同じく守られる。消す表紙の派生画像
+(books.thumbnails) もキーが決まっているため一緒に消す。
+"""
+
+from datetime import timedelta
+from typing import Any
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.core.management.base import CommandParser
+from django.utils import timezone
+
+from books.entities import Book
+from books.storage import COVER_PREFIX
+from books.storage import s3_client
+from books.thumbnails import thumbnail_keys
+
+# list_objects_v2 / DeleteObjects の 1 回あたりの上限。
+_BATCH_SIZE = 1000
+
+
+class Command(BaseCommand):
+    help = "どの書籍からも参照されていない表紙画像をまとめて削除する"
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--min-age",
+            type=int,
+            default=60,
+            help="この分数より新しいオブジェクトは削除しない",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="削除せずに対象件数だけを表示する",
+        )
+
+    def handle(self, **options: Any) -> None:
+        client = s3_client()
+        bucket: str = settings.S3_BUCKET_NAME
+        cutoff = timezone.now() - timedelta(minutes=options["min_age"])
+        paginator = client.get_paginator("list_objects_v2")
+        pages = paginator.paginate(
+            Bucket=bucket,
+            Prefix=COVER_PREFIX,
+            PaginationConfig={"PageSize": _BATCH_SIZE},
+        )
+        scanned = purged = 0
+        for page in pages:
+            objects = page.get("Contents", [])
+            scanned += len(objects)
+            keys = [
+                obj["Key"] for obj in objects if obj["LastModified"] < cutoff
+            ]
+            orphans = _orphans(keys)
+            if orphans and not options["dry_run"]:
+                doomed = [
+                    key
+                    for orphan in orphans
+                    for key in (orphan, *thumbnail_keys(cover_name=orphan))
+                ]
+                for start in range(0, len(doomed), _BATCH_SIZE):
+                    batch = doomed[start : start + _BATCH_SIZE]
+                    client.delete_objects(
+                        Bucket=bucket,
+                        Delete={
+                            "Objects": [{"Key": key} for key in batch],
+                            "Quiet": True,
+                        },
+                    )
+            purged += len(orphans)
+        verb = "対象" if options["dry_run"] else "削除"
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"表紙 {scanned} 件を確認し、{purged} 件を{verb}しました。"
+            )
+        )
+
+
+def _orphans(keys: list[str]) -> list[str]:
+    """keys のうちどの書籍の cover_image にもないものを返す (1 クエリ)."""
+    if not keys:
+        return []
+    referenced = set(
+        Book.objects.filter(cover_image__in=keys).values_list(
+            "cover_image",
+            flat=True,
+        )
+    )
+    return [key for key in keys if key not in referenced]
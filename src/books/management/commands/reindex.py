@@ -0,0 +1,73 @@
+"""書籍の検索インデックス (books.search) を DB から作り直す.
+
+新しい実体 (books-<日時>) を refresh を止めた状態で作り、書籍を著者と
+JOIN しながらサーバサイドカーソルで --batch-size 件ずつ読んで bulk
+helper で流し込む。終わったら refresh を戻してエイリアス books を
+付け替え、古い実体を消す (--keep-old なら残す)。付け替えまでは古い
+実体で検索できる。
+
+流し込み中の差分の反映は古い実体へ向かうため、反映を止めずに実行した
+ときは、付け替えた後の変更だけが新しい実体に載る。取りこぼしが問題なら
+BOOK_SEARCH_ENABLED を切らずにもう一度実行する。
+"""
+
+from typing import Any
+
+from django.core.management.base import BaseCommand
+from django.core.management.base import CommandParser
+from elasticsearch import helpers
+
+from books.search import BULK_CHUNK_SIZE
+from books.search import book_actions
+from books.search import create_index
+from books.search import finish_bulk_load
+from books.search import indexable_books
+from books.search import search_client
+from books.search import switch_alias
+
+
+class Command(BaseCommand):
+    help = "書籍の検索インデックスを DB から作り直す"
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=BULK_CHUNK_SIZE,
+            help="1 回に DB から読み、bulk で送る書籍の件数",
+        )
+        parser.add_argument(
+            "--keep-old",
+            action="store_true",
+            help="付け替えた後も古い実体を消さない",
+        )
+
+    def handle(self, **options: Any) -> None:
+        client = search_client()
+        batch_size: int = options["batch_size"]
+        index = create_index(client=client, bulk_load=True)
+        self.stdout.write(f"{index} を作成しました")
+        books = indexable_books().iterator(chunk_size=batch_size)
+        indexed = 0
+        for ok, item in helpers.streaming_bulk(
+            client,
+            book_actions(books=books, index=index),
+            chunk_size=batch_size,
+        ):
+            if not ok:
+                # raise_on_error の既定で失敗は例外になるが念のため。
+                self.stderr.write(f"載せられませんでした: {item}")
+                continue
+            indexed += 1
+            if indexed % batch_size == 0:
+                self.stdout.write(f"{indexed} 件")
+        finish_bulk_load(client=client, index=index)
+        old = switch_alias(client=client, index=index)
+        if not options["keep_old"]:
+            for name in old:
+                client.indices.delete(index=name)
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{indexed} 件を {index} に載せ、books を付け替えました。"
+            )
+        )
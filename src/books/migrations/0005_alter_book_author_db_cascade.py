@@ -0,0 +1,23 @@
+# Generated by Django 6.0.2 on 2026-10-18 10:00
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("authors", "0004_author_version"),
+        ("books", "0004_book_published_id_idx"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="book",
+            name="author",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.DO_NOTHING,
+                related_name="books",
+                to="authors.author",
+            ),
+        ),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 6.0.2 on 2026-10-18 10:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("books", "0007_book_cover_thumbnails_source"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="book",
+            index=models.Index(
+                condition=models.Q(("cover_image", ""), _negated=True),
+                fields=["cover_image"],
+                name="book_cover_image_idx",
+            ),
+        ),
+    ]
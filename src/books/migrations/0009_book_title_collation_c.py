@@ -0,0 +1,26 @@
+# Generated by Django 6.0.2 on 2026-10-18 10:00
+
+import django.core.validators
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("books", "0008_book_cover_image_idx"),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="book",
+            name="book_title_prefix_idx",
+        ),
+        migrations.AlterField(
+            model_name="book",
+            name="title",
+            field=models.CharField(
+                db_collation="C",
+                max_length=255,
+                validators=[django.core.validators.MinLengthValidator(1)],
+            ),
+        ),
+    ]
@@ -0,0 +1,42 @@
+from django.db import migrations
+
+# Book.author の外部キー制約を ON DELETE CASCADE で張り直す (ORM 側は
+# DO_NOTHING)。制約名は Django が付けたものを引いて使い回す。
+_RECREATE = """
+DO $$
+DECLARE
+    fk_name text;
+BEGIN
+    SELECT conname INTO STRICT fk_name
+    FROM pg_constraint
+    WHERE conrelid = 'books_book'::regclass
+        AND contype = 'f'
+        AND conkey = ARRAY[(
+            SELECT attnum FROM pg_attribute
+            WHERE attrelid = 'books_book'::regclass
+                AND attname = 'author_id'
+        )];
+    EXECUTE format('ALTER TABLE books_book DROP CONSTRAINT %%I', fk_name);
+    EXECUTE format(
+        'ALTER TABLE books_book ADD CONSTRAINT %%I'
+        ' FOREIGN KEY (author_id) REFERENCES authors_author (id)'
+        ' %s DEFERRABLE INITIALLY DEFERRED',
+        fk_name
+    );
+END
+$$;
+"""
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("authors", "0004_author_version"),
+        ("books", "0009_book_title_collation_c"),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            sql=_RECREATE % "ON DELETE CASCADE",
+            reverse_sql=_RECREATE % "ON DELETE NO ACTION",
+        ),
+    ]
@@ -0,0 +1,208 @@
+"""本一覧の keyset ページング (``?cursor=`` 指定時のみ使う).
+
+位置は並びの先頭キーと id の組 (common.domain.pagination.Cursor、著者の
+find_after と同じトークン) で持ち回り、``(key, id)`` が前ページの端より
+後ろ (前) の行を範囲条件で引く。DRF の CursorPagination は先頭キー +
+OFFSET で位置を持つため、同じ出版日の本が多いとその分を読み飛ばすが、
+こちらは books.filters の並びと揃えた複合索引の範囲走査になり、何ページ目
+でも 1 ページ目と同じコストで返す。総件数は数えない。
+"""
+
+import datetime
+from collections.abc import Callable
+from collections.abc import Sequence
+from typing import Any
+
+from django.db.models import Q
+from django.db.models import QuerySet
+from rest_framework.exceptions import ValidationError
+from rest_framework.pagination import BasePagination
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import replace_query_param
+from rest_framework.views import APIView
+
+from books.entities import Book
+from common.domain.pagination import Cursor
+from common.interfaces.cursor import decode_cursor
+from common.interfaces.cursor import encode_cursor
+
+CURSOR_QUERY_PARAM = "cursor"
+
+_DEFAULT_ORDERING = ("-published_date", "-id")
+
+# 並びの先頭キー → cursor の key (文字列) を値に戻す関数。
+_KEY_PARSERS: dict[str, Callable[[str], object]] = {
+    "published_date": datetime.date.fromisoformat,
+    "title": str,
+}
+
+type _Schema = dict[str, Any]
+
+
+class BookCursorPagination(BasePagination):
+    """本一覧の (並びキー, id) の keyset ページング.
+
+    並びは絞り込み側 (books.filters) で付けた ORDER BY に従う。
+    """
+
+    page_size_query_param = "page_size"
+    max_page_size = 100
+
+    def __init__(self) -> None:
+        self._next: str | None = None
+        self._previous: str | None = None
+
+    def paginate_queryset(
+        self,
+        queryset: QuerySet[Any, Any] | Sequence[Any],
+        request: Request,
+        view: APIView | None = None,  # noqa: ARG002
+    ) -> list[Any]:
+        """cursor の次 (前) の 1 ページを返し、前後のリンクを覚える.
+
+        範囲条件で引くため queryset は Book の QuerySet に限る。
+        """
+        if not isinstance(queryset, QuerySet):
+            msg = "keyset ページングには QuerySet を渡してください"
+            raise TypeError(msg)
+        ordering = (
+            tuple(str(field) for field in queryset.query.order_by)
+            or _DEFAULT_ORDERING
+        )
+        field = ordering[0].removeprefix("-")
+        descending = ordering[0].startswith("-")
+        page_size = self._page_size(request)
+        cursor = self._cursor(request, field=field)
+        queryset = queryset.order_by(*ordering)
+        if cursor is not None:
+            if cursor.backward:
+                queryset = queryset.reverse()
+            lookup = "lt" if descending != cursor.backward else "gt"
+            key = _KEY_PARSERS[field](cursor.key)
+            pk = int(cursor.tiebreaker)
+            # 先頭キー単独の条件はプランナに索引の範囲を示すため。
+            queryset = queryset.filter(**{f"{field}__{lookup}e": key}).filter(
+                Q(**{f"{field}__{lookup}": key}) | Q(**{f"id__{lookup}": pk})
+            )
+        books: list[Book] = list(queryset[: page_size + 1])
+        has_more = len(books) > page_size
+        books = books[:page_size]
+        backward = cursor is not None and cursor.backward
+        if backward:
+            books.reverse()
+        # 後ろから戻ってきた場合、次ページは必ず存在する。
+        has_next = True if backward else has_more
+        has_previous = has_more if backward else cursor is not None
+        self._next = self._previous = None
+        if books and has_next:
+            self._next = _cursor_url(
+                request,
+                book=books[-1],
+                field=field,
+                backward=False,
+            )
+        if books and has_previous:
+            self._previous = _cursor_url(
+                request,
+                book=books[0],
+                field=field,
+                backward=True,
+            )
+        return books
+
+    def get_paginated_response(self, data: Any) -> Response:
+        """next/previous のリンクと 1 ページ分の結果を返す."""
+        return Response(
+            {
+                "next": self._next,
+                "previous": self._previous,
+                "results": data,
+            }
+        )
+
+    def get_paginated_response_schema(self, schema: _Schema) -> _Schema:
+        """OpenAPI 用のレスポンス形 (next/previous/results)."""
+        link = {"type": "string", "nullable": True, "format": "uri"}
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "next": link,
+                "previous": link,
+                "results": schema,
+            },
+        }
+
+    def get_schema_operation_parameters(self, _view: Any) -> list[_Schema]:
+        """OpenAPI 用のクエリパラメータ (cursor/page_size)."""
+        return [
+            {
+                "name": CURSOR_QUERY_PARAM,
+                "required": False,
+                "in": "query",
+                "description": "ページ位置 (初回は空、以降は next/previous)",
+                "schema": {"type": "string"},
+            },
+            {
+                "name": self.page_size_query_param,
+                "required": False,
+                "in": "query",
+                "description": "1 ページの件数",
+                "schema": {"type": "integer"},
+            },
+        ]
+
+    def _page_size(self, request: Request) -> int:
+        raw = request.query_params.get(self.page_size_query_param)
+        if raw is None:
+            return api_settings.PAGE_SIZE or self.max_page_size
+        try:
+            page_size = int(raw)
+        except ValueError as exc:
+            msg = "page_size は整数で指定してください"
+            raise ValidationError(msg) from exc
+        if page_size < 1:
+            msg = "page_size は 1 以上で指定してください"
+            raise ValidationError(msg)
+        return min(page_size, self.max_page_size)
+
+    @staticmethod
+    def _cursor(
+        request: Request,
+        *,
+        field: str,
+    ) -> Cursor | None:
+        """cursor トークンを検証して返す (空は先頭、不正は 400)."""
+        token = request.query_params.get(CURSOR_QUERY_PARAM, "")
+        if not token:
+            return None
+        try:
+            cursor = decode_cursor(token)
+            _KEY_PARSERS[field](cursor.key)
+            int(cursor.tiebreaker)
+        except ValueError as exc:
+            msg = "cursor が不正です"
+            raise ValidationError(msg) from exc
+        return cursor
+
+
+def _cursor_url(
+    request: Request,
+    *,
+    book: Book,
+    field: str,
+    backward: bool,
+) -> str:
+    """book の位置を指す cursor 付き URL を組み立てる."""
+    cursor = Cursor(
+        key=str(getattr(book, field)),
+        tiebreaker=str(book.pk),
+        backward=backward,
+    )
+    return replace_query_param(
+        request.build_absolute_uri(),
+        CURSOR_QUERY_PARAM,
+        encode_cursor(cursor),
+    )
@@ -0,0 +1,350 @@
+"""書籍の全文検索 (Elasticsearch).
+
+タイトル・著者名で探すには DB では全件走査になるため、書籍ごとに著者名を
+写し持つドキュメントを Elasticsearch の BOOK_INDEX に置く。
+
+- 日本語のタイトルは語の区切りがないため、1〜2 文字の n-gram で索引する
+  (cjk_width で全角英数・半角カナを揃え、小文字にする)。1 文字の検索語
+  でも引け、2 文字以上は bi-gram の一致が多いものほど上位になる。
+- BOOK_INDEX はエイリアスで、実体は ``books-<日時>``。reindex コマンドが
+  新しい実体を作って流し込み、エイリアスを付け替える (検索は止まらない)。
+- 書籍の作成/更新/削除、import_books の各チャンク、著者名の変更・著者の
+  削除 (authors.interfaces.signals.author_changed) のコミット後に差分を
+  反映する。反映の失敗はログに留め、要求は失敗させない (reindex で直る)。
+  BOOK_SEARCH_ENABLED が偽なら反映しない。
+- 検索は (_score 降順, book_id 昇順) で並べ、search_after で続きを読む
+  (深いページでも from/size のように読み飛ばさない)。
+"""
+
+import functools
+import logging
+from collections.abc import Callable
+from collections.abc import Iterable
+from collections.abc import Iterator
+from datetime import UTC
+from datetime import datetime
+from typing import Any
+from uuid import UUID
+
+import attrs
+from django.conf import settings
+from django.db import transaction
+from elasticsearch import ApiError
+from elasticsearch import Elasticsearch
+from elasticsearch import TransportError
+from elasticsearch import helpers
+
+from books.entities import Book
+from common.infrastructure.adapters.exceptions import AdapterError
+
+logger = logging.getLogger(__name__)
+
+# 検索・差分の反映が向くエイリアス。
+BOOK_INDEX = "books"
+
+# 1 回の bulk 要求で送るドキュメント数。
+BULK_CHUNK_SIZE = 1000
+
+_INDEX_SETTINGS: dict[str, Any] = {
+    "index": {"max_ngram_diff": 1},
+    "analysis": {
+        "tokenizer": {
+            "ja_ngram": {
+                "type": "ngram",
+                "min_gram": 1,
+                "max_gram": 2,
+                "token_chars": ["letter", "digit"],
+            },
+        },
+        "analyzer": {
+            "ja_ngram": {
+                "type": "custom",
+                "tokenizer": "ja_ngram",
+                "filter": ["cjk_width", "lowercase"],
+            },
+        },
+    },
+}
+
+_INDEX_MAPPINGS: dict[str, Any] = {
+    "dynamic": "strict",
+    "properties": {
+        "book_id": {"type": "long"},
+        "title": {
+            "type": "text",
+            "analyzer": "ja_ngram",
+            "fields": {"keyword": {"type": "keyword"}},
+        },
+        "isbn": {"type": "keyword"},
+        "published_date": {"type": "date"},
+        "author_id": {"type": "keyword"},
+        "author_name": {"type": "text", "analyzer": "ja_ngram"},
+    },
+}
+
+# 検索語から作った n-gram のうち一致を求める割合。
+_MIN_MATCH = "75%"
+
+# ES が返す _score とタイブレーカ (search_after にそのまま渡す)。
+type SearchAfter = tuple[float, int]
+
+
+class BookSearchError(AdapterError):
+    """書籍の検索に失敗した場合に発生する例外."""
+
+
+@attrs.frozen(kw_only=True)
+class SearchPage:
+    """検索結果の 1 ページ (next_after は続きがなければ None)."""
+
+    book_ids: list[int]
+    next_after: SearchAfter | None
+
+
+@functools.cache
+def search_client() -> Elasticsearch:
+    """プロセスで共有する Elasticsearch クライアント."""
+    return Elasticsearch(hosts=[settings.ELASTICSEARCH_URL])
+
+
+def create_index(
+    client: Elasticsearch,
+    *,
+    bulk_load: bool = False,
+) -> str:
+    """BOOK_INDEX の新しい実体を作り、その名前を返す.
+
+    bulk_load なら流し込みの間は refresh を止めておく (finish_bulk_load
+    で戻す)。
+    """
+    name = f"{BOOK_INDEX}-{datetime.now(tz=UTC):%Y%m%d%H%M%S%f}"
+    index_settings = _INDEX_SETTINGS
+    if bulk_load:
+        index_settings = {
+            **_INDEX_SETTINGS,
+            "index": {**_INDEX_SETTINGS["index"], "refresh_interval": "-1"},
+        }
+    client.indices.create(
+        index=name,
+        settings=index_settings,
+        mappings=_INDEX_MAPPINGS,
+    )
+    return name
+
+
+def finish_bulk_load(
+    client: Elasticsearch,
+    *,
+    index: str,
+) -> None:
+    """refresh を既定に戻し、流し込んだ内容を検索できるようにする."""
+    client.indices.put_settings(
+        index=index,
+        settings={"index": {"refresh_interval": None}},
+    )
+    client.indices.refresh(index=index)
+
+
+def switch_alias(
+    client: Elasticsearch,
+    *,
+    index: str,
+) -> list[str]:
+    """BOOK_INDEX を index に付け替え、外した実体の名前を返す."""
+    current: list[str] = []
+    if client.indices.exists_alias(name=BOOK_INDEX):
+        current = list(client.indices.get_alias(name=BOOK_INDEX))
+    client.indices.update_aliases(
+        actions=[
+            *(
+                {"remove": {"index": old, "alias": BOOK_INDEX}}
+                for old in current
+            ),
+            {"add": {"index": index, "alias": BOOK_INDEX}},
+        ],
+    )
+    return current
+
+
+def book_actions(
+    books: Iterable[Book],
+    *,
+    index: str = BOOK_INDEX,
+) -> Iterator[dict[str, Any]]:
+    """bulk helper に渡す index 操作 (books は author を読んでおくこと)."""
+    for book in books:
+        yield {
+            "_op_type": "index",
+            "_index": index,
+            "_id": str(book.pk),
+            "_source": {
+                "book_id": book.pk,
+                "title": book.title,
+                "isbn": book.isbn,
+                "published_date": book.published_date.isoformat(),
+                "author_id": str(book.author_id),
+                "author_name": book.author.name,
+            },
+        }
+
+
+def indexable_books() -> Any:
+    """索引に載せる列だけを著者と JOIN して読む QuerySet."""
+    return (
+        Book.objects.select_related("author")
+        .only("title", "isbn", "published_date", "author__name")
+        .order_by("pk")
+    )
+
+
+def index_books(book_ids: Iterable[int]) -> None:
+    """書籍を DB から読み直して索引に反映する (消えた行は索引からも消す)."""
+    ids = set(book_ids)
+    if not ids:
+        return
+    client = search_client()
+    _ensure_index(client)
+    books = list(indexable_books().filter(pk__in=ids))
+    gone = ids - {book.pk for book in books}
+    helpers.bulk(
+        client,
+        book_actions(books),
+        chunk_size=BULK_CHUNK_SIZE,
+    )
+    if gone:
+        delete_books(book_ids=gone)
+
+
+def delete_books(book_ids: Iterable[int]) -> None:
+    """書籍を索引から消す (索引にないものは無視する)."""
+    actions = (
+        {"_op_type": "delete", "_index": BOOK_INDEX, "_id": str(book_id)}
+        for book_id in book_ids
+    )
+    helpers.bulk(
+        search_client(),
+        actions,
+        chunk_size=BULK_CHUNK_SIZE,
+        ignore_status=(404,),
+    )
+
+
+def reindex_author(author_id: UUID) -> None:
+    """著者名の変わった著者の書籍を載せ直す."""
+    client = search_client()
+    _ensure_index(client)
+    books = (
+        indexable_books()
+        .filter(author_id=author_id)
+        .iterator(chunk_size=BULK_CHUNK_SIZE)
+    )
+    helpers.bulk(
+        client,
+        book_actions(books),
+        chunk_size=BULK_CHUNK_SIZE,
+    )
+
+
+def delete_author_books(author_id: UUID) -> None:
+    """消えた著者の書籍を索引から消す (書籍は DB の連鎖削除で消えている)."""
+    search_client().delete_by_query(
+        index=BOOK_INDEX,
+        query={"term": {"author_id": str(author_id)}},
+        conflicts="proceed",
+        ignore_unavailable=True,
+    )
+
+
+def schedule_index(book_ids: Iterable[int]) -> None:
+    """コミット後に書籍を索引へ反映する."""
+    ids = list(book_ids)
+    _on_commit(lambda: index_books(book_ids=ids))
+
+
+def schedule_delete(book_ids: Iterable[int]) -> None:
+    """コミット後に書籍を索引から消す."""
+    ids = list(book_ids)
+    _on_commit(lambda: delete_books(book_ids=ids))
+
+
+def on_author_changed(
+    sender: Any,  # noqa: ARG001
+    *,
+    author_id: UUID,
+    deleted: bool,
+    **kwargs: Any,  # noqa: ARG001
+) -> None:
+    """author_changed の受け手 (BooksConfig.ready で接続する)."""
+    if deleted:
+        _on_commit(lambda: delete_author_books(author_id=author_id))
+    else:
+        _on_commit(lambda: reindex_author(author_id=author_id))
+
+
+def search_books(
+    query: str,
+    *,
+    size: int,
+    after: SearchAfter | None = None,
+) -> SearchPage:
+    """タイトル・著者名・ISBN で探し、関連度順に book_id を返す."""
+    try:
+        response: Any = search_client().search(
+            index=BOOK_INDEX,
+            query={
+                "bool": {
+                    "should": [
+                        {
+                            "multi_match": {
+                                "query": query,
+                                "fields": ["title^2", "author_name"],
+                                "minimum_should_match": _MIN_MATCH,
+                            },
+                        },
+                        # 語順まで一致するタイトルを上に出す。
+                        {"match_phrase": {"title": {"query": query}}},
+                        {"term": {"isbn": {"value": query, "boost": 10}}},
+                    ],
+                    "minimum_should_match": 1,
+                },
+            },
+            sort=["_score", {"book_id": "asc"}],
+            search_after=list(after) if after is not None else None,
+            size=size + 1,
+            source=False,
+            ignore_unavailable=True,
+            track_total_hits=False,
+        )
+    except (ApiError, TransportError) as e:
+        msg = f"書籍を検索できませんでした: {e}"
+        raise BookSearchError(msg) from e
+    hits = response["hits"]["hits"]
+    page = hits[:size]
+    next_after = None
+    if len(hits) > size and page:
+        score, book_id = page[-1]["sort"]
+        next_after = (float(score), int(book_id))
+    return SearchPage(
+        book_ids=[int(hit["_id"]) for hit in page],
+        next_after=next_after,
+    )
+
+
+@functools.cache
+def _ensure_index(client: Elasticsearch) -> None:
+    """BOOK_INDEX がなければ実体を作ってエイリアスを張る (プロセスで 1 回)."""
+    if not client.indices.exists(index=BOOK_INDEX):
+        switch_alias(client, index=create_index(client))
+
+
+def _on_commit(job: Callable[[], None]) -> None:
+    if not settings.BOOK_SEARCH_ENABLED:
+        return
+    transaction.on_commit(lambda: _run_quietly(job))
+
+
+def _run_quietly(job: Callable[[], None]) -> None:
+    try:
+        job()
+    except (ApiError, TransportError, helpers.BulkIndexError):
+        logger.exception("書籍の検索インデックスを更新できませんでした")
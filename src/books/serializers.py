@@ -1,13 +1,39 @@
+import base64
+import binascii
+import hashlib
+from typing import Any
+
+from drf_spectacular.utils import extend_schema_field
 from rest_framework import serializers
 
 from authors.interfaces.serializers.author import AuthorSerializer
+from books.entities import ISBN_LENGTH
 from books.entities import TITLE_MAX_LENGTH
 from books.entities import TITLE_MIN_LENGTH
 from books.entities import Book
 from books.entities.safe_text import SafeText
+from books.thumbnails import CoverThumbnails
+from books.thumbnails import cover_thumbnail_urls
+from books.uploads import COVER_CONTENT_TYPES
+from books.uploads import CoverImageField
+from books.uploads import finalize_cover_upload
+
+# cover_thumbnails の OpenAPI 上の形 ({"120": {"webp": URL, ...}, ...})。
+_COVER_THUMBNAILS_SCHEMA = {
+    "type": "object",
+    "nullable": True,
+    "description": "表紙の縮小版の URL (大きさ → 形式 → URL)。未生成なら null",
+    "additionalProperties": {
+        "type": "object",
+        "additionalProperties": {"type": "string", "format": "uri"},
+    },
+}
 
 
 class BookSerializer(serializers.ModelSerializer[Book]):
+    cover_image = CoverImageField(required=False)
+    cover_thumbnails = serializers.SerializerMethodField()
+
     class Meta:
         model = Book
         fields = [
@@ -17,26 +43,31 @@ class BookSerializer(serializers.ModelSerializer[Book]):
             "published_date",
             "author",
             "cover_image",
+            "cover_thumbnails",
             "created_at",
         ]
         read_only_fields = ["id", "created_at"]
 
+    @extend_schema_field(_COVER_THUMBNAILS_SCHEMA)
+    def get_cover_thumbnails(self, book: Book) -> CoverThumbnails | None:
+        return cover_thumbnail_urls(book=book)
+
     def validate_title(self, value: str) -> str:
-        try:
-            SafeText(
-                value=value,
-                min_length=TITLE_MIN_LENGTH,
-                max_length=TITLE_MAX_LENGTH,
-            )
-        except ValueError as e:
-            raise serializers.ValidationError(str(e)) from e
+        (error,) = SafeText.validate_many(
+            values=[value],
+            min_length=TITLE_MIN_LENGTH,
+            max_length=TITLE_MAX_LENGTH,
+        )
+        if error is not None:
+            raise serializers.ValidationError(error)
         return value
 
 
 class BookDetailSerializer(serializers.ModelSerializer[Book]):
-    """読み取り用: author をネストして返す."""
+    """読み取り用 (``?expand=author`` の詳細): author をネストして返す."""
 
     author = AuthorSerializer(read_only=True)
+    cover_thumbnails = serializers.SerializerMethodField()
 
     class Meta:
         model = Book
@@ -47,6 +78,109 @@ class BookDetailSerializer(serializers.ModelSerializer[Book]):
             "published_date",
             "author",
             "cover_image",
+            "cover_thumbnails",
             "created_at",
         ]
         read_only_fields = ["id", "created_at"]
+
+    @extend_schema_field(_COVER_THUMBNAILS_SCHEMA)
+    def get_cover_thumbnails(self, book: Book) -> CoverThumbnails | None:
+        return cover_thumbnail_urls(book=book)
+
+
+# 1 回の一括照会で受け付ける ISBN の上限 (IN 句を有限に保つ)。
+LOOKUP_MAX_ISBNS = 1000
+
+
+class BookLookupSerializer(serializers.Serializer[Any]):
+    """ISBN 一括照会の入力."""
+
+    isbns = serializers.ListField(
+        child=serializers.CharField(max_length=ISBN_LENGTH),
+        min_length=1,
+        max_length=LOOKUP_MAX_ISBNS,
+    )
+
+
+class BookLookupResultSerializer(serializers.Serializer[Any]):
+    """ISBN 一括照会の応答 (見つからなかった ISBN も明示する)."""
+
+    results = BookSerializer(many=True)
+    missing = serializers.ListField(child=serializers.CharField())
+
+
+class CoverUploadRequestSerializer(serializers.Serializer[Any]):
+    """表紙の直接アップロード (presigned POST) の発行依頼."""
+
+    content_type = serializers.ChoiceField(
+        choices=sorted(COVER_CONTENT_TYPES),
+    )
+    checksum_sha256 = serializers.CharField(
+        help_text="送る内容の SHA-256 (base64)。S3 が受信時に照合する",
+    )
+
+    def validate_checksum_sha256(self, value: str) -> str:
+        try:
+            digest = base64.b64decode(value, validate=True)
+        except binascii.Error:
+            digest = b""
+        if len(digest) != hashlib.sha256().digest_size:
+            msg = "SHA-256 の base64 ではありません"
+            raise serializers.ValidationError(msg)
+        return value
+
+
+class CoverUploadSerializer(serializers.Serializer[Any]):
+    """発行した presigned POST (url へ fields と file を送る)."""
+
+    key = serializers.CharField()
+    url = serializers.URLField()
+    expires_in = serializers.IntegerField(help_text="有効期限 (秒)")
+
+    def get_fields(self) -> dict[str, serializers.Field[Any, Any, Any, Any]]:
+        # fields は Serializer 自身の属性と同名のため、宣言せずここで足す。
+        fields = super().get_fields()
+        fields["fields"] = serializers.DictField(
+            child=serializers.CharField(),
+        )
+        return fields
+
+
+class CoverFinalizeSerializer(serializers.Serializer[Any]):
+    """直接アップロードした表紙の確定 (key は検証後に表紙のキーになる)."""
+
+    key = serializers.CharField()
+
+    def validate_key(self, value: str) -> str:
+        try:
+            return finalize_cover_upload(key=value)
+        except ValueError as e:
+            raise serializers.ValidationError(str(e)) from e
+
+
+# 1 回の検索で返す件数の既定値と上限。
+SEARCH_PAGE_SIZE = 20
+SEARCH_MAX_PAGE_SIZE = 100
+
+
+class BookSearchQuerySerializer(serializers.Serializer[Any]):
+    """``GET /books/search/`` のクエリ."""
+
+    q = serializers.CharField(max_length=200, help_text="検索語")
+    cursor = serializers.CharField(
+        required=False,
+        help_text="前の応答の next に含まれる続きの位置",
+    )
+    page_size = serializers.IntegerField(
+        required=False,
+        default=SEARCH_PAGE_SIZE,
+        min_value=1,
+        max_value=SEARCH_MAX_PAGE_SIZE,
+    )
+
+
+class BookSearchResultSerializer(serializers.Serializer[Any]):
+    """検索結果 (関連度順)。next は続きがなければ null."""
+
+    results = BookSerializer(many=True)
+    next = serializers.URLField(allow_null=True)
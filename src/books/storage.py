@@ -0,0 +1,46 @@
+"""表紙画像を置く S3 互換ストレージへの接続と、表紙のキーの決め方.
+
+表紙は内容の SHA-256 をキーにする (content-addressed)。同じ画像を何度
+上げても同じオブジェクトを指すため、既にあれば PUT を省ける。複数の
+書籍が 1 つのオブジェクトを共有するので、消してよいのは参照する書籍が
+0 件になったときだけで、その判定は purge_orphan_covers が行う。
+"""
+
+from typing import Any
+
+import boto3
+from django.conf import settings
+
+# Book.cover_image の upload_to (S3 上のキー接頭辞)。
+COVER_PREFIX = "books/covers/"
+
+# ストリーミング受信中の表紙を一時的に置く接頭辞 (内容のハッシュが
+# 決まってから表紙のキーへコピーする)。残骸は purge_orphan_covers が消す。
+COVER_STAGING_PREFIX = f"{COVER_PREFIX}staging/"
+
+# Pillow の形式名 → 表紙のキーの拡張子。
+_COVER_EXTENSIONS = {"JPEG": "jpg", "PNG": "png", "GIF": "gif", "WEBP": "webp"}
+
+# 表紙の派生画像 (books.thumbnails) の接頭辞。表紙とは別の接頭辞にし、
+# purge_orphan_covers が派生画像を「参照のない表紙」と見なさないようにする。
+THUMBNAIL_PREFIX = "books/thumbnails/"
+
+
+def s3_client() -> Any:
+    """設定の接続先で S3 クライアントを作る."""
+    return boto3.client(
+        "s3",
+        endpoint_url=settings.S3_ENDPOINT_URL,
+        aws_access_key_id=settings.S3_ACCESS_KEY,
+        aws_secret_access_key=settings.S3_SECRET_KEY,
+    )
+
+
+def cover_name(
+    *,
+    digest: str,
+    image_format: str,
+) -> str:
+    """内容の SHA-256 から表紙のキーを決める (同じ内容なら同じキー)."""
+    extension = _COVER_EXTENSIONS.get(image_format, image_format.lower())
+    return f"{COVER_PREFIX}{digest}.{extension}"
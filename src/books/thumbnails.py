@@ -0,0 +1,249 @@
+"""表紙のサムネイル (縮小版・WebP 版) をリクエストの外で生成する.
+
+一覧 UI が 120px の表示のために数 MB の原寸画像を落とさなくて済むよう、
+表紙ごとに THUMBNAIL_SIZES の各大きさと THUMBNAIL_FORMATS の各形式の
+派生画像を作り、表紙のキーから決まるキー (thumbnail_key) で保存する。
+
+- 生成は書籍の作成/更新のコミット後にプロセスプールへ投げ、リクエストの
+  応答は待たない (画像のデコードは CPU を使い GIL を離さないため)。
+- JPEG は Pillow の draft モードで 1/2・1/4・1/8 の縮小デコードを使い、
+  最大の大きさに足りる最小の解像度だけを復号する。
+- 生成を終えたら Book.cover_thumbnails_source に元の表紙名を記録する。
+  表紙が差し替わっていれば記録しない (古い表紙の派生を出さない)。
+- 既存の書籍は backfill_cover_thumbnails で埋める。
+
+COVER_THUMBNAIL_WORKERS=0 のときはプールを使わず呼び出し元で同期実行する
+(テストやローカルの確認用)。
+"""
+
+import functools
+import logging
+import multiprocessing
+import os
+from collections.abc import Callable
+from concurrent.futures import Executor
+from concurrent.futures import Future
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from io import BytesIO
+from typing import IO
+from typing import Any
+
+import django
+from django.conf import settings
+from django.core.files.storage import storages
+from django.db import close_old_connections
+from django.db import transaction
+from PIL import Image
+from PIL import ImageOps
+
+from books.entities import Book
+from books.storage import COVER_PREFIX
+from books.storage import THUMBNAIL_PREFIX
+
+logger = logging.getLogger(__name__)
+
+# 縮小後の長辺 (px)。大きい順に、前の結果からさらに縮めて作る。
+THUMBNAIL_SIZES = (480, 240, 120)
+
+# {大きさ: {形式: URL}} (cover_thumbnails の値)。
+type CoverThumbnails = dict[str, dict[str, str]]
+
+# 出力形式 → (Pillow の形式名, 拡張子, 保存オプション)。
+THUMBNAIL_FORMATS: dict[str, tuple[str, str, dict[str, Any]]] = {
+    "jpeg": ("JPEG", "jpg", {"quality": 82, "progressive": True}),
+    "webp": ("WEBP", "webp", {"quality": 80, "method": 4}),
+}
+
+
+def thumbnail_key(
+    cover_name: str,
+    *,
+    size: int,
+    fmt: str,
+) -> str:
+    """表紙のキーから派生画像のキーを決める (常に同じ値になる)."""
+    stem = cover_name.removeprefix(COVER_PREFIX)
+    extension = THUMBNAIL_FORMATS[fmt][1]
+    return f"{THUMBNAIL_PREFIX}{stem}/{size}.{extension}"
+
+
+def thumbnail_keys(cover_name: str) -> list[str]:
+    """表紙 1 枚分の派生画像のキーをすべて返す."""
+    return [
+        thumbnail_key(cover_name=cover_name, size=size, fmt=fmt)
+        for size in THUMBNAIL_SIZES
+        for fmt in THUMBNAIL_FORMATS
+    ]
+
+
+def cover_thumbnail_urls(book: Book) -> CoverThumbnails | None:
+    """{大きさ: {形式: URL}} を返す (派生画像が未生成なら None)."""
+    cover_name = book.cover_image.name
+    if not cover_name or book.cover_thumbnails_source != cover_name:
+        return None
+    storage = book.cover_image.storage
+    return {
+        str(size): {
+            fmt: storage.url(
+                thumbnail_key(cover_name=cover_name, size=size, fmt=fmt)
+            )
+            for fmt in THUMBNAIL_FORMATS
+        }
+        for size in THUMBNAIL_SIZES
+    }
+
+
+def render_thumbnails(source: IO[bytes]) -> dict[tuple[int, str], bytes]:
+    """画像を読み、(大きさ, 形式) → エンコード済みバイト列を返す."""
+    rendered: dict[tuple[int, str], bytes] = {}
+    with Image.open(source) as image:
+        largest = max(THUMBNAIL_SIZES)
+        # JPEG 以外では何もしない。
+        image.draft("RGB", (largest, largest))
+        frame = ImageOps.exif_transpose(image)
+    mode = "RGBA" if frame.has_transparency_data else "RGB"
+    frame = frame.convert(mode)
+    for size in sorted(THUMBNAIL_SIZES, reverse=True):
+        frame.thumbnail((size, size), Image.Resampling.LANCZOS)
+        for fmt, (pillow_format, _, options) in THUMBNAIL_FORMATS.items():
+            target = frame
+            if pillow_format == "JPEG" and frame.mode != "RGB":
+                target = frame.convert("RGB")
+            buffer = BytesIO()
+            target.save(buffer, format=pillow_format, **options)
+            rendered[size, fmt] = buffer.getvalue()
+    return rendered
+
+
+def generate_thumbnails(
+    *,
+    book_id: int,
+    cover_name: str,
+    force: bool = False,
+) -> bool:
+    """表紙の派生画像を保存し、書籍に記録する.
+
+    表紙は内容で決まるキーを複数の書籍で共有するため、同じ表紙の派生画像を
+    他の書籍で作り終えていれば作り直さない (force なら作り直す)。
+    表紙が差し替わっていて記録しなかったときは False を返す。
+    """
+    rendered_before = Book.objects.filter(
+        cover_image=cover_name,
+        cover_thumbnails_source=cover_name,
+    ).exists()
+    if force or not rendered_before:
+        _store_thumbnails(cover_name=cover_name)
+    updated = Book.objects.filter(pk=book_id, cover_image=cover_name).update(
+        cover_thumbnails_source=cover_name,
+    )
+    return updated > 0
+
+
+def _store_thumbnails(cover_name: str) -> None:
+    storage = storages["default"]
+    with storage.open(cover_name, "rb") as source:
+        rendered = render_thumbnails(source=source)
+    for (size, fmt), data in rendered.items():
+        key = thumbnail_key(cover_name=cover_name, size=size, fmt=fmt)
+        # キーは固定なので、その場で上書きする。save は既存のキーを別名に
+        # ずらし、exists → delete → save は並行する生成と競合するため。
+        with storage.open(key, "wb") as target:
+            target.write(data)
+
+
+def schedule_thumbnails(book: Book) -> None:
+    """コミット後に book の表紙の派生画像の生成を依頼する."""
+    cover_name = book.cover_image.name
+    if not cover_name or book.cover_thumbnails_source == cover_name:
+        return
+    job = functools.partial(
+        generate_thumbnails,
+        book_id=book.pk,
+        cover_name=cover_name,
+    )
+    transaction.on_commit(lambda: _submit(job))
+
+
+def thumbnail_executor() -> Executor:
+    """派生画像の生成に使う Executor (workers=0 なら同期実行)."""
+    if settings.COVER_THUMBNAIL_WORKERS == 0:
+        return _InlineExecutor()
+    return _process_pool()
+
+
+def _submit(job: Callable[[], bool]) -> None:
+    try:
+        future = thumbnail_executor().submit(job)
+    except BrokenProcessPool:
+        # 子プロセスが落ちたプールは使えないため作り直させる。
+        # 取りこぼした表紙は backfill_cover_thumbnails で拾える。
+        _process_pool.cache_clear()
+        logger.exception("サムネイル生成のプールが壊れています")
+        return
+    future.add_done_callback(_log_failure)
+
+
+def _log_failure(future: Future[bool]) -> None:
+    error = future.exception()
+    if error is not None:
+        logger.error(
+            "サムネイルを生成できませんでした",
+            exc_info=error,
+        )
+
+
+@functools.cache
+def _process_pool() -> ProcessPoolExecutor:
+    # fork だと親の DB 接続や boto3 のソケットを共有してしまうため spawn。
+    return _WorkerPoolExecutor(
+        max_workers=settings.COVER_THUMBNAIL_WORKERS,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_init_worker,
+        initargs=(os.environ["DJANGO_SETTINGS_MODULE"],),
+    )
+
+
+def _init_worker(settings_module: str) -> None:
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", settings_module)
+    django.setup()
+
+
+def _run_in_worker(job: Callable[[], Any]) -> Any:
+    # 子プロセスは前の job の DB 接続を持ち越すため、切れた接続を先に
+    # 捨てる (呼び出し元のスレッドでは呼ばない。同期実行や atomic の中で
+    # 呼び出し元の接続を閉じてしまう)。
+    close_old_connections()
+    return job()
+
+
+class _WorkerPoolExecutor(ProcessPoolExecutor):
+    """job を _run_in_worker 越しに子プロセスで動かすプール."""
+
+    def submit(
+        self,
+        fn: Callable[..., Any],
+        /,
+        *args: Any,
+        **kwargs: Any,
+    ) -> Future[Any]:
+        job = functools.partial(fn, *args, **kwargs)
+        return super().submit(_run_in_worker, job)
+
+
+class _InlineExecutor(Executor):
+    """submit の場で実行し、完了済みの Future を返す Executor."""
+
+    def submit(
+        self,
+        fn: Callable[..., Any],
+        /,
+        *args: Any,
+        **kwargs: Any,
+    ) -> Future[Any]:
+        future: Future[Any] = Future()
+        try:
+            future.set_result(fn(*args, **kwargs))
+        except Exception as e:
+            future.set_exception(e)
+        return future
@@ -0,0 +1,688 @@
+"""表紙画像を S3 マルチパートアップロードへ直接流すアップロードハンドラ.
+
+Django 既定のハンドラは受信したファイルをメモリか一時ファイルに溜め、
+保存時に S3Storage がそれを読み直して送る。大きなスキャン画像では
+ワーカーのメモリを占有し、I/O も 2 倍になる。
+
+CoverUploadHandler は multipart の受信チャンクを part 単位に溜め、
+溜まった part から順に S3 のマルチパートアップロードへ送る。送信は
+COVER_UPLOAD_CONCURRENCY 本まで並行し、それ以上は受信側を待たせるため、
+1 アップロードのメモリは (並行数 + 1) part 分で頭打ちになる。part 1 つに
+満たない小さなファイルは 1 回の PUT で送る。
+
+表紙のキーは内容の SHA-256 で決まる (books.storage.cover_name)。受信中に
+ハッシュを計算し、小さなファイルは同じキーのオブジェクトが既にあれば PUT
+自体を省く。マルチパートはキーが決まる前に送り始めるため一時キー
+(COVER_STAGING_PREFIX) に送り、既にあれば part を破棄、なければ完了させて
+表紙のキーへサーバ側でコピーする。ハンドラを通らないアップロード
+(ローカルのストレージ等) も CoverImageField が同じキーで保存する。
+
+既にある表紙を指すだけのとき (重複) も、その表紙をその場でコピーし直して
+LastModified を今にする (_reuse_existing)。書籍の行がコミットされる前に、
+古い孤児だった同じ表紙を purge_orphan_covers が --min-age を過ぎたものと
+して消さないようにするため。
+
+最初の part を送る前に先頭バイトを Pillow で判定し、画像でなければ以降を
+読み捨てて S3 には何も書かない (CoverImageField が 400 にする)。
+既定ストレージが S3Storage でないとき (テスト等) は何もせず、後続の
+Django 既定ハンドラに任せる。送信後に検証エラー等で書籍が作られなかった
+場合のオブジェクトは purge_orphan_covers が後で消す。
+
+遅いクライアントの送信中ずっとワーカーを塞がないよう、バイト列を
+アプリサーバに通さない直接アップロードも用意する。
+
+1. presign_cover_upload が一時キー (COVER_STAGING_PREFIX 配下) への
+   presigned POST を発行する。ポリシーで Content-Type・大きさの上限
+   (COVER_DIRECT_UPLOAD_MAX_SIZE)・クライアントが申告した SHA-256
+   (``x-amz-checksum-sha256``) を縛るため、範囲外や申告と違う内容は
+   S3 が拒否する (PUT の署名 URL では大きさを縛れないので POST にする)。
+2. クライアントが S3 へ直接送る。
+3. finalize_cover_upload が HeadObject で一時オブジェクトの大きさ・
+   Content-Type・S3 が検証済みの SHA-256 を読み、先頭バイトだけを
+   範囲指定の GET で読んで画像形式を判定し、表紙のキーへサーバ側で
+   コピーする (同じキーが既にあればコピーしない)。本体はアプリサーバを
+   通らない。
+"""
+
+import base64
+import binascii
+import hashlib
+import logging
+import re
+import threading
+import uuid
+from concurrent.futures import Future
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+from typing import Any
+
+import attrs
+from botocore.exceptions import BotoCoreError
+from botocore.exceptions import ClientError
+from django.conf import settings
+from django.core.files.base import File
+from django.core.files.storage import storages
+from django.core.files.uploadedfile import UploadedFile
+from django.core.files.uploadhandler import FileUploadHandler
+from django.core.files.uploadhandler import StopFutureHandlers
+from django.http import HttpRequest
+from PIL import Image
+from PIL import UnidentifiedImageError
+from rest_framework import serializers
+from storages.backends.s3 import S3Storage
+from storages.utils import safe_join
+
+from books.storage import COVER_STAGING_PREFIX
+from books.storage import cover_name
+from common.infrastructure.adapters.exceptions import AdapterError
+
+logger = logging.getLogger(__name__)
+
+# このハンドラが受け持つ multipart のフィールド名。
+COVER_FIELD = "cover_image"
+
+# 形式の判定に渡す先頭バイト数 (JPEG の大きな EXIF/ICC も収まる大きさ)。
+_SNIFF_BYTES = 1024 * 1024
+
+# 直接アップロードで受け付ける Content-Type → Pillow の形式名。
+COVER_CONTENT_TYPES = {
+    "image/jpeg": "JPEG",
+    "image/png": "PNG",
+    "image/gif": "GIF",
+    "image/webp": "WEBP",
+}
+
+# presign_cover_upload が発行する一時キーの形。
+_DIRECT_KEY_PREFIX = f"{COVER_STAGING_PREFIX}direct/"
+_DIRECT_KEY = re.compile(rf"{re.escape(_DIRECT_KEY_PREFIX)}[0-9a-f]{{32}}")
+
+# 直接アップロードで S3 に検証させるチェックサムの方式。
+_CHECKSUM_ALGORITHM = "SHA256"
+
+
+class CoverUploadError(AdapterError):
+    """表紙の S3 への送信に失敗した場合に発生する例外."""
+
+
+class StreamedCoverFile(UploadedFile):  # type: ignore[type-arg]
+    """S3 へ送信済みの表紙 (本体は持たず、キーと判定結果だけを持つ).
+
+    image_format は先頭バイトから判定した Pillow の形式名で、画像で
+    なければ None (その場合 S3 には何も書いていない)。
+    """
+
+    def __init__(
+        self,
+        *,
+        key: str,
+        name: str | None,
+        content_type: str | None,
+        size: int,
+        image_format: str | None,
+    ) -> None:
+        # request 終了時に close されるため、空の実体を持たせておく。
+        super().__init__(
+            file=BytesIO(),
+            name=name,
+            content_type=content_type,
+            size=size,
+        )
+        self.key = key
+        self.image_format = image_format
+
+
+class CoverImageField(serializers.ImageField):
+    """表紙を内容のハッシュのキーで保存し、そのキー (文字列) を返す.
+
+    モデルにキーを渡すと FieldFile は保存済み扱いになり、S3Storage が
+    もう一度アップロードすることはない。StreamedCoverFile は送信済みの
+    キーをそのまま、それ以外のファイルは ImageField として検証してから
+    ハッシュを取り、同じキーがなければ保存する。
+    """
+
+    def to_internal_value(self, data: Any) -> Any:
+        if not isinstance(data, StreamedCoverFile):
+            file = super().to_internal_value(data)
+            return _store_cover(file)
+        if data.image_format is None:
+            self.fail("invalid_image")
+        # 名前・空ファイル等の FileField としての検証だけ行う。
+        serializers.FileField.to_internal_value(self, data)
+        return data.key
+
+
+def _store_cover(file: File[Any]) -> str:
+    """ハンドラを通らなかった表紙を内容のハッシュのキーで保存する."""
+    digest = hashlib.sha256()
+    for chunk in file.chunks():
+        digest.update(chunk)
+    # ImageField の検証で Pillow が開いた結果が image に入っている。
+    name = cover_name(
+        digest=digest.hexdigest(),
+        image_format=file.image.format,  # type: ignore[attr-defined]
+    )
+    storage = storages["default"]
+    if isinstance(storage, S3Storage):
+        exists = _reuse_existing(
+            client=storage.connection.meta.client,
+            bucket=storage.bucket_name,
+            key=safe_join(storage.location, name),
+        )
+    else:
+        exists = storage.exists(name)
+    if not exists:
+        file.seek(0)
+        storage.save(name, file)
+    return name
+
+
+class CoverUploadHandler(FileUploadHandler):
+    """cover_image の受信チャンクを S3 マルチパートアップロードへ流す."""
+
+    def __init__(self, request: HttpRequest | None = None) -> None:
+        super().__init__(request)
+        self._writer: _MultipartWriter | None = None
+        self._active = False
+
+    def new_file(
+        self,
+        field_name: str,
+        file_name: str,
+        content_type: str,
+        content_length: int | None,
+        charset: str | None = None,
+        content_type_extra: dict[str, bytes] | None = None,
+    ) -> None:
+        super().new_file(
+            field_name,
+            file_name,
+            content_type,
+            content_length,
+            charset,
+            content_type_extra,
+        )
+        self._writer = None
+        self._active = False
+        storage = storages["default"]
+        if field_name != COVER_FIELD or not isinstance(storage, S3Storage):
+            return
+        self._active = True
+        self._writer = _MultipartWriter(
+            client=storage.connection.meta.client,
+            bucket=storage.bucket_name,
+            location=storage.location,
+            content_type=content_type,
+            part_size=settings.COVER_UPLOAD_PART_SIZE,
+            concurrency=settings.COVER_UPLOAD_CONCURRENCY,
+        )
+        raise StopFutureHandlers
+
+    def receive_data_chunk(
+        self,
+        raw_data: bytes,
+        start: int,  # noqa: ARG002
+    ) -> bytes | None:
+        if not self._active or self._writer is None:
+            return raw_data
+        self._writer.write(raw_data)
+        return None
+
+    def file_complete(self, file_size: int) -> StreamedCoverFile | None:
+        if not self._active or self._writer is None:
+            return None
+        writer, self._writer = self._writer, None
+        image_format = writer.close()
+        return StreamedCoverFile(
+            key=writer.name or "",
+            name=self.file_name,
+            content_type=self.content_type,
+            size=file_size,
+            image_format=image_format,
+        )
+
+    def upload_interrupted(self) -> None:
+        if self._writer is not None:
+            self._writer.abort()
+            self._writer = None
+
+
+class _MultipartWriter:
+    """受け取ったバイト列を part_size ごとに S3 へ並行送信する.
+
+    part は一時キーへ送り、close で内容のハッシュから表紙のキー (name)
+    を決める。
+    """
+
+    def __init__(
+        self,
+        *,
+        client: Any,
+        bucket: str,
+        location: str,
+        content_type: str,
+        part_size: int,
+        concurrency: int,
+    ) -> None:
+        self.name: str | None = None
+        self._client = client
+        self._bucket = bucket
+        self._location = location
+        # マルチパートの送り先 (表紙のキーはまだ決まっていない)。
+        self._key = safe_join(
+            location,
+            f"{COVER_STAGING_PREFIX}{uuid.uuid4().hex}",
+        )
+        self._digest = hashlib.sha256()
+        self._content_type = content_type
+        self._part_size = part_size
+        self._buffer = bytearray()
+        # スレッドは最初の submit まで作られない (小さなファイルでは不要)。
+        self._executor = ThreadPoolExecutor(
+            max_workers=concurrency,
+            thread_name_prefix="cover-upload",
+        )
+        # 送信中の part 数を並行数までに抑え、受信側を待たせる。
+        self._slots = threading.BoundedSemaphore(concurrency)
+        self._failure: BaseException | None = None
+        self._upload_id: str | None = None
+        self._parts: list[tuple[int, Future[str]]] = []
+        self._sniffed = False
+        self._image_format: str | None = None
+
+    def write(self, data: bytes) -> None:
+        if self._sniffed and self._image_format is None:
+            # 画像でないと分かったので残りは読み捨てる。
+            return
+        self._digest.update(data)
+        self._buffer += data
+        if len(self._buffer) < self._part_size:
+            return
+        try:
+            self._send_part(final=False)
+        except BaseException:
+            # 受信中の例外では Django は upload_interrupted を呼ばない。
+            self.abort()
+            raise
+
+    def close(self) -> str | None:
+        """残りを送って表紙のキーに置き、判定した画像形式を返す.
+
+        同じ内容の表紙が既にあれば置かずに鮮度だけ更新する (name は
+        そのキーになる)。
+        """
+        try:
+            if not self._sniffed:
+                self._sniff()
+            if self._image_format is None:
+                return None
+            self.name = cover_name(
+                digest=self._digest.hexdigest(),
+                image_format=self._image_format,
+            )
+            key = safe_join(self._location, self.name)
+            if self._upload_id is None:
+                if not self._reuse(key):
+                    _call_s3(
+                        self._client.put_object,
+                        Bucket=self._bucket,
+                        Key=key,
+                        Body=bytes(self._buffer),
+                        ContentType=self._content_type,
+                    )
+                return self._image_format
+            if self._buffer:
+                self._send_part(final=True)
+            parts = [
+                {"PartNumber": number, "ETag": future.result()}
+                for number, future in self._parts
+            ]
+            if self._reuse(key):
+                # 送った part は不要なので、オブジェクトを作らずに捨てる。
+                self.abort()
+                return self._image_format
+            _call_s3(
+                self._client.complete_multipart_upload,
+                Bucket=self._bucket,
+                Key=self._key,
+                UploadId=self._upload_id,
+                MultipartUpload={"Parts": parts},
+            )
+            self._upload_id = None
+            _call_s3(
+                self._client.copy_object,
+                Bucket=self._bucket,
+                Key=key,
+                CopySource={"Bucket": self._bucket, "Key": self._key},
+            )
+            _call_s3(
+                self._client.delete_object,
+                Bucket=self._bucket,
+                Key=self._key,
+            )
+        except BaseException:
+            self.abort()
+            raise
+        finally:
+            self._shutdown()
+        return self._image_format
+
+    def _reuse(self, key: str) -> bool:
+        return _reuse_existing(
+            client=self._client,
+            bucket=self._bucket,
+            key=key,
+        )
+
+    def abort(self) -> None:
+        """途中まで送った part を破棄する.
+
+        破棄自体の失敗は元の例外を隠さないようログに留める (残った part は
+        バケットのライフサイクル規則で消える)。
+        """
+        self._shutdown()
+        if self._upload_id is None:
+            return
+        upload_id, self._upload_id = self._upload_id, None
+        try:
+            _call_s3(
+                self._client.abort_multipart_upload,
+                Bucket=self._bucket,
+                Key=self._key,
+                UploadId=upload_id,
+            )
+        except CoverUploadError:
+            logger.warning(
+                "マルチパートアップロードを破棄できませんでした: %s",
+                self._key,
+                exc_info=True,
+            )
+
+    def _sniff(self) -> None:
+        """先頭バイトが Pillow で開ける画像かを判定する (本体は読まない)."""
+        self._sniffed = True
+        try:
+            head = BytesIO(self._buffer[:_SNIFF_BYTES])
+            with Image.open(head) as image:
+                self._image_format = image.format
+        except (UnidentifiedImageError, OSError):
+            self._image_format = None
+        if self._image_format is None:
+            self._buffer.clear()
+
+    def _send_part(self, final: bool) -> None:
+        if not self._sniffed:
+            self._sniff()
+            if self._image_format is None:
+                return
+        if self._upload_id is None:
+            response = _call_s3(
+                self._client.create_multipart_upload,
+                Bucket=self._bucket,
+                Key=self._key,
+                ContentType=self._content_type,
+            )
+            self._upload_id = response["UploadId"]
+        while len(self._buffer) >= self._part_size or (final and self._buffer):
+            body = bytes(self._buffer[: self._part_size])
+            del self._buffer[: self._part_size]
+            self._submit(body)
+
+    def _submit(self, body: bytes) -> None:
+        self._slots.acquire()
+        if self._failure is not None:
+            # 先に失敗した part があれば以降を送らずに止める。
+            self._slots.release()
+            raise self._failure
+        number = len(self._parts) + 1
+        future = self._executor.submit(self._upload_part, number, body)
+        future.add_done_callback(self._part_done)
+        self._parts.append((number, future))
+
+    def _part_done(self, future: Future[str]) -> None:
+        self._slots.release()
+        if future.cancelled() or self._failure is not None:
+            return
+        self._failure = future.exception()
+
+    def _upload_part(
+        self,
+        number: int,
+        body: bytes,
+    ) -> str:
+        response = _call_s3(
+            self._client.upload_part,
+            Bucket=self._bucket,
+            Key=self._key,
+            UploadId=self._upload_id,
+            PartNumber=number,
+            Body=body,
+        )
+        etag: str = response["ETag"]
+        return etag
+
+    def _shutdown(self) -> None:
+        self._executor.shutdown(wait=True, cancel_futures=True)
+
+
+@attrs.frozen(kw_only=True)
+class PresignedCoverUpload:
+    """クライアントに渡す presigned POST (url へ fields と file を送る)."""
+
+    key: str
+    url: str
+    fields: dict[str, str]
+    expires_in: int
+
+
+def presign_cover_upload(
+    *,
+    content_type: str,
+    checksum_sha256: str,
+) -> PresignedCoverUpload:
+    """一時キーへの presigned POST を発行する.
+
+    checksum_sha256 は送る内容の SHA-256 (base64)。S3 が受信時に内容と
+    照合し、違えば拒否する。
+    """
+    key = f"{_DIRECT_KEY_PREFIX}{uuid.uuid4().hex}"
+    storage = _direct_upload_storage()
+    expires_in: int = settings.COVER_DIRECT_UPLOAD_EXPIRES
+    checksum_fields = {
+        "x-amz-checksum-algorithm": _CHECKSUM_ALGORITHM,
+        "x-amz-checksum-sha256": checksum_sha256,
+    }
+    try:
+        post = storage.connection.meta.client.generate_presigned_post(
+            Bucket=storage.bucket_name,
+            Key=safe_join(storage.location, key),
+            Fields={"Content-Type": content_type, **checksum_fields},
+            Conditions=[
+                {"Content-Type": content_type},
+                *({name: value} for name, value in checksum_fields.items()),
+                [
+                    "content-length-range",
+                    1,
+                    settings.COVER_DIRECT_UPLOAD_MAX_SIZE,
+                ],
+            ],
+            ExpiresIn=expires_in,
+        )
+    except (BotoCoreError, ClientError) as e:
+        msg = f"表紙のアップロード URL を発行できませんでした: {e}"
+        raise CoverUploadError(msg) from e
+    return PresignedCoverUpload(
+        key=key,
+        url=post["url"],
+        fields=post["fields"],
+        expires_in=expires_in,
+    )
+
+
+def finalize_cover_upload(key: str) -> str:
+    """直接アップロードされた一時オブジェクトを検証し、表紙のキーを返す.
+
+    key も戻り値もストレージ上の名前 (location からの相対) で、S3 の
+    キーには default ストレージの location を前に付けて読み書きする。
+    一時オブジェクトがない・大きすぎる・受け付けない Content-Type・
+    SHA-256 のチェックサムがない・画像でない (Content-Type と形式が違う)
+    ときは ValueError。弾いた一時オブジェクトはどの書籍も指さないため
+    purge_orphan_covers が消す。
+    """
+    if not _DIRECT_KEY.fullmatch(key):
+        msg = "直接アップロード用のキーではありません"
+        raise ValueError(msg)
+    storage = _direct_upload_storage()
+    client = storage.connection.meta.client
+    bucket: str = storage.bucket_name
+    staged = safe_join(storage.location, key)
+    head = _head_object(
+        client=client,
+        bucket=bucket,
+        key=staged,
+        checksum=True,
+    )
+    if head is None:
+        msg = "アップロードされた表紙が見つかりません"
+        raise ValueError(msg)
+    if head["ContentLength"] > settings.COVER_DIRECT_UPLOAD_MAX_SIZE:
+        msg = "表紙が大きすぎます"
+        raise ValueError(msg)
+    expected_format = COVER_CONTENT_TYPES.get(head.get("ContentType", ""))
+    if expected_format is None:
+        msg = "受け付けない Content-Type です"
+        raise ValueError(msg)
+    digest = _sha256_hex(head)
+    if digest is None:
+        msg = "SHA-256 のチェックサム付きで送られていません"
+        raise ValueError(msg)
+    image_format = _sniff_object(client=client, bucket=bucket, key=staged)
+    if image_format != expected_format:
+        msg = "Content-Type と一致する画像ではありません"
+        raise ValueError(msg)
+    name = cover_name(digest=digest, image_format=image_format)
+    target = safe_join(storage.location, name)
+    if not _reuse_existing(client=client, bucket=bucket, key=target):
+        _call_s3(
+            client.copy_object,
+            Bucket=bucket,
+            Key=target,
+            CopySource={"Bucket": bucket, "Key": staged},
+        )
+    _call_s3(client.delete_object, Bucket=bucket, Key=staged)
+    return name
+
+
+def _direct_upload_storage() -> S3Storage:
+    """表紙を読む default ストレージ (直接アップロードは S3 のときだけ)."""
+    storage = storages["default"]
+    if not isinstance(storage, S3Storage):
+        msg = "表紙のストレージが S3 ではないため直接アップロードできません"
+        raise CoverUploadError(msg)
+    return storage
+
+
+def _call_s3(
+    method: Any,
+    **kwargs: Any,
+) -> Any:
+    try:
+        return method(**kwargs)
+    except (BotoCoreError, ClientError) as e:
+        msg = f"表紙の S3 への送信に失敗しました: {e}"
+        raise CoverUploadError(msg) from e
+
+
+def _head_object(
+    *,
+    client: Any,
+    bucket: str,
+    key: str,
+    checksum: bool = False,
+) -> dict[str, Any] | None:
+    """オブジェクトのメタデータを返す (なければ None).
+
+    checksum なら保存時のチェックサム (ChecksumSHA256 等) も返させる。
+    """
+    extra = {"ChecksumMode": "ENABLED"} if checksum else {}
+    try:
+        head: dict[str, Any] = client.head_object(
+            Bucket=bucket,
+            Key=key,
+            **extra,
+        )
+    except ClientError as e:
+        if e.response.get("Error", {}).get("Code") in {"404", "NoSuchKey"}:
+            return None
+        msg = f"表紙の存在確認に失敗しました: {e}"
+        raise CoverUploadError(msg) from e
+    except BotoCoreError as e:
+        msg = f"表紙の存在確認に失敗しました: {e}"
+        raise CoverUploadError(msg) from e
+    return head
+
+
+def _reuse_existing(
+    *,
+    client: Any,
+    bucket: str,
+    key: str,
+) -> bool:
+    """key の表紙があれば LastModified を今にして True を返す.
+
+    S3 は自分自身へのコピーにメタデータの置き換えを求めるため、
+    Content-Type とユーザメタデータは元のものを渡し直す。
+    """
+    head = _head_object(client=client, bucket=bucket, key=key)
+    if head is None:
+        return False
+    _call_s3(
+        client.copy_object,
+        Bucket=bucket,
+        Key=key,
+        CopySource={"Bucket": bucket, "Key": key},
+        MetadataDirective="REPLACE",
+        ContentType=head.get("ContentType", "binary/octet-stream"),
+        Metadata=head.get("Metadata", {}),
+    )
+    return True
+
+
+def _sha256_hex(head: dict[str, Any]) -> str | None:
+    """HeadObject の ChecksumSHA256 (base64) を 16 進に直す.
+
+    part ごとのチェックサムを合成した値 (マルチパート) は内容の
+    SHA-256 ではないため None を返す。
+    """
+    if head.get("ChecksumType", "FULL_OBJECT") != "FULL_OBJECT":
+        return None
+    try:
+        return base64.b64decode(head["ChecksumSHA256"], validate=True).hex()
+    except (KeyError, binascii.Error):
+        return None
+
+
+def _sniff_object(
+    *,
+    client: Any,
+    bucket: str,
+    key: str,
+) -> str | None:
+    """先頭バイトだけを範囲指定で読み、判定した画像形式を返す."""
+    try:
+        body = client.get_object(
+            Bucket=bucket,
+            Key=key,
+            Range=f"bytes=0-{_SNIFF_BYTES - 1}",
+        )["Body"]
+        try:
+            head = body.read()
+        finally:
+            body.close()
+    except (BotoCoreError, ClientError) as e:
+        msg = f"表紙を読み込めませんでした: {e}"
+        raise CoverUploadError(msg) from e
+    try:
+        with Image.open(BytesIO(head)) as image:
+            return image.format
+    except (UnidentifiedImageError, OSError):
+        return None
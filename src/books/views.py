@@ -1,51 +1,365 @@
-import logging
+from collections.abc import Sequence
 from typing import Any
 
+from django.db import transaction
+from django.http import HttpRequest
+from django.http import StreamingHttpResponse
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import OpenApiParameter
+from drf_spectacular.utils import extend_schema
+from drf_spectacular.utils import extend_schema_view
+from rest_framework import serializers
+from rest_framework import status
 from rest_framework import viewsets
+from rest_framework.decorators import action
+from rest_framework.pagination import BasePagination
 from rest_framework.parsers import FormParser
 from rest_framework.parsers import JSONParser
 from rest_framework.parsers import MultiPartParser
+from rest_framework.request import Request
+from rest_framework.response import Response
 from rest_framework.serializers import BaseSerializer
+from rest_framework.utils.urls import replace_query_param
 
+from authors.interfaces.serializers.author import AuthorSerializer
+from authors.models import Author
 from books.entities import Book
+from books.filters import BookFilterSerializer
+from books.filters import filter_books
+from books.pagination import CURSOR_QUERY_PARAM
+from books.pagination import BookCursorPagination
+from books.search import schedule_delete
+from books.search import schedule_index
+from books.search import search_books
 from books.serializers import BookDetailSerializer
+from books.serializers import BookLookupResultSerializer
+from books.serializers import BookLookupSerializer
+from books.serializers import BookSearchQuerySerializer
+from books.serializers import BookSearchResultSerializer
 from books.serializers import BookSerializer
+from books.serializers import CoverFinalizeSerializer
+from books.serializers import CoverUploadRequestSerializer
+from books.serializers import CoverUploadSerializer
+from books.thumbnails import schedule_thumbnails
+from books.uploads import CoverUploadHandler
+from books.uploads import presign_cover_upload
+from common.domain.pagination import Cursor
+from common.interfaces.cursor import decode_cursor
+from common.interfaces.cursor import encode_cursor
+from common.interfaces.ndjson import accepts_gzip
+from common.interfaces.ndjson import ndjson_response
 from notifications.domain.events import BookCreated
-from notifications.domain.results import NotificationProblem
 from notifications.infrastructure.containers.notificaton import container
-from notifications.usecases.protocols import NotifyBookCreatedUseCase
+from notifications.usecases.protocols import NotificationDispatcher
 
-logger = logging.getLogger(__name__)
+# 全件エクスポートでサーバサイドカーソルから 1 回に読む件数。
+_EXPORT_CHUNK_SIZE = 2000
 
+EXPAND_QUERY_PARAM = "expand"
 
+# ?expand= で展開できる関連 (カンマ区切りで指定する)。
+_EXPANDABLE = frozenset({"author"})
+
+_EXPAND_PARAM = OpenApiParameter(
+    name=EXPAND_QUERY_PARAM,
+    type=OpenApiTypes.STR,
+    location=OpenApiParameter.QUERY,
+    description=(
+        "author を指定すると著者を展開する。一覧では included.authors に"
+        "ページ内の著者を 1 回ずつ、詳細では author にネストして返す"
+    ),
+)
+
+
+@extend_schema_view(
+    list=extend_schema(parameters=[_EXPAND_PARAM, BookFilterSerializer]),
+    retrieve=extend_schema(parameters=[_EXPAND_PARAM]),
+)
 class BookViewSet(viewsets.ModelViewSet[Book]):
-    queryset = Book.objects.select_related("author").all()
+    """書籍の CRUD.
+
+    既定では author を id のまま返し、authors を JOIN しない。
+    ``?expand=author`` のときだけ著者を読み、一覧では行ごとに繰り返さず
+    ページ内の異なる著者を ``included.authors`` (id → 著者) に 1 回ずつ
+    載せる。詳細は 1 冊なので author にネストして返す。
+
+    一覧は books.filters の条件 (author・出版日の範囲・isbn・title の
+    前方一致) で絞り込み、``?sort=`` の許可リストの順に並べる。
+
+    表紙は multipart/form-data で受けるほか、``cover-uploads`` で発行した
+    presigned POST でクライアントから S3 へ直接送らせることもできる
+    (books.uploads)。
+    """
+
+    queryset = Book.objects.all()
     parser_classes = [
         MultiPartParser,
         FormParser,
         JSONParser,
     ]
 
+    def initialize_request(
+        self,
+        request: HttpRequest,
+        *args: Any,
+        **kwargs: Any,
+    ) -> Request:
+        """表紙を S3 へ直接流すハンドラを既定のハンドラより前に差し込む.
+
+        request.FILES/POST を読む前 (DRF の Request を作る前) でないと
+        差し替えられない。
+        """
+        request.upload_handlers.insert(0, CoverUploadHandler(request=request))
+        return super().initialize_request(request, *args, **kwargs)
+
+    @property
+    def paginator(self) -> BasePagination | None:
+        """``?cursor=`` があれば keyset、なければ既定のページ番号方式."""
+        if not hasattr(self, "_paginator"):
+            use_cursor = (
+                self.request is not None
+                and CURSOR_QUERY_PARAM in self.request.query_params
+            )
+            pagination_class = (
+                BookCursorPagination if use_cursor else self.pagination_class
+            )
+            self._paginator = (
+                pagination_class() if pagination_class is not None else None
+            )
+        return self._paginator
+
+    def get_queryset(self) -> Any:
+        queryset = super().get_queryset()
+        if self.action == "list":
+            filters = BookFilterSerializer(data=self.request.query_params)
+            filters.is_valid(raise_exception=True)
+            return filter_books(
+                queryset=queryset,
+                params=filters.validated_data,
+            )
+        if self.action == "retrieve" and self._expands_author():
+            return queryset.select_related("author")
+        return queryset
+
     def get_serializer_class(
         self,
     ) -> type[BookSerializer | BookDetailSerializer]:
-        if self.action in ("list", "retrieve"):
+        if self.action == "retrieve" and self._expands_author():
             return BookDetailSerializer
         return BookSerializer
 
-    def perform_create(self, serializer: BaseSerializer[Any]) -> None:
-        """本の作成時に通知を送信する."""
+    def list(
+        self,
+        request: Request,
+        *args: Any,
+        **kwargs: Any,
+    ) -> Response:
+        if not self._expands_author():
+            return super().list(request, *args, **kwargs)
+        queryset = self.filter_queryset(self.get_queryset())
+        page = self.paginate_queryset(queryset)
+        books = list(queryset) if page is None else page
+        data = self.get_serializer(books, many=True).data
+        included = {"authors": self._included_authors(books)}
+        if page is None:
+            return Response({"results": data, "included": included})
+        response = self.get_paginated_response(data)
+        response.data["included"] = included
+        return response
+
+    @action(detail=False, methods=["get"], url_path="export")
+    def export(self, request: Request) -> StreamingHttpResponse:
+        """全書籍を NDJSON でストリーミングする.
+
+        author は id のまま返し (JOIN しない)、サーバサイドカーソルで
+        _EXPORT_CHUNK_SIZE 件ずつ読むため、件数によらずメモリは一定。
+        """
+        serializer = BookSerializer(context=self.get_serializer_context())
+        books = Book.objects.order_by("id").iterator(
+            chunk_size=_EXPORT_CHUNK_SIZE,
+        )
+        return ndjson_response(
+            (serializer.to_representation(book) for book in books),
+            filename="books.ndjson",
+            gzip=accepts_gzip(request),
+        )
+
+    def _expands_author(self) -> bool:
+        """``?expand=`` に author が含まれるか (未知の値は 400)."""
+        raw = self.request.query_params.get(EXPAND_QUERY_PARAM, "")
+        requested = {name.strip() for name in raw.split(",") if name.strip()}
+        unknown = requested - _EXPANDABLE
+        if unknown:
+            msg = f"展開できない関連です: {', '.join(sorted(unknown))}"
+            raise serializers.ValidationError({EXPAND_QUERY_PARAM: [msg]})
+        return "author" in requested
+
+    def _included_authors(self, books: Sequence[Book]) -> dict[str, Any]:
+        """ページ内の異なる著者を 1 クエリで読み、id → 著者の dict にする."""
+        authors = Author.objects.in_bulk({book.author_id for book in books})
+        serializer = AuthorSerializer(context=self.get_serializer_context())
+        return {
+            str(author_id): serializer.to_representation(author)
+            for author_id, author in authors.items()
+        }
+
+    @extend_schema(
+        request=BookLookupSerializer,
+        responses=BookLookupResultSerializer,
+    )
+    @action(detail=False, methods=["post"], url_path="lookup")
+    def lookup(self, request: Request) -> Response:
+        """ISBN の一覧に一致する書籍を 1 クエリで返す.
+
+        ``isbn IN (...)`` を isbn の一意索引で引く (並べ替えはしない)。
+        結果は指定順 (重複は除く) で、見つからなかった ISBN は missing に
+        入れる。件数の上限は LOOKUP_MAX_ISBNS。
+        """
+        serializer = BookLookupSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        isbns = list(dict.fromkeys(serializer.validated_data["isbns"]))
+        found = {
+            book.isbn: book
+            for book in Book.objects.filter(isbn__in=isbns).order_by()
+        }
+        books = [found[isbn] for isbn in isbns if isbn in found]
+        context = self.get_serializer_context()
+        return Response(
+            {
+                "results": BookSerializer(
+                    instance=books,
+                    many=True,
+                    context=context,
+                ).data,
+                "missing": [isbn for isbn in isbns if isbn not in found],
+            }
+        )
+
+    @extend_schema(
+        parameters=[BookSearchQuerySerializer],
+        responses=BookSearchResultSerializer,
+    )
+    @action(detail=False, methods=["get"], url_path="search")
+    def search(self, request: Request) -> Response:
+        """タイトル・著者名・ISBN で全文検索する (books.search).
+
+        関連度順に返し、続きは next の URL (``?cursor=``) で読む。
+        cursor は Elasticsearch の search_after の位置 (スコアと id) で、
+        ページが深くなっても読み飛ばしは発生しない。
+        """
+        params = BookSearchQuerySerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        after = None
+        if "cursor" in params.validated_data:
+            try:
+                cursor = decode_cursor(params.validated_data["cursor"])
+                after = (float(cursor.key), int(cursor.tiebreaker))
+            except ValueError as e:
+                raise serializers.ValidationError(
+                    {CURSOR_QUERY_PARAM: [str(e)]}
+                ) from e
+        page = search_books(
+            query=params.validated_data["q"],
+            size=params.validated_data["page_size"],
+            after=after,
+        )
+        # 索引にあっても DB から消えた書籍は飛ばす (索引の反映待ち)。
+        found = Book.objects.in_bulk(page.book_ids)
+        books = [found[pk] for pk in page.book_ids if pk in found]
+        next_url = None
+        if page.next_after is not None:
+            score, book_id = page.next_after
+            token = encode_cursor(
+                Cursor(key=repr(score), tiebreaker=str(book_id)),
+            )
+            next_url = replace_query_param(
+                request.build_absolute_uri(),
+                CURSOR_QUERY_PARAM,
+                token,
+            )
+        return Response(
+            {
+                "results": BookSerializer(
+                    instance=books,
+                    many=True,
+                    context=self.get_serializer_context(),
+                ).data,
+                "next": next_url,
+            }
+        )
+
+    @extend_schema(
+        request=CoverUploadRequestSerializer,
+        responses={201: CoverUploadSerializer},
+    )
+    @action(detail=False, methods=["post"], url_path="cover-uploads")
+    def cover_uploads(self, request: Request) -> Response:
+        """表紙を S3 へ直接送るための presigned POST を発行する.
+
+        送信後に ``POST /books/{id}/cover/`` へ key を渡して確定する。
+        """
+        serializer = CoverUploadRequestSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        upload = presign_cover_upload(
+            content_type=serializer.validated_data["content_type"],
+            checksum_sha256=serializer.validated_data["checksum_sha256"],
+        )
+        return Response(
+            CoverUploadSerializer(instance=upload).data,
+            status=status.HTTP_201_CREATED,
+        )
+
+    @extend_schema(
+        request=CoverFinalizeSerializer,
+        responses=BookSerializer,
+    )
+    @action(detail=True, methods=["post"], url_path="cover")
+    def cover(
+        self,
+        request: Request,
+        pk: str | None = None,  # noqa: ARG002
+    ) -> Response:
+        """直接アップロードした表紙を検証して書籍に付ける."""
+        book = self.get_object()
+        serializer = CoverFinalizeSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        book.cover_image.name = serializer.validated_data["key"]
+        book.save(update_fields=["cover_image"])
+        schedule_thumbnails(book=book)
+        return Response(
+            BookSerializer(
+                instance=book,
+                context=self.get_serializer_context(),
+            ).data
+        )
+
+    def perform_update(self, serializer: BaseSerializer[Any]) -> None:
+        """検索インデックスへの反映と、表紙の派生画像の生成を依頼する."""
         instance = serializer.save()
-        event = BookCreated(
-            title=instance.title,
-            isbn=instance.isbn,
-            author_name=instance.author.name,
-        )
-        result = container.injector.get(
-            NotifyBookCreatedUseCase,  # type: ignore[type-abstract]
-        ).execute(event=event)
-        if isinstance(result, NotificationProblem):
-            logger.warning(
-                "通知送信に失敗しました: %s",
-                result.detail,
+        schedule_index(book_ids=[instance.pk])
+        schedule_thumbnails(book=instance)
+
+    def perform_destroy(self, instance: Book) -> None:
+        """削除し、コミット後に検索インデックスからも消す."""
+        book_id = instance.pk
+        instance.delete()
+        schedule_delete(book_ids=[book_id])
+
+    def perform_create(self, serializer: BaseSerializer[Any]) -> None:
+        """本を作成し、通知・索引・派生画像の生成を依頼する.
+
+        通知は本と同じトランザクションで積む (作成が戻れば通知も出ない)。
+        送信は待たない。
+        """
+        with transaction.atomic():
+            instance = serializer.save()
+            event = BookCreated(
+                title=instance.title,
+                isbn=instance.isbn,
+                author_name=instance.author.name,
             )
+            container.injector.get(
+                NotificationDispatcher,  # type: ignore[type-abstract]
+            ).dispatch(event=event)
+        schedule_index(book_ids=[instance.pk])
+        schedule_thumbnails(book=instance)
@@ -15,6 +15,15 @@ class EntityDoesNotExistError(EntityError):
     pass
 
 
+class EntityVersionConflictError(EntityError):
+    """期待した版とエンティティの現在の版が一致しない場合に発生する例外.
+
+    楽観的排他制御で、読んだ後に他者が更新していたことを表す。
+    """
+
+    pass
+
+
 class GenerateRepositoryError(EntityError):
     """リポジトリの生成に失敗した場合に発生する例外."""
 
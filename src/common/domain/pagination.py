@@ -0,0 +1,38 @@
+"""ページングの値オブジェクト.
+
+keyset (cursor) ページングでは「最後に見た行の並び順キー + 一意な
+tiebreaker (PK)」を位置として持ち回る。OFFSET と異なり読み飛ばす行を
+DB に走査させないため、何ページ目でも 1 ページ目と同じコストで引ける。
+
+総件数も大きな表では COUNT(*) が 1 ページ分の取得より高くつくため、
+``CountStrategy`` で厳密/推定/なしを選べるようにする。
+"""
+
+from enum import Enum
+
+import attrs
+
+
+@attrs.frozen(kw_only=True)
+class Cursor:
+    """keyset ページングの位置.
+
+    key は並び順キーの文字列表現、tiebreaker は同値キーを一意に
+    順序付ける PK の文字列表現。backward=True は前ページ方向を表す。
+    """
+
+    key: str
+    tiebreaker: str
+    backward: bool = False
+
+
+class CountStrategy(Enum):
+    """一覧の総件数の求め方.
+
+    EXACT は COUNT(*)、ESTIMATE は DB の統計情報による概算、
+    NONE は総件数を求めず次ページの有無だけを返す。
+    """
+
+    EXACT = "exact"
+    ESTIMATE = "estimate"
+    NONE = "none"
@@ -1,5 +1,8 @@
 """attrs 用の共通バリデータ."""
 
+from collections.abc import Mapping
+from typing import Any
+
 import attrs
 
 
@@ -15,3 +18,22 @@ def validate_not_empty(
 
 
 not_empty = attrs.validators.instance_of(str)
+
+
+def validate_changes(
+    entity_type: type,
+    changes: Mapping[str, Any],
+) -> None:
+    """部分更新の値を entity_type の属性バリデータで検証する.
+
+    現在のエンティティを読まずに更新するときに使う。attrs.evolve と
+    同じく、属性でない名前は TypeError、不正な値は各バリデータの例外とする。
+    """
+    attributes = attrs.fields_dict(entity_type)
+    for name, value in changes.items():
+        attribute = attributes.get(name)
+        if attribute is None:
+            msg = f"{name} は {entity_type.__name__} の属性ではありません"
+            raise TypeError(msg)
+        if attribute.validator is not None:
+            attribute.validator(None, attribute, value)
@@ -20,6 +20,7 @@ from rest_framework.views import exception_handler as drf_exception_handler
 
 from common.domain.entities.exceptions import EntityDoesNotExistError
 from common.domain.entities.exceptions import EntityError
+from common.domain.entities.exceptions import EntityVersionConflictError
 from common.domain.exceptions import AppError
 from common.infrastructure.adapters.exceptions import AdapterError
 from common.infrastructure.factories.exceptions import FactoryError
@@ -34,6 +35,8 @@ def _map_app_error(exc: AppError) -> tuple[HTTPStatus, str]:
     """AppError 配下を (HTTP ステータス, タイトル) に対応付ける."""
     if isinstance(exc, EntityDoesNotExistError):
         return HTTPStatus.NOT_FOUND, "Not Found"
+    if isinstance(exc, EntityVersionConflictError):
+        return HTTPStatus.PRECONDITION_FAILED, "Precondition Failed"
     if isinstance(exc, EntityError):
         # GenerateRepositoryError を含む。不正なエンティティ起因。
         return HTTPStatus.UNPROCESSABLE_ENTITY, "Unprocessable Entity"
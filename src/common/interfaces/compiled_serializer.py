@@ -0,0 +1,115 @@
+"""attrs エンティティ向けの事前組み立て (compiled) 出力シリアライザ.
+
+DRF の ``Serializer.to_representation`` はフィールドごとに
+get_attribute → to_representation を呼ぶため、100 行のページでも
+数千回の関数呼び出しになる。read-only の出力専用シリアライザでは
+やることは「属性を読んで UUID/日時を文字列にする」だけなので、
+フィールド宣言からクラスごとに 1 度だけ取り出し方 (attrgetter) と
+整形関数の組を作り、以後はそれで直接 dict を組み立てる。
+
+フィールド宣言は通常の DRF と同じため、OpenAPI スキーマは変わらない。
+sparse fieldset (フィールドを pop した状態) ごとにも組み立てて使い回す。
+"""
+
+from collections.abc import Callable
+from operator import attrgetter
+from typing import Any
+from typing import ClassVar
+
+import attrs
+from rest_framework import ISO_8601
+from rest_framework import serializers
+from rest_framework.settings import api_settings
+
+
+@attrs.frozen(kw_only=True)
+class _Plan:
+    """出力名の並び・属性の一括取り出し・位置ごとの整形関数."""
+
+    names: tuple[str, ...]
+    getter: Callable[[Any], Any]
+    converters: tuple[Callable[[Any], Any], ...]
+
+
+class CompiledSerializer(serializers.Serializer[Any]):
+    """to_representation を事前に組み立てた read-only シリアライザ.
+
+    対応フィールドは Char/Integer/Boolean/UUID (hex_verbose)/DateTime
+    (ISO 8601) のみで、出力は DRF の同名フィールドと同一になる。
+    それ以外のフィールドを宣言すると初回の整形時に TypeError とする。
+    """
+
+    _plans: ClassVar[dict[tuple[type, tuple[str, ...]], _Plan]] = {}
+
+    def to_representation(self, instance: Any) -> dict[str, Any]:
+        fields = self.fields
+        key = (type(self), tuple(fields))
+        plan = self._plans.get(key)
+        if plan is None:
+            plan = _compile(fields)
+            self._plans[key] = plan
+        values = plan.getter(instance)
+        if len(plan.names) == 1:
+            # attrgetter は属性 1 つだと tuple でなく値そのものを返す。
+            values = (values,)
+        return {
+            name: None if value is None else convert(value)
+            for name, convert, value in zip(
+                plan.names,
+                plan.converters,
+                values,
+                strict=True,
+            )
+        }
+
+
+def _compile(fields: Any) -> _Plan:
+    """宣言フィールドから取り出し方と整形関数の組を作る."""
+    sources = []
+    for name, field in fields.items():
+        if not field.source_attrs:
+            msg = f"{name}: source='*' は CompiledSerializer で扱えません"
+            raise TypeError(msg)
+        sources.append(".".join(field.source_attrs))
+    return _Plan(
+        names=tuple(fields),
+        getter=attrgetter(*sources),
+        converters=tuple(_converter(field) for field in fields.values()),
+    )
+
+
+def _converter(field: Any) -> Callable[[Any], Any]:
+    """DRF の to_representation と同じ結果を返す整形関数を選ぶ."""
+    if isinstance(field, serializers.UUIDField):
+        if field.uuid_format != "hex_verbose":
+            msg = f"{field.field_name}: uuid format は hex_verbose のみ対応"
+            raise TypeError(msg)
+        return str
+    if isinstance(field, serializers.DateTimeField):
+        output_format = getattr(field, "format", api_settings.DATETIME_FORMAT)
+        if output_format is None or output_format.lower() != ISO_8601:
+            msg = f"{field.field_name}: 日時の書式は ISO 8601 のみ対応"
+            raise TypeError(msg)
+        return _datetime_formatter(field)
+    if isinstance(field, serializers.BooleanField):
+        return bool
+    if isinstance(field, serializers.IntegerField):
+        return int
+    if isinstance(field, serializers.CharField):
+        # StrEnum 等も DRF と同じく str() で平らにする。
+        return str
+    msg = f"{field.field_name}: {type(field).__name__} は未対応です"
+    raise TypeError(msg)
+
+
+def _datetime_formatter(field: Any) -> Callable[[Any], str]:
+    """DRF の DateTimeField と同じ ISO 8601 文字列を返す関数を作る."""
+    enforce_timezone = field.enforce_timezone
+
+    def format_datetime(value: Any) -> str:
+        text: str = enforce_timezone(value).isoformat()
+        if text.endswith("+00:00"):
+            return text[:-6] + "Z"
+        return text
+
+    return format_datetime
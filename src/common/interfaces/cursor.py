@@ -0,0 +1,46 @@
+"""keyset ページング位置 (Cursor) の不透明トークン化.
+
+クライアントには中身を解釈させないよう、JSON を URL-safe base64 に
+包んだ文字列として渡す。改ざん・破損したトークンは ValueError とし、
+ビュー側で 400 に変換する。
+"""
+
+import base64
+import binascii
+import json
+
+from common.domain.pagination import Cursor
+
+
+def encode_cursor(cursor: Cursor) -> str:
+    """Cursor を不透明トークンに変換する."""
+    payload = {
+        "k": cursor.key,
+        "t": cursor.tiebreaker,
+        "b": cursor.backward,
+    }
+    raw = json.dumps(payload, ensure_ascii=False, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(token: str) -> Cursor:
+    """不透明トークンを Cursor に戻す (不正時 ValueError)."""
+    padded = token + "=" * (-len(token) % 4)
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(padded))
+    except (binascii.Error, UnicodeDecodeError, json.JSONDecodeError) as exc:
+        msg = "cursor が不正です"
+        raise ValueError(msg) from exc
+    if not isinstance(payload, dict):
+        payload = {}
+    key = payload.get("k")
+    tiebreaker = payload.get("t")
+    backward = payload.get("b", False)
+    if not (
+        isinstance(key, str)
+        and isinstance(tiebreaker, str)
+        and isinstance(backward, bool)
+    ):
+        msg = "cursor が不正です"
+        raise ValueError(msg)
+    return Cursor(key=key, tiebreaker=tiebreaker, backward=backward)
@@ -0,0 +1,81 @@
+"""HTTP 条件付きリクエスト (ETag / If-None-Match) の補助.
+
+References
+----------
+https://www.rfc-editor.org/rfc/rfc9110#section-8.8.3
+https://www.rfc-editor.org/rfc/rfc9110#section-13.1.2
+"""
+
+import hashlib
+import re
+from collections.abc import Iterable
+
+# make_version_etag の形式 ("<版>-<16 バイトの 16 進>")。
+_VERSION_ETAG = re.compile(r'"(\d+)-[0-9a-f]{32}"')
+
+
+def make_etag(parts: Iterable[str]) -> str:
+    """表現を一意に決める部品列から強い ETag (引用符付き) を作る."""
+    digest = hashlib.blake2b(digest_size=16)
+    for part in parts:
+        digest.update(part.encode())
+        # 部品の境界を明示し ("ab","c") と ("a","bc") を区別する。
+        digest.update(b"\x00")
+    return f'"{digest.hexdigest()}"'
+
+
+def if_none_match(
+    header: str | None,
+    *,
+    etag: str,
+) -> bool:
+    """If-None-Match が etag に一致するか (GET 用の弱い比較)."""
+    if header is None:
+        return False
+    candidates = [candidate.strip() for candidate in header.split(",")]
+    if "*" in candidates:
+        return True
+    return any(
+        candidate.removeprefix("W/") == etag for candidate in candidates
+    )
+
+
+def make_version_etag(
+    *,
+    version: int,
+    variant: str,
+) -> str:
+    """版を読み取れる強い ETag を作る.
+
+    variant は同じ版の異なる表現 (fields 指定等) を区別する文字列。
+    If-Match から版を取り出せるよう、ダイジェストの前に版を平文で置く。
+    """
+    digest = make_etag(parts=[str(version), variant]).strip('"')
+    return f'"{version}-{digest}"'
+
+
+def if_match_versions(
+    header: str | None,
+    *,
+    variant: str,
+) -> frozenset[int] | None:
+    """If-Match が許す版の集合を返す (ヘッダなし・"*" は None).
+
+    If-Match は強い比較のため W/ 付きは一致しない。variant の表現の
+    ETag として正しいものだけを採り、なければ空集合 (= 必ず 412) を返す。
+    """
+    if header is None:
+        return None
+    candidates = [candidate.strip() for candidate in header.split(",")]
+    if "*" in candidates:
+        return None
+    versions = set()
+    for candidate in candidates:
+        match = _VERSION_ETAG.fullmatch(candidate)
+        if match is None:
+            continue
+        version = int(match.group(1))
+        expected = make_version_etag(version=version, variant=variant)
+        if candidate == expected:
+            versions.add(version)
+    return frozenset(versions)
@@ -0,0 +1,73 @@
+"""全件エクスポート用の NDJSON ストリーミング応答.
+
+1 行 1 JSON を生成しながら送るため、表の大きさによらずメモリは一定。
+行はまとめて (_FLUSH_BYTES 程度ずつ) 書き出し、書き込み回数を抑える。
+``Accept-Encoding: gzip`` なら送る前に逐次 gzip 圧縮する。
+"""
+
+import re
+import zlib
+from collections.abc import Iterable
+from collections.abc import Iterator
+from typing import Any
+
+from django.http import StreamingHttpResponse
+from django.utils.cache import patch_vary_headers
+from rest_framework.request import Request
+from rest_framework.utils.encoders import JSONEncoder
+
+NDJSON_CONTENT_TYPE = "application/x-ndjson"
+
+# この大きさ (バイト) 溜まるごとに 1 チャンクとして送る。
+_FLUSH_BYTES = 64 * 1024
+
+_ACCEPTS_GZIP = re.compile(r"\bgzip\b")
+
+
+def accepts_gzip(request: Request) -> bool:
+    """クライアントが gzip の Content-Encoding を受け付けるか."""
+    return bool(
+        _ACCEPTS_GZIP.search(request.headers.get("Accept-Encoding", ""))
+    )
+
+
+def ndjson_response(
+    rows: Iterable[dict[str, Any]],
+    *,
+    filename: str,
+    gzip: bool = False,
+) -> StreamingHttpResponse:
+    """rows を NDJSON としてストリーミングする応答を返す."""
+    chunks = _encode(rows)
+    response = StreamingHttpResponse(
+        _gzip(chunks) if gzip else chunks,
+        content_type=NDJSON_CONTENT_TYPE,
+    )
+    response["Content-Disposition"] = f'attachment; filename="{filename}"'
+    if gzip:
+        response["Content-Encoding"] = "gzip"
+    patch_vary_headers(response, ("Accept-Encoding",))
+    return response
+
+
+def _encode(rows: Iterable[dict[str, Any]]) -> Iterator[bytes]:
+    encoder = JSONEncoder(ensure_ascii=False, separators=(",", ":"))
+    buffer = bytearray()
+    for row in rows:
+        buffer += encoder.encode(row).encode()
+        buffer += b"\n"
+        if len(buffer) >= _FLUSH_BYTES:
+            yield bytes(buffer)
+            buffer.clear()
+    if buffer:
+        yield bytes(buffer)
+
+
+def _gzip(chunks: Iterable[bytes]) -> Iterator[bytes]:
+    # wbits=16+MAX_WBITS で gzip ヘッダ/トレーラ付きの形式になる。
+    compressor = zlib.compressobj(wbits=16 + zlib.MAX_WBITS)
+    for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
@@ -0,0 +1,96 @@
+"""リポジトリ読み取りキャッシュの部品.
+
+プロセス内 LRU (件数上限 + TTL) を Django のキャッシュフレームワーク
+(プロセス間で共有) の前段に置く 2 段構成で使う。プロセス内の段は
+他プロセスの無効化を受け取れないため、TTL を短くして古さを抑える。
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from collections.abc import Hashable
+
+import attrs
+
+
+@attrs.frozen(kw_only=True)
+class CacheStats:
+    """読み取りキャッシュの命中状況 (上限・TTL の調整用).
+
+    local_hits/shared_hits は各段での命中、misses は永続層まで
+    読みに行った回数。不在 (negative) の命中も hit に数える。
+    """
+
+    local_hits: int
+    shared_hits: int
+    misses: int
+    local_size: int
+
+    @property
+    def hit_ratio(self) -> float:
+        """全参照に対する命中率 (参照がなければ 0.0)."""
+        hits = self.local_hits + self.shared_hits
+        total = hits + self.misses
+        return hits / total if total else 0.0
+
+
+class LocalCache[T]:
+    """件数上限と TTL を持つスレッドセーフな LRU キャッシュ.
+
+    上限を超えると最も長く参照されていない項目から追い出す。
+    期限切れの項目は参照時に取り除く (掃除用のスレッドは持たない)。
+    """
+
+    def __init__(
+        self,
+        *,
+        maxsize: int,
+        ttl: float,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._maxsize = maxsize
+        self._ttl = ttl
+        self._clock = clock
+        self._entries: OrderedDict[Hashable, tuple[float, T]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> T | None:
+        """key の値を返す (なし・期限切れなら None)."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= self._clock():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(
+        self,
+        key: Hashable,
+        value: T,
+    ) -> None:
+        """key に value を保存する (上限超過分は LRU で追い出す)."""
+        if self._maxsize <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (self._clock() + self._ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._maxsize:
+                self._entries.popitem(last=False)
+
+    def delete(self, key: Hashable) -> None:
+        """key を取り除く (なければ何もしない)."""
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        """全項目を取り除く."""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -0,0 +1,14 @@
+"""生 SQL を組み立てる ORM 補助 (update/delete) 用の列名の解決."""
+
+from typing import Any
+
+from django.db.models import Field
+from django.db.models import ForeignObjectRel
+
+
+def column_name(field: Field[Any, Any] | ForeignObjectRel) -> str:
+    """field の DB 上の列名を返す (列を持たない項目は ValueError)."""
+    if isinstance(field, ForeignObjectRel) or field.column is None:
+        msg = f"列を持たない項目です: {field.name}"
+        raise ValueError(msg)
+    return field.column
@@ -0,0 +1,42 @@
+"""一覧の総件数の求め方 (CountStrategy) の ORM 実装."""
+
+from django.db import connection
+from django.db.models import Model
+from django.db.models import QuerySet
+
+from common.domain.pagination import CountStrategy
+
+# 推定値がこれ未満の小さな表は COUNT(*) も安いため厳密に数える
+# (統計が古い・未 ANALYZE の表で 0 や -1 を返すのも避けられる)。
+_EXACT_COUNT_THRESHOLD = 10_000
+
+
+def count_queryset(
+    queryset: QuerySet[Model],
+    *,
+    strategy: CountStrategy,
+) -> int:
+    """strategy に従って queryset (全件) の件数を返す.
+
+    ESTIMATE は PostgreSQL の ``pg_class.reltuples`` (ANALYZE/autovacuum が
+    更新するプランナ統計) を読むため、表の大きさによらず定数時間で返る。
+    絞り込み条件付きの queryset には使えないため呼び出し側で全件を渡す。
+    """
+    if strategy is CountStrategy.ESTIMATE:
+        estimate = _estimate_table_rows(queryset.model)
+        if estimate >= _EXACT_COUNT_THRESHOLD:
+            return estimate
+    return queryset.count()
+
+
+def _estimate_table_rows(model: type[Model]) -> int:
+    """プランナ統計による表の推定行数を返す (取得不能時 -1)."""
+    if connection.vendor != "postgresql":
+        return -1
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass",
+            [model._meta.db_table],
+        )
+        row = cursor.fetchone()
+    return int(row[0]) if row is not None else -1
@@ -0,0 +1,68 @@
+"""DB 側の連鎖削除 (ON DELETE CASCADE) に任せる 1 文削除の ORM 補助.
+
+``Model.delete()`` は Django の Collector が関連行を Python に読み込んで
+から消すため、子が多い行 (大量の書籍を持つ著者等) では遅く、メモリも
+食う。関連を ``on_delete=DO_NOTHING`` にして外部キー制約に
+``ON DELETE CASCADE`` を付けておけば (マイグレーションの SQL で付ける)
+連鎖は DB が行うので、親を ``DELETE ... RETURNING`` の 1 文で消すだけで
+済む。
+
+報告用の件数は同じ文の中で数える。データ変更を伴う CTE と同じ文の
+SELECT は文の開始時点のスナップショットを読むため、連鎖で消える子行も
+数えられる (数えるのは直下の DO_NOTHING 関連まで。DO_NOTHING の関連は
+DB の制約が連鎖させるか削除を断るかのどちらかなので、削除が通るなら
+数えた子行は連鎖で消えている)。
+"""
+
+from typing import Any
+
+from django.db import connection
+from django.db.models import DO_NOTHING
+from django.db.models import Model
+
+from common.interfaces.repositories.columns import column_name
+
+
+def delete_returning(
+    model: type[Model],
+    *,
+    pk: Any,
+) -> tuple[int, dict[str, int]]:
+    """pk の行を 1 文で削除し、(総削除件数, モデルごとの件数) を返す.
+
+    戻り値は ``QuerySet.delete()`` と同じ形で、連鎖で消えた直下の子行
+    (DO_NOTHING の関連) を含む。該当行がなければ (0, {}) を返す。
+    """
+    meta = model._meta
+    quote = connection.ops.quote_name
+    pk_column = quote(column_name(meta.pk))
+    relations = [
+        relation
+        for relation in meta.related_objects
+        if relation.on_delete is DO_NOTHING
+    ]
+    counts = ["(SELECT count(*) FROM deleted)"]
+    for relation in relations:
+        child = relation.related_model._meta
+        counts.append(
+            f"(SELECT count(*) FROM {quote(child.db_table)}"  # noqa: S608
+            f" WHERE {quote(column_name(relation.field))}"
+            f" IN (SELECT {pk_column} FROM deleted))"
+        )
+    # 識別子は quote_name 済み、値はプレースホルダで渡している。
+    sql = (
+        f"WITH deleted AS (DELETE FROM {quote(meta.db_table)}"  # noqa: S608
+        f" WHERE {pk_column} = %s RETURNING {pk_column})"
+        f" SELECT {', '.join(counts)}"
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(sql, [meta.pk.get_db_prep_value(pk, connection)])
+        row = cursor.fetchone()
+    deleted, *cascaded = row
+    if deleted == 0:
+        return 0, {}
+    per_model = {meta.label: deleted}
+    for relation, count in zip(relations, cascaded, strict=True):
+        label = relation.related_model._meta.label
+        per_model[label] = per_model.get(label, 0) + count
+    return sum(per_model.values()), per_model
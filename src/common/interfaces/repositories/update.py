@@ -0,0 +1,69 @@
+"""版付き (楽観的排他制御) の 1 往復更新の ORM 補助.
+
+``QuerySet.update()`` は更新件数しか返さないため、更新後の行が必要だと
+もう 1 往復 SELECT が要る。``UPDATE ... RETURNING`` で更新と読み戻しを
+1 文にまとめ、``WHERE version IN (...)`` で版の確認も同じ文で行う。
+行ロックは文の実行中しか保持しない (SELECT FOR UPDATE を使わない)。
+"""
+
+from typing import Any
+
+from django.db import connection
+from django.db.models import Field
+from django.db.models import Model
+
+from common.interfaces.repositories.columns import column_name
+
+
+def update_returning[M: Model](
+    model: type[M],
+    *,
+    pk: Any,
+    changes: dict[str, Any],
+    expected_versions: frozenset[int] | None = None,
+    version_field: str = "version",
+) -> M | None:
+    """pk の行に changes を反映して版を 1 進め、更新後のインスタンスを返す.
+
+    該当行がない (不在または版の不一致) ときは None を返す。どちらかを
+    区別する必要があれば呼び出し側で存在確認する (失敗時のみの 1 往復)。
+    """
+    if expected_versions is not None and not expected_versions:
+        return None
+    meta = model._meta
+    quote = connection.ops.quote_name
+    version = quote(column_name(meta.get_field(version_field)))
+    assignments = [f"{version} = {version} + 1"]
+    params: list[Any] = []
+    for name, value in changes.items():
+        field = meta.get_field(name)
+        if not isinstance(field, Field):
+            msg = f"更新できない項目です: {name}"
+            raise TypeError(msg)
+        assignments.append(f"{quote(column_name(field))} = %s")
+        params.append(field.get_db_prep_save(value, connection))
+    conditions = [f"{quote(column_name(meta.pk))} = %s"]
+    params.append(meta.pk.get_db_prep_value(pk, connection))
+    if expected_versions is not None:
+        placeholders = ", ".join(["%s"] * len(expected_versions))
+        conditions.append(f"{version} IN ({placeholders})")
+        params.extend(sorted(expected_versions))
+    fields = meta.concrete_fields
+    returning = ", ".join(quote(column_name(field)) for field in fields)
+    # 識別子は quote_name 済み、値はすべてプレースホルダで渡している。
+    sql = (
+        f"UPDATE {quote(meta.db_table)}"  # noqa: S608
+        f" SET {', '.join(assignments)}"
+        f" WHERE {' AND '.join(conditions)}"
+        f" RETURNING {returning}"
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        row = cursor.fetchone()
+    if row is None:
+        return None
+    return model.from_db(
+        connection.alias,
+        [field.attname for field in fields],
+        row,
+    )
@@ -4,6 +4,29 @@
 出力整形 (serializer) → ステータス、という HTTP 配管を共通化する。
 具象は serializer/deserializer クラスと 5 つのフックを実装する。
 
+一覧は既定で page/page_size の OFFSET ページングだが、``?cursor=``
+(初回は空文字) を付けると keyset ページングに切り替わり、エンベロープに
+next/previous のリンクが付く。深いページでも読み飛ばしが発生しない。
+総件数は ``?count=exact|estimate|none`` で選べ、none では ``count`` の
+代わりに ``has_next`` を返す (COUNT(*) を発行しない)。cursor モードの
+既定は none で、何ページ目でも 1 ページ目と同じコストで返す。
+
+一覧・単一取得は ``?fields=id,name`` で返す項目を絞れる。絞り込みは
+リポジトリまで渡り、不要な列 (大きな TEXT 等) を DB から読まない。
+
+一覧・単一取得は強い ETag を返し、``If-None-Match`` が一致すれば
+シリアライズせずに 304 を返す。ETag は各エンティティの整数の版
+(``etag_version_field``、既定 version) と、一覧ではページの
+エンベロープ (件数・リンク) から求める。版を持たない資源には付けない。
+更新は ``If-Match`` の ETag から版を取り出して楽観的排他制御に使い、
+不一致なら 412 を返す (単一取得の全項目の ETag だけが一致し得る)。
+
+``GET .../export/`` は全件を NDJSON でストリーミングする (サーバサイド
+カーソルで ``export_chunk_size`` 件ずつ読むためメモリは一定)。
+
+``POST .../bulk/`` は JSON 配列を一括検証し、全件を単一トランザクションで
+作成する (1 件でも不正なら何も作らず、要素ごとのエラーを 400 で返す)。
+
 存在しない ID は ``EntityDoesNotExistError`` を送出し、共通例外
 ハンドラが 404 に変換する (本基底では捕捉しない = 取りこぼし防止)。
 
@@ -12,18 +35,41 @@ NOTE: DRF が一覧アクションを ``list`` という名前で要求し、ク
 フックの戻り値は ``Sequence`` で表現する。
 """
 
+import json
+from collections.abc import Callable
+from collections.abc import Iterator
 from collections.abc import Sequence
 from typing import Any
 from typing import ClassVar
 from typing import cast
 
+from django.http import StreamingHttpResponse
 from rest_framework import status
+from rest_framework.decorators import action
 from rest_framework.exceptions import ValidationError
 from rest_framework.request import Request
 from rest_framework.response import Response
 from rest_framework.serializers import BaseSerializer
+from rest_framework.utils.urls import replace_query_param
 from rest_framework.viewsets import ViewSet
 
+from common.domain.pagination import CountStrategy
+from common.domain.pagination import Cursor
+from common.interfaces.cursor import decode_cursor
+from common.interfaces.cursor import encode_cursor
+from common.interfaces.etag import if_match_versions
+from common.interfaces.etag import if_none_match
+from common.interfaces.etag import make_etag
+from common.interfaces.etag import make_version_etag
+from common.interfaces.ndjson import accepts_gzip
+from common.interfaces.ndjson import ndjson_response
+
+_CURSOR_PARAM = "cursor"
+# fields 指定なし (全項目) の表現を表す ETag の variant。
+_FULL_VARIANT = "*"
+_COUNT_PARAM = "count"
+_FIELDS_PARAM = "fields"
+
 
 class CrudViewSet(ViewSet):
     """create/get/list/update/delete の HTTP 配管を提供する基底."""
@@ -31,14 +77,36 @@ class CrudViewSet(ViewSet):
     output_serializer_class: ClassVar[type[BaseSerializer[Any]]]
     input_deserializer_class: ClassVar[type[BaseSerializer[Any]]]
 
+    # keyset ページングの並び順キー (エンティティ属性名) と、
+    # tiebreaker (id) の文字列を検証・変換する関数。
+    cursor_key_field: ClassVar[str] = "id"
+    cursor_tiebreaker_type: ClassVar[Callable[[str], object]] = str
+
+    # ETag の算出に使うエンティティの整数の版 (更新ごとに増える属性名)。
+    etag_version_field: ClassVar[str] = "version"
+
+    # 全件エクスポートで永続層から 1 回に読む件数。
+    export_chunk_size: ClassVar[int] = 2000
+
+    # 一括作成 1 リクエストあたりの上限件数。
+    bulk_create_max: ClassVar[int] = 10_000
+
     # --- 具象が実装するフック (usecase 呼び出し) ---
 
     def perform_create(self, data: dict[str, Any]) -> Any:
         """検証済みデータからエンティティを作成して返す."""
         raise NotImplementedError
 
-    def perform_get(self, pk: str) -> Any:
-        """ID でエンティティを取得して返す."""
+    def perform_create_many(self, data: list[dict[str, Any]]) -> Sequence[Any]:
+        """検証済みデータの配列からエンティティを一括作成して返す."""
+        raise NotImplementedError
+
+    def perform_get(
+        self,
+        pk: str,
+        fields: frozenset[str] | None = None,
+    ) -> Any:
+        """ID でエンティティを取得して返す (fields 外は読まなくてよい)."""
         raise NotImplementedError
 
     def perform_list(
@@ -46,16 +114,44 @@ class CrudViewSet(ViewSet):
         *,
         page: int,
         page_size: int,
-    ) -> tuple[Sequence[Any], int]:
-        """一覧と総件数を返す."""
+        count: CountStrategy,
+        fields: frozenset[str] | None = None,
+    ) -> tuple[Sequence[Any], int | None]:
+        """一覧と総件数を返す.
+
+        count=NONE では総件数の代わりに None を返し、次ページ判定用に
+        一覧を最大 page_size + 1 件返す。
+        """
+        raise NotImplementedError
+
+    def perform_list_after(
+        self,
+        *,
+        cursor: Cursor | None,
+        page_size: int,
+        fields: frozenset[str] | None = None,
+    ) -> tuple[Sequence[Any], bool]:
+        """cursor 以降の一覧と続きの有無を返す."""
+        raise NotImplementedError
+
+    def perform_count(self, strategy: CountStrategy) -> int:
+        """総件数を返す."""
+        raise NotImplementedError
+
+    def perform_stream(self, chunk_size: int) -> Iterator[Any]:
+        """全件を逐次返す (永続層からは chunk_size 件ずつ読む)."""
         raise NotImplementedError
 
     def perform_update(
         self,
         pk: str,
         data: dict[str, Any],
+        expected_versions: frozenset[int] | None = None,
     ) -> Any:
-        """検証済みデータでエンティティを更新して返す."""
+        """検証済みデータでエンティティを更新して返す.
+
+        expected_versions は If-Match が許す版。None なら版を確認しない。
+        """
         raise NotImplementedError
 
     def perform_delete(self, pk: str) -> None:
@@ -66,13 +162,36 @@ class CrudViewSet(ViewSet):
 
     def list(self, request: Request) -> Response:
         """一覧を返す."""
-        page, page_size = self._pagination_params(request)
-        entities, total = self.perform_list(page=page, page_size=page_size)
-        serializer = self.output_serializer_class(
-            instance=entities,
-            many=True,
+        if _CURSOR_PARAM in request.query_params:
+            return self._list_by_cursor(request)
+        page, page_size, count = self._pagination_params(request)
+        fields = self._fields_param(request)
+        entities, total = self.perform_list(
+            page=page,
+            page_size=page_size,
+            count=count,
+            fields=fields,
+        )
+        envelope: dict[str, Any]
+        if total is None:
+            # 1 件多く読んだ分で次ページの有無を判定し、返却からは除く。
+            envelope = {"has_next": len(entities) > page_size}
+            entities = entities[:page_size]
+        else:
+            envelope = {"count": total}
+        etag = self._list_etag(request, entities=entities, envelope=envelope)
+        return self._conditional_response(
+            request,
+            etag=etag,
+            render=lambda: {
+                **envelope,
+                "results": self._serialize(
+                    entities,
+                    many=True,
+                    fields=fields,
+                ),
+            },
         )
-        return Response({"count": total, "results": serializer.data})
 
     def create(self, request: Request) -> Response:
         """新規作成して 201 を返す."""
@@ -81,15 +200,55 @@ class CrudViewSet(ViewSet):
         serializer = self.output_serializer_class(instance=entity)
         return Response(serializer.data, status=status.HTTP_201_CREATED)
 
+    @action(detail=False, methods=["post"], url_path="bulk")
+    def bulk_create(self, request: Request) -> Response:
+        """一括作成して 201 を返す (要素ごとの結果を入力順に返す)."""
+        deserializer = self.input_deserializer_class.many_init(
+            data=request.data,
+            allow_empty=False,
+            max_length=self.bulk_create_max,
+        )
+        deserializer.is_valid(raise_exception=True)
+        entities = self.perform_create_many(
+            cast("list[dict[str, Any]]", deserializer.validated_data),
+        )
+        serializer = self.output_serializer_class(
+            instance=entities,
+            many=True,
+        )
+        return Response(
+            {"count": len(entities), "results": serializer.data},
+            status=status.HTTP_201_CREATED,
+        )
+
+    @action(detail=False, methods=["get"], url_path="export")
+    def export(self, request: Request) -> StreamingHttpResponse:
+        """全件を NDJSON でストリーミングする."""
+        # シリアライザは 1 つを使い回し、行ごとの生成コストを避ける。
+        serializer = self.output_serializer_class()
+        rows = (
+            serializer.to_representation(entity)
+            for entity in self.perform_stream(self.export_chunk_size)
+        )
+        return ndjson_response(
+            rows,
+            filename=f"{self.basename}.ndjson",
+            gzip=accepts_gzip(request),
+        )
+
     def retrieve(
         self,
-        _request: Request,
+        request: Request,
         pk: str,
     ) -> Response:
         """単一取得して返す."""
-        entity = self.perform_get(pk)
-        serializer = self.output_serializer_class(instance=entity)
-        return Response(serializer.data)
+        fields = self._fields_param(request)
+        entity = self.perform_get(pk, fields=fields)
+        return self._conditional_response(
+            request,
+            etag=self._entity_etag(entity, fields=fields),
+            render=lambda: self._serialize(entity, fields=fields),
+        )
 
     def update(
         self,
@@ -98,9 +257,7 @@ class CrudViewSet(ViewSet):
     ) -> Response:
         """全項目更新して返す."""
         data = self._validate(request.data)
-        entity = self.perform_update(pk, data)
-        serializer = self.output_serializer_class(instance=entity)
-        return Response(serializer.data)
+        return self._update_response(request, pk=pk, data=data)
 
     def partial_update(
         self,
@@ -109,9 +266,7 @@ class CrudViewSet(ViewSet):
     ) -> Response:
         """部分更新して返す."""
         data = self._validate(request.data, partial=True)
-        entity = self.perform_update(pk, data)
-        serializer = self.output_serializer_class(instance=entity)
-        return Response(serializer.data)
+        return self._update_response(request, pk=pk, data=data)
 
     def destroy(
         self,
@@ -122,9 +277,214 @@ class CrudViewSet(ViewSet):
         self.perform_delete(pk)
         return Response(status=status.HTTP_204_NO_CONTENT)
 
+    def _list_by_cursor(self, request: Request) -> Response:
+        """keyset ページングで一覧を返す (next/previous リンク付き)."""
+        cursor = self._cursor_param(request)
+        # page は OFFSET 用のため cursor モードでは使わない。総件数は
+        # 明示されたときだけ数える (毎ページ COUNT(*) を払わない)。
+        _, page_size, count = self._pagination_params(
+            request,
+            default_count=CountStrategy.NONE,
+        )
+        fields = self._fields_param(request)
+        entities, has_more = self.perform_list_after(
+            cursor=cursor,
+            page_size=page_size,
+            fields=fields,
+        )
+        backward = cursor is not None and cursor.backward
+        # 後ろから戻ってきた場合、次ページは必ず存在する。
+        has_next = True if backward else has_more
+        has_previous = has_more if backward else cursor is not None
+        next_url = previous_url = None
+        if entities and has_next:
+            next_url = self._cursor_url(
+                request,
+                entity=entities[-1],
+                backward=False,
+            )
+        if entities and has_previous:
+            previous_url = self._cursor_url(
+                request,
+                entity=entities[0],
+                backward=True,
+            )
+        envelope: dict[str, Any] = (
+            {"has_next": next_url is not None}
+            if count is CountStrategy.NONE
+            else {"count": self.perform_count(count)}
+        )
+        envelope |= {"next": next_url, "previous": previous_url}
+        etag = self._list_etag(request, entities=entities, envelope=envelope)
+        return self._conditional_response(
+            request,
+            etag=etag,
+            render=lambda: {
+                **envelope,
+                "results": self._serialize(
+                    entities,
+                    many=True,
+                    fields=fields,
+                ),
+            },
+        )
+
+    def _update_response(
+        self,
+        request: Request,
+        *,
+        pk: str,
+        data: dict[str, Any],
+    ) -> Response:
+        """If-Match の版を条件に更新し、新しい ETag 付きで返す."""
+        expected_versions = if_match_versions(
+            request.headers.get("If-Match"),
+            variant=_FULL_VARIANT,
+        )
+        entity = self.perform_update(
+            pk,
+            data,
+            expected_versions=expected_versions,
+        )
+        serializer = self.output_serializer_class(instance=entity)
+        etag = self._entity_etag(entity, fields=None)
+        headers = {"ETag": etag} if etag is not None else None
+        return Response(serializer.data, headers=headers)
+
+    def _entity_etag(
+        self,
+        entity: Any,
+        *,
+        fields: frozenset[str] | None,
+    ) -> str | None:
+        """単一資源の表現の ETag を返す (版を持たなければ None)."""
+        version = getattr(entity, self.etag_version_field, None)
+        if version is None:
+            return None
+        variant = ",".join(sorted(fields)) if fields else _FULL_VARIANT
+        return make_version_etag(version=version, variant=variant)
+
+    def _entity_version(self, entity: Any) -> str | None:
+        """エンティティの id + 版を返す (版を持たなければ None)."""
+        version = getattr(entity, self.etag_version_field, None)
+        if version is None:
+            return None
+        return f"{entity.id}:{version}"
+
+    def _list_etag(
+        self,
+        request: Request,
+        *,
+        entities: Sequence[Any],
+        envelope: dict[str, Any],
+    ) -> str | None:
+        """一覧ページの ETag を求める (版のない要素があれば None).
+
+        行を読み直さず、取得済みページの id + 版とエンベロープだけを
+        集約するため、シリアライズより十分安い。
+        """
+        versions = [self._entity_version(entity) for entity in entities]
+        if None in versions:
+            return None
+        return make_etag(
+            parts=[
+                request.get_full_path(),
+                json.dumps(envelope, sort_keys=True),
+                *cast("list[str]", versions),
+            ],
+        )
+
     @staticmethod
-    def _pagination_params(request: Request) -> tuple[int, int]:
-        """page/page_size を検証して返す (不正は 400)."""
+    def _conditional_response(
+        request: Request,
+        *,
+        etag: str | None,
+        render: Callable[[], Any],
+    ) -> Response:
+        """If-None-Match が一致すれば render を呼ばずに 304 を返す."""
+        if etag is None:
+            return Response(render())
+        headers = {"ETag": etag}
+        if if_none_match(request.headers.get("If-None-Match"), etag=etag):
+            return Response(
+                status=status.HTTP_304_NOT_MODIFIED,
+                headers=headers,
+            )
+        return Response(render(), headers=headers)
+
+    def _fields_param(self, request: Request) -> frozenset[str] | None:
+        """fields (カンマ区切り) を検証して返す (未指定は None、不正は 400)."""
+        raw = request.query_params.get(_FIELDS_PARAM)
+        if raw is None:
+            return None
+        fields = frozenset(
+            name.strip() for name in raw.split(",") if name.strip()
+        )
+        prototype: Any = self.output_serializer_class()
+        known = prototype.fields.keys()
+        unknown = fields - known
+        if not fields or unknown:
+            msg = f"fields に指定できるのは {', '.join(known)} です"
+            raise ValidationError(msg)
+        return fields
+
+    def _serialize(
+        self,
+        instance: Any,
+        *,
+        many: bool = False,
+        fields: frozenset[str] | None = None,
+    ) -> Any:
+        """出力シリアライザで整形する (fields 指定時はその項目のみ)."""
+        serializer: Any = self.output_serializer_class(
+            instance=instance,
+            many=many,
+        )
+        if fields is not None:
+            target = serializer.child if many else serializer
+            for name in target.fields.keys() - fields:
+                target.fields.pop(name)
+        return serializer.data
+
+    def _cursor_param(self, request: Request) -> Cursor | None:
+        """cursor トークンを検証して返す (空は先頭、不正は 400)."""
+        token = request.query_params.get(_CURSOR_PARAM, "")
+        if not token:
+            return None
+        try:
+            cursor = decode_cursor(token)
+            type(self).cursor_tiebreaker_type(cursor.tiebreaker)
+        except ValueError as exc:
+            msg = "cursor が不正です"
+            raise ValidationError(msg) from exc
+        return cursor
+
+    def _cursor_url(
+        self,
+        request: Request,
+        *,
+        entity: Any,
+        backward: bool,
+    ) -> str:
+        """entity の位置を指す cursor 付き URL を組み立てる."""
+        cursor = Cursor(
+            key=str(getattr(entity, self.cursor_key_field)),
+            tiebreaker=str(entity.id),
+            backward=backward,
+        )
+        return replace_query_param(
+            request.build_absolute_uri(),
+            _CURSOR_PARAM,
+            encode_cursor(cursor),
+        )
+
+    @staticmethod
+    def _pagination_params(
+        request: Request,
+        *,
+        default_count: CountStrategy = CountStrategy.EXACT,
+    ) -> tuple[int, int, CountStrategy]:
+        """page/page_size/count を検証して返す (不正は 400)."""
         try:
             page = int(request.query_params.get("page", "1"))
             page_size = int(request.query_params.get("page_size", "10"))
@@ -134,7 +494,14 @@ class CrudViewSet(ViewSet):
         if page < 1 or page_size < 1:
             msg = "page と page_size は 1 以上で指定してください"
             raise ValidationError(msg)
-        return page, page_size
+        try:
+            count = CountStrategy(
+                request.query_params.get(_COUNT_PARAM, default_count.value),
+            )
+        except ValueError as exc:
+            msg = "count は exact/estimate/none のいずれかで指定してください"
+            raise ValidationError(msg) from exc
+        return page, page_size, count
 
     def _validate(
         self,
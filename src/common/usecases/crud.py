@@ -5,9 +5,14 @@
 ユースケースに置く。
 """
 
+from collections.abc import Iterator
+from typing import Any
 from typing import Protocol
 from typing import TypeVar
 
+from common.domain.pagination import CountStrategy
+from common.domain.pagination import Cursor
+
 TEntity = TypeVar("TEntity")
 # ID は引数位置 (get/delete) でのみ使うため反変。
 TId = TypeVar("TId", contravariant=True)
@@ -24,8 +29,24 @@ class CrudRepository(Protocol[TEntity, TId]):
         """エンティティを永続化し、保存後のエンティティを返す."""
         ...
 
-    def get(self, entity_id: TId) -> TEntity:
-        """ID でエンティティを取得する (不在時 EntityDoesNotExistError)."""
+    def create_many(self, entities: list[TEntity]) -> list[TEntity]:
+        """複数エンティティを単一トランザクションで一括永続化する.
+
+        全件成功か全件失敗のいずれかとし、保存後のエンティティを
+        入力と同じ順序で返す。
+        """
+        ...
+
+    def get(
+        self,
+        entity_id: TId,
+        fields: frozenset[str] | None = None,
+    ) -> TEntity:
+        """ID でエンティティを取得する (不在時 EntityDoesNotExistError).
+
+        fields を指定すると、その項目以外は永続層から読まなくてよい
+        (読まなかった任意項目はエンティティの既定値になる)。
+        """
         ...
 
     def find_all(
@@ -33,14 +54,60 @@ class CrudRepository(Protocol[TEntity, TId]):
         *,
         page: int,
         page_size: int,
-    ) -> tuple[list[TEntity], int]:
-        """ページネーション付きの一覧と総件数を返す."""
+        count: CountStrategy = CountStrategy.EXACT,
+        fields: frozenset[str] | None = None,
+    ) -> tuple[list[TEntity], int | None]:
+        """ページネーション付きの一覧と総件数を返す.
+
+        count=NONE のときは総件数を求めず None を返し、次ページの有無を
+        判定できるよう一覧を最大 page_size + 1 件返す。
+        """
+        ...
+
+    def find_after(
+        self,
+        *,
+        cursor: Cursor | None,
+        page_size: int,
+        fields: frozenset[str] | None = None,
+    ) -> tuple[list[TEntity], bool]:
+        """cursor の次 (backward なら前) の一覧と続きの有無を返す.
+
+        cursor が None なら先頭ページを返す。一覧は常に昇順で返す。
+        fields の意味は get と同じ。
+        """
+        ...
+
+    def count(self, strategy: CountStrategy = CountStrategy.EXACT) -> int:
+        """総件数を返す (ESTIMATE は統計情報による概算)."""
         ...
 
-    def update(self, entity: TEntity) -> TEntity:
-        """エンティティを更新する (不在時 EntityDoesNotExistError)."""
+    def stream(self, chunk_size: int) -> Iterator[TEntity]:
+        """全件を id 順に 1 件ずつ返す (全件エクスポート用).
+
+        永続層からは chunk_size 件ずつ読み、全件をメモリに載せない。
+        """
         ...
 
-    def delete(self, entity_id: TId) -> None:
-        """ID でエンティティを削除する (不在時 EntityDoesNotExistError)."""
+    def update(
+        self,
+        entity_id: TId,
+        *,
+        changes: dict[str, Any],
+        expected_versions: frozenset[int] | None = None,
+    ) -> TEntity:
+        """changes を反映して版を 1 進め、更新後のエンティティを返す.
+
+        現在値を読まずに 1 往復で更新と読み戻しを行う (changes は検証済み
+        であること)。expected_versions を渡すと、現在の版がそのいずれかの
+        ときだけ更新し、不一致なら EntityVersionConflictError を送出する。
+        """
+        ...
+
+    def delete(self, entity_id: TId) -> int:
+        """ID でエンティティを削除し、削除行数を返す.
+
+        行数は DB 側で連鎖削除された関連行を含む。
+        不在時は EntityDoesNotExistError を送出する。
+        """
         ...
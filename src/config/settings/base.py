@@ -21,6 +21,7 @@ INSTALLED_APPS = [
     "config",
     "authors",
     "books",
+    "notifications",
 ]
 
 MIDDLEWARE = [
@@ -121,11 +122,72 @@ STORAGES = {
 
 MEDIA_URL = f"{S3_ENDPOINT_URL}/{S3_BUCKET_NAME}/"
 
+# 表紙を S3 マルチパートアップロードへ直接流す (books.uploads)。
+# 1 アップロードのメモリは概ね (並行数 + 1) 個の part 分で頭打ち。
+# S3 の part は最後を除き 5 MiB 以上である必要がある。
+COVER_UPLOAD_PART_SIZE: int = env.int(
+    "COVER_UPLOAD_PART_SIZE",
+    default=8 * 1024 * 1024,
+)
+COVER_UPLOAD_CONCURRENCY: int = env.int(
+    "COVER_UPLOAD_CONCURRENCY",
+    default=4,
+)
+# 表紙の直接アップロード (books.uploads) の大きさの上限と、
+# presigned POST の有効期限 (秒)。
+COVER_DIRECT_UPLOAD_MAX_SIZE: int = env.int(
+    "COVER_DIRECT_UPLOAD_MAX_SIZE",
+    default=20 * 1024 * 1024,
+)
+COVER_DIRECT_UPLOAD_EXPIRES: int = env.int(
+    "COVER_DIRECT_UPLOAD_EXPIRES",
+    default=600,
+)
+# 表紙の派生画像を作るプロセスプールの大きさ (0 なら同期実行)。
+COVER_THUMBNAIL_WORKERS: int = env.int(
+    "COVER_THUMBNAIL_WORKERS",
+    default=2,
+)
+
+# ---- Cache ----
+# プロセス間で共有する段。本番では Redis/Memcached の URL を与える。
+CACHES = {
+    "default": env.cache_url(
+        "CACHE_URL",
+        default="locmemcache://",
+    ),
+}
+
+# 著者 get の読み取りキャッシュ。プロセス内の段 (LRU) は他プロセスの
+# 無効化を受け取れないため、TTL を共有段より十分短くする。
+AUTHOR_CACHE_LOCAL_MAXSIZE: int = env.int(
+    "AUTHOR_CACHE_LOCAL_MAXSIZE",
+    default=1024,
+)
+AUTHOR_CACHE_LOCAL_TTL: float = env.float(
+    "AUTHOR_CACHE_LOCAL_TTL",
+    default=5.0,
+)
+AUTHOR_CACHE_TTL: int = env.int(
+    "AUTHOR_CACHE_TTL",
+    default=300,
+)
+AUTHOR_CACHE_NEGATIVE_TTL: int = env.int(
+    "AUTHOR_CACHE_NEGATIVE_TTL",
+    default=30,
+)
+
 # ---- Elasticsearch ----
 ELASTICSEARCH_URL: str = env(
     "ELASTICSEARCH_URL",
     default="http://localhost:9200",
 )
+# 書籍の作成/更新/削除を検索インデックス (books.search) へ反映するか。
+# 止めている間の差分は manage.py reindex で取り込み直す。
+BOOK_SEARCH_ENABLED: bool = env.bool(
+    "BOOK_SEARCH_ENABLED",
+    default=False,
+)
 
 # ---- Notifications ----
 NOTIFICATION_CHANNEL: str = env(
@@ -136,6 +198,83 @@ DISCORD_WEBHOOK_URL: str = env(
     "DISCORD_WEBHOOK_URL",
     default="",
 )
+# Discord Webhook に送る HTTP クライアントの接続プール。keep-alive で
+# 保つ接続数とその有効期限 [秒]、HTTP/2 を使うか (要 httpx[http2])。
+DISCORD_HTTP_MAX_CONNECTIONS: int = env.int(
+    "DISCORD_HTTP_MAX_CONNECTIONS",
+    default=10,
+)
+DISCORD_HTTP_MAX_KEEPALIVE_CONNECTIONS: int = env.int(
+    "DISCORD_HTTP_MAX_KEEPALIVE_CONNECTIONS",
+    default=5,
+)
+DISCORD_HTTP_KEEPALIVE_EXPIRY: float = env.float(
+    "DISCORD_HTTP_KEEPALIVE_EXPIRY",
+    default=30.0,
+)
+DISCORD_HTTP2: bool = env.bool(
+    "DISCORD_HTTP2",
+    default=False,
+)
+# 接続 (と書き込み・プール待ち) と応答の読み込みを待つ秒数。
+DISCORD_CONNECT_TIMEOUT: float = env.float(
+    "DISCORD_CONNECT_TIMEOUT",
+    default=3.0,
+)
+DISCORD_READ_TIMEOUT: float = env.float(
+    "DISCORD_READ_TIMEOUT",
+    default=10.0,
+)
+# 通知の配り方。outbox は作成と同じトランザクションで DB に積み、
+# manage.py run_notification_worker が配る。thread はプロセス内の
+# 配送キュー (落ちると失われる)。
+NOTIFICATION_DISPATCHER: str = env(
+    "NOTIFICATION_DISPATCHER",
+    default="outbox",
+)
+# thread の配送キュー (notifications.infrastructure.adapters.dispatcher)。
+# 積める件数と配送スレッド数 (0 なら呼び出し元で同期実行)。
+NOTIFICATION_QUEUE_SIZE: int = env.int(
+    "NOTIFICATION_QUEUE_SIZE",
+    default=1000,
+)
+NOTIFICATION_DISPATCH_WORKERS: int = env.int(
+    "NOTIFICATION_DISPATCH_WORKERS",
+    default=2,
+)
+# キューが満杯のときの扱い (block / drop_oldest / spill)、block で空きを
+# 待つ秒数と、spill や終了時に配り切れなかった通知の退避先。
+NOTIFICATION_OVERFLOW_POLICY: str = env(
+    "NOTIFICATION_OVERFLOW_POLICY",
+    default="spill",
+)
+NOTIFICATION_BLOCK_TIMEOUT: float = env.float(
+    "NOTIFICATION_BLOCK_TIMEOUT",
+    default=5.0,
+)
+NOTIFICATION_SPILL_PATH: str = env(
+    "NOTIFICATION_SPILL_PATH",
+    default=str(BASE_DIR / "var" / "notification_spill.jsonl"),
+)
+# 終了時にキューを配り切るまで待つ秒数。
+NOTIFICATION_DRAIN_TIMEOUT: float = env.float(
+    "NOTIFICATION_DRAIN_TIMEOUT",
+    default=10.0,
+)
+# outbox の通知の送信に一時的な理由で失敗したときの再試行。最初の送信を
+# 含めた試行回数の上限と、待ち時間の初期値・上限 [秒] (1 回ごとに倍)。
+NOTIFICATION_RETRY_MAX_ATTEMPTS: int = env.int(
+    "NOTIFICATION_RETRY_MAX_ATTEMPTS",
+    default=5,
+)
+NOTIFICATION_RETRY_BASE_DELAY: float = env.float(
+    "NOTIFICATION_RETRY_BASE_DELAY",
+    default=2.0,
+)
+NOTIFICATION_RETRY_MAX_DELAY: float = env.float(
+    "NOTIFICATION_RETRY_MAX_DELAY",
+    default=300.0,
+)
 
 REST_FRAMEWORK: dict[str, object] = {
     "DEFAULT_PAGINATION_CLASS": (
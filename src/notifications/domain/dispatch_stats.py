@@ -0,0 +1,25 @@
+"""通知ディスパッチャの状態."""
+
+import attrs
+
+from notifications.domain.overflow_policy import OverflowPolicy
+
+
+@attrs.frozen(kw_only=True)
+class DispatchStats:
+    """通知キューの深さと、プロセスの起動からの件数.
+
+    capacity・high_water・overflow は上限のないキュー (outbox) では None。
+    """
+
+    depth: int
+    capacity: int | None
+    # これまでで最も深かったときの件数。
+    high_water: int | None
+    workers: int
+    overflow: OverflowPolicy | None
+    enqueued: int
+    delivered: int
+    failed: int
+    dropped: int
+    spilled: int
@@ -9,3 +9,4 @@ class EventType(StrEnum):
 
     BOOK_CREATED = auto()
     AUTHOR_CREATED = auto()
+    AUTHORS_BULK_CREATED = auto()
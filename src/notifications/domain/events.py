@@ -26,3 +26,20 @@ class AuthorCreated:
     name: str = attrs.field(
         validator=[not_empty, validate_not_empty],
     )
+
+
+@attrs.frozen(kw_only=True)
+class AuthorsBulkCreated:
+    """著者が一括作成されたことを表すドメインイベント (1 件に集約)."""
+
+    names: tuple[str, ...] = attrs.field(
+        validator=[
+            attrs.validators.min_len(1),
+            attrs.validators.deep_iterable(
+                member_validator=[not_empty, validate_not_empty],
+            ),
+        ],
+    )
+
+
+NotificationEvent = BookCreated | AuthorCreated | AuthorsBulkCreated
@@ -0,0 +1,15 @@
+"""通知キューが満杯のときの扱い."""
+
+from enum import StrEnum
+from enum import auto
+
+
+class OverflowPolicy(StrEnum):
+    """通知キューが満杯のときに新しいイベントをどう扱うか."""
+
+    # 空くまで待つ (待ちきれなければ捨てる)。
+    BLOCK = auto()
+    # 最も古いイベントを捨てて積む。
+    DROP_OLDEST = auto()
+    # ファイルへ退避し、キューが空いたら戻す。
+    SPILL = auto()
@@ -22,6 +22,8 @@ class NotificationSuccess:
 class NotificationProblem:
     """RFC 9457 Problem Details に準拠した通知エラー値オブジェクト.
 
+    retryable は送り直せば届く見込みのある失敗 (タイムアウトや 5xx) か。
+
     References
     ----------
     https://www.rfc-editor.org/rfc/rfc9457
@@ -32,6 +34,7 @@ class NotificationProblem:
     status: int = 0
     detail: str = ""
     instance: str = ""
+    retryable: bool = False
 
 
 NotificationResult = NotificationSuccess | NotificationProblem
@@ -0,0 +1,29 @@
+"""通知送信の再試行方針."""
+
+import random
+
+import attrs
+
+
+@attrs.frozen(kw_only=True)
+class RetryPolicy:
+    """送信に失敗した通知を何回まで、どれだけ間を空けて送り直すか.
+
+    待ち時間は base_delay から 1 回ごとに倍にして max_delay で頭打ちにし、
+    その半分から全体までの間で揺らす (同時に失敗した通知が同じ時刻に
+    集中しないように)。
+    """
+
+    # 最初の送信を含めた試行回数の上限。
+    max_attempts: int
+    base_delay: float
+    max_delay: float
+
+    def should_retry(self, attempts: int) -> bool:
+        """attempts 回試して失敗した通知をもう一度送るか."""
+        return attempts < self.max_attempts
+
+    def backoff(self, attempts: int) -> float:
+        """attempts 回目の失敗から次の試行までの秒数."""
+        ceiling = min(self.max_delay, self.base_delay * 2.0 ** (attempts - 1))
+        return ceiling / 2 + random.uniform(0, ceiling / 2)  # noqa: S311
@@ -1,3 +1,5 @@
+from collections.abc import Sequence
+
 import injector
 
 from common.usecases.protocols import LoggerFactory
@@ -13,3 +15,9 @@ class ConsoleNotifierImpl:
     def send(self, message: str) -> None:
         """ログに通知メッセージを出力する."""
         self._logger.info("[Notification] %s", message)
+
+    def send_many(self, messages: Sequence[str]) -> list[Exception | None]:
+        """1 件ずつログに出力する."""
+        for message in messages:
+            self.send(message=message)
+        return [None] * len(messages)
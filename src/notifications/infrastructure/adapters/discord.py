@@ -1,7 +1,134 @@
+"""Discord Webhook への通知.
+
+送信ごとに httpx.post を呼ぶと毎回 TCP/TLS の接続からやり直しになり、
+1 件あたり 100 ms 以上余計にかかるうえ、大量に送ると一時ポートを使い
+切る。送信には NotificationModule が作って閉じる httpx.Client
+(build_discord_client) を使い回し、接続を keep-alive で保つ。
+
+Webhook には Discord のレート制限がかかり、超えると 429 が返る。
+DiscordWebhookNotifierImpl は
+
+- 応答の ``X-RateLimit-Remaining`` / ``X-RateLimit-Reset-After`` と、
+  429 の ``Retry-After`` から Webhook ごとの残り回数 (_RateLimitBucket)
+  を覚え、使い切ったら戻るまで待ってから送る。
+- 送るのは同時に 1 件だけで、その間 (制限で待っている間も) に来た
+  メッセージは溜めておき、次の 1 回の POST に content (2000 文字) と
+  embeds (10 個・説明 4096 文字・合計 6000 文字) に収まるだけ詰める。
+- 429 のときは送り直さず、詰めたメッセージ全部を再試行の対象となる
+  失敗 (HTTPStatusError) にする。送り直すかどうかと試行回数の上限は
+  呼び出し元 (outbox の RetryPolicy) が決める。以後の送信は Retry-After
+  まで待つ。
+
+send は自分のメッセージを送り終えるまで戻らず、送れなければ例外を投げる。
+send_many は渡されたメッセージを列に並べて同じように詰めて送り、
+1 件ごとの失敗を返す (outbox のワーカーは取り出した分をまとめて渡す)。
+"""
+
+import threading
+import time
+from collections import deque
+from collections.abc import Sequence
+from http import HTTPStatus
+from typing import Any
+
+import attrs
 import httpx
 
 from common.usecases.protocols import LoggerFactory
 
+# Discord のメッセージ 1 件あたりの上限。
+_CONTENT_LIMIT = 2000
+_EMBED_LIMIT = 10
+_EMBED_DESCRIPTION_LIMIT = 4096
+_EMBED_TOTAL_LIMIT = 6000
+
+# 詰めたメッセージの区切り。
+_SEPARATOR = "\n"
+
+# 429 に Retry-After が付いていないときに待つ秒数。
+_DEFAULT_RETRY_AFTER = 1.0
+
+type _Payload = dict[str, Any]
+
+
+@attrs.frozen(kw_only=True)
+class DiscordClientConfig:
+    """Webhook 用 HTTP クライアントの設定 (NotificationModule が作る)."""
+
+    max_connections: int
+    max_keepalive_connections: int
+    keepalive_expiry: float
+    http2: bool
+    connect_timeout: float
+    read_timeout: float
+
+
+def build_discord_client(config: DiscordClientConfig) -> httpx.Client:
+    """接続プールを持つ httpx.Client を作る (閉じるのは呼び出し元).
+
+    http2=True には h2 パッケージ (httpx[http2]) が要る。
+    """
+    return httpx.Client(
+        limits=httpx.Limits(
+            max_connections=config.max_connections,
+            max_keepalive_connections=config.max_keepalive_connections,
+            keepalive_expiry=config.keepalive_expiry,
+        ),
+        # 書き込みとプール待ちは接続と同じだけ待つ。
+        timeout=httpx.Timeout(
+            connect=config.connect_timeout,
+            read=config.read_timeout,
+            write=config.connect_timeout,
+            pool=config.connect_timeout,
+        ),
+        http2=config.http2,
+    )
+
+
+class _RateLimitBucket:
+    """Webhook の残り送信回数と、次に送れる時刻を覚える."""
+
+    def __init__(self) -> None:
+        # 最初の応答を受け取るまでは残り回数が分からないため制限しない。
+        self._remaining: int | None = None
+        self._reset_at = 0.0
+        self._blocked_until = 0.0
+
+    def acquire(self) -> None:
+        """1 回分送れるようになるまで待ち、その 1 回を使う."""
+        now = time.monotonic()
+        if self._remaining == 0 and now < self._reset_at:
+            time.sleep(self._reset_at - now)
+        now = time.monotonic()
+        if now < self._blocked_until:
+            time.sleep(self._blocked_until - now)
+        if self._remaining is not None and self._remaining > 0:
+            self._remaining -= 1
+
+    def update(self, response: httpx.Response) -> None:
+        """応答の X-RateLimit-* / Retry-After を取り込む."""
+        now = time.monotonic()
+        remaining = _header_number(response, "X-RateLimit-Remaining")
+        reset_after = _header_number(response, "X-RateLimit-Reset-After")
+        if remaining is not None:
+            self._remaining = int(remaining)
+        if reset_after is not None:
+            self._reset_at = now + reset_after
+        if response.status_code == HTTPStatus.TOO_MANY_REQUESTS:
+            retry_after = _header_number(response, "Retry-After")
+            self._blocked_until = now + (
+                _DEFAULT_RETRY_AFTER if retry_after is None else retry_after
+            )
+
+
+class _Pending:
+    """送信待ちのメッセージ 1 件."""
+
+    def __init__(self, message: str) -> None:
+        self.message = message
+        self.done = False
+        self.error: Exception | None = None
+
 
 class DiscordWebhookNotifierImpl:
     """Discord Webhook を使った通知アダプタ."""
@@ -9,23 +136,75 @@ class DiscordWebhookNotifierImpl:
     def __init__(
         self,
         webhook_url: str,
+        client: httpx.Client,
         logger_factory: LoggerFactory,
     ) -> None:
         self._webhook_url = webhook_url
+        self._client = client
         self._logger = logger_factory.build(name=__name__)
+        self._bucket = _RateLimitBucket()
+        self._cond = threading.Condition()
+        self._pending: deque[_Pending] = deque()
+        self._sending = False
 
     def send(self, message: str) -> None:
-        """Discord Webhook にメッセージを送信する."""
+        """Discord Webhook にメッセージを送信する.
+
+        他のスレッドが送信中なら、その送信に詰めてもらうのを待つ。
+        """
+        (error,) = self.send_many(messages=[message])
+        if error is not None:
+            raise error
+
+    def send_many(self, messages: Sequence[str]) -> list[Exception | None]:
+        """messages を詰められるだけ詰めて送り、1 件ごとの失敗を返す."""
+        own = [_Pending(message=message) for message in messages]
+        with self._cond:
+            self._pending.extend(own)
+            while self._sending and not _all_done(own):
+                self._cond.wait()
+            leading = not _all_done(own)
+            if leading:
+                self._sending = True
+        if leading:
+            self._send_until(own)
+        return [pending.error for pending in own]
+
+    def _send_until(self, own: list[_Pending]) -> None:
+        # 送信役を引き受け、自分のメッセージが片付くまで列を送る。
+        try:
+            while not _all_done(own):
+                self._bucket.acquire()
+                with self._cond:
+                    batch, payload = _take_batch(self._pending)
+                try:
+                    self._post(payload=payload, size=len(batch))
+                except Exception as exc:
+                    _finish(batch, error=exc)
+                else:
+                    _finish(batch, error=None)
+                with self._cond:
+                    self._cond.notify_all()
+        finally:
+            with self._cond:
+                self._sending = False
+                self._cond.notify_all()
+
+    def _post(
+        self,
+        *,
+        payload: _Payload,
+        size: int,
+    ) -> None:
+        """1 回 POST する (429 を含む失敗は例外)."""
         self._logger.debug(
-            "Discord Webhook に送信開始: url=%s",
+            "Discord Webhook に送信開始: url=%s messages=%d",
             self._webhook_url,
+            size,
         )
         try:
-            response = httpx.post(
-                url=self._webhook_url,
-                json={"content": message},
-                timeout=10.0,
-            )
+            response = self._client.post(url=self._webhook_url, json=payload)
+            self._bucket.update(response)
             response.raise_for_status()
         except httpx.HTTPStatusError:
             self._logger.error(
@@ -41,6 +220,83 @@ class DiscordWebhookNotifierImpl:
             )
             raise
         self._logger.debug(
-            "Discord Webhook に送信完了: url=%s",
+            "Discord Webhook に送信完了: url=%s messages=%d",
             self._webhook_url,
+            size,
         )
+
+
+def _header_number(
+    response: httpx.Response,
+    name: str,
+) -> float | None:
+    value = response.headers.get(name)
+    if value is None:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        return None
+
+
+def _all_done(own: list[_Pending]) -> bool:
+    return all(pending.done for pending in own)
+
+
+def _finish(
+    batch: list[_Pending],
+    *,
+    error: Exception | None,
+) -> None:
+    for pending in batch:
+        pending.error = error
+        pending.done = True
+
+
+def _take_batch(pending: deque[_Pending]) -> tuple[list[_Pending], _Payload]:
+    """列の先頭から 1 回の POST に収まるだけ取り、その本文を作る."""
+    messages = [item.message for item in pending]
+    count, payload = _pack(messages)
+    return [pending.popleft() for _ in range(count)], payload
+
+
+def _pack(messages: Sequence[str]) -> tuple[int, _Payload]:
+    # 先頭は上限を超えていても単独で送る (Discord が 400 で断る)。
+    count = max(_fill(messages, limit=_CONTENT_LIMIT), 1)
+    payload: _Payload = {
+        "content": _SEPARATOR.join(messages[:count]),
+    }
+    embeds: list[dict[str, str]] = []
+    embed_total = 0
+    while count < len(messages) and len(embeds) < _EMBED_LIMIT:
+        rest = messages[count:]
+        size = _fill(
+            rest,
+            limit=min(
+                _EMBED_DESCRIPTION_LIMIT,
+                _EMBED_TOTAL_LIMIT - embed_total,
+            ),
+        )
+        if size == 0:
+            break
+        description = _SEPARATOR.join(rest[:size])
+        embeds.append({"description": description})
+        embed_total += len(description)
+        count += size
+    if embeds:
+        payload["embeds"] = embeds
+    return count, payload
+
+
+def _fill(
+    messages: Sequence[str],
+    *,
+    limit: int,
+) -> int:
+    """区切りを含めて limit 文字に収まる先頭からの件数."""
+    length = -len(_SEPARATOR)
+    for count, message in enumerate(messages):
+        length += len(_SEPARATOR) + len(message)
+        if length > limit:
+            return count
+    return len(messages)
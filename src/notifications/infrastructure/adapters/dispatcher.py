@@ -0,0 +1,304 @@
+"""通知イベントの非同期配送 (有界キュー + 配送スレッド).
+
+Discord への送信と通知履歴の保存は合わせて数秒かかることがあり、作成 API
+の中で待つと API の遅さが Discord の遅さに引きずられる。作成 API は
+イベントをキューに積むだけで戻り、配送スレッドが各ユースケース
+(NotifyBookCreatedUseCase 等) を実行する。
+
+- キューは queue_size 件で頭打ちにし、満杯のときは overflow に従う。
+  BLOCK は block_timeout 秒まで空きを待ち (それでも満杯なら捨てる)、
+  DROP_OLDEST は最も古いイベントを捨てて積み、SPILL は spill_path に
+  JSON Lines で書き出す。
+- 書き出したイベントは手すきの配送スレッドがキューへ戻す。ファイルは
+  rename で取り出してから読むため、複数のプロセスで共有してよく、
+  プロセスの再起動をまたいでも残る。
+- 終了時 (atexit) は受け付けを止め、drain_timeout 秒までキューを
+  配り切る。配り切れなかったイベントは spill_path に書き出す。
+- workers=0 なら dispatch の場で同期実行する (テストやローカルの確認用)。
+"""
+
+import atexit
+import json
+import os
+import queue
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Any
+
+import attrs
+import injector
+
+from common.usecases.protocols import LoggerFactory
+from notifications.domain.dispatch_stats import DispatchStats
+from notifications.domain.events import NotificationEvent
+from notifications.domain.overflow_policy import OverflowPolicy
+from notifications.domain.results import NotificationProblem
+from notifications.infrastructure.adapters.event_codec import decode_event
+from notifications.infrastructure.adapters.event_codec import encode_event
+from notifications.usecases.protocols import DeliverNotificationUseCase
+
+# 手すきの配送スレッドが退避ファイルを見に行く間隔 [秒]。
+_IDLE_INTERVAL = 1.0
+
+# 配送スレッドに終了を知らせる番兵。
+_STOP = object()
+
+
+@attrs.frozen(kw_only=True)
+class DispatcherConfig:
+    """ディスパッチャの設定 (NotificationModule が settings から作る)."""
+
+    queue_size: int
+    workers: int
+    overflow: OverflowPolicy
+    spill_path: Path
+    block_timeout: float
+    drain_timeout: float
+
+
+class ThreadedNotificationDispatcherImpl:
+    """有界キューと配送スレッドで通知イベントを配る."""
+
+    @injector.inject
+    def __init__(
+        self,
+        config: DispatcherConfig,
+        deliver: DeliverNotificationUseCase,
+        logger_factory: LoggerFactory,
+    ) -> None:
+        self._config = config
+        self._deliver_use_case = deliver
+        self._logger = logger_factory.build(name=__name__)
+        self._queue: queue.Queue[Any] = queue.Queue(maxsize=config.queue_size)
+        self._lock = threading.Lock()
+        self._spill_lock = threading.Lock()
+        self._counts: Counter[str] = Counter()
+        self._high_water = 0
+        self._closed = False
+        self._abandoned = False
+        self._threads = [
+            threading.Thread(
+                target=self._run,
+                name=f"notification-dispatch-{number}",
+                daemon=True,
+            )
+            for number in range(config.workers)
+        ]
+        for thread in self._threads:
+            thread.start()
+        if self._threads:
+            atexit.register(self.shutdown)
+
+    def dispatch(self, event: NotificationEvent) -> None:
+        """イベントを積んですぐ戻る (workers=0 ならその場で配る)."""
+        if not self._threads:
+            self._deliver(event)
+            return
+        if self._closed:
+            self._spill([event])
+            return
+        try:
+            self._queue.put_nowait(event)
+        except queue.Full:
+            self._overflow(event)
+            return
+        self._enqueued()
+
+    def stats(self) -> DispatchStats:
+        """キューの深さとプロセスの起動からの件数を返す."""
+        with self._lock:
+            return DispatchStats(
+                depth=self._queue.qsize(),
+                capacity=self._config.queue_size,
+                high_water=self._high_water,
+                workers=len(self._threads),
+                overflow=self._config.overflow,
+                enqueued=self._counts["enqueued"],
+                delivered=self._counts["delivered"],
+                failed=self._counts["failed"],
+                dropped=self._counts["dropped"],
+                spilled=self._counts["spilled"],
+            )
+
+    def shutdown(self, timeout: float | None = None) -> None:
+        """受け付けを止め、timeout 秒 (既定は drain_timeout) まで配り切る.
+
+        配り切れなかったイベントは退避ファイルに書き出す。
+        """
+        if self._closed or not self._threads:
+            return
+        self._closed = True
+        if timeout is None:
+            timeout = self._config.drain_timeout
+        deadline = time.monotonic() + timeout
+        # 番兵は積まれたイベントの後ろに並ぶため、各スレッドは手元の
+        # イベントを配り終えてから止まる。
+        for _ in self._threads:
+            try:
+                self._queue.put(_STOP, timeout=_remaining(deadline))
+            except queue.Full:
+                break
+        for thread in self._threads:
+            thread.join(timeout=_remaining(deadline))
+        self._abandoned = True
+        left: list[NotificationEvent] = []
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is not _STOP:
+                left.append(item)
+        if left:
+            self._logger.warning(
+                "配り切れなかった通知を退避します: count=%d",
+                len(left),
+            )
+            self._spill(left)
+        atexit.unregister(self.shutdown)
+
+    def _overflow(self, event: NotificationEvent) -> None:
+        match self._config.overflow:
+            case OverflowPolicy.BLOCK:
+                try:
+                    self._queue.put(event, timeout=self._config.block_timeout)
+                except queue.Full:
+                    self._drop(event)
+                    return
+                self._enqueued()
+            case OverflowPolicy.DROP_OLDEST:
+                # 捨ててから積むまでに他のスレッドが積むことがあるため、
+                # 積めるまで繰り返す。
+                while True:
+                    try:
+                        oldest = self._queue.get_nowait()
+                    except queue.Empty:
+                        pass
+                    else:
+                        if oldest is _STOP:
+                            # 終了処理と重なった。番兵は戻して退避する。
+                            self._queue.put(_STOP)
+                            self._spill([event])
+                            return
+                        self._drop(oldest)
+                    try:
+                        self._queue.put_nowait(event)
+                    except queue.Full:
+                        continue
+                    self._enqueued()
+                    return
+            case OverflowPolicy.SPILL:
+                self._spill([event])
+
+    def _run(self) -> None:
+        self._replay()
+        while not self._abandoned:
+            try:
+                item = self._queue.get(timeout=_IDLE_INTERVAL)
+            except queue.Empty:
+                self._replay()
+                continue
+            if item is _STOP:
+                return
+            self._deliver(item)
+
+    def _deliver(self, event: NotificationEvent) -> None:
+        try:
+            result = self._deliver_use_case.execute(event=event)
+        except Exception:
+            self._logger.exception("通知を配送できませんでした: %r", event)
+            self._count("failed")
+            return
+        if isinstance(result, NotificationProblem):
+            self._logger.warning("通知送信に失敗しました: %s", result.detail)
+            self._count("failed")
+            return
+        self._count("delivered")
+
+    def _replay(self) -> None:
+        """退避ファイルのイベントをキューの空きの分だけ戻す."""
+        if self._closed:
+            return
+        path = self._config.spill_path
+        claimed = path.with_name(
+            f"{path.name}.{os.getpid()}-{threading.get_ident()}"
+        )
+        # rename は 1 つのプロセス・スレッドだけが成功する。
+        try:
+            path.rename(claimed)
+        except FileNotFoundError:
+            return
+        lines = claimed.read_text(encoding="utf-8").splitlines()
+        for index, line in enumerate(lines):
+            event = self._decode(line)
+            if event is None:
+                continue
+            try:
+                self._queue.put_nowait(event)
+            except queue.Full:
+                self._append(lines[index:])
+                break
+            self._enqueued()
+        claimed.unlink()
+
+    def _spill(self, events: list[NotificationEvent]) -> None:
+        lines: list[str] = []
+        for event in events:
+            event_type, payload = encode_event(event=event)
+            lines.append(
+                json.dumps(
+                    {"event_type": event_type, "event": payload},
+                    ensure_ascii=False,
+                )
+            )
+        try:
+            self._append(lines)
+        except OSError:
+            self._logger.exception(
+                "通知を退避できませんでした: path=%s",
+                self._config.spill_path,
+            )
+            self._count("dropped", len(events))
+            return
+        self._count("spilled", len(events))
+
+    def _append(self, lines: list[str]) -> None:
+        path = self._config.spill_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # 1 回の write にまとめ、他のプロセスの追記と行が混ざらないようにする。
+        with self._spill_lock, path.open("a", encoding="utf-8") as file:
+            file.write("".join(f"{line}\n" for line in lines))
+
+    def _decode(self, line: str) -> NotificationEvent | None:
+        try:
+            data = json.loads(line)
+            return decode_event(
+                event_type=data["event_type"],
+                payload=data["event"],
+            )
+        except (ValueError, KeyError, TypeError):
+            self._logger.exception("退避した通知を読めません: %s", line)
+            return None
+
+    def _drop(self, event: NotificationEvent) -> None:
+        self._logger.warning("通知キューが満杯のため捨てました: %r", event)
+        self._count("dropped")
+
+    def _enqueued(self) -> None:
+        with self._lock:
+            self._counts["enqueued"] += 1
+            self._high_water = max(self._high_water, self._queue.qsize())
+
+    def _count(
+        self,
+        name: str,
+        amount: int = 1,
+    ) -> None:
+        with self._lock:
+            self._counts[name] += amount
+
+
+def _remaining(deadline: float) -> float:
+    return max(deadline - time.monotonic(), 0.0)
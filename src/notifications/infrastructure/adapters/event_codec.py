@@ -0,0 +1,43 @@
+"""通知イベントと JSON に書ける値の相互変換 (退避ファイル・outbox 用)."""
+
+from collections.abc import Mapping
+from typing import Any
+
+import attrs
+
+from notifications.domain.event_type import EventType
+from notifications.domain.events import AuthorCreated
+from notifications.domain.events import AuthorsBulkCreated
+from notifications.domain.events import BookCreated
+from notifications.domain.events import NotificationEvent
+
+_EVENT_TYPES: dict[type[NotificationEvent], EventType] = {
+    BookCreated: EventType.BOOK_CREATED,
+    AuthorCreated: EventType.AUTHOR_CREATED,
+    AuthorsBulkCreated: EventType.AUTHORS_BULK_CREATED,
+}
+
+_EVENT_CLASSES = {event_type: cls for cls, event_type in _EVENT_TYPES.items()}
+
+
+def encode_event(event: NotificationEvent) -> tuple[EventType, dict[str, Any]]:
+    """イベントを (種別, 属性の dict) にする."""
+    return _EVENT_TYPES[type(event)], attrs.asdict(event)
+
+
+def decode_event(
+    *,
+    event_type: str,
+    payload: Mapping[str, Any],
+) -> NotificationEvent:
+    """encode_event の結果からイベントを作り直す.
+
+    種別・属性が不正なら ValueError / KeyError / TypeError。
+    """
+    cls = _EVENT_CLASSES[EventType(value=event_type)]
+    # JSON を経ると tuple は list になっているため戻す。
+    fields: dict[str, Any] = {
+        name: tuple(value) if isinstance(value, list) else value
+        for name, value in payload.items()
+    }
+    return cls(**fields)
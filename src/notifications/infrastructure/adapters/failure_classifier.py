@@ -0,0 +1,36 @@
+"""httpx の例外から、通知の送信失敗を再試行するかどうかを決める."""
+
+from http import HTTPStatus
+
+import httpx
+
+# 送り直せば通る見込みのある応答 (上流の一時的な不調と混雑)。
+_RETRYABLE_STATUSES = frozenset(
+    {
+        HTTPStatus.REQUEST_TIMEOUT,
+        HTTPStatus.TOO_MANY_REQUESTS,
+        HTTPStatus.INTERNAL_SERVER_ERROR,
+        HTTPStatus.BAD_GATEWAY,
+        HTTPStatus.SERVICE_UNAVAILABLE,
+        HTTPStatus.GATEWAY_TIMEOUT,
+    }
+)
+
+
+class HttpxDeliveryFailureClassifierImpl:
+    """タイムアウト・接続断・一時的な HTTP エラーを再試行の対象にする.
+
+    4xx (Webhook の URL 違いや本文の不正) やプログラムの誤りは何度送っても
+    同じ結果になるため、再試行しない。
+    """
+
+    def is_retryable(self, error: Exception) -> bool:
+        """error が再試行で解消しうる失敗なら True."""
+        if isinstance(error, httpx.HTTPStatusError):
+            return error.response.status_code in _RETRYABLE_STATUSES
+        return isinstance(
+            error,
+            httpx.TimeoutException
+            | httpx.NetworkError
+            | httpx.RemoteProtocolError,
+        )
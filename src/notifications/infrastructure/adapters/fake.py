@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+from collections.abc import Sequence
+
 from notifications.domain.event_type import EventType
 from notifications.domain.notification_channel import NotificationChannel
 from notifications.domain.notification_log import NotificationLog
@@ -21,6 +23,18 @@ class FakeNotifier:
         """メッセージをリストに記録する."""
         self._messages.append(message)
 
+    def send_many(self, messages: Sequence[str]) -> list[Exception | None]:
+        """1 件ずつ send し、失敗をメッセージごとに返す."""
+        errors: list[Exception | None] = []
+        for message in messages:
+            try:
+                self.send(message=message)
+            except Exception as exc:
+                errors.append(exc)
+            else:
+                errors.append(None)
+        return errors
+
 
 class FakeNotificationLogWriter:
     """テスト用: 保存された通知履歴を記録するアダプタ."""
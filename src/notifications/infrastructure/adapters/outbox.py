@@ -0,0 +1,313 @@
+"""通知イベントの transactional outbox (PostgreSQL).
+
+作成 API の中で送ると、送信後にトランザクションが戻っても通知が出て
+しまい、配送スレッドに積んだだけではプロセスが落ちると失われる。
+OutboxNotificationDispatcherImpl はイベントを呼び出し元の
+トランザクションで OutboxEvent に書き、同じトランザクションで NOTIFY
+する (行も通知もコミットされたときだけ現れる)。
+
+OutboxRelay (manage.py run_notification_worker) は
+
+- 短いトランザクションで ``SELECT ... FOR UPDATE SKIP LOCKED`` により
+  配る時刻になった行を batch_size 件取り、available_at を lease 秒先へ
+  ずらしてコミットする (取った行は他のワーカーから見えなくなる)。
+  他のワーカーが取っている最中の行は飛ばすため、ワーカーは何台並べてもよい。
+- トランザクションの外で、取った行をまとめて
+  DeliverNotificationUseCase.execute_many (Notifier.send_many) に渡し
+  (Discord は 1 回の POST に詰める。HTTP やレート制限の待ちの間も
+  ロックを握らない)、1 行ずつ消すか次の時刻を書く。どちらも lease が
+  自分のもののままの行に限る。
+- 取る行がなくなったら OutboxListener で NOTIFY を待つ。取り逃しに備え、
+  NOTIFY がなくても idle_timeout 秒ごとには見に行く。
+
+配送中にワーカーが落ちると、配り終えていない行は lease が切れてから
+他のワーカーが配り直す。配り終えて消す前に落ちた行だけが 2 回届きうる。
+
+送信が再試行で解消しうる失敗 (NotificationProblem.retryable、Discord の
+レート制限の 429 を含む) に終わった行は
+消さず、RetryPolicy に従って attempts を増やし available_at を先へずらす。
+outbox がそのまま再送の待ち行列になるため、ワーカーを再起動しても
+予定は残る。上限まで失敗した行と、再試行しても変わらない失敗の行は消す。
+配送そのものが例外で終わったバッチの行も、一時的な失敗として同じく
+送り直す。
+"""
+
+import threading
+import time
+from datetime import datetime
+from datetime import timedelta
+from http import HTTPStatus
+from typing import Any
+
+import injector
+from django.db import connection
+from django.db import transaction
+from django.utils import timezone
+
+from common.usecases.protocols import LoggerFactory
+from notifications.domain.dispatch_stats import DispatchStats
+from notifications.domain.events import NotificationEvent
+from notifications.domain.results import NotificationProblem
+from notifications.domain.results import NotificationResult
+from notifications.domain.retry_policy import RetryPolicy
+from notifications.infrastructure.adapters.event_codec import decode_event
+from notifications.infrastructure.adapters.event_codec import encode_event
+from notifications.models import OutboxEvent
+from notifications.usecases.protocols import DeliverNotificationUseCase
+
+# 積んだことをワーカーに知らせる LISTEN/NOTIFY のチャネル。
+OUTBOX_CHANNEL = "notification_outbox"
+
+# 止める指示を確かめる間隔 [秒] (NOTIFY を待つ間も)。
+_WAIT_SLICE = 1.0
+
+# 取った行を他のワーカーから隠しておく秒数の既定値 (1 バッチを配り
+# 終えるのに十分な長さにする)。
+DEFAULT_LEASE = 300.0
+
+
+class OutboxNotificationDispatcherImpl:
+    """通知イベントを呼び出し元のトランザクションで outbox に積む."""
+
+    @injector.inject
+    def __init__(self, logger_factory: LoggerFactory) -> None:
+        self._logger = logger_factory.build(name=__name__)
+        self._lock = threading.Lock()
+        self._enqueued = 0
+
+    def dispatch(self, event: NotificationEvent) -> None:
+        """イベントを OutboxEvent に書き、コミット時にワーカーを起こす."""
+        event_type, payload = encode_event(event=event)
+        OutboxEvent.objects.create(event_type=event_type, payload=payload)
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT pg_notify(%s, '')", [OUTBOX_CHANNEL])
+        with self._lock:
+            self._enqueued += 1
+
+    def stats(self) -> DispatchStats:
+        """未配送の行数 (全プロセス分) と、このプロセスが積んだ件数を返す."""
+        with self._lock:
+            enqueued = self._enqueued
+        return DispatchStats(
+            depth=OutboxEvent.objects.count(),
+            capacity=None,
+            high_water=None,
+            workers=0,
+            overflow=None,
+            enqueued=enqueued,
+            delivered=0,
+            failed=0,
+            dropped=0,
+            spilled=0,
+        )
+
+    def shutdown(self, timeout: float | None = None) -> None:
+        """何もしない (積んだイベントは DB にある)."""
+
+
+class OutboxRelay:
+    """outbox の行を取り出して配る."""
+
+    @injector.inject
+    def __init__(
+        self,
+        deliver: DeliverNotificationUseCase,
+        policy: RetryPolicy,
+        logger_factory: LoggerFactory,
+    ) -> None:
+        self._deliver = deliver
+        self._policy = policy
+        self._logger = logger_factory.build(name=__name__)
+
+    def deliver_batch(
+        self,
+        batch_size: int,
+        lease: float = DEFAULT_LEASE,
+    ) -> int:
+        """配る時刻になった行を batch_size 件まで取って配る (取った件数を返す).
+
+        届いた行と諦めた行は消し、送り直す行は次の時刻を決めて残す。
+        配っている間は行をロックせず、lease 秒だけ他のワーカーから隠す。
+        """
+        leased_until = timezone.now() + timedelta(seconds=lease)
+        rows = self._claim(batch_size=batch_size, leased_until=leased_until)
+        retries = self._deliver_rows(rows)
+        for row in rows:
+            self._settle(
+                row,
+                retry=row.pk in retries,
+                leased_until=leased_until,
+            )
+        return len(rows)
+
+    def seconds_until_due(self) -> float | None:
+        """まだ配る時刻でない行のうち、最も早い行までの秒数 (なければ None)."""
+        now = timezone.now()
+        available_at = (
+            OutboxEvent.objects.filter(available_at__gt=now)
+            .order_by("available_at")
+            .values_list("available_at", flat=True)
+            .first()
+        )
+        if available_at is None:
+            return None
+        return (available_at - now).total_seconds()
+
+    @staticmethod
+    def _claim(
+        *,
+        batch_size: int,
+        leased_until: datetime,
+    ) -> list[OutboxEvent]:
+        """配る時刻になった行を取り、available_at を leased_until にする.
+
+        他のワーカーがロックしている行は待たずに飛ばす。ロックは
+        available_at を書き換えてコミットするまでしか握らない。
+        """
+        with transaction.atomic():
+            rows = list(
+                OutboxEvent.objects.select_for_update(skip_locked=True)
+                .filter(available_at__lte=timezone.now())
+                .order_by("id")[:batch_size]
+            )
+            OutboxEvent.objects.filter(
+                pk__in=[row.pk for row in rows],
+            ).update(available_at=leased_until)
+        return rows
+
+    @staticmethod
+    def _settle(
+        row: OutboxEvent,
+        *,
+        retry: bool,
+        leased_until: datetime,
+    ) -> None:
+        """配り終えた 1 行を消すか、送り直す時刻を書く (1 文ずつ).
+
+        lease が切れて他のワーカーが取り直した行 (available_at が
+        変わった行) には触れない。
+        """
+        mine = OutboxEvent.objects.filter(
+            pk=row.pk,
+            available_at=leased_until,
+        )
+        if retry:
+            mine.update(attempts=row.attempts, available_at=row.available_at)
+        else:
+            mine.delete()
+
+    def _deliver_rows(self, rows: list[OutboxEvent]) -> set[int]:
+        """rows をまとめて配り、送り直す行の pk を返す.
+
+        送り直す行には次の時刻と試行回数を書く (_reschedule)。配送自体が
+        例外で終わった行は届いたか分からないため、一時的な失敗として
+        RetryPolicy に従って送り直す (消さない)。
+        """
+        # 1 行の失敗でバッチ全体を戻すと、同じ行で止まり続けるため
+        # 失敗はログに留める (結果は通知履歴にも残る)。
+        readable: list[tuple[OutboxEvent, NotificationEvent]] = []
+        for row in rows:
+            try:
+                event = decode_event(
+                    event_type=row.event_type,
+                    payload=row.payload,
+                )
+            except (ValueError, KeyError, TypeError):
+                self._logger.exception(
+                    "outbox の行を読めません: id=%s",
+                    row.pk,
+                )
+            else:
+                readable.append((row, event))
+        if not readable:
+            return set()
+        try:
+            results = self._deliver.execute_many(
+                events=[event for _, event in readable],
+                retry_counts=[row.attempts for row, _ in readable],
+            )
+        except Exception:
+            self._logger.exception(
+                "通知を配送できませんでした: ids=%s",
+                [row.pk for row, _ in readable],
+            )
+            failure = NotificationProblem(
+                title="Notification Delivery Failed",
+                status=HTTPStatus.INTERNAL_SERVER_ERROR,
+                detail="通知の配送中に例外が発生しました",
+                retryable=True,
+            )
+            results = [failure] * len(readable)
+        retries: set[int] = set()
+        for (row, _), result in zip(readable, results, strict=True):
+            if self._reschedule(row, result=result):
+                retries.add(row.pk)
+        return retries
+
+    def _reschedule(
+        self,
+        row: OutboxEvent,
+        *,
+        result: NotificationResult,
+    ) -> bool:
+        """送り直すなら次の時刻と試行回数を row に書いて True を返す."""
+        if not isinstance(result, NotificationProblem):
+            return False
+        attempts = row.attempts + 1
+        if not (
+            result.retryable and self._policy.should_retry(attempts=attempts)
+        ):
+            self._logger.warning(
+                "通知送信に失敗しました (%d 回目、諦めます): %s",
+                attempts,
+                result.detail,
+            )
+            return False
+        delay = self._policy.backoff(attempts=attempts)
+        self._logger.warning(
+            "通知送信に失敗しました (%d 回目、%.1f 秒後に再送): %s",
+            attempts,
+            delay,
+            result.detail,
+        )
+        row.attempts = attempts
+        row.available_at = timezone.now() + timedelta(seconds=delay)
+        return True
+
+
+class OutboxListener:
+    """OUTBOX_CHANNEL を LISTEN し、NOTIFY を待つ."""
+
+    def __init__(self) -> None:
+        connection.ensure_connection()
+        self._connection: Any = connection.connection
+        # 配送中 (別のクエリの実行中) に届いた NOTIFY はハンドラにだけ
+        # 渡るため、印を付けておいて次の wait ですぐ戻る。
+        self._notified = threading.Event()
+        self._connection.add_notify_handler(
+            lambda _notify: self._notified.set()
+        )
+        with connection.cursor() as cursor:
+            cursor.execute(f"LISTEN {OUTBOX_CHANNEL}")
+
+    def wait(
+        self,
+        *,
+        timeout: float,
+        stop: threading.Event,
+    ) -> None:
+        """NOTIFY が届くか、timeout 秒経つか、stop が立つまで待つ."""
+        deadline = time.monotonic() + timeout
+        while not (stop.is_set() or self._notified.is_set()):
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            received = list(
+                self._connection.notifies(
+                    timeout=min(remaining, _WAIT_SLICE),
+                    stop_after=1,
+                )
+            )
+            if received:
+                break
+        self._notified.clear()
@@ -1,8 +1,11 @@
 from __future__ import annotations
 
+import atexit
+from pathlib import Path
 from typing import Any
 from typing import ClassVar
 
+import httpx
 import injector
 from django.conf import settings
 from elasticsearch import Elasticsearch
@@ -11,24 +14,44 @@ from common.infrastructure.containers.di import ContainerHolder
 from common.infrastructure.factories.logger import LoggerFactoryImpl
 from common.usecases.protocols import LoggerFactory
 from notifications.domain.notification_channel import NotificationChannel
+from notifications.domain.overflow_policy import OverflowPolicy
+from notifications.domain.retry_policy import RetryPolicy
 from notifications.infrastructure.adapters.console import ConsoleNotifierImpl
+from notifications.infrastructure.adapters.discord import DiscordClientConfig
 from notifications.infrastructure.adapters.discord import (
     DiscordWebhookNotifierImpl,
 )
+from notifications.infrastructure.adapters.discord import build_discord_client
+from notifications.infrastructure.adapters.dispatcher import DispatcherConfig
+from notifications.infrastructure.adapters.dispatcher import (
+    ThreadedNotificationDispatcherImpl,
+)
 from notifications.infrastructure.adapters.elasticsearch import (
     ElasticsearchNotificationLogReaderImpl,
 )
 from notifications.infrastructure.adapters.elasticsearch import (
     ElasticsearchNotificationLogWriterImpl,
 )
+from notifications.infrastructure.adapters.failure_classifier import (
+    HttpxDeliveryFailureClassifierImpl,
+)
+from notifications.infrastructure.adapters.outbox import (
+    OutboxNotificationDispatcherImpl,
+)
+from notifications.usecases.notify import DeliverNotificationUseCaseImpl
 from notifications.usecases.notify import NotifyAuthorCreatedUseCaseImpl
+from notifications.usecases.notify import NotifyAuthorsBulkCreatedUseCaseImpl
 from notifications.usecases.notify import NotifyBookCreatedUseCaseImpl
+from notifications.usecases.protocols import DeliverNotificationUseCase
+from notifications.usecases.protocols import DeliveryFailureClassifier
 from notifications.usecases.protocols import GetNotificationLogDetailUseCase
 from notifications.usecases.protocols import GetNotificationLogsUseCase
+from notifications.usecases.protocols import NotificationDispatcher
 from notifications.usecases.protocols import NotificationLogReader
 from notifications.usecases.protocols import NotificationLogWriter
 from notifications.usecases.protocols import Notifier
 from notifications.usecases.protocols import NotifyAuthorCreatedUseCase
+from notifications.usecases.protocols import NotifyAuthorsBulkCreatedUseCase
 from notifications.usecases.protocols import NotifyBookCreatedUseCase
 from notifications.usecases.query import GetNotificationLogDetailUseCaseImpl
 from notifications.usecases.query import GetNotificationLogsUseCaseImpl
@@ -42,6 +65,11 @@ class NotificationModule(injector.Module):
         NotificationChannel.CONSOLE: ConsoleNotifierImpl,
     }
 
+    _DISPATCHER_MAP: ClassVar[dict[str, type]] = {
+        "outbox": OutboxNotificationDispatcherImpl,
+        "thread": ThreadedNotificationDispatcherImpl,
+    }
+
     def __init__(
         self,
         notifier_override: Notifier | None = None,
@@ -50,6 +78,7 @@ class NotificationModule(injector.Module):
         channel_override: NotificationChannel | None = None,
     ) -> None:
         self._factory = LoggerFactoryImpl()
+        self._http_client: httpx.Client | None = None
 
         if notifier_override is not None:
             self._notifier: Any = notifier_override
@@ -66,16 +95,60 @@ class NotificationModule(injector.Module):
         self._log_reader: Any = (
             log_reader_override or self._es_reader_provider()
         )
+        self._dispatcher = self._DISPATCHER_MAP[
+            settings.NOTIFICATION_DISPATCHER
+        ]
+        self._dispatcher_config = DispatcherConfig(
+            queue_size=settings.NOTIFICATION_QUEUE_SIZE,
+            workers=settings.NOTIFICATION_DISPATCH_WORKERS,
+            overflow=OverflowPolicy(
+                value=settings.NOTIFICATION_OVERFLOW_POLICY,
+            ),
+            spill_path=Path(settings.NOTIFICATION_SPILL_PATH),
+            block_timeout=settings.NOTIFICATION_BLOCK_TIMEOUT,
+            drain_timeout=settings.NOTIFICATION_DRAIN_TIMEOUT,
+        )
+        self._retry_policy = RetryPolicy(
+            max_attempts=settings.NOTIFICATION_RETRY_MAX_ATTEMPTS,
+            base_delay=settings.NOTIFICATION_RETRY_BASE_DELAY,
+            max_delay=settings.NOTIFICATION_RETRY_MAX_DELAY,
+        )
 
     def _build_notifier(self) -> Any:
         cls = self._NOTIFIER_MAP[self._channel]
         if cls is DiscordWebhookNotifierImpl:
             return cls(
                 webhook_url=settings.DISCORD_WEBHOOK_URL,
+                client=self._build_http_client(),
                 logger_factory=self._factory,
             )
         return cls
 
+    def _build_http_client(self) -> httpx.Client:
+        # 接続プールはモジュールが持ち、プロセスの終了時か close で閉じる。
+        self._http_client = build_discord_client(
+            config=DiscordClientConfig(
+                max_connections=settings.DISCORD_HTTP_MAX_CONNECTIONS,
+                max_keepalive_connections=(
+                    settings.DISCORD_HTTP_MAX_KEEPALIVE_CONNECTIONS
+                ),
+                keepalive_expiry=settings.DISCORD_HTTP_KEEPALIVE_EXPIRY,
+                http2=settings.DISCORD_HTTP2,
+                connect_timeout=settings.DISCORD_CONNECT_TIMEOUT,
+                read_timeout=settings.DISCORD_READ_TIMEOUT,
+            ),
+        )
+        atexit.register(self.close)
+        return self._http_client
+
+    def close(self) -> None:
+        """モジュールが作った HTTP クライアントを閉じる."""
+        if self._http_client is None:
+            return
+        atexit.unregister(self.close)
+        self._http_client.close()
+        self._http_client = None
+
     def _es_writer_provider(self) -> Any:
         factory = self._factory
 
@@ -138,6 +211,26 @@ class NotificationModule(injector.Module):
             NotifyAuthorCreatedUseCase,  # type: ignore[type-abstract]
             to=NotifyAuthorCreatedUseCaseImpl,
         )
+        binder.bind(
+            NotifyAuthorsBulkCreatedUseCase,  # type: ignore[type-abstract]
+            to=NotifyAuthorsBulkCreatedUseCaseImpl,
+        )
+        binder.bind(
+            DeliverNotificationUseCase,  # type: ignore[type-abstract]
+            to=DeliverNotificationUseCaseImpl,
+        )
+        binder.bind(
+            DeliveryFailureClassifier,  # type: ignore[type-abstract]
+            to=HttpxDeliveryFailureClassifierImpl,
+        )
+        binder.bind(RetryPolicy, to=self._retry_policy)
+        binder.bind(DispatcherConfig, to=self._dispatcher_config)
+        # キューと配送スレッドはコンテナごとに 1 つにする。
+        binder.bind(
+            NotificationDispatcher,  # type: ignore[type-abstract]
+            to=self._dispatcher,
+            scope=injector.singleton,
+        )
         binder.bind(
             GetNotificationLogsUseCase,  # type: ignore[type-abstract]
             to=GetNotificationLogsUseCaseImpl,
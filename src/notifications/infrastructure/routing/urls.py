@@ -3,6 +3,9 @@
 from django.urls import path
 
 from notifications.infrastructure.containers.notificaton import container
+from notifications.interfaces.views.dispatch_stats import (
+    NotificationDispatcherStatsView,
+)
 from notifications.interfaces.views.notification_log import (
     NotificationLogDetailView,
 )
@@ -11,6 +14,7 @@ from notifications.interfaces.views.notification_log import (
 )
 from notifications.usecases.protocols import GetNotificationLogDetailUseCase
 from notifications.usecases.protocols import GetNotificationLogsUseCase
+from notifications.usecases.protocols import NotificationDispatcher
 
 NotificationLogListView.use_case_resolver = lambda: container.injector.get(
     GetNotificationLogsUseCase,  # type: ignore[type-abstract]
@@ -20,7 +24,19 @@ NotificationLogDetailView.use_case_resolver = lambda: container.injector.get(
     GetNotificationLogDetailUseCase,  # type: ignore[type-abstract]
 )
 
+NotificationDispatcherStatsView.dispatcher_resolver = lambda: (
+    container.injector.get(
+        NotificationDispatcher,  # type: ignore[type-abstract]
+    )
+)
+
 urlpatterns = [
+    # notifications/<log_id>/ より先に置く。
+    path(
+        "notifications/dispatcher/",
+        NotificationDispatcherStatsView.as_view(),
+        name="notification-dispatcher-stats",
+    ),
     path(
         "notifications/",
         NotificationLogListView.as_view(),
@@ -0,0 +1,20 @@
+"""通知ディスパッチャの状態のシリアライザ."""
+
+from rest_framework import serializers
+
+from common.interfaces.compiled_serializer import CompiledSerializer
+
+
+class DispatchStatsSerializer(CompiledSerializer):
+    """通知キューの深さと件数のシリアライザ (read-only)."""
+
+    depth = serializers.IntegerField(read_only=True)
+    capacity = serializers.IntegerField(read_only=True, allow_null=True)
+    high_water = serializers.IntegerField(read_only=True, allow_null=True)
+    workers = serializers.IntegerField(read_only=True)
+    overflow = serializers.CharField(read_only=True, allow_null=True)
+    enqueued = serializers.IntegerField(read_only=True)
+    delivered = serializers.IntegerField(read_only=True)
+    failed = serializers.IntegerField(read_only=True)
+    dropped = serializers.IntegerField(read_only=True)
+    spilled = serializers.IntegerField(read_only=True)
@@ -1,11 +1,11 @@
 """通知履歴のシリアライザ."""
 
-from typing import Any
-
 from rest_framework import serializers
 
+from common.interfaces.compiled_serializer import CompiledSerializer
+
 
-class NotificationLogSerializer(serializers.Serializer[Any]):
+class NotificationLogSerializer(CompiledSerializer):
     """通知履歴シリアライザ (read-only)."""
 
     id = serializers.UUIDField(read_only=True)
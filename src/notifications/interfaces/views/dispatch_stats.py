@@ -0,0 +1,30 @@
+"""通知ディスパッチャの状態 API ビュー."""
+
+from collections.abc import Callable
+from typing import ClassVar
+
+from drf_spectacular.utils import extend_schema
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from notifications.interfaces.serializers.dispatch_stats import (
+    DispatchStatsSerializer,
+)
+from notifications.usecases.protocols import NotificationDispatcher
+
+
+class NotificationDispatcherStatsView(APIView):
+    """通知キューの深さと件数を返す API (応答したプロセスの値)."""
+
+    dispatcher_resolver: ClassVar[Callable[[], NotificationDispatcher]]
+
+    @extend_schema(
+        operation_id="notifications_dispatcher_stats",
+        summary="通知キューの状態",
+        responses=DispatchStatsSerializer,
+    )
+    def get(self, _request: Request) -> Response:
+        """通知キューの深さと件数を返す."""
+        stats = type(self).dispatcher_resolver().stats()
+        return Response(DispatchStatsSerializer(instance=stats).data)
@@ -0,0 +1,108 @@
+"""outbox (notifications.models.OutboxEvent) に積まれた通知を配るワーカー.
+
+未配送の行を --batch-size 件ずつ ``FOR UPDATE SKIP LOCKED`` で取り、
+--lease 秒だけ他のワーカーから隠してから (ロックは取る間だけ) 配る。
+取る行がなくなったら NOTIFY を待つ (DB を定期的に読みに行かない)。
+送り直しを待っている行があれば、その時刻には起きて配る。
+同じコマンドを何プロセス並べてもよい。途中で落ちたワーカーの行は
+lease が切れてから他のワーカーが配り直す。
+
+SIGTERM / SIGINT を受けたら配っているバッチを終えてから止まる。
+--once なら取る行がなくなった時点で終える (cron や確認用)。
+"""
+
+import signal
+import threading
+from typing import Any
+
+from django.core.management.base import BaseCommand
+from django.core.management.base import CommandParser
+
+from notifications.infrastructure.adapters.outbox import DEFAULT_LEASE
+from notifications.infrastructure.adapters.outbox import OutboxListener
+from notifications.infrastructure.adapters.outbox import OutboxRelay
+from notifications.infrastructure.containers.notificaton import container
+
+
+class Command(BaseCommand):
+    help = "outbox に積まれた通知を配る"
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=100,
+            help="1 回に取って配る件数",
+        )
+        parser.add_argument(
+            "--lease",
+            type=float,
+            default=DEFAULT_LEASE,
+            help="取った行を他のワーカーから隠す秒数",
+        )
+        parser.add_argument(
+            "--idle-timeout",
+            type=float,
+            default=30.0,
+            help="NOTIFY がなくても outbox を見に行く間隔 [秒]",
+        )
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="取る行がなくなったら終える",
+        )
+
+    def handle(self, **options: Any) -> None:
+        relay = container.injector.get(OutboxRelay)
+        stop = threading.Event()
+        previous = {
+            signum: signal.signal(signum, lambda *_: stop.set())
+            for signum in (signal.SIGTERM, signal.SIGINT)
+        }
+        try:
+            delivered = self._run(
+                relay=relay,
+                batch_size=options["batch_size"],
+                lease=options["lease"],
+                idle_timeout=options["idle_timeout"],
+                once=options["once"],
+                stop=stop,
+            )
+        finally:
+            for signum, handler in previous.items():
+                signal.signal(signum, handler)
+        self.stdout.write(
+            self.style.SUCCESS(f"通知を {delivered} 件配りました。")
+        )
+
+    def _run(
+        self,
+        *,
+        relay: OutboxRelay,
+        batch_size: int,
+        lease: float,
+        idle_timeout: float,
+        once: bool,
+        stop: threading.Event,
+    ) -> int:
+        # 最初のバッチより前に LISTEN し、その間に積まれた分も拾う。
+        listener = None if once else OutboxListener()
+        delivered = 0
+        while not stop.is_set():
+            count = relay.deliver_batch(batch_size=batch_size, lease=lease)
+            delivered += count
+            if count:
+                self.stdout.write(f"{count} 件配りました (累計 {delivered})")
+            if count == batch_size:
+                # まだ残っている。
+                continue
+            if listener is None:
+                break
+            due = relay.seconds_until_due()
+            listener.wait(
+                timeout=idle_timeout
+                if due is None
+                else min(idle_timeout, due),
+                stop=stop,
+            )
+        return delivered
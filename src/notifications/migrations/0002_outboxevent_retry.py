@@ -0,0 +1,26 @@
+# Generated by Django 6.0.2 on 2026-10-18 15:00
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("notifications", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="outboxevent",
+            name="attempts",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="outboxevent",
+            name="available_at",
+            field=models.DateTimeField(
+                db_index=True,
+                default=django.utils.timezone.now,
+            ),
+        ),
+    ]
@@ -0,0 +1,27 @@
+from django.db import models
+from django.utils import timezone
+
+
+class OutboxEvent(models.Model):
+    """配送を待つ通知イベント (送り終えたら消す).
+
+    作成 API は書籍・著者の行と同じトランザクションで積み、
+    run_notification_worker が取り出して配る。送信に失敗して送り直す
+    行は attempts を増やし、available_at まで取り出さない。
+    """
+
+    # notifications.domain.event_type.EventType の値。
+    event_type = models.CharField(max_length=64)
+    # イベントの属性 (attrs.asdict の結果)。
+    payload = models.JSONField()
+    created_at = models.DateTimeField(auto_now_add=True)
+    # これまでに失敗した回数 (通知履歴の retry_count)。
+    attempts = models.PositiveIntegerField(default=0)
+    # この時刻になるまで配らない (再試行の待ち)。
+    available_at = models.DateTimeField(default=timezone.now, db_index=True)
+
+    class Meta:
+        ordering = ["id"]
+
+    def __str__(self) -> str:
+        return f"{self.event_type}#{self.pk}"
@@ -1,24 +1,43 @@
 """通知送信ユースケースの実装."""
 
+import itertools
+from collections.abc import Sequence
 from http import HTTPStatus
+from typing import ClassVar
 
 import injector
 
 from common.usecases.protocols import LoggerFactory
 from notifications.domain.event_type import EventType
 from notifications.domain.events import AuthorCreated
+from notifications.domain.events import AuthorsBulkCreated
 from notifications.domain.events import BookCreated
+from notifications.domain.events import NotificationEvent
 from notifications.domain.notification_channel import NotificationChannel
 from notifications.domain.notification_status import NotificationStatus
 from notifications.domain.results import NotificationProblem
 from notifications.domain.results import NotificationResult
 from notifications.domain.results import NotificationSuccess
+from notifications.usecases.protocols import DeliveryFailureClassifier
 from notifications.usecases.protocols import NotificationLogWriter
 from notifications.usecases.protocols import Notifier
+from notifications.usecases.protocols import NotifyAuthorCreatedUseCase
+from notifications.usecases.protocols import NotifyAuthorsBulkCreatedUseCase
+from notifications.usecases.protocols import NotifyBookCreatedUseCase
 
+# 一括作成通知の本文に列挙する著者名の上限 (残りは件数のみ)。
+_BULK_NAME_PREVIEW = 10
 
-class NotifyBookCreatedUseCaseImpl:
-    """本作成通知ユースケースの実装."""
+
+class _NotifyUseCase[EventT: NotificationEvent]:
+    """通知ユースケースの共通部分 (送信・ログ・通知履歴の保存).
+
+    サブクラスは通知の種類 (_event_type と _label) と、イベントから
+    ログに出す対象と本文を作る _compose だけを決める。
+    """
+
+    _event_type: ClassVar[EventType]
+    _label: ClassVar[str]
 
     @injector.inject
     def __init__(
@@ -27,147 +46,254 @@ class NotifyBookCreatedUseCaseImpl:
         logger_factory: LoggerFactory,
         log_writer: NotificationLogWriter,
         channel: NotificationChannel,
+        classifier: DeliveryFailureClassifier,
     ) -> None:
         self._notifier = notifier
         self._logger = logger_factory.build(name=__name__)
         self._log_writer = log_writer
         self._channel = channel
+        self._classifier = classifier
 
-    def execute(self, event: BookCreated) -> NotificationResult:
-        """本作成イベントの通知を実行する."""
-        message = (
-            f"本が登録されました: {event.title} (著者: {event.author_name})"
-        )
+    def execute(
+        self,
+        event: EventT,
+        retry_count: int = 0,
+    ) -> NotificationResult:
+        """イベントの通知を実行する.
+
+        retry_count はこれまでに失敗した回数 (通知履歴に残す)。
+        """
+        target, message = self._compose(event=event)
         try:
             self._notifier.send(message=message)
-        except Exception:
+        except Exception as exc:
+            return self._record(
+                target=target,
+                message=message,
+                retry_count=retry_count,
+                error=exc,
+            )
+        return self._record(
+            target=target,
+            message=message,
+            retry_count=retry_count,
+            error=None,
+        )
+
+    def execute_many(
+        self,
+        events: Sequence[EventT],
+        retry_counts: Sequence[int],
+    ) -> list[NotificationResult]:
+        """events を 1 回の send_many で送る (retry_counts は 1 件ごと)."""
+        composed = [self._compose(event=event) for event in events]
+        errors = self._notifier.send_many(
+            messages=[message for _, message in composed],
+        )
+        return [
+            self._record(
+                target=target,
+                message=message,
+                retry_count=retry_count,
+                error=error,
+            )
+            for (target, message), retry_count, error in zip(
+                composed,
+                retry_counts,
+                errors,
+                strict=True,
+            )
+        ]
+
+    def _compose(self, event: EventT) -> tuple[str, str]:
+        """(ログと失敗詳細に出す対象, 本文) を返す."""
+        raise NotImplementedError
+
+    def _record(
+        self,
+        *,
+        target: str,
+        message: str,
+        retry_count: int,
+        error: Exception | None,
+    ) -> NotificationResult:
+        """送信の結果をログと通知履歴に残し、結果値を返す."""
+        if error is not None:
+            detail = f"{self._label}の送信に失敗しました: {target}"
             self._logger.warning(
-                "本作成通知の送信に失敗: title=%s",
-                event.title,
-                exc_info=True,
+                "%sの送信に失敗: %s",
+                self._label,
+                target,
+                exc_info=error,
             )
             self._save_log(
-                event_type=EventType.BOOK_CREATED,
                 message=message,
                 status=NotificationStatus.FAILURE,
-                detail=(f"本作成通知の送信に失敗しました: {event.title}"),
+                detail=detail,
+                retry_count=retry_count,
             )
             return NotificationProblem(
                 title="Notification Delivery Failed",
                 status=HTTPStatus.BAD_GATEWAY,
-                detail=(f"本作成通知の送信に失敗しました: {event.title}"),
+                detail=detail,
+                retryable=self._classifier.is_retryable(error=error),
             )
-        self._logger.info(
-            "本作成通知を送信しました: title=%s",
-            event.title,
-        )
+        self._logger.info("%sを送信しました: %s", self._label, target)
         self._save_log(
-            event_type=EventType.BOOK_CREATED,
             message=message,
             status=NotificationStatus.SUCCESS,
             detail="",
+            retry_count=retry_count,
         )
         return NotificationSuccess(message=message)
 
     def _save_log(
         self,
         *,
-        event_type: EventType,
         message: str,
         status: NotificationStatus,
         detail: str,
+        retry_count: int,
     ) -> None:
         """通知履歴を保存する (失敗時はログ出力のみ)."""
         try:
             self._log_writer.save(
-                event_type=event_type,
+                event_type=self._event_type,
                 message=message,
                 status=status,
                 detail=detail,
                 recipient=self._channel,
                 channel=self._channel,
-                retry_count=0,
+                retry_count=retry_count,
             )
         except Exception:
             self._logger.warning(
                 "通知履歴の保存に失敗: event_type=%s",
-                event_type,
+                self._event_type,
                 exc_info=True,
             )
 
 
-class NotifyAuthorCreatedUseCaseImpl:
+class NotifyBookCreatedUseCaseImpl(_NotifyUseCase[BookCreated]):
+    """本作成通知ユースケースの実装."""
+
+    _event_type = EventType.BOOK_CREATED
+    _label = "本作成通知"
+
+    def _compose(self, event: BookCreated) -> tuple[str, str]:
+        message = (
+            f"本が登録されました: {event.title} (著者: {event.author_name})"
+        )
+        return event.title, message
+
+
+class NotifyAuthorCreatedUseCaseImpl(_NotifyUseCase[AuthorCreated]):
     """著者作成通知ユースケースの実装."""
 
+    _event_type = EventType.AUTHOR_CREATED
+    _label = "著者作成通知"
+
+    def _compose(self, event: AuthorCreated) -> tuple[str, str]:
+        return event.name, f"著者が登録されました: {event.name}"
+
+
+class NotifyAuthorsBulkCreatedUseCaseImpl(
+    _NotifyUseCase[AuthorsBulkCreated],
+):
+    """著者一括作成通知ユースケースの実装.
+
+    件数分の通知を送らず、1 通に集約して送る。
+    """
+
+    _event_type = EventType.AUTHORS_BULK_CREATED
+    _label = "著者一括作成通知"
+
+    def _compose(self, event: AuthorsBulkCreated) -> tuple[str, str]:
+        total = len(event.names)
+        preview = "、".join(event.names[:_BULK_NAME_PREVIEW])
+        rest = total - _BULK_NAME_PREVIEW
+        suffix = f" ほか{rest}件" if rest > 0 else ""
+        return (
+            f"{total}件",
+            f"著者が{total}件登録されました: {preview}{suffix}",
+        )
+
+
+class DeliverNotificationUseCaseImpl:
+    """通知イベントを種類に応じたユースケースで配送する."""
+
     @injector.inject
     def __init__(
         self,
-        notifier: Notifier,
-        logger_factory: LoggerFactory,
-        log_writer: NotificationLogWriter,
-        channel: NotificationChannel,
+        book_created: NotifyBookCreatedUseCase,
+        author_created: NotifyAuthorCreatedUseCase,
+        authors_bulk_created: NotifyAuthorsBulkCreatedUseCase,
     ) -> None:
-        self._notifier = notifier
-        self._logger = logger_factory.build(name=__name__)
-        self._log_writer = log_writer
-        self._channel = channel
+        self._book_created = book_created
+        self._author_created = author_created
+        self._authors_bulk_created = authors_bulk_created
 
-    def execute(self, event: AuthorCreated) -> NotificationResult:
-        """著者作成イベントの通知を実行する."""
-        message = f"著者が登録されました: {event.name}"
-        try:
-            self._notifier.send(message=message)
-        except Exception:
-            self._logger.warning(
-                "著者作成通知の送信に失敗: name=%s",
-                event.name,
-                exc_info=True,
-            )
-            self._save_log(
-                event_type=EventType.AUTHOR_CREATED,
-                message=message,
-                status=NotificationStatus.FAILURE,
-                detail=(f"著者作成通知の送信に失敗しました: {event.name}"),
+    def execute(
+        self,
+        event: NotificationEvent,
+        retry_count: int = 0,
+    ) -> NotificationResult:
+        """イベントの種類に対応する通知ユースケースを実行する.
+
+        retry_count はこれまでに失敗した回数 (通知履歴に残す)。
+        """
+        if isinstance(event, BookCreated):
+            return self._book_created.execute(
+                event=event,
+                retry_count=retry_count,
             )
-            return NotificationProblem(
-                title="Notification Delivery Failed",
-                status=HTTPStatus.BAD_GATEWAY,
-                detail=(f"著者作成通知の送信に失敗しました: {event.name}"),
+        if isinstance(event, AuthorCreated):
+            return self._author_created.execute(
+                event=event,
+                retry_count=retry_count,
             )
-        self._logger.info(
-            "著者作成通知を送信しました: name=%s",
-            event.name,
-        )
-        self._save_log(
-            event_type=EventType.AUTHOR_CREATED,
-            message=message,
-            status=NotificationStatus.SUCCESS,
-            detail="",
+        return self._authors_bulk_created.execute(
+            event=event,
+            retry_count=retry_count,
         )
-        return NotificationSuccess(message=message)
 
-    def _save_log(
+    def execute_many(
         self,
-        *,
-        event_type: EventType,
-        message: str,
-        status: NotificationStatus,
-        detail: str,
-    ) -> None:
-        """通知履歴を保存する (失敗時はログ出力のみ)."""
-        try:
-            self._log_writer.save(
-                event_type=event_type,
-                message=message,
-                status=status,
-                detail=detail,
-                recipient=self._channel,
-                channel=self._channel,
-                retry_count=0,
-            )
-        except Exception:
-            self._logger.warning(
-                "通知履歴の保存に失敗: event_type=%s",
-                event_type,
-                exc_info=True,
-            )
+        events: Sequence[NotificationEvent],
+        retry_counts: Sequence[int],
+    ) -> list[NotificationResult]:
+        """events を送り、結果を同じ順で返す.
+
+        同じ種類のイベントが続く間は 1 回の send_many にまとめる。
+        """
+        results: list[NotificationResult] = []
+        for kind, group in itertools.groupby(
+            zip(events, retry_counts, strict=True),
+            key=lambda pair: type(pair[0]),
+        ):
+            run, counts = zip(*group, strict=True)
+            if kind is BookCreated:
+                results += self._book_created.execute_many(
+                    events=_of_kind(kind=BookCreated, events=run),
+                    retry_counts=counts,
+                )
+            elif kind is AuthorCreated:
+                results += self._author_created.execute_many(
+                    events=_of_kind(kind=AuthorCreated, events=run),
+                    retry_counts=counts,
+                )
+            else:
+                results += self._authors_bulk_created.execute_many(
+                    events=_of_kind(kind=AuthorsBulkCreated, events=run),
+                    retry_counts=counts,
+                )
+        return results
+
+
+def _of_kind[EventT: NotificationEvent](
+    *,
+    kind: type[EventT],
+    events: Sequence[NotificationEvent],
+) -> list[EventT]:
+    """events のうち kind のもの (型を絞るため)."""
+    return [event for event in events if isinstance(event, kind)]
@@ -1,9 +1,13 @@
+from collections.abc import Sequence
 from typing import Protocol
 from typing import runtime_checkable
 
+from notifications.domain.dispatch_stats import DispatchStats
 from notifications.domain.event_type import EventType
 from notifications.domain.events import AuthorCreated
+from notifications.domain.events import AuthorsBulkCreated
 from notifications.domain.events import BookCreated
+from notifications.domain.events import NotificationEvent
 from notifications.domain.notification_channel import NotificationChannel
 from notifications.domain.notification_log import NotificationLog
 from notifications.domain.notification_status import NotificationStatus
@@ -12,10 +16,23 @@ from notifications.domain.results import NotificationResult
 
 @runtime_checkable
 class Notifier(Protocol):
-    """通知送信のポート."""
+    """通知送信のポート.
+
+    send_many はまとめて送り (詰められるアダプタは詰める)、1 件ごとの
+    失敗 (届けば None) を同じ順で返す。
+    """
 
     def send(self, message: str) -> None: ...
 
+    def send_many(self, messages: Sequence[str]) -> list[Exception | None]: ...
+
+
+@runtime_checkable
+class DeliveryFailureClassifier(Protocol):
+    """送信の失敗が送り直せば届く見込みのあるものかを見分けるポート."""
+
+    def is_retryable(self, error: Exception) -> bool: ...
+
 
 @runtime_checkable
 class NotificationLogWriter(Protocol):
@@ -52,14 +69,83 @@ class NotificationLogReader(Protocol):
 class NotifyBookCreatedUseCase(Protocol):
     """本作成通知ユースケースのポート."""
 
-    def execute(self, event: BookCreated) -> NotificationResult: ...
+    def execute(
+        self,
+        event: BookCreated,
+        retry_count: int = 0,
+    ) -> NotificationResult: ...
+
+    def execute_many(
+        self,
+        events: Sequence[BookCreated],
+        retry_counts: Sequence[int],
+    ) -> list[NotificationResult]: ...
 
 
 @runtime_checkable
 class NotifyAuthorCreatedUseCase(Protocol):
     """著者作成通知ユースケースのポート."""
 
-    def execute(self, event: AuthorCreated) -> NotificationResult: ...
+    def execute(
+        self,
+        event: AuthorCreated,
+        retry_count: int = 0,
+    ) -> NotificationResult: ...
+
+    def execute_many(
+        self,
+        events: Sequence[AuthorCreated],
+        retry_counts: Sequence[int],
+    ) -> list[NotificationResult]: ...
+
+
+@runtime_checkable
+class NotifyAuthorsBulkCreatedUseCase(Protocol):
+    """著者一括作成通知ユースケースのポート."""
+
+    def execute(
+        self,
+        event: AuthorsBulkCreated,
+        retry_count: int = 0,
+    ) -> NotificationResult: ...
+
+    def execute_many(
+        self,
+        events: Sequence[AuthorsBulkCreated],
+        retry_counts: Sequence[int],
+    ) -> list[NotificationResult]: ...
+
+
+@runtime_checkable
+class DeliverNotificationUseCase(Protocol):
+    """通知イベントを種類に応じて配送するユースケースのポート.
+
+    execute_many は events をまとめて送り (retry_counts は 1 件ごとの
+    retry_count)、結果を同じ順で返す。
+    """
+
+    def execute(
+        self,
+        event: NotificationEvent,
+        retry_count: int = 0,
+    ) -> NotificationResult: ...
+
+    def execute_many(
+        self,
+        events: Sequence[NotificationEvent],
+        retry_counts: Sequence[int],
+    ) -> list[NotificationResult]: ...
+
+
+@runtime_checkable
+class NotificationDispatcher(Protocol):
+    """通知イベントを呼び出し元から切り離して配送するポート."""
+
+    def dispatch(self, event: NotificationEvent) -> None: ...
+
+    def stats(self) -> DispatchStats: ...
+
+    def shutdown(self, timeout: float | None = None) -> None: ...
 
 
 @runtime_checkable
@@ -1,6 +1,11 @@
+import gzip
+import json
+import logging
 from typing import Any
 
 import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from hypothesis import given
 from hypothesis import strategies as st
 from rest_framework import status
@@ -12,7 +17,9 @@ from authors.infrastructure.containers.author import AuthorModule
 from authors.infrastructure.containers.author import (
     container as author_container,
 )
+from authors.interfaces.serializers.author import AuthorSerializer
 from authors.models import Author
+from books.entities import Book
 from notifications.infrastructure.adapters.fake import FakeNotifier
 from notifications.infrastructure.containers.notificaton import (
     NotificationModule,
@@ -56,6 +63,163 @@ class TestAuthorListCreate:
         # Assert
         assert response.status_code == status.HTTP_400_BAD_REQUEST
 
+    @pytest.mark.parametrize(
+        ("page", "has_next"),
+        [(1, True), (2, False)],
+        ids=["first_page", "last_page"],
+    )
+    def test_happy_list_count_none_returns_has_next(
+        self,
+        api_client: APIClient,
+        db: Any,
+        page: int,
+        has_next: bool,
+    ) -> None:
+        """count=none では count の代わりに has_next を返すこと."""
+        # Arrange
+        for name in ["著者A", "著者B", "著者C"]:
+            Author.objects.create(name=name)
+
+        # Act
+        response = api_client.get(
+            f"{self.endpoint}?count=none&page_size=2&page={page}",
+        )
+
+        # Assert
+        assert response.status_code == status.HTTP_200_OK
+        assert "count" not in response.data
+        assert response.data["has_next"] is has_next
+        assert len(response.data["results"]) == (2 if has_next else 1)
+
+    def test_happy_list_count_estimate_returns_count(
+        self, api_client: APIClient, author: Author
+    ) -> None:
+        """count=estimate でも小さな表は厳密な件数を返すこと."""
+        # Act
+        response = api_client.get(f"{self.endpoint}?count=estimate")
+
+        # Assert
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["count"] == 1
+
+    def test_error_list_rejects_unknown_count_strategy(
+        self, api_client: APIClient, db: Any
+    ) -> None:
+        """異常系: 未知の count 指定は 400 になること."""
+        # Act
+        response = api_client.get(f"{self.endpoint}?count=approx")
+
+        # Assert
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_happy_list_by_cursor_walks_all_pages(
+        self, api_client: APIClient, db: Any
+    ) -> None:
+        """cursor モードで next を辿ると全件を name 順に一巡できること."""
+        # Arrange
+        for name in ["著者C", "著者A", "著者B"]:
+            Author.objects.create(name=name)
+
+        # Act
+        first = api_client.get(f"{self.endpoint}?cursor=&page_size=2")
+        second = api_client.get(first.data["next"])
+
+        # Assert
+        assert first.status_code == status.HTTP_200_OK
+        assert "count" not in first.data
+        assert first.data["has_next"] is True
+        assert first.data["previous"] is None
+        assert [r["name"] for r in first.data["results"]] == [
+            "著者A",
+            "著者B",
+        ]
+        assert [r["name"] for r in second.data["results"]] == ["著者C"]
+        assert second.data["next"] is None
+        assert second.data["previous"] is not None
+
+    def test_happy_list_by_cursor_counts_on_request(
+        self, api_client: APIClient, db: Any
+    ) -> None:
+        """cursor モードでも count を指定すれば総件数を返すこと."""
+        # Arrange
+        for name in ["著者A", "著者B", "著者C"]:
+            Author.objects.create(name=name)
+
+        # Act
+        response = api_client.get(
+            f"{self.endpoint}?cursor=&page_size=2&count=exact"
+        )
+
+        # Assert
+        assert response.data["count"] == 3
+        assert "has_next" not in response.data
+
+    def test_happy_list_by_cursor_previous_returns_prior_page(
+        self, api_client: APIClient, db: Any
+    ) -> None:
+        """previous リンクで直前のページに戻れること."""
+        # Arrange
+        for name in ["著者A", "著者B", "著者C"]:
+            Author.objects.create(name=name)
+        first = api_client.get(f"{self.endpoint}?cursor=&page_size=2")
+        second = api_client.get(first.data["next"])
+
+        # Act
+        back = api_client.get(second.data["previous"])
+
+        # Assert
+        assert [r["name"] for r in back.data["results"]] == [
+            "著者A",
+            "著者B",
+        ]
+        assert back.data["previous"] is None
+        assert back.data["next"] is not None
+
+    @pytest.mark.parametrize(
+        "cursor",
+        ["not-a-cursor", "eyJrIjoiYSIsInQiOiJ4In0"],
+        ids=["garbage", "non_uuid_tiebreaker"],
+    )
+    def test_error_list_rejects_invalid_cursor(
+        self, api_client: APIClient, db: Any, cursor: str
+    ) -> None:
+        """異常系: 不正な cursor は 400 になること (500 にしない)."""
+        # Act
+        response = api_client.get(f"{self.endpoint}?cursor={cursor}")
+
+        # Assert
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_happy_list_sparse_fields_skips_unrequested_columns(
+        self, api_client: APIClient, author: Author
+    ) -> None:
+        """fields 指定で応答が絞られ、bio 列を SELECT しないこと."""
+        # Act
+        with CaptureQueriesContext(connection) as queries:
+            response = api_client.get(f"{self.endpoint}?fields=id,name")
+
+        # Assert
+        assert response.status_code == status.HTTP_200_OK
+        assert set(response.data["results"][0]) == {"id", "name"}
+        selects = [
+            query["sql"]
+            for query in queries.captured_queries
+            if query["sql"].startswith("SELECT")
+            and "COUNT" not in query["sql"]
+        ]
+        assert selects
+        assert all('"bio"' not in sql for sql in selects)
+
+    def test_error_list_rejects_unknown_field(
+        self, api_client: APIClient, db: Any
+    ) -> None:
+        """異常系: 出力にない項目を fields に指定すると 400 になること."""
+        # Act
+        response = api_client.get(f"{self.endpoint}?fields=id,password")
+
+        # Assert
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
     def test_happy_create_author_with_bio(
         self, api_client: APIClient, db: Any
     ) -> None:
@@ -215,6 +379,79 @@ class TestAuthorListCreate:
         assert response.status_code == status.HTTP_400_BAD_REQUEST
 
 
+@pytest.mark.django_db
+class TestAuthorBulkCreate:
+    endpoint = "/api/v1/authors/bulk/"
+
+    # --- 正常系 ---
+
+    def test_happy_bulk_create_returns_results_in_order(
+        self,
+        api_client: APIClient,
+        db: Any,
+        fake_notifier: FakeNotifier,
+    ) -> None:
+        """全件を作成し、入力順の結果と集約通知 1 通を返すこと."""
+        # Arrange
+        payload = [
+            {"name": "太宰治", "bio": "走れメロスの著者"},
+            {"name": "芥川龍之介"},
+            {"name": "樋口一葉"},
+        ]
+
+        # Act
+        response = api_client.post(self.endpoint, payload, format="json")
+
+        # Assert
+        assert response.status_code == status.HTTP_201_CREATED
+        assert response.data["count"] == 3
+        names = [r["name"] for r in response.data["results"]]
+        assert names == ["太宰治", "芥川龍之介", "樋口一葉"]
+        assert Author.objects.count() == 3
+        (msg,) = fake_notifier.messages
+        assert "3件" in msg
+
+    # --- 異常系 ---
+
+    def test_error_bulk_create_is_all_or_nothing(
+        self,
+        api_client: APIClient,
+        db: Any,
+        fake_notifier: FakeNotifier,
+    ) -> None:
+        """異常系: 1 件でも不正なら何も作らず要素ごとのエラーを返すこと."""
+        # Arrange
+        payload = [{"name": "太宰治"}, {"bio": "名前なし"}]
+
+        # Act
+        response = api_client.post(self.endpoint, payload, format="json")
+
+        # Assert
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.data[1]["name"][0].code == "required"
+        assert Author.objects.count() == 0
+        assert fake_notifier.messages == ()
+
+    @pytest.mark.parametrize(
+        "payload",
+        [[], {"name": "太宰治"}],
+        ids=["empty", "not_a_list"],
+    )
+    def test_error_bulk_create_rejects_non_list_or_empty(
+        self,
+        api_client: APIClient,
+        db: Any,
+        payload: Any,
+    ) -> None:
+        """異常系: 空配列や配列でない入力は 400 になること."""
+        # Act
+        response = api_client.post(self.endpoint, payload, format="json")
+
+        # Assert
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert Author.objects.count() == 0
+
+
 @pytest.mark.django_db
 class TestAuthorRetrieveUpdateDelete:
     endpoint = "/api/v1/authors/"
@@ -232,6 +469,19 @@ class TestAuthorRetrieveUpdateDelete:
         assert response.data["name"] == "夏目漱石"
         assert response.data["id"] == str(author.pk)
 
+    def test_happy_retrieve_sparse_fields(
+        self, api_client: APIClient, author: Author
+    ) -> None:
+        """単一取得でも fields 指定の項目だけを返すこと."""
+        # Act
+        response = api_client.get(
+            f"{self.endpoint}{author.pk}/?fields=name,bio",
+        )
+
+        # Assert
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data == {"name": "夏目漱石", "bio": "日本の小説家"}
+
     def test_happy_put_updates_author(
         self, api_client: APIClient, author: Author
     ) -> None:
@@ -275,6 +525,34 @@ class TestAuthorRetrieveUpdateDelete:
         assert response.status_code == status.HTTP_204_NO_CONTENT
         assert Author.objects.count() == 0
 
+    def test_happy_delete_cascades_books_in_one_query(
+        self, api_client: APIClient, book: Book
+    ) -> None:
+        """書籍の連鎖削除を DB に任せ、1 文で削除すること."""
+        # Act
+        with CaptureQueriesContext(connection) as queries:
+            response = api_client.delete(f"{self.endpoint}{book.author_id}/")
+
+        # Assert
+        assert response.status_code == status.HTTP_204_NO_CONTENT
+        assert len(queries) == 1
+        assert "RETURNING" in queries[0]["sql"]
+        assert not Book.objects.exists()
+
+    def test_happy_delete_reports_rows_including_books(
+        self,
+        api_client: APIClient,
+        book: Book,
+        caplog: pytest.LogCaptureFixture,
+    ) -> None:
+        """削除行数に連鎖で消えた書籍が含まれること."""
+        # Act
+        with caplog.at_level(logging.INFO, logger="authors"):
+            api_client.delete(f"{self.endpoint}{book.author_id}/")
+
+        # Assert
+        assert f"id={book.author_id} rows=2" in caplog.text
+
     # --- 異常系 ---
 
     @pytest.mark.parametrize(
@@ -324,6 +602,268 @@ class TestAuthorRetrieveUpdateDelete:
         assert "name" in response.data
 
 
+@pytest.mark.django_db
+class TestAuthorConditionalGet:
+    """ETag / If-None-Match による条件付き GET の検証."""
+
+    endpoint = "/api/v1/authors/"
+
+    # --- 正常系 ---
+
+    def test_happy_retrieve_returns_304_for_matching_etag(
+        self, api_client: APIClient, author: Author
+    ) -> None:
+        # Arrange
+        url = f"{self.endpoint}{author.pk}/"
+        etag = api_client.get(url)["ETag"]
+
+        # Act
+        response = api_client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        # Assert
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+        assert response["ETag"] == etag
+        assert not response.content
+
+    def test_happy_retrieve_accepts_weak_and_listed_etags(
+        self, api_client: APIClient, author: Author
+    ) -> None:
+        # Arrange
+        url = f"{self.endpoint}{author.pk}/"
+        etag = api_client.get(url)["ETag"]
+
+        # Act
+        response = api_client.get(
+            url,
+            HTTP_IF_NONE_MATCH=f'"other", W/{etag}',
+        )
+
+        # Assert
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+    def test_happy_retrieve_etag_changes_after_update(
+        self, api_client: APIClient, author: Author
+    ) -> None:
+        # Arrange
+        url = f"{self.endpoint}{author.pk}/"
+        etag = api_client.get(url)["ETag"]
+        api_client.patch(url, {"bio": "更新済み"}, format="json")
+
+        # Act
+        response = api_client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        # Assert
+        assert response.status_code == status.HTTP_200_OK
+        assert response["ETag"] != etag
+        assert response.data["bio"] == "更新済み"
+
+    def test_happy_retrieve_etag_depends_on_fields(
+        self, api_client: APIClient, author: Author
+    ) -> None:
+        """表現が異なる fields 指定では ETag も異なること."""
+        # Arrange
+        url = f"{self.endpoint}{author.pk}/"
+
+        # Act
+        full = api_client.get(url)
+        sparse = api_client.get(f"{url}?fields=name")
+
+        # Assert
+        assert full["ETag"] != sparse["ETag"]
+
+    def test_happy_list_returns_304_until_page_changes(
+        self, api_client: APIClient, author: Author
+    ) -> None:
+        # Arrange
+        etag = api_client.get(self.endpoint)["ETag"]
+
+        # Act
+        unchanged = api_client.get(self.endpoint, HTTP_IF_NONE_MATCH=etag)
+        Author.objects.create(name="森鴎外")
+        changed = api_client.get(self.endpoint, HTTP_IF_NONE_MATCH=etag)
+
+        # Assert
+        assert unchanged.status_code == status.HTTP_304_NOT_MODIFIED
+        assert changed.status_code == status.HTTP_200_OK
+        assert changed.data["count"] == 2
+
+    def test_happy_list_by_cursor_returns_304_for_matching_etag(
+        self, api_client: APIClient, author: Author
+    ) -> None:
+        # Arrange
+        url = f"{self.endpoint}?cursor="
+        etag = api_client.get(url)["ETag"]
+
+        # Act
+        response = api_client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        # Assert
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+    def test_happy_304_skips_serialization(
+        self,
+        api_client: APIClient,
+        author: Author,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        """304 応答ではシリアライザを一切呼ばないこと."""
+        # Arrange
+        url = f"{self.endpoint}{author.pk}/"
+        etag = api_client.get(url)["ETag"]
+        monkeypatch.setattr(
+            AuthorSerializer,
+            "to_representation",
+            _fail_if_called,
+        )
+
+        # Act
+        response = api_client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        # Assert
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+
+@pytest.mark.django_db
+class TestAuthorConditionalUpdate:
+    """If-Match による楽観的排他制御付き更新の検証."""
+
+    endpoint = "/api/v1/authors/"
+
+    # --- 正常系 ---
+
+    def test_happy_put_with_current_etag_updates_in_one_query(
+        self, api_client: APIClient, author: Author
+    ) -> None:
+        # Arrange
+        url = f"{self.endpoint}{author.pk}/"
+        etag = api_client.get(url)["ETag"]
+        payload = {"name": "夏目漱石", "bio": "更新済み"}
+
+        # Act
+        with CaptureQueriesContext(connection) as queries:
+            response = api_client.put(
+                url, payload, format="json", HTTP_IF_MATCH=etag
+            )
+
+        # Assert
+        assert response.status_code == status.HTTP_200_OK
+        assert len(queries) == 1
+        assert "RETURNING" in queries[0]["sql"]
+        assert response["ETag"] != etag
+        author.refresh_from_db()
+        assert (author.bio, author.version) == ("更新済み", 2)
+
+    def test_happy_response_etag_matches_next_get(
+        self, api_client: APIClient, author: Author
+    ) -> None:
+        # Arrange
+        url = f"{self.endpoint}{author.pk}/"
+
+        # Act
+        response = api_client.patch(url, {"bio": "一"}, format="json")
+
+        # Assert
+        assert response["ETag"] == api_client.get(url)["ETag"]
+
+    # --- 異常系 ---
+
+    def test_error_stale_etag_returns_412(
+        self, api_client: APIClient, author: Author
+    ) -> None:
+        # Arrange
+        url = f"{self.endpoint}{author.pk}/"
+        stale = api_client.get(url)["ETag"]
+        api_client.patch(url, {"bio": "他者の更新"}, format="json")
+
+        # Act
+        response = api_client.patch(
+            url, {"bio": "上書き"}, format="json", HTTP_IF_MATCH=stale
+        )
+
+        # Assert
+        assert response.status_code == status.HTTP_412_PRECONDITION_FAILED
+        author.refresh_from_db()
+        assert author.bio == "他者の更新"
+
+    def test_error_sparse_etag_does_not_match(
+        self, api_client: APIClient, author: Author
+    ) -> None:
+        """fields 指定の表現の ETag は If-Match に使えないこと."""
+        # Arrange
+        url = f"{self.endpoint}{author.pk}/"
+        sparse = api_client.get(f"{url}?fields=name")["ETag"]
+
+        # Act
+        response = api_client.patch(
+            url, {"bio": "上書き"}, format="json", HTTP_IF_MATCH=sparse
+        )
+
+        # Assert
+        assert response.status_code == status.HTTP_412_PRECONDITION_FAILED
+
+    def test_error_if_match_on_missing_author_returns_404(
+        self, api_client: APIClient, author: Author
+    ) -> None:
+        # Arrange
+        etag = api_client.get(f"{self.endpoint}{author.pk}/")["ETag"]
+        author.delete()
+
+        # Act
+        response = api_client.patch(
+            f"{self.endpoint}{author.pk}/",
+            {"bio": "幽霊"},
+            format="json",
+            HTTP_IF_MATCH=etag,
+        )
+
+        # Assert
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+@pytest.mark.django_db
+class TestAuthorExport:
+    endpoint = "/api/v1/authors/export/"
+
+    # --- 正常系 ---
+
+    def test_happy_streams_all_authors_as_ndjson(
+        self, api_client: APIClient, db: Any
+    ) -> None:
+        # Arrange
+        Author.objects.bulk_create(
+            [Author(name=f"著者{index:03}") for index in range(25)]
+        )
+
+        # Act
+        response = api_client.get(self.endpoint)
+
+        # Assert
+        assert response.status_code == status.HTTP_200_OK
+        assert response["Content-Type"] == "application/x-ndjson"
+        assert "Accept-Encoding" in response["Vary"]
+        lines = b"".join(response.streaming_content).splitlines()
+        names = sorted(json.loads(line)["name"] for line in lines)
+        assert names == [f"著者{index:03}" for index in range(25)]
+
+    def test_happy_gzip_when_accepted(
+        self, api_client: APIClient, author: Author
+    ) -> None:
+        # Act
+        response = api_client.get(self.endpoint, HTTP_ACCEPT_ENCODING="gzip")
+
+        # Assert
+        assert response["Content-Encoding"] == "gzip"
+        body = gzip.decompress(b"".join(response.streaming_content))
+        assert json.loads(body)["id"] == str(author.pk)
+
+
+def _fail_if_called(
+    *args: Any,
+    **kwargs: Any,
+) -> Any:
+    pytest.fail("304 応答でシリアライズが行われた")
+
+
 @pytest.mark.django_db
 class TestAuthorDependencyInjection:
     """DI で著者リポジトリを差し替えられることの検証."""
@@ -0,0 +1,31 @@
+"""著者キャッシュの状態 API の機能テスト."""
+
+import http
+
+from rest_framework.test import APIClient
+
+from authors.models import Author
+
+
+class TestAuthorCacheStatsAPI:
+    """著者キャッシュの状態 API のテスト."""
+
+    def test_happy_reports_hits_and_misses(
+        self,
+        api_client: APIClient,
+        db: object,
+    ) -> None:
+        """単一取得の命中数と読みに行った回数が返ること."""
+        # Arrange
+        author = Author.objects.create(name="夏目漱石")
+        for _ in range(3):
+            api_client.get(f"/api/v1/authors/{author.id}/")
+
+        # Act
+        response = api_client.get("/api/v1/authors/cache/")
+
+        # Assert
+        assert response.status_code == http.HTTPStatus.OK
+        assert response.data["misses"] == 1
+        assert response.data["local_hits"] == 2
+        assert response.data["hit_ratio"] == 2 / 3
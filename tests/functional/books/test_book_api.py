@@ -1,7 +1,12 @@
+import datetime
+import gzip
+import json
 from typing import Any
 
 import pytest
 from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from hypothesis import HealthCheck
 from hypothesis import given
 from hypothesis import settings
@@ -34,18 +39,123 @@ class TestBookListCreate:
         assert response.status_code == status.HTTP_200_OK
         assert response.data["count"] == 0
 
-    def test_happy_list_returns_nested_author(
+    def test_happy_list_returns_author_id_without_join(
         self, api_client: APIClient, book: Book
     ) -> None:
+        """既定では author は id のままで、authors を JOIN しないこと."""
         # Act
-        response = api_client.get(self.endpoint)
+        with CaptureQueriesContext(connection) as queries:
+            response = api_client.get(self.endpoint)
 
         # Assert
         assert response.status_code == status.HTTP_200_OK
         assert response.data["count"] == 1
         result = response.data["results"][0]
-        assert isinstance(result["author"], dict)
-        assert "name" in result["author"]
+        assert result["author"] == book.author_id
+        assert "included" not in response.data
+        assert all(
+            "authors_author" not in query["sql"]
+            for query in queries.captured_queries
+        )
+
+    def test_happy_list_expand_author_includes_each_author_once(
+        self, api_client: APIClient, author: Author
+    ) -> None:
+        """?expand=author でページ内の著者を included に 1 回ずつ載せること."""
+        # Arrange
+        other = Author.objects.create(name="森鷗外")
+        for index, owner in enumerate([author, author, other]):
+            Book.objects.create(
+                title=f"本{index}",
+                isbn=f"978400310200{index}",
+                published_date=datetime.date(1900 + index, 1, 1),
+                author=owner,
+            )
+
+        # Act
+        with CaptureQueriesContext(connection) as queries:
+            response = api_client.get(f"{self.endpoint}?expand=author")
+
+        # Assert
+        assert response.status_code == status.HTTP_200_OK
+        authors = response.data["included"]["authors"]
+        assert set(authors) == {str(author.pk), str(other.pk)}
+        assert authors[str(author.pk)]["name"] == "夏目漱石"
+        results = response.data["results"]
+        assert {r["author"] for r in results} == {author.pk, other.pk}
+        # count + 書籍 + 著者 (重複なしの 1 回) の 3 クエリ。
+        assert len(queries.captured_queries) == 3
+
+    def test_happy_list_expand_author_with_cursor(
+        self, api_client: APIClient, book: Book
+    ) -> None:
+        # Act
+        response = api_client.get(f"{self.endpoint}?cursor=&expand=author")
+
+        # Assert
+        assert response.status_code == status.HTTP_200_OK
+        assert list(response.data["included"]["authors"]) == [
+            str(book.author_id)
+        ]
+
+    def test_happy_list_by_cursor_returns_next_link(
+        self, api_client: APIClient, author: Author
+    ) -> None:
+        """cursor モードで next を辿ると出版日の降順に一巡できること."""
+        # Arrange
+        for index in range(3):
+            Book.objects.create(
+                title=f"本{index}",
+                isbn=f"978400310100{index}",
+                published_date=datetime.date(1900 + index, 1, 1),
+                author=author,
+            )
+
+        # Act
+        first = api_client.get(f"{self.endpoint}?cursor=&page_size=2")
+        second = api_client.get(first.data["next"])
+
+        # Assert
+        assert first.status_code == status.HTTP_200_OK
+        titles = [r["title"] for r in first.data["results"]]
+        titles += [r["title"] for r in second.data["results"]]
+        assert titles == ["本2", "本1", "本0"]
+        assert second.data["next"] is None
+        assert second.data["previous"] is not None
+
+    def test_happy_cursor_walks_books_sharing_a_date(
+        self, api_client: APIClient, author: Author
+    ) -> None:
+        """同じ出版日の本が続いても (出版日, id) の位置で漏れなく進むこと."""
+        # Arrange
+        for index in range(5):
+            Book.objects.create(
+                title=f"本{index}",
+                isbn=f"978400310100{index}",
+                published_date=datetime.date(1905, 1, 1),
+                author=author,
+            )
+
+        # Act
+        pages = [api_client.get(f"{self.endpoint}?cursor=&page_size=2")]
+        while pages[-1].data["next"] is not None:
+            pages.append(api_client.get(pages[-1].data["next"]))
+        back = api_client.get(pages[-1].data["previous"])
+
+        # Assert
+        titles = [r["title"] for page in pages for r in page.data["results"]]
+        assert titles == ["本4", "本3", "本2", "本1", "本0"]
+        assert [r["title"] for r in back.data["results"]] == ["本2", "本1"]
+        assert "count" not in pages[0].data
+
+    def test_error_list_rejects_invalid_cursor(
+        self, api_client: APIClient, db: Any
+    ) -> None:
+        # Act
+        response = api_client.get(f"{self.endpoint}?cursor=not-a-cursor")
+
+        # Assert
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
 
     def test_happy_create_book(
         self,
@@ -200,6 +310,74 @@ class TestBookListCreate:
         assert response.status_code == status.HTTP_201_CREATED
         assert response.data["cover_image"]
 
+    def test_happy_create_shares_cover_with_same_content(
+        self,
+        api_client: APIClient,
+        author: Author,
+        test_image: SimpleUploadedFile,
+    ) -> None:
+        """同じ内容の表紙は別の書籍でも同じキーを指すこと."""
+        # Arrange
+        content = test_image.read()
+        names = []
+
+        # Act
+        for isbn in ("9784003101032", "9784003101049"):
+            response = api_client.post(
+                self.endpoint,
+                {
+                    "title": "坊っちゃん",
+                    "isbn": isbn,
+                    "published_date": "1906-04-01",
+                    "author": author.pk,
+                    "cover_image": SimpleUploadedFile(
+                        name="cover.png",
+                        content=content,
+                        content_type="image/png",
+                    ),
+                },
+                format="multipart",
+            )
+            names.append(Book.objects.get(pk=response.data["id"]).cover_image)
+
+        # Assert
+        assert names[0].name == names[1].name
+        assert names[0].name.startswith("books/covers/")
+
+    def test_happy_create_generates_cover_thumbnails(
+        self,
+        api_client: APIClient,
+        author: Author,
+        test_image: SimpleUploadedFile,
+        settings: Any,
+        django_capture_on_commit_callbacks: Any,
+    ) -> None:
+        """コミット後に派生画像が作られ、cover_thumbnails に出ること."""
+        # Arrange
+        settings.COVER_THUMBNAIL_WORKERS = 0
+        payload = {
+            "title": "坊っちゃん",
+            "isbn": "9784003101032",
+            "published_date": "1906-04-01",
+            "author": author.pk,
+            "cover_image": test_image,
+        }
+
+        # Act
+        with django_capture_on_commit_callbacks(execute=True):
+            created = api_client.post(
+                self.endpoint,
+                payload,
+                format="multipart",
+            )
+        response = api_client.get(f"{self.endpoint}{created.data['id']}/")
+
+        # Assert
+        assert created.data["cover_thumbnails"] is None
+        thumbnails = response.data["cover_thumbnails"]
+        assert set(thumbnails) == {"480", "240", "120"}
+        assert thumbnails["120"]["webp"].endswith("/120.webp")
+
     def test_happy_create_book_without_cover_image(
         self,
         api_client: APIClient,
@@ -224,6 +402,7 @@ class TestBookListCreate:
         # Assert
         assert response.status_code == status.HTTP_201_CREATED
         assert not response.data["cover_image"]
+        assert response.data["cover_thumbnails"] is None
 
     # --- 異常系 ---
 
@@ -384,6 +563,15 @@ class TestBookListCreate:
         assert response.status_code == status.HTTP_400_BAD_REQUEST
         assert "author" in response.data
 
+    def test_error_list_rejects_unknown_expand(
+        self, api_client: APIClient, db: Any
+    ) -> None:
+        # Act
+        response = api_client.get(f"{self.endpoint}?expand=author,reviews")
+
+        # Assert
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
 
 @pytest.mark.django_db
 class TestBookRetrieveUpdateDelete:
@@ -391,7 +579,7 @@ class TestBookRetrieveUpdateDelete:
 
     # --- 正常系 ---
 
-    def test_happy_retrieve_returns_book_with_author(
+    def test_happy_retrieve_returns_book_with_author_id(
         self, api_client: APIClient, book: Book
     ) -> None:
         # Act
@@ -400,7 +588,17 @@ class TestBookRetrieveUpdateDelete:
         # Assert
         assert response.status_code == status.HTTP_200_OK
         assert response.data["title"] == "吾輩は猫である"
-        assert isinstance(response.data["author"], dict)
+        assert response.data["author"] == book.author_id
+
+    def test_happy_retrieve_expand_author_nests_author(
+        self, api_client: APIClient, book: Book
+    ) -> None:
+        # Act
+        response = api_client.get(f"{self.endpoint}{book.pk}/?expand=author")
+
+        # Assert
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["author"]["name"] == "夏目漱石"
 
     def test_happy_put_updates_book(
         self, api_client: APIClient, book: Book
@@ -528,3 +726,195 @@ class TestBookRetrieveUpdateDelete:
         # Assert
         assert response.status_code == (status.HTTP_400_BAD_REQUEST)
         assert "title" in response.data
+
+
+@pytest.mark.django_db
+class TestBookListFilters:
+    endpoint = "/api/v1/books/"
+
+    @pytest.fixture(autouse=True)
+    def _books(self, author: Author) -> list[Book]:
+        other = Author.objects.create(name="森鷗外")
+        rows = [
+            ("吾輩は猫である", "9784003101018", 1905, author),
+            ("坊っちゃん", "9784003101025", 1906, author),
+            ("舞姫", "9784003100615", 1890, other),
+        ]
+        return [
+            Book.objects.create(
+                title=title,
+                isbn=isbn,
+                published_date=datetime.date(year, 1, 1),
+                author=owner,
+            )
+            for title, isbn, year, owner in rows
+        ]
+
+    def _titles(self, query: str) -> list[str]:
+        response = APIClient().get(f"{self.endpoint}?{query}")
+        assert response.status_code == status.HTTP_200_OK
+        return [r["title"] for r in response.data["results"]]
+
+    # --- 正常系 ---
+
+    def test_happy_default_sort_is_newest_first(self) -> None:
+        # Act & Assert
+        assert self._titles("") == ["坊っちゃん", "吾輩は猫である", "舞姫"]
+
+    def test_happy_filter_by_author(self, author: Author) -> None:
+        # Act & Assert
+        assert self._titles(f"author={author.pk}") == [
+            "坊っちゃん",
+            "吾輩は猫である",
+        ]
+
+    def test_happy_filter_by_published_date_range(self) -> None:
+        """範囲は両端を含むこと."""
+        # Act & Assert
+        assert self._titles(
+            "published_from=1890-01-01&published_to=1905-01-01"
+        ) == ["吾輩は猫である", "舞姫"]
+
+    def test_happy_filter_by_exact_isbn(self) -> None:
+        # Act & Assert
+        assert self._titles("isbn=9784003100615") == ["舞姫"]
+
+    def test_happy_filter_by_title_prefix(self) -> None:
+        # Act & Assert
+        assert self._titles("title=吾輩") == ["吾輩は猫である"]
+        assert self._titles("title=猫") == []
+
+    def test_happy_sort_by_published_date_ascending(self) -> None:
+        # Act & Assert
+        assert self._titles("sort=published_date") == [
+            "舞姫",
+            "吾輩は猫である",
+            "坊っちゃん",
+        ]
+
+    def test_happy_cursor_follows_requested_sort(self) -> None:
+        """cursor モードでも ?sort= の順で次ページへ進むこと."""
+        # Arrange
+        client = APIClient()
+
+        # Act
+        first = client.get(
+            f"{self.endpoint}?cursor=&sort=published_date&page_size=2"
+        )
+        second = client.get(first.data["next"])
+
+        # Assert
+        titles = [r["title"] for r in first.data["results"]]
+        titles += [r["title"] for r in second.data["results"]]
+        assert titles == ["舞姫", "吾輩は猫である", "坊っちゃん"]
+
+    # --- 異常系 ---
+
+    @pytest.mark.parametrize(
+        "query",
+        [
+            "sort=isbn",
+            "author=not-a-uuid",
+            "published_from=1906-01-01&published_to=1905-01-01",
+            "isbn=97840031010180",
+            "title=吾輩&sort=-published_date",
+            "published_from=1890-01-01&sort=title",
+            "isbn=9784003100615&title=舞姫",
+        ],
+        ids=[
+            "unknown-sort",
+            "bad-author",
+            "reversed-range",
+            "long-isbn",
+            "title-prefix-by-date",
+            "range-by-title",
+            "isbn-with-filter",
+        ],
+    )
+    def test_error_rejects_invalid_query(
+        self, api_client: APIClient, db: Any, query: str
+    ) -> None:
+        # Act
+        response = api_client.get(f"{self.endpoint}?{query}")
+
+        # Assert
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+@pytest.mark.django_db
+class TestBookLookup:
+    endpoint = "/api/v1/books/lookup/"
+
+    # --- 正常系 ---
+
+    def test_happy_returns_found_and_missing_in_one_query(
+        self, api_client: APIClient, book: Book
+    ) -> None:
+        """指定順 (重複なし) で返し、無い ISBN を missing に入れること."""
+        # Arrange
+        payload = {"isbns": ["0000000000000", book.isbn, book.isbn]}
+
+        # Act
+        with CaptureQueriesContext(connection) as queries:
+            response = api_client.post(self.endpoint, payload, format="json")
+
+        # Assert
+        assert response.status_code == status.HTTP_200_OK
+        assert [r["isbn"] for r in response.data["results"]] == [book.isbn]
+        assert response.data["missing"] == ["0000000000000"]
+        assert len(queries.captured_queries) == 1
+        assert "IN" in queries.captured_queries[0]["sql"]
+
+    # --- 異常系 ---
+
+    @pytest.mark.parametrize(
+        "isbns",
+        [[], ["9784003101018"] * 1001, ["97840031010180"]],
+        ids=["empty", "too-many", "too-long"],
+    )
+    def test_error_rejects_invalid_list(
+        self, api_client: APIClient, db: Any, isbns: list[str]
+    ) -> None:
+        # Act
+        response = api_client.post(
+            self.endpoint, {"isbns": isbns}, format="json"
+        )
+
+        # Assert
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+@pytest.mark.django_db
+class TestBookExport:
+    endpoint = "/api/v1/books/export/"
+
+    # --- 正常系 ---
+
+    def test_happy_streams_ndjson_with_author_id(
+        self, api_client: APIClient, book: Book
+    ) -> None:
+        # Act
+        response = api_client.get(self.endpoint)
+
+        # Assert
+        assert response.status_code == status.HTTP_200_OK
+        assert response.streaming
+        assert response["Content-Type"] == "application/x-ndjson"
+        lines = b"".join(response.streaming_content).splitlines()
+        rows = [json.loads(line) for line in lines]
+        assert [row["isbn"] for row in rows] == [book.isbn]
+        assert rows[0]["author"] == str(book.author_id)
+
+    def test_happy_gzip_when_accepted(
+        self, api_client: APIClient, book: Book
+    ) -> None:
+        # Act
+        response = api_client.get(
+            self.endpoint,
+            HTTP_ACCEPT_ENCODING="gzip, deflate",
+        )
+
+        # Assert
+        assert response["Content-Encoding"] == "gzip"
+        body = gzip.decompress(b"".join(response.streaming_content))
+        assert json.loads(body)["title"] == book.title
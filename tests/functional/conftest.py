@@ -9,11 +9,17 @@ from io import BytesIO
 from typing import Any
 
 import pytest
+from django.core.cache import cache
 from django.core.files.uploadedfile import SimpleUploadedFile
 from PIL import Image
 from rest_framework.test import APIClient
 
+from authors.infrastructure.containers.author import (
+    container as author_container,
+)
+from authors.interfaces.repositories.cached import CachedAuthorRepository
 from authors.models import Author
+from authors.usecases.protocols import AuthorRepository
 from books.entities import Book
 from notifications.infrastructure.adapters.fake import (
     FakeNotificationLogReader,
@@ -63,9 +69,23 @@ def _memory_storage(settings: Any) -> None:
     }
 
 
+@pytest.fixture(autouse=True)
+def _fresh_caches() -> Generator[None]:
+    """テスト間で読み取りキャッシュを持ち越さない (DB は毎回戻るため)."""
+    yield
+    cache.clear()
+    repository = author_container.injector.get(
+        AuthorRepository,  # type: ignore[type-abstract]
+    )
+    if isinstance(repository, CachedAuthorRepository):
+        repository.clear()
+
+
 @pytest.fixture
-def fake_notifier() -> Generator[FakeNotifier]:
-    """テスト用の FakeNotifier を DI に差し込む."""
+def fake_notifier(settings: Any) -> Generator[FakeNotifier]:
+    """テスト用の FakeNotifier を DI に差し込む (通知は同期で配る)."""
+    settings.NOTIFICATION_DISPATCHER = "thread"
+    settings.NOTIFICATION_DISPATCH_WORKERS = 0
     notifier = FakeNotifier()
     container.override(
         NotificationModule(
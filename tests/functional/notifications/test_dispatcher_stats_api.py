@@ -0,0 +1,37 @@
+"""通知キューの状態 API の機能テスト."""
+
+import http
+
+from rest_framework.test import APIClient
+
+from authors.models import Author
+from notifications.infrastructure.adapters.fake import FakeNotifier
+
+
+class TestNotificationDispatcherStatsAPI:
+    """通知キューの状態 API のテスト."""
+
+    def test_happy_reports_delivered_events(
+        self,
+        api_client: APIClient,
+        fake_notifier: FakeNotifier,
+        db: object,
+    ) -> None:
+        """作成 API が積んだ通知の件数とキューの深さが返ること."""
+        # Arrange
+        api_client.post(
+            "/api/v1/authors/",
+            {"name": "夏目漱石"},
+            format="json",
+        )
+
+        # Act
+        response = api_client.get("/api/v1/notifications/dispatcher/")
+
+        # Assert
+        assert response.status_code == http.HTTPStatus.OK
+        assert Author.objects.count() == 1
+        assert response.data["depth"] == 0
+        assert response.data["delivered"] == 1
+        assert response.data["overflow"] == "spill"
+        assert len(fake_notifier.messages) == 1
@@ -0,0 +1,81 @@
+"""books 結合テストのフィクスチャ."""
+
+from collections.abc import Generator
+from typing import Any
+
+import boto3
+import pytest
+from elasticsearch import Elasticsearch
+from moto import mock_aws
+
+from books import search
+
+
+@pytest.fixture
+def s3_client(settings: Any) -> Any:
+    """moto で S3 をモックし、表紙用のバケットを用意する."""
+    with mock_aws():
+        settings.S3_ENDPOINT_URL = None
+        settings.S3_ACCESS_KEY = "testing"
+        settings.S3_SECRET_KEY = "testing"
+        settings.S3_BUCKET_NAME = "test-media"
+        client = boto3.client(
+            "s3",
+            region_name="us-east-1",
+            aws_access_key_id="testing",
+            aws_secret_access_key="testing",
+        )
+        client.create_bucket(Bucket=settings.S3_BUCKET_NAME)
+        yield client
+
+
+@pytest.fixture
+def s3_storage(
+    s3_client: Any,
+    settings: Any,
+) -> Any:
+    """既定ストレージを moto 上の S3Storage にする."""
+    settings.STORAGES = {
+        **settings.STORAGES,
+        "default": {
+            "BACKEND": "storages.backends.s3.S3Storage",
+            "OPTIONS": {
+                "bucket_name": settings.S3_BUCKET_NAME,
+                "region_name": "us-east-1",
+                "access_key": "testing",
+                "secret_key": "testing",
+                "file_overwrite": False,
+            },
+        },
+    }
+    settings.COVER_THUMBNAIL_WORKERS = 0
+    return s3_client
+
+
+def _drop_book_indices(client: Elasticsearch) -> None:
+    # ワイルドカードでの削除は既定で禁止されているため名前で消す。
+    names = client.indices.get(
+        index=f"{search.BOOK_INDEX}-*",
+        allow_no_indices=True,
+    )
+    for name in names:
+        client.indices.delete(index=name)
+
+
+@pytest.fixture
+def search_index(settings: Any) -> Generator[Elasticsearch]:
+    """books の検索インデックスを空にし、差分の反映を有効にする."""
+    settings.BOOK_SEARCH_ENABLED = True
+    client = search.search_client()
+    if not client.ping():
+        msg = (
+            f"Elasticsearch ({settings.ELASTICSEARCH_URL}) に接続できません。"
+            " docker compose up -d elasticsearch"
+            " を実行してください。"
+        )
+        raise ConnectionError(msg)
+    _drop_book_indices(client)
+    search._ensure_index.cache_clear()
+    yield client
+    _drop_book_indices(client)
+    search._ensure_index.cache_clear()
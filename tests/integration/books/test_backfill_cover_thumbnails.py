@@ -0,0 +1,105 @@
+import datetime
+from io import BytesIO
+from typing import Any
+
+import pytest
+from django.core.management import call_command
+from PIL import Image
+
+from authors.models import Author
+from books.entities import Book
+from books.thumbnails import thumbnail_keys
+
+
+def _book_with_cover(
+    client: Any,
+    *,
+    bucket: str,
+) -> Book:
+    buf = BytesIO()
+    Image.new("RGB", (1200, 800), color="blue").save(buf, format="JPEG")
+    key = "books/covers/neko.jpg"
+    client.put_object(Bucket=bucket, Key=key, Body=buf.getvalue())
+    return Book.objects.create(
+        title="吾輩は猫である",
+        isbn="9784003101018",
+        published_date=datetime.date(1905, 1, 1),
+        author=Author.objects.create(name="夏目漱石"),
+        cover_image=key,
+    )
+
+
+@pytest.mark.django_db
+class TestBackfillCoverThumbnails:
+    def test_happy_generates_missing_thumbnails(
+        self,
+        s3_storage: Any,
+        settings: Any,
+    ) -> None:
+        # Arrange
+        bucket = settings.S3_BUCKET_NAME
+        book = _book_with_cover(s3_storage, bucket=bucket)
+        Book.objects.create(
+            title="坊っちゃん",
+            isbn="9784003101025",
+            published_date=datetime.date(1906, 1, 1),
+            author=book.author,
+        )
+
+        # Act
+        call_command("backfill_cover_thumbnails")
+
+        # Assert
+        book.refresh_from_db()
+        assert book.cover_thumbnails_source == "books/covers/neko.jpg"
+        listed = s3_storage.list_objects_v2(
+            Bucket=bucket,
+            Prefix="books/thumbnails/",
+        )
+        keys = {obj["Key"] for obj in listed["Contents"]}
+        assert keys == set(thumbnail_keys(cover_name=book.cover_image.name))
+
+    def test_happy_force_overwrites_fixed_keys(
+        self,
+        s3_storage: Any,
+        settings: Any,
+    ) -> None:
+        """作り直しても同じキーに上書きし、別名のオブジェクトを作らないこと."""
+        # Arrange
+        bucket = settings.S3_BUCKET_NAME
+        book = _book_with_cover(s3_storage, bucket=bucket)
+        call_command("backfill_cover_thumbnails")
+
+        # Act
+        call_command("backfill_cover_thumbnails", force=True)
+
+        # Assert
+        listed = s3_storage.list_objects_v2(
+            Bucket=bucket,
+            Prefix="books/thumbnails/",
+        )
+        keys = [obj["Key"] for obj in listed["Contents"]]
+        assert sorted(keys) == sorted(
+            thumbnail_keys(cover_name=book.cover_image.name),
+        )
+
+    def test_happy_skips_books_already_done(
+        self,
+        s3_storage: Any,
+        settings: Any,
+    ) -> None:
+        # Arrange
+        book = _book_with_cover(s3_storage, bucket=settings.S3_BUCKET_NAME)
+        Book.objects.filter(pk=book.pk).update(
+            cover_thumbnails_source=book.cover_image.name,
+        )
+
+        # Act
+        call_command("backfill_cover_thumbnails")
+
+        # Assert
+        listed = s3_storage.list_objects_v2(
+            Bucket=settings.S3_BUCKET_NAME,
+            Prefix="books/thumbnails/",
+        )
+        assert "Contents" not in listed
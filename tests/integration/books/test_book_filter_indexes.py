@@ -0,0 +1,115 @@
+"""本一覧の絞り込み/並び替えが索引の範囲走査になることのテスト.
+
+行数が少ないと planner は Seq Scan を選ぶため、enable_seqscan を切って
+「索引で返せるか (Sort を挟まないか)」だけを EXPLAIN で確かめる。
+絞り込みと並びの全組み合わせについて、索引で返すか 400 で断るかの
+どちらかになることを確かめる。
+"""
+
+import itertools
+import uuid
+from typing import Any
+
+import pytest
+from django.db import connection
+from django.db import transaction
+
+from books.entities import Book
+from books.filters import SORT_ORDERINGS
+from books.filters import BookFilterSerializer
+from books.filters import filter_books
+
+# 並びと組み合わせる絞り込み (isbn は単独で引くため別に確かめる)。
+_FILTERS: dict[str, dict[str, str]] = {
+    "author": {"author": str(uuid.uuid4())},
+    "published": {
+        "published_from": "1905-01-01",
+        "published_to": "1905-12-31",
+    },
+    "title": {"title": "吾輩"},
+}
+
+
+def _cases(served: bool) -> list[Any]:
+    """絞り込みと並び (未指定を含む) の組み合わせのうち served 側."""
+    cases = []
+    for size in range(len(_FILTERS) + 1):
+        for names in itertools.combinations(_FILTERS, size):
+            for sort in [None, *SORT_ORDERINGS]:
+                default = "title" if "title" in names else "-published_date"
+                by_title = (sort or default).endswith("title")
+                unservable = ("title" in names and not by_title) or (
+                    "published" in names and by_title
+                )
+                if unservable == served:
+                    continue
+                query = {
+                    key: value
+                    for name in names
+                    for key, value in _FILTERS[name].items()
+                }
+                if sort is not None:
+                    query["sort"] = sort
+                label = "+".join(names) or "none"
+                cases.append(
+                    pytest.param(query, id=f"{label}:{sort or 'default'}")
+                )
+    return cases
+
+
+def _validated(query: dict[str, str]) -> dict[str, Any]:
+    filters = BookFilterSerializer(data=query)
+    filters.is_valid(raise_exception=True)
+    return filters.validated_data
+
+
+def _plan(params: dict[str, Any]) -> str:
+    queryset = filter_books(queryset=Book.objects.all(), params=params)
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute("SET LOCAL enable_seqscan = off")
+        return queryset.explain()
+
+
+@pytest.mark.django_db
+class TestBookFilterIndexes:
+    """filter_books の実行計画のテスト."""
+
+    @pytest.mark.parametrize("query", _cases(served=True))
+    def test_happy_sorted_by_index(self, query: dict[str, str]) -> None:
+        # Act
+        plan = _plan(_validated(query))
+
+        # Assert
+        assert "Index" in plan
+        assert "Seq Scan" not in plan
+        assert "Sort" not in plan
+
+    def test_happy_isbn_uses_unique_index(self) -> None:
+        # Act
+        plan = _plan(_validated({"isbn": "9784003101018"}))
+
+        # Assert
+        assert "isbn" in plan
+        assert "Seq Scan" not in plan
+
+    # --- 異常系 ---
+
+    @pytest.mark.parametrize("query", _cases(served=False))
+    def test_error_rejects_unindexed_sort(self, query: dict[str, str]) -> None:
+        """一つの索引で返せない組み合わせは並びのエラーで断ること."""
+        # Act
+        filters = BookFilterSerializer(data=query)
+
+        # Assert
+        assert not filters.is_valid()
+        assert set(filters.errors) == {"sort"}
+
+    def test_error_rejects_isbn_with_other_filters(self) -> None:
+        # Act
+        filters = BookFilterSerializer(
+            data={"isbn": "9784003101018", "title": "吾輩"},
+        )
+
+        # Assert
+        assert not filters.is_valid()
+        assert set(filters.errors) == {"isbn"}
@@ -0,0 +1,189 @@
+"""表紙の S3 マルチパートへの直接アップロード (CoverUploadHandler) のテスト."""
+
+import datetime
+import hashlib
+from io import BytesIO
+from typing import Any
+
+import pytest
+from django.core.files.storage import storages
+from django.core.files.uploadedfile import SimpleUploadedFile
+from PIL import Image
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from authors.models import Author
+from books.entities import Book
+
+_PART_SIZE = 5 * 1024 * 1024
+
+
+def _png(padding: int = 0) -> bytes:
+    buf = BytesIO()
+    Image.new("RGB", (10, 10), color="red").save(buf, format="PNG")
+    # PNG の末尾以降のバイトは Pillow が無視するため、大きさの調整に使う。
+    return buf.getvalue() + b"\0" * padding
+
+
+def _post(
+    content: bytes,
+    *,
+    name: str = "cover.png",
+    isbn: str = "9784003101018",
+) -> Any:
+    author = Author.objects.create(name="夏目漱石")
+    return APIClient().post(
+        "/api/v1/books/",
+        {
+            "title": "吾輩は猫である",
+            "isbn": isbn,
+            "published_date": datetime.date(1905, 1, 1).isoformat(),
+            "author": str(author.pk),
+            "cover_image": SimpleUploadedFile(
+                name=name,
+                content=content,
+                content_type="image/png",
+            ),
+        },
+        format="multipart",
+    )
+
+
+@pytest.mark.django_db
+class TestCoverUpload:
+    @pytest.fixture(autouse=True)
+    def _small_parts(self, settings: Any) -> None:
+        settings.COVER_UPLOAD_PART_SIZE = _PART_SIZE
+        settings.COVER_UPLOAD_CONCURRENCY = 2
+
+    def test_happy_small_cover_is_put_once(
+        self,
+        s3_storage: Any,
+        settings: Any,
+    ) -> None:
+        """part 1 つに満たない表紙はマルチパートを使わず 1 回で送ること."""
+        # Arrange
+        content = _png()
+
+        # Act
+        response = _post(content)
+
+        # Assert
+        assert response.status_code == status.HTTP_201_CREATED
+        key = Book.objects.get().cover_image.name
+        digest = hashlib.sha256(content).hexdigest()
+        assert key == f"books/covers/{digest}.png"
+        head = s3_storage.head_object(
+            Bucket=settings.S3_BUCKET_NAME,
+            Key=key,
+            PartNumber=1,
+        )
+        assert "PartsCount" not in head
+        body = s3_storage.get_object(Bucket=settings.S3_BUCKET_NAME, Key=key)
+        assert body["Body"].read() == content
+
+    def test_happy_large_cover_is_sent_in_parts(
+        self,
+        s3_storage: Any,
+        settings: Any,
+    ) -> None:
+        """part ごとに送り、一時キーを残さず表紙のキーに置くこと."""
+        # Arrange
+        content = _png(padding=2 * _PART_SIZE + 123)
+        parts: list[int] = []
+        events = storages["default"].connection.meta.client.meta.events
+        events.register(
+            "provide-client-params.s3.UploadPart",
+            lambda params, **_: parts.append(params["PartNumber"]),
+        )
+
+        # Act
+        response = _post(content)
+
+        # Assert
+        assert response.status_code == status.HTTP_201_CREATED
+        assert sorted(parts) == [1, 2, 3]
+        key = Book.objects.get().cover_image.name
+        digest = hashlib.sha256(content).hexdigest()
+        assert key == f"books/covers/{digest}.png"
+        listed = s3_storage.list_objects_v2(Bucket=settings.S3_BUCKET_NAME)
+        assert [obj["Key"] for obj in listed["Contents"]] == [key]
+        body = s3_storage.get_object(Bucket=settings.S3_BUCKET_NAME, Key=key)
+        assert body["Body"].read() == content
+
+    @pytest.mark.parametrize(
+        "padding",
+        [0, 2 * _PART_SIZE + 123],
+        ids=["single-put", "multipart"],
+    )
+    def test_happy_same_content_shares_one_object(
+        self,
+        s3_storage: Any,
+        settings: Any,
+        padding: int,
+    ) -> None:
+        """同じ内容の表紙は同じキーを指し、オブジェクトが 1 つだけ残ること."""
+        # Arrange
+        content = _png(padding=padding)
+        _post(content)
+
+        # Act
+        response = _post(content, isbn="9784101010014")
+
+        # Assert
+        assert response.status_code == status.HTTP_201_CREATED
+        names = {book.cover_image.name for book in Book.objects.all()}
+        assert len(names) == 1
+        listed = s3_storage.list_objects_v2(Bucket=settings.S3_BUCKET_NAME)
+        assert [obj["Key"] for obj in listed["Contents"]] == list(names)
+        uploads = s3_storage.list_multipart_uploads(
+            Bucket=settings.S3_BUCKET_NAME,
+        )
+        assert "Uploads" not in uploads
+
+    @pytest.mark.parametrize(
+        "padding",
+        [0, 2 * _PART_SIZE + 123],
+        ids=["single-put", "multipart"],
+    )
+    def test_happy_same_content_refreshes_existing_object(
+        self,
+        s3_storage: Any,
+        settings: Any,
+        padding: int,
+    ) -> None:
+        """重複でも既存の表紙をその場でコピーし直し、鮮度を更新すること."""
+        # Arrange
+        content = _png(padding=padding)
+        _post(content)
+        copies: list[dict[str, Any]] = []
+        events = storages["default"].connection.meta.client.meta.events
+        events.register(
+            "provide-client-params.s3.CopyObject",
+            lambda params, **_: copies.append(dict(params)),
+        )
+
+        # Act
+        _post(content, isbn="9784101010014")
+
+        # Assert
+        key = Book.objects.get(isbn="9784101010014").cover_image.name
+        assert [copy["Key"] for copy in copies] == [key]
+        assert copies[0]["MetadataDirective"] == "REPLACE"
+        head = s3_storage.head_object(Bucket=settings.S3_BUCKET_NAME, Key=key)
+        assert head["ContentType"] == "image/png"
+
+    def test_error_non_image_is_rejected_without_upload(
+        self,
+        s3_storage: Any,
+        settings: Any,
+    ) -> None:
+        # Act
+        response = _post(b"not an image" * 1000, name="cover.png")
+
+        # Assert
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert "cover_image" in response.data
+        listed = s3_storage.list_objects_v2(Bucket=settings.S3_BUCKET_NAME)
+        assert "Contents" not in listed
+        assert not Book.objects.exists()
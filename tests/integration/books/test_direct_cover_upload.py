@@ -0,0 +1,270 @@
+"""表紙の presigned POST による直接アップロードと確定のテスト."""
+
+import base64
+import datetime
+import hashlib
+from io import BytesIO
+from typing import Any
+
+import pytest
+from PIL import Image
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from authors.models import Author
+from books.entities import Book
+
+
+def _png() -> bytes:
+    buf = BytesIO()
+    Image.new("RGB", (10, 10), color="red").save(buf, format="PNG")
+    return buf.getvalue()
+
+
+@pytest.fixture
+def book() -> Book:
+    return Book.objects.create(
+        title="吾輩は猫である",
+        isbn="9784003101018",
+        published_date=datetime.date(1905, 1, 1),
+        author=Author.objects.create(name="夏目漱石"),
+    )
+
+
+def _checksum(body: bytes) -> str:
+    return base64.b64encode(hashlib.sha256(body).digest()).decode()
+
+
+def _upload(
+    client: Any,
+    *,
+    bucket: str,
+    body: bytes,
+    content_type: str = "image/png",
+    checksum: bool = True,
+) -> str:
+    """発行を受け、クライアントの代わりに POST 先のキーへ置いてキーを返す.
+
+    checksum=False は SHA-256 を付けずに置く (ポリシーを無視した送信)。
+    """
+    issued = APIClient().post(
+        "/api/v1/books/cover-uploads/",
+        {"content_type": content_type, "checksum_sha256": _checksum(body)},
+        format="json",
+    )
+    assert issued.status_code == status.HTTP_201_CREATED
+    extra = (
+        {"ChecksumAlgorithm": "SHA256", "ChecksumSHA256": _checksum(body)}
+        if checksum
+        else {}
+    )
+    client.put_object(
+        Bucket=bucket,
+        Key=issued.data["fields"]["key"],
+        Body=body,
+        ContentType=content_type,
+        **extra,
+    )
+    return issued.data["key"]
+
+
+def _finalize(
+    book: Book,
+    *,
+    key: str,
+) -> Any:
+    return APIClient().post(
+        f"/api/v1/books/{book.pk}/cover/",
+        {"key": key},
+        format="json",
+    )
+
+
+@pytest.mark.django_db
+class TestDirectCoverUpload:
+    def test_happy_presign_is_scoped_to_staging(
+        self,
+        s3_storage: Any,
+        settings: Any,
+    ) -> None:
+        """一時キーへの POST ポリシーを Content-Type 付きで発行すること."""
+        # Act
+        response = APIClient().post(
+            "/api/v1/books/cover-uploads/",
+            {"content_type": "image/jpeg", "checksum_sha256": _checksum(b"")},
+            format="json",
+        )
+
+        # Assert
+        assert response.status_code == status.HTTP_201_CREATED
+        key = response.data["key"]
+        assert key.startswith("books/covers/staging/direct/")
+        fields = response.data["fields"]
+        assert fields["key"] == key
+        assert fields["Content-Type"] == "image/jpeg"
+        assert fields["x-amz-checksum-algorithm"] == "SHA256"
+        assert fields["x-amz-checksum-sha256"] == _checksum(b"")
+        assert "policy" in fields
+        assert settings.S3_BUCKET_NAME in response.data["url"]
+
+    def test_happy_finalize_attaches_content_addressed_cover(
+        self,
+        s3_storage: Any,
+        settings: Any,
+        book: Book,
+    ) -> None:
+        """確定すると内容のハッシュのキーに移り、一時キーは消えること."""
+        # Arrange
+        bucket = settings.S3_BUCKET_NAME
+        content = _png()
+        key = _upload(s3_storage, bucket=bucket, body=content)
+
+        # Act
+        response = _finalize(book, key=key)
+
+        # Assert
+        assert response.status_code == status.HTTP_200_OK
+        digest = hashlib.sha256(content).hexdigest()
+        name = f"books/covers/{digest}.png"
+        book.refresh_from_db()
+        assert book.cover_image.name == name
+        listed = s3_storage.list_objects_v2(Bucket=bucket)
+        assert [obj["Key"] for obj in listed["Contents"]] == [name]
+
+    def test_happy_finalize_honours_storage_location(
+        self,
+        s3_storage: Any,
+        settings: Any,
+        book: Book,
+    ) -> None:
+        """ストレージの location の下に置き、書籍には相対の名前を残すこと."""
+        # Arrange
+        default = settings.STORAGES["default"]
+        settings.STORAGES = {
+            **settings.STORAGES,
+            "default": {
+                **default,
+                "OPTIONS": {**default["OPTIONS"], "location": "media"},
+            },
+        }
+        bucket = settings.S3_BUCKET_NAME
+        content = _png()
+        key = _upload(s3_storage, bucket=bucket, body=content)
+
+        # Act
+        response = _finalize(book, key=key)
+
+        # Assert
+        assert response.status_code == status.HTTP_200_OK
+        digest = hashlib.sha256(content).hexdigest()
+        name = f"books/covers/{digest}.png"
+        book.refresh_from_db()
+        assert book.cover_image.name == name
+        assert book.cover_image.storage.exists(name)
+        listed = s3_storage.list_objects_v2(Bucket=bucket)
+        assert [obj["Key"] for obj in listed["Contents"]] == [f"media/{name}"]
+
+    @pytest.mark.parametrize(
+        ("body", "content_type"),
+        [(b"not an image", "image/png"), (_png(), "image/jpeg")],
+        ids=["not-image", "type-mismatch"],
+    )
+    def test_error_finalize_rejects_non_matching_image(
+        self,
+        s3_storage: Any,
+        settings: Any,
+        book: Book,
+        body: bytes,
+        content_type: str,
+    ) -> None:
+        # Arrange
+        key = _upload(
+            s3_storage,
+            bucket=settings.S3_BUCKET_NAME,
+            body=body,
+            content_type=content_type,
+        )
+
+        # Act
+        response = _finalize(book, key=key)
+
+        # Assert
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert "key" in response.data
+        book.refresh_from_db()
+        assert not book.cover_image
+
+    def test_error_finalize_rejects_missing_checksum(
+        self,
+        s3_storage: Any,
+        settings: Any,
+        book: Book,
+    ) -> None:
+        """S3 が SHA-256 を検証していない一時オブジェクトは断ること."""
+        # Arrange
+        key = _upload(
+            s3_storage,
+            bucket=settings.S3_BUCKET_NAME,
+            body=_png(),
+            checksum=False,
+        )
+
+        # Act
+        response = _finalize(book, key=key)
+
+        # Assert
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert "key" in response.data
+
+    def test_error_presign_rejects_bad_checksum(self, s3_storage: Any) -> None:
+        # Act
+        response = APIClient().post(
+            "/api/v1/books/cover-uploads/",
+            {"content_type": "image/png", "checksum_sha256": "abc"},
+            format="json",
+        )
+
+        # Assert
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert "checksum_sha256" in response.data
+
+    def test_error_finalize_rejects_too_large(
+        self,
+        s3_storage: Any,
+        settings: Any,
+        book: Book,
+    ) -> None:
+        # Arrange
+        content = _png()
+        settings.COVER_DIRECT_UPLOAD_MAX_SIZE = len(content) - 1
+        key = _upload(
+            s3_storage,
+            bucket=settings.S3_BUCKET_NAME,
+            body=content,
+        )
+
+        # Act
+        response = _finalize(book, key=key)
+
+        # Assert
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    @pytest.mark.parametrize(
+        "key",
+        [
+            "books/covers/staging/direct/" + "0" * 32,
+            "books/covers/kept.png",
+        ],
+        ids=["not-uploaded", "outside-staging"],
+    )
+    def test_error_finalize_rejects_unknown_key(
+        self,
+        s3_storage: Any,
+        book: Book,
+        key: str,
+    ) -> None:
+        # Act
+        response = _finalize(book, key=key)
+
+        # Assert
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
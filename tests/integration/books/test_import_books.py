@@ -0,0 +1,171 @@
+import datetime
+import json
+from pathlib import Path
+
+import pytest
+from django.core.management import CommandError
+from django.core.management import call_command
+
+from authors.models import Author
+from books.entities import Book
+
+_HEADER = "title,isbn,published_date,author\n"
+
+
+def _errors(error_dir: Path) -> list[dict[str, object]]:
+    return [
+        json.loads(line)
+        for path in sorted(error_dir.glob("chunk-*.jsonl"))
+        for line in path.read_text(encoding="utf-8").splitlines()
+    ]
+
+
+@pytest.mark.django_db
+class TestImportBooks:
+    def test_happy_imports_csv_in_chunks(self, tmp_path: Path) -> None:
+        """チャンクをまたいで全行が取り込まれること."""
+        # Arrange
+        author = Author.objects.create(name="夏目漱石")
+        feed = tmp_path / "feed.csv"
+        feed.write_text(
+            _HEADER
+            + "".join(
+                f"吾輩は猫である 第{i}版,97840031010{i:02d},1905-01-01,"
+                "夏目漱石\n"
+                for i in range(5)
+            ),
+            encoding="utf-8",
+        )
+
+        # Act
+        call_command(
+            "import_books",
+            str(feed),
+            "--chunk-size=2",
+            f"--error-dir={tmp_path / 'errors'}",
+        )
+
+        # Assert
+        books = Book.objects.order_by("isbn")
+        assert [book.isbn for book in books] == [
+            f"97840031010{i:02d}" for i in range(5)
+        ]
+        assert {book.author_id for book in books} == {author.pk}
+        assert _errors(tmp_path / "errors") == []
+
+    def test_happy_updates_existing_isbn(self, tmp_path: Path) -> None:
+        """既存の ISBN は追加せず、値を更新すること."""
+        # Arrange
+        author = Author.objects.create(name="夏目漱石")
+        Book.objects.create(
+            title="旧題",
+            isbn="9784003101018",
+            published_date=datetime.date(1900, 1, 1),
+            author=author,
+        )
+        feed = tmp_path / "feed.jsonl"
+        feed.write_text(
+            json.dumps(
+                {
+                    "title": "吾輩は猫である",
+                    "isbn": "9784003101018",
+                    "published_date": "1905-01-01",
+                    "author": "夏目漱石",
+                },
+                ensure_ascii=False,
+            )
+            + "\n",
+            encoding="utf-8",
+        )
+
+        # Act
+        call_command(
+            "import_books",
+            str(feed),
+            f"--error-dir={tmp_path / 'errors'}",
+        )
+
+        # Assert
+        book = Book.objects.get()
+        assert book.title == "吾輩は猫である"
+        assert book.published_date == datetime.date(1905, 1, 1)
+
+    def test_happy_skip_existing_keeps_book(self, tmp_path: Path) -> None:
+        # Arrange
+        author = Author.objects.create(name="夏目漱石")
+        Book.objects.create(
+            title="旧題",
+            isbn="9784003101018",
+            published_date=datetime.date(1900, 1, 1),
+            author=author,
+        )
+        feed = tmp_path / "feed.csv"
+        feed.write_text(
+            _HEADER + "吾輩は猫である,9784003101018,1905-01-01,夏目漱石\n",
+            encoding="utf-8",
+        )
+
+        # Act
+        call_command(
+            "import_books",
+            str(feed),
+            "--skip-existing",
+            f"--error-dir={tmp_path / 'errors'}",
+        )
+
+        # Assert
+        assert Book.objects.get().title == "旧題"
+
+    def test_error_writes_rejected_rows(self, tmp_path: Path) -> None:
+        """取り込めない行は理由付きでエラーファイルに書かれること."""
+        # Arrange
+        Author.objects.create(name="夏目漱石")
+        Author.objects.create(name="同名")
+        Author.objects.create(name="同名")
+        feed = tmp_path / "feed.csv"
+        feed.write_text(
+            _HEADER
+            + "吾輩は猫である,9784003101018,1905-01-01,夏目漱石\n"
+            + "<script>,9784003101025,1905-01-01,夏目漱石\n"
+            + "坊っちゃん,97840031010321,1906-01-01,夏目漱石\n"
+            + "草枕,9784003101049,1906/09/01,夏目漱石\n"
+            + "三四郎,9784003101056,1908-01-01,不明\n"
+            + "それから,9784003101063,1909-01-01,同名\n"
+            + "門,9784003101018,1910-01-01,夏目漱石\n",
+            encoding="utf-8",
+        )
+
+        # Act
+        call_command(
+            "import_books",
+            str(feed),
+            f"--error-dir={tmp_path / 'errors'}",
+        )
+
+        # Assert
+        book = Book.objects.get()
+        assert book.title == "門"
+        errors = {
+            error["line"]: error["errors"]
+            for error in _errors(tmp_path / "errors")
+        }
+        assert set(errors) == {2, 3, 4, 5, 6, 7}
+        assert set(errors[2]) == {"isbn"}
+        assert set(errors[3]) == {"title"}
+        assert set(errors[4]) == {"isbn"}
+        assert set(errors[5]) == {"published_date"}
+        assert errors[6] == {"author": "著者が見つかりません"}
+        assert set(errors[7]) == {"author"}
+
+    def test_error_rejects_missing_columns(self, tmp_path: Path) -> None:
+        # Arrange
+        feed = tmp_path / "feed.csv"
+        feed.write_text("title,isbn\n猫,9784003101018\n", encoding="utf-8")
+
+        # Act & Assert
+        with pytest.raises(CommandError, match="author"):
+            call_command(
+                "import_books",
+                str(feed),
+                f"--error-dir={tmp_path / 'errors'}",
+            )
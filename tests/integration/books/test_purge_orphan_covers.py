@@ -0,0 +1,136 @@
+import datetime
+from typing import Any
+
+import pytest
+from django.core.management import call_command
+
+from authors.models import Author
+from books.entities import Book
+from books.thumbnails import thumbnail_keys
+
+
+def _keys(
+    client: Any,
+    *,
+    bucket: str,
+) -> set[str]:
+    response = client.list_objects_v2(Bucket=bucket)
+    return {obj["Key"] for obj in response.get("Contents", [])}
+
+
+@pytest.mark.django_db
+class TestPurgeOrphanCovers:
+    def test_happy_deletes_only_unreferenced_covers(
+        self,
+        s3_client: Any,
+        settings: Any,
+    ) -> None:
+        """書籍から参照されない表紙だけが削除されること."""
+        # Arrange
+        bucket = settings.S3_BUCKET_NAME
+        for key in ("books/covers/kept.png", "books/covers/orphan.png"):
+            s3_client.put_object(Bucket=bucket, Key=key, Body=b"x")
+        Book.objects.create(
+            title="吾輩は猫である",
+            isbn="9784003101018",
+            published_date=datetime.date(1905, 1, 1),
+            author=Author.objects.create(name="夏目漱石"),
+            cover_image="books/covers/kept.png",
+        )
+
+        # Act
+        call_command("purge_orphan_covers", "--min-age=0")
+
+        # Assert
+        assert _keys(s3_client, bucket=bucket) == {"books/covers/kept.png"}
+
+    def test_happy_keeps_shared_cover_until_unreferenced(
+        self,
+        s3_client: Any,
+        settings: Any,
+    ) -> None:
+        """共有された表紙は最後の書籍が消えるまで削除されないこと."""
+        # Arrange
+        bucket = settings.S3_BUCKET_NAME
+        key = "books/covers/shared.png"
+        s3_client.put_object(Bucket=bucket, Key=key, Body=b"x")
+        author = Author.objects.create(name="夏目漱石")
+        first, second = (
+            Book.objects.create(
+                title="吾輩は猫である",
+                isbn=isbn,
+                published_date=datetime.date(1905, 1, 1),
+                author=author,
+                cover_image=key,
+            )
+            for isbn in ("9784003101018", "9784101010014")
+        )
+
+        # Act
+        first.delete()
+        call_command("purge_orphan_covers", "--min-age=0")
+        kept = _keys(s3_client, bucket=bucket)
+        second.delete()
+        call_command("purge_orphan_covers", "--min-age=0")
+
+        # Assert
+        assert kept == {key}
+        assert _keys(s3_client, bucket=bucket) == set()
+
+    def test_happy_deletes_thumbnails_of_orphans(
+        self,
+        s3_client: Any,
+        settings: Any,
+    ) -> None:
+        # Arrange
+        bucket = settings.S3_BUCKET_NAME
+        orphan = "books/covers/orphan.png"
+        for key in (orphan, *thumbnail_keys(cover_name=orphan)):
+            s3_client.put_object(Bucket=bucket, Key=key, Body=b"x")
+
+        # Act
+        call_command("purge_orphan_covers", "--min-age=0")
+
+        # Assert
+        assert _keys(s3_client, bucket=bucket) == set()
+
+    def test_happy_dry_run_keeps_objects(
+        self,
+        s3_client: Any,
+        settings: Any,
+    ) -> None:
+        # Arrange
+        bucket = settings.S3_BUCKET_NAME
+        s3_client.put_object(
+            Bucket=bucket,
+            Key="books/covers/orphan.png",
+            Body=b"x",
+        )
+
+        # Act
+        call_command("purge_orphan_covers", "--min-age=0", "--dry-run")
+
+        # Assert
+        assert _keys(s3_client, bucket=bucket) == {"books/covers/orphan.png"}
+
+    def test_happy_skips_recent_uploads(
+        self,
+        s3_client: Any,
+        settings: Any,
+    ) -> None:
+        """行のコミット前かもしれない新しいオブジェクトは消さないこと."""
+        # Arrange
+        bucket = settings.S3_BUCKET_NAME
+        s3_client.put_object(
+            Bucket=bucket,
+            Key="books/covers/just-uploaded.png",
+            Body=b"x",
+        )
+
+        # Act
+        call_command("purge_orphan_covers")
+
+        # Assert
+        assert _keys(s3_client, bucket=bucket) == {
+            "books/covers/just-uploaded.png"
+        }
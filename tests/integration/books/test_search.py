@@ -0,0 +1,163 @@
+"""書籍の全文検索 (books.search と GET /books/search/) の結合テスト."""
+
+import datetime
+from typing import Any
+
+import pytest
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from authors.interfaces.repositories.author import AuthorRepositoryImpl
+from authors.models import Author
+from books.entities import Book
+from books.search import BOOK_INDEX
+from books.search import index_books
+from books.search import search_client
+
+_ENDPOINT = "/api/v1/books/search/"
+
+
+def _book(
+    *,
+    title: str,
+    isbn: str,
+    author: Author,
+) -> Book:
+    return Book.objects.create(
+        title=title,
+        isbn=isbn,
+        published_date=datetime.date(1905, 1, 1),
+        author=author,
+    )
+
+
+def _refresh() -> None:
+    search_client().indices.refresh(index=BOOK_INDEX)
+
+
+def _titles(response: Any) -> list[str]:
+    return [book["title"] for book in response.data["results"]]
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures("search_index")
+class TestBookSearch:
+    def test_happy_ranks_title_matches_first(self) -> None:
+        """語順まで一致するタイトルが部分一致より上に来ること."""
+        # Arrange
+        author = Author.objects.create(name="夏目漱石")
+        books = [
+            _book(title="猫の事務所", isbn="9784003101001", author=author),
+            _book(title="吾輩は猫である", isbn="9784003101018", author=author),
+            _book(title="坊っちゃん", isbn="9784003101025", author=author),
+        ]
+        index_books(book_ids=[book.pk for book in books])
+        _refresh()
+
+        # Act
+        response = APIClient().get(_ENDPOINT, {"q": "吾輩は猫"})
+
+        # Assert
+        assert response.status_code == status.HTTP_200_OK
+        assert _titles(response)[0] == "吾輩は猫である"
+        assert "坊っちゃん" not in _titles(response)
+
+    def test_happy_finds_by_author_name_and_isbn(self) -> None:
+        # Arrange
+        soseki = Author.objects.create(name="夏目漱石")
+        ogai = Author.objects.create(name="森鷗外")
+        books = [
+            _book(title="吾輩は猫である", isbn="9784003101018", author=soseki),
+            _book(title="舞姫", isbn="9784003100608", author=ogai),
+        ]
+        index_books(book_ids=[book.pk for book in books])
+        _refresh()
+
+        # Act
+        by_author = APIClient().get(_ENDPOINT, {"q": "鷗外"})
+        by_isbn = APIClient().get(_ENDPOINT, {"q": "9784003101018"})
+
+        # Assert
+        assert _titles(by_author) == ["舞姫"]
+        assert _titles(by_isbn)[0] == "吾輩は猫である"
+
+    def test_happy_pages_with_search_after(self) -> None:
+        """next をたどると重複も欠けもなく全件を読めること."""
+        # Arrange
+        author = Author.objects.create(name="夏目漱石")
+        books = [
+            _book(
+                title=f"猫 第{i}巻", isbn=f"97840031010{i:02d}", author=author
+            )
+            for i in range(5)
+        ]
+        index_books(book_ids=[book.pk for book in books])
+        _refresh()
+
+        # Act
+        seen: list[int] = []
+        url: str | None = f"{_ENDPOINT}?q=猫&page_size=2"
+        while url is not None:
+            response = APIClient().get(url)
+            seen += [book["id"] for book in response.data["results"]]
+            url = response.data["next"]
+
+        # Assert
+        assert sorted(seen) == sorted(book.pk for book in books)
+
+    def test_error_rejects_broken_cursor(self) -> None:
+        # Act
+        response = APIClient().get(_ENDPOINT, {"q": "猫", "cursor": "!!"})
+
+        # Assert
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+# on_commit の反映を実際のコミットで動かすため、トランザクションで包まない。
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.usefixtures("search_index")
+class TestBookSearchSync:
+    def test_happy_api_changes_are_reflected(self) -> None:
+        """作成/更新/削除がコミット後に索引へ反映されること."""
+        # Arrange
+        author = Author.objects.create(name="夏目漱石")
+        client = APIClient()
+        payload = {
+            "title": "吾輩は猫である",
+            "isbn": "9784003101018",
+            "published_date": "1905-01-01",
+            "author": str(author.pk),
+        }
+
+        # Act
+        created = client.post("/api/v1/books/", payload, format="json")
+        client.patch(
+            f"/api/v1/books/{created.data['id']}/",
+            {"title": "坊っちゃん"},
+            format="json",
+        )
+        _refresh()
+        after_update = client.get(_ENDPOINT, {"q": "坊っちゃん"})
+        client.delete(f"/api/v1/books/{created.data['id']}/")
+        _refresh()
+        after_delete = client.get(_ENDPOINT, {"q": "坊っちゃん"})
+
+        # Assert
+        assert _titles(after_update) == ["坊っちゃん"]
+        assert _titles(after_delete) == []
+
+    def test_happy_author_rename_is_reflected(self) -> None:
+        # Arrange
+        author = Author.objects.create(name="夏目金之助")
+        book = _book(
+            title="吾輩は猫である", isbn="9784003101018", author=author
+        )
+        index_books(book_ids=[book.pk])
+
+        # Act
+        AuthorRepositoryImpl().update(author.pk, changes={"name": "漱石"})
+        _refresh()
+        response = APIClient().get(_ENDPOINT, {"q": "漱石"})
+
+        # Assert
+        assert _titles(response) == ["吾輩は猫である"]
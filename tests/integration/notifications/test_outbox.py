@@ -0,0 +1,480 @@
+"""通知の transactional outbox と run_notification_worker の統合テスト."""
+
+import threading
+import time
+from collections.abc import Iterator
+from collections.abc import Sequence
+from http import HTTPStatus
+from io import StringIO
+from typing import Any
+
+import httpx
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.db import transaction
+from django.utils import timezone
+
+from common.infrastructure.factories.logger import LoggerFactoryImpl
+from notifications.domain.events import AuthorCreated
+from notifications.domain.events import BookCreated
+from notifications.infrastructure.adapters.fake import (
+    FakeNotificationLogReader,
+)
+from notifications.infrastructure.adapters.fake import (
+    FakeNotificationLogWriter,
+)
+from notifications.infrastructure.adapters.fake import FakeNotifier
+from notifications.infrastructure.adapters.outbox import OutboxListener
+from notifications.infrastructure.adapters.outbox import (
+    OutboxNotificationDispatcherImpl,
+)
+from notifications.infrastructure.adapters.outbox import OutboxRelay
+from notifications.infrastructure.containers.notificaton import (
+    NotificationModule,
+)
+from notifications.infrastructure.containers.notificaton import container
+from notifications.models import OutboxEvent
+
+
+class _RollbackError(Exception):
+    """トランザクションを戻すためのテスト用例外."""
+
+
+class _FailingNotifier(FakeNotifier):
+    """error を投げ続けるテスト用 Notifier."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.error: Exception = httpx.ConnectError("接続失敗")
+
+    def send(self, message: str) -> None:
+        raise self.error
+
+
+@pytest.fixture
+def fake() -> Iterator[FakeNotifier]:
+    fake = FakeNotifier()
+    container.override(
+        NotificationModule(
+            notifier_override=fake,
+            log_writer_override=FakeNotificationLogWriter(),
+            log_reader_override=FakeNotificationLogReader(),
+        ),
+    )
+    yield fake
+    container.reset()
+
+
+@pytest.fixture
+def failing(settings: Any) -> Iterator[_FailingNotifier]:
+    settings.NOTIFICATION_RETRY_MAX_ATTEMPTS = 3
+    notifier = _FailingNotifier()
+    container.override(
+        NotificationModule(
+            notifier_override=notifier,
+            log_writer_override=FakeNotificationLogWriter(),
+            log_reader_override=FakeNotificationLogReader(),
+        ),
+    )
+    yield notifier
+    container.reset()
+
+
+class _CrashError(BaseException):
+    """配送中のワーカーの異常終了を模すテスト用例外."""
+
+
+class _CrashOnceNotifier(FakeNotifier):
+    """最初の送信でだけワーカーごと落ちるテスト用 Notifier."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.crashed = False
+
+    def send(self, message: str) -> None:
+        if not self.crashed:
+            self.crashed = True
+            raise _CrashError
+        super().send(message)
+
+
+class _BatchRecordingNotifier(FakeNotifier):
+    """send_many に渡された件数を記録するテスト用 Notifier."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.batches: list[int] = []
+
+    def send_many(self, messages: Sequence[str]) -> list[Exception | None]:
+        self.batches.append(len(messages))
+        return super().send_many(messages=messages)
+
+
+class _RaisingNotifier(FakeNotifier):
+    """send_many が例外を投げる (配送そのものが失敗する) テスト用 Notifier."""
+
+    def send_many(self, messages: Sequence[str]) -> list[Exception | None]:
+        msg = "送信先の設定が壊れています"
+        raise RuntimeError(msg)
+
+
+def _dispatcher() -> OutboxNotificationDispatcherImpl:
+    return OutboxNotificationDispatcherImpl(logger_factory=LoggerFactoryImpl())
+
+
+def _author(name: str) -> AuthorCreated:
+    return AuthorCreated(name=name)
+
+
+@pytest.mark.django_db
+class TestOutbox:
+    def test_happy_dispatch_writes_row(self) -> None:
+        """イベントの種別と属性を outbox に書くこと."""
+        # Arrange
+        dispatcher = _dispatcher()
+
+        # Act
+        dispatcher.dispatch(
+            event=BookCreated(
+                title="吾輩は猫である",
+                isbn="9784003101018",
+                author_name="夏目漱石",
+            )
+        )
+
+        # Assert
+        (row,) = OutboxEvent.objects.all()
+        assert row.event_type == "book_created"
+        assert row.payload["title"] == "吾輩は猫である"
+        assert dispatcher.stats().depth == 1
+
+    def test_happy_rolled_back_dispatch_leaves_no_row(self) -> None:
+        """積んだトランザクションが戻れば通知も残らないこと."""
+
+        # Arrange
+        def create_then_fail() -> None:
+            with transaction.atomic():
+                _dispatcher().dispatch(event=_author("夏目漱石"))
+                raise _RollbackError
+
+        # Act
+        with pytest.raises(_RollbackError):
+            create_then_fail()
+
+        # Assert
+        assert not OutboxEvent.objects.exists()
+
+    def test_happy_relay_delivers_in_order(self, fake: FakeNotifier) -> None:
+        """積んだ順に Notifier で送り、送った行を消すこと."""
+        # Arrange
+        dispatcher = _dispatcher()
+        for name in ("夏目漱石", "森鴎外", "樋口一葉"):
+            dispatcher.dispatch(event=_author(name))
+        relay = container.injector.get(OutboxRelay)
+
+        # Act
+        first = relay.deliver_batch(batch_size=2)
+        second = relay.deliver_batch(batch_size=2)
+
+        # Assert
+        assert (first, second) == (2, 1)
+        assert fake.messages == (
+            "著者が登録されました: 夏目漱石",
+            "著者が登録されました: 森鴎外",
+            "著者が登録されました: 樋口一葉",
+        )
+        assert not OutboxEvent.objects.exists()
+
+    def test_happy_relay_sends_batch_at_once(self) -> None:
+        """取った行をまとめて 1 回の send_many に渡すこと."""
+        # Arrange
+        notifier = _BatchRecordingNotifier()
+        container.override(
+            NotificationModule(
+                notifier_override=notifier,
+                log_writer_override=FakeNotificationLogWriter(),
+                log_reader_override=FakeNotificationLogReader(),
+            ),
+        )
+        dispatcher = _dispatcher()
+        for name in ("夏目漱石", "森鴎外", "樋口一葉"):
+            dispatcher.dispatch(event=_author(name))
+
+        # Act
+        count = container.injector.get(OutboxRelay).deliver_batch(
+            batch_size=10,
+        )
+        container.reset()
+
+        # Assert
+        assert count == 3
+        assert notifier.batches == [3]
+        assert not OutboxEvent.objects.exists()
+
+    def test_happy_skips_unreadable_row(self, fake: FakeNotifier) -> None:
+        """読めない行で止まらず、他の行を配ること."""
+        # Arrange
+        OutboxEvent.objects.create(event_type="unknown", payload={})
+        OutboxEvent.objects.create(
+            event_type="author_created",
+            payload={"name": "夏目漱石"},
+        )
+
+        # Act
+        count = container.injector.get(OutboxRelay).deliver_batch(
+            batch_size=10,
+        )
+
+        # Assert
+        assert count == 2
+        assert fake.messages == ("著者が登録されました: 夏目漱石",)
+        assert not OutboxEvent.objects.exists()
+
+
+@pytest.mark.django_db
+class TestOutboxRetry:
+    def test_happy_retries_later(self, failing: _FailingNotifier) -> None:
+        """一時的な失敗の行は消さず、後の時刻に送り直す予定にすること."""
+        # Arrange
+        _dispatcher().dispatch(event=_author("夏目漱石"))
+        relay = container.injector.get(OutboxRelay)
+
+        # Act
+        first = relay.deliver_batch(batch_size=10)
+        second = relay.deliver_batch(batch_size=10)
+
+        # Assert
+        assert (first, second) == (1, 0)
+        (row,) = OutboxEvent.objects.all()
+        assert row.attempts == 1
+        assert row.available_at > timezone.now()
+        due = relay.seconds_until_due()
+        assert due is not None
+        assert 0 < due <= 2.0
+
+    def test_happy_limits_429(self, failing: _FailingNotifier) -> None:
+        """429 も送り直す予定を立て、試行回数の上限で諦めること."""
+        # Arrange
+        request = httpx.Request("POST", "https://discord.com/api/webhooks/x")
+        failing.error = httpx.HTTPStatusError(
+            "429",
+            request=request,
+            response=httpx.Response(
+                status_code=HTTPStatus.TOO_MANY_REQUESTS,
+                request=request,
+            ),
+        )
+        _dispatcher().dispatch(event=_author("夏目漱石"))
+        relay = container.injector.get(OutboxRelay)
+
+        # Act
+        relay.deliver_batch(batch_size=10)
+        (row,) = OutboxEvent.objects.all()
+        OutboxEvent.objects.update(attempts=2, available_at=timezone.now())
+        relay.deliver_batch(batch_size=10)
+
+        # Assert
+        assert row.attempts == 1
+        assert not OutboxEvent.objects.exists()
+
+    def test_happy_gives_up(self, failing: _FailingNotifier) -> None:
+        """試行回数の上限に達した行は消すこと."""
+        # Arrange
+        _dispatcher().dispatch(event=_author("夏目漱石"))
+        OutboxEvent.objects.update(attempts=2)
+
+        # Act
+        count = container.injector.get(OutboxRelay).deliver_batch(
+            batch_size=10,
+        )
+
+        # Assert
+        assert count == 1
+        assert not OutboxEvent.objects.exists()
+
+    def test_happy_drops_permanent(self, failing: _FailingNotifier) -> None:
+        """送り直しても変わらない失敗の行は 1 回で消すこと."""
+        # Arrange
+        failing.error = RuntimeError("バグ")
+        _dispatcher().dispatch(event=_author("夏目漱石"))
+
+        # Act
+        container.injector.get(OutboxRelay).deliver_batch(batch_size=10)
+
+        # Assert
+        assert not OutboxEvent.objects.exists()
+
+    def test_happy_retries_batch_when_delivery_raises(self) -> None:
+        """配送が例外で終わったバッチの行は消さず、送り直す予定にすること."""
+        # Arrange
+        container.override(
+            NotificationModule(
+                notifier_override=_RaisingNotifier(),
+                log_writer_override=FakeNotificationLogWriter(),
+                log_reader_override=FakeNotificationLogReader(),
+            ),
+        )
+        dispatcher = _dispatcher()
+        dispatcher.dispatch(event=_author("夏目漱石"))
+        dispatcher.dispatch(event=_author("太宰治"))
+
+        # Act
+        count = container.injector.get(OutboxRelay).deliver_batch(
+            batch_size=10,
+        )
+        container.reset()
+
+        # Assert
+        assert count == 2
+        rows = list(OutboxEvent.objects.all())
+        assert [row.attempts for row in rows] == [1, 1]
+        assert all(row.available_at > timezone.now() for row in rows)
+
+    def test_happy_redelivers_after_lease_of_crashed_worker(self) -> None:
+        """配送中に落ちた行は残り、lease が切れたら配り直すこと."""
+        # Arrange
+        notifier = _CrashOnceNotifier()
+        container.override(
+            NotificationModule(
+                notifier_override=notifier,
+                log_writer_override=FakeNotificationLogWriter(),
+                log_reader_override=FakeNotificationLogReader(),
+            ),
+        )
+        _dispatcher().dispatch(event=_author("夏目漱石"))
+        relay = container.injector.get(OutboxRelay)
+        with pytest.raises(_CrashError):
+            relay.deliver_batch(batch_size=10, lease=0.0)
+
+        # Act
+        count = relay.deliver_batch(batch_size=10)
+        container.reset()
+
+        # Assert
+        assert count == 1
+        assert notifier.messages == ("著者が登録されました: 夏目漱石",)
+        assert not OutboxEvent.objects.exists()
+
+
+@pytest.mark.django_db(transaction=True)
+class TestOutboxWorkers:
+    def test_happy_skips_locked_rows(self, fake: FakeNotifier) -> None:
+        """他のワーカーが握っている行は待たずに飛ばすこと."""
+        # Arrange
+        dispatcher = _dispatcher()
+        dispatcher.dispatch(event=_author("夏目漱石"))
+        dispatcher.dispatch(event=_author("森鴎外"))
+        locked = threading.Event()
+        release = threading.Event()
+
+        def hold_first() -> None:
+            with transaction.atomic():
+                list(
+                    OutboxEvent.objects.select_for_update().order_by("id")[:1]
+                )
+                locked.set()
+                release.wait(timeout=10.0)
+            connection.close()
+
+        other = threading.Thread(target=hold_first)
+        other.start()
+        locked.wait(timeout=10.0)
+
+        # Act
+        count = container.injector.get(OutboxRelay).deliver_batch(
+            batch_size=10,
+        )
+        release.set()
+        other.join()
+
+        # Assert
+        assert count == 1
+        assert fake.messages == ("著者が登録されました: 森鴎外",)
+        assert OutboxEvent.objects.count() == 1
+
+    def test_happy_does_not_lock_rows_while_sending(self) -> None:
+        """送信中の行はロックせず、lease の間は他のワーカーが取らないこと."""
+        # Arrange
+        observed: list[tuple[int, bool]] = []
+
+        class _Probe(FakeNotifier):
+            def send(self, message: str) -> None:
+                def probe() -> None:
+                    other = container.injector.get(OutboxRelay)
+                    count = other.deliver_batch(batch_size=10)
+                    with transaction.atomic():
+                        free = OutboxEvent.objects.select_for_update(
+                            nowait=True,
+                        ).exists()
+                    observed.append((count, free))
+                    connection.close()
+
+                thread = threading.Thread(target=probe)
+                thread.start()
+                thread.join()
+                super().send(message)
+
+        container.override(
+            NotificationModule(
+                notifier_override=_Probe(),
+                log_writer_override=FakeNotificationLogWriter(),
+                log_reader_override=FakeNotificationLogReader(),
+            ),
+        )
+        _dispatcher().dispatch(event=_author("夏目漱石"))
+
+        # Act
+        count = container.injector.get(OutboxRelay).deliver_batch(
+            batch_size=10,
+        )
+        container.reset()
+
+        # Assert
+        assert count == 1
+        assert observed == [(0, True)]
+        assert not OutboxEvent.objects.exists()
+
+    def test_happy_listener_wakes_on_commit(self) -> None:
+        """積んだトランザクションのコミットで待ちが解けること."""
+        # Arrange
+        listener = OutboxListener()
+
+        def enqueue() -> None:
+            time.sleep(0.2)
+            with transaction.atomic():
+                _dispatcher().dispatch(event=_author("夏目漱石"))
+            connection.close()
+
+        other = threading.Thread(target=enqueue)
+        started = time.monotonic()
+        other.start()
+
+        # Act
+        listener.wait(timeout=10.0, stop=threading.Event())
+        elapsed = time.monotonic() - started
+        other.join()
+
+        # Assert
+        assert elapsed < 5.0
+
+    def test_happy_worker_once_drains(self, fake: FakeNotifier) -> None:
+        """--once で積まれた分を配り切って終えること."""
+        # Arrange
+        dispatcher = _dispatcher()
+        for number in range(5):
+            dispatcher.dispatch(event=_author(f"著者{number}"))
+        out = StringIO()
+
+        # Act
+        call_command(
+            "run_notification_worker",
+            "--once",
+            "--batch-size=2",
+            stdout=out,
+        )
+
+        # Assert
+        assert len(fake.messages) == 5
+        assert not OutboxEvent.objects.exists()
+        assert "5 件" in out.getvalue()
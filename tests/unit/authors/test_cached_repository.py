@@ -0,0 +1,152 @@
+"""著者リポジトリの読み取りキャッシュのテスト (DB 不要・Fake リポジトリ)."""
+
+import uuid
+from typing import Any
+
+import pytest
+from django.core.cache.backends.locmem import LocMemCache
+
+from authors.domain.entities.author import Author
+from authors.infrastructure.adapters.fake import FakeAuthorRepository
+from authors.interfaces.repositories.cached import CachedAuthorRepository
+from common.domain.entities.exceptions import EntityDoesNotExistError
+
+
+def _repository(
+    *authors: Author,
+    shared: LocMemCache | None = None,
+) -> CachedAuthorRepository:
+    return CachedAuthorRepository(
+        inner=FakeAuthorRepository(authors=list(authors)),
+        shared=shared or LocMemCache(f"test-{uuid.uuid4()}", {}),
+        local_maxsize=16,
+        local_ttl=60,
+        ttl=300,
+        negative_ttl=30,
+    )
+
+
+class TestCachedAuthorRepository:
+    """CachedAuthorRepository のテスト."""
+
+    def test_happy_second_get_hits_local_tier(self) -> None:
+        # Arrange
+        author = Author(name="太宰治")
+        repository = _repository(author)
+
+        # Act
+        first = repository.get(author.id)
+        second = repository.get(author.id)
+
+        # Assert
+        assert first.name == second.name == "太宰治"
+        stats = repository.stats()
+        assert (stats.misses, stats.local_hits) == (1, 1)
+
+    def test_happy_shared_tier_serves_other_process(self) -> None:
+        """プロセス内の段が空でも共有段から引けること."""
+        # Arrange
+        author = Author(name="太宰治")
+        shared = LocMemCache(f"test-{uuid.uuid4()}", {})
+        _repository(author, shared=shared).get(author.id)
+        other = _repository(author, shared=shared)
+
+        # Act
+        found = other.get(author.id)
+
+        # Assert
+        assert found.name == "太宰治"
+        stats = other.stats()
+        assert (stats.misses, stats.shared_hits) == (0, 1)
+
+    def test_happy_update_invalidates_cached_entity(self) -> None:
+        # Arrange
+        author = Author(name="太宰治")
+        repository = _repository(author)
+        repository.get(author.id)
+
+        # Act
+        repository.update(author.id, changes={"bio": "更新"})
+
+        # Assert
+        assert repository.get(author.id).bio == "更新"
+        assert repository.stats().misses == 2
+
+    def test_happy_hit_ratio(self) -> None:
+        # Arrange
+        author = Author(name="太宰治")
+        repository = _repository(author)
+
+        # Act
+        for _ in range(4):
+            repository.get(author.id)
+
+        # Assert
+        assert repository.stats().hit_ratio == pytest.approx(0.75)
+
+    def test_happy_racing_fill_is_dropped(self, monkeypatch: Any) -> None:
+        """読み取り中に更新が挟まっても、古い値を次回以降返さないこと."""
+        # Arrange
+        author = Author(name="太宰治")
+        inner = FakeAuthorRepository(authors=[author])
+        repository = CachedAuthorRepository(
+            inner=inner,
+            shared=LocMemCache(f"test-{uuid.uuid4()}", {}),
+            local_maxsize=16,
+            local_ttl=60,
+            ttl=300,
+            negative_ttl=30,
+        )
+        read = inner.get
+        raced: list[bool] = []
+
+        def racing_get(
+            entity_id: uuid.UUID,
+            fields: frozenset[str] | None = None,
+        ) -> Author:
+            stale = read(entity_id, fields)
+            if not raced:
+                raced.append(True)
+                repository.update(entity_id, changes={"bio": "更新"})
+            return stale
+
+        monkeypatch.setattr(inner, "get", racing_get)
+
+        # Act
+        first = repository.get(author.id)
+        second = repository.get(author.id)
+
+        # Assert
+        assert first.bio == ""
+        assert second.bio == "更新"
+        assert repository.stats().misses == 2
+
+    # --- 異常系 ---
+
+    def test_error_negative_lookup_is_cached(self) -> None:
+        """不在 ID の 2 回目は内側を読まずに EntityDoesNotExistError."""
+        # Arrange
+        repository = _repository()
+        missing = uuid.uuid7()
+
+        # Act
+        for _ in range(2):
+            with pytest.raises(EntityDoesNotExistError):
+                repository.get(missing)
+
+        # Assert
+        stats = repository.stats()
+        assert (stats.misses, stats.local_hits) == (1, 1)
+
+    def test_error_delete_invalidates_cached_entity(self) -> None:
+        # Arrange
+        author = Author(name="太宰治")
+        repository = _repository(author)
+        repository.get(author.id)
+
+        # Act
+        repository.delete(author.id)
+
+        # Assert
+        with pytest.raises(EntityDoesNotExistError):
+            repository.get(author.id)
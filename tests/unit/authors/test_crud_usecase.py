@@ -7,6 +7,8 @@ import pytest
 from authors.infrastructure.adapters.fake import FakeAuthorRepository
 from authors.usecases.crud import AuthorCrudUseCaseImpl
 from common.domain.entities.exceptions import EntityDoesNotExistError
+from common.domain.entities.exceptions import EntityVersionConflictError
+from common.domain.pagination import Cursor
 
 
 def _use_case() -> AuthorCrudUseCaseImpl:
@@ -29,6 +31,20 @@ class TestAuthorCrudUseCaseImpl:
         assert author.name == "太宰治"
         assert use_case.get(author.id).bio == "走れメロス"
 
+    def test_happy_create_many_persists_all_in_order(self) -> None:
+        """一括作成で全件が入力順に採番・永続化されること."""
+        # Arrange
+        use_case = _use_case()
+        items = [{"name": "太宰治", "bio": "走れメロス"}, {"name": "芥川"}]
+
+        # Act
+        authors = use_case.create_many(items=items)
+
+        # Assert
+        assert [author.name for author in authors] == ["太宰治", "芥川"]
+        assert authors[1].bio == ""
+        assert use_case.count() == 2
+
     def test_happy_update_partial_keeps_other_fields(self) -> None:
         """部分更新で指定外のフィールドが保たれること."""
         # Arrange
@@ -46,6 +62,24 @@ class TestAuthorCrudUseCaseImpl:
         assert updated.bio == "新略歴"
         assert updated.id == author.id
 
+    def test_happy_update_bumps_version(self) -> None:
+        """期待した版が一致すれば更新され、版が 1 進むこと."""
+        # Arrange
+        use_case = _use_case()
+        author = use_case.create(name="太宰治", bio="旧略歴")
+        first = use_case.update(author_id=author.id, fields={"bio": "一"})
+
+        # Act
+        second = use_case.update(
+            author_id=author.id,
+            fields={"bio": "二"},
+            expected_versions=frozenset({first.version or 0}),
+        )
+
+        # Assert
+        assert second.bio == "二"
+        assert second.version == (first.version or 0) + 1
+
     def test_happy_list_paginates(self) -> None:
         """一覧がページネーションされること."""
         # Arrange
@@ -60,6 +94,50 @@ class TestAuthorCrudUseCaseImpl:
         assert total == 3
         assert len(page1) == 2
 
+    def test_happy_find_after_walks_pages_by_keyset(self) -> None:
+        """cursor を辿ると name 順に重複・欠落なく一巡できること."""
+        # Arrange
+        use_case = _use_case()
+        for name in ["著者C", "著者A", "著者B"]:
+            use_case.create(name=name, bio="")
+
+        # Act
+        first, first_has_more = use_case.find_after(cursor=None, page_size=2)
+        last = first[-1]
+        second, second_has_more = use_case.find_after(
+            cursor=Cursor(key=last.name, tiebreaker=str(last.id)),
+            page_size=2,
+        )
+
+        # Assert
+        assert [author.name for author in first] == ["著者A", "著者B"]
+        assert first_has_more
+        assert [author.name for author in second] == ["著者C"]
+        assert not second_has_more
+
+    def test_happy_find_after_backward_returns_previous_page(self) -> None:
+        """backward の cursor で直前のページが昇順で返ること."""
+        # Arrange
+        use_case = _use_case()
+        for name in ["著者A", "著者B", "著者C"]:
+            use_case.create(name=name, bio="")
+        page, _ = use_case.find_after(cursor=None, page_size=3)
+        anchor = page[-1]
+
+        # Act
+        previous, has_more = use_case.find_after(
+            cursor=Cursor(
+                key=anchor.name,
+                tiebreaker=str(anchor.id),
+                backward=True,
+            ),
+            page_size=1,
+        )
+
+        # Assert
+        assert [author.name for author in previous] == ["著者B"]
+        assert has_more
+
     def test_happy_delete_removes(self) -> None:
         """削除後に取得すると不在エラーになること."""
         # Arrange
@@ -94,6 +172,34 @@ class TestAuthorCrudUseCaseImpl:
                 fields={"name": "幽霊"},
             )
 
+    def test_error_update_stale_version_raises(self) -> None:
+        """版が一致しなければ EntityVersionConflictError で更新しないこと."""
+        # Arrange
+        use_case = _use_case()
+        author = use_case.create(name="太宰治", bio="旧略歴")
+        use_case.update(author_id=author.id, fields={"bio": "他者の更新"})
+
+        # Act
+        with pytest.raises(EntityVersionConflictError):
+            use_case.update(
+                author_id=author.id,
+                fields={"bio": "上書き"},
+                expected_versions=frozenset({1}),
+            )
+
+        # Assert
+        assert use_case.get(author.id).bio == "他者の更新"
+
+    def test_error_update_rejects_invalid_name(self) -> None:
+        """現在値を読まない更新でもエンティティの検証を通すこと."""
+        # Arrange
+        use_case = _use_case()
+        author = use_case.create(name="太宰治", bio="")
+
+        # Act & Assert
+        with pytest.raises(ValueError, match="name"):
+            use_case.update(author_id=author.id, fields={"name": "   "})
+
     def test_error_delete_missing_raises(self) -> None:
         """存在しない ID の削除で EntityDoesNotExistError になること."""
         # Arrange
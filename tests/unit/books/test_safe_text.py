@@ -139,3 +139,67 @@ class TestSafeTextInvalid:
         """異常系: 記号カテゴリの任意テキストが拒否されること."""
         with pytest.raises(ValueError, match="使用できない文字"):
             SafeText(value=text)
+
+
+def _per_value_error(
+    text: str,
+    *,
+    min_length: int,
+    max_length: int,
+) -> str | None:
+    try:
+        SafeText(value=text, min_length=min_length, max_length=max_length)
+    except ValueError as e:
+        return str(e)
+    return None
+
+
+class TestSafeTextValidateMany:
+    """一括検証 (validate_many)"""
+
+    def test_happy_reports_each_value_in_order(self) -> None:
+        """正常系: 入力順に、問題なければ None、あればメッセージを返すこと."""
+        # Act
+        errors = SafeText.validate_many(
+            values=["吾輩は猫である", "", "a" * 256, "test<>value"],
+        )
+
+        # Assert
+        assert errors == [
+            None,
+            "1文字以上で入力してください",
+            "255文字以下で入力してください",
+            "使用できない文字が含まれています",
+        ]
+
+    def test_happy_accepts_empty_iterable(self) -> None:
+        assert SafeText.validate_many(values=iter(())) == []
+
+    @given(
+        texts=st.lists(st.text(max_size=12), max_size=20),
+        min_length=st.integers(min_value=0, max_value=3),
+        max_length=st.integers(min_value=3, max_value=10),
+    )
+    def test_happy_matches_per_value_validation(
+        self,
+        texts: list[str],
+        min_length: int,
+        max_length: int,
+    ) -> None:
+        """正常系: SafeText を 1 件ずつ作った場合と同じ判定になること."""
+        # Act
+        errors = SafeText.validate_many(
+            values=texts,
+            min_length=min_length,
+            max_length=max_length,
+        )
+
+        # Assert
+        assert errors == [
+            _per_value_error(
+                text,
+                min_length=min_length,
+                max_length=max_length,
+            )
+            for text in texts
+        ]
@@ -0,0 +1,75 @@
+"""表紙の派生画像 (books.thumbnails) のテスト."""
+
+from io import BytesIO
+
+from PIL import Image
+
+from books.thumbnails import THUMBNAIL_FORMATS
+from books.thumbnails import THUMBNAIL_SIZES
+from books.thumbnails import render_thumbnails
+from books.thumbnails import thumbnail_key
+
+
+def _image(
+    *,
+    mode: str,
+    image_format: str,
+    color: str | tuple[int, ...] = "red",
+) -> BytesIO:
+    buf = BytesIO()
+    Image.new(mode, (2000, 1000), color=color).save(buf, format=image_format)
+    buf.seek(0)
+    return buf
+
+
+class TestRenderThumbnails:
+    """render_thumbnails のテスト."""
+
+    def test_happy_renders_every_size_and_format(self) -> None:
+        # Act
+        rendered = render_thumbnails(
+            source=_image(mode="RGB", image_format="JPEG")
+        )
+
+        # Assert
+        assert set(rendered) == {
+            (size, fmt)
+            for size in THUMBNAIL_SIZES
+            for fmt in THUMBNAIL_FORMATS
+        }
+        for (size, fmt), data in rendered.items():
+            with Image.open(BytesIO(data)) as image:
+                assert image.format == THUMBNAIL_FORMATS[fmt][0]
+                # 長辺を size に収め、縦横比を保つ。
+                assert image.size == (size, size // 2)
+
+    def test_happy_keeps_alpha_in_webp_only(self) -> None:
+        """半透明の PNG は WebP では透過を保ち、JPEG では RGB にすること."""
+        # Act
+        rendered = render_thumbnails(
+            source=_image(
+                mode="RGBA",
+                image_format="PNG",
+                color=(255, 0, 0, 128),
+            )
+        )
+
+        # Assert
+        size = THUMBNAIL_SIZES[0]
+        with Image.open(BytesIO(rendered[size, "webp"])) as image:
+            assert image.mode == "RGBA"
+        with Image.open(BytesIO(rendered[size, "jpeg"])) as image:
+            assert image.mode == "RGB"
+
+
+class TestThumbnailKey:
+    """thumbnail_key のテスト."""
+
+    def test_happy_is_deterministic_next_to_covers(self) -> None:
+        # Act
+        key = thumbnail_key(
+            cover_name="books/covers/neko.jpg", size=120, fmt="webp"
+        )
+
+        # Assert
+        assert key == "books/thumbnails/neko.jpg/120.webp"
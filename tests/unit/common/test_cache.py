@@ -0,0 +1,53 @@
+"""プロセス内 LRU キャッシュのテスト."""
+
+from common.interfaces.repositories.cache import LocalCache
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestLocalCache:
+    """LocalCache のテスト."""
+
+    def test_happy_evicts_least_recently_used(self) -> None:
+        # Arrange
+        cache: LocalCache[int] = LocalCache(maxsize=2, ttl=60)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+
+        # Act
+        cache.set("c", 3)
+
+        # Assert
+        assert cache.get("b") is None
+        assert (cache.get("a"), cache.get("c")) == (1, 3)
+        assert len(cache) == 2
+
+    def test_happy_expires_after_ttl(self) -> None:
+        # Arrange
+        clock = _Clock()
+        cache: LocalCache[int] = LocalCache(maxsize=2, ttl=5, clock=clock)
+        cache.set("a", 1)
+
+        # Act
+        clock.now = 5.0
+
+        # Assert
+        assert cache.get("a") is None
+        assert len(cache) == 0
+
+    def test_happy_zero_maxsize_disables_cache(self) -> None:
+        # Arrange
+        cache: LocalCache[int] = LocalCache(maxsize=0, ttl=60)
+
+        # Act
+        cache.set("a", 1)
+
+        # Assert
+        assert cache.get("a") is None
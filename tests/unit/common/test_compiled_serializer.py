@@ -0,0 +1,119 @@
+"""事前組み立て (compiled) 出力シリアライザのテスト.
+
+DRF 標準の ``Serializer.to_representation`` と同じ出力になることを確認する。
+"""
+
+from datetime import UTC
+from datetime import datetime
+from typing import Any
+
+import pytest
+from rest_framework import serializers
+
+from authors.domain.entities.author import Author
+from authors.interfaces.serializers.author import AuthorSerializer
+from common.interfaces.compiled_serializer import CompiledSerializer
+from notifications.domain.event_type import EventType
+from notifications.domain.notification_channel import NotificationChannel
+from notifications.domain.notification_log import NotificationLog
+from notifications.domain.notification_status import NotificationStatus
+from notifications.interfaces.serializers.notification_log import (
+    NotificationLogSerializer,
+)
+
+
+def _drf(
+    serializer: serializers.Serializer[Any],
+    instance: Any,
+) -> Any:
+    return serializers.Serializer.to_representation(serializer, instance)
+
+
+class TestCompiledSerializer:
+    """CompiledSerializer のテスト."""
+
+    def test_happy_author_matches_drf(self) -> None:
+        # Arrange
+        author = Author(
+            name="太宰治",
+            bio="作家",
+            created_at=datetime(2026, 1, 1, 9, 30, tzinfo=UTC),
+            updated_at=None,
+        )
+        serializer = AuthorSerializer(instance=author)
+
+        # Act
+        data = serializer.data
+
+        # Assert
+        assert data == _drf(serializer, author)
+        assert data["updated_at"] is None
+
+    def test_happy_notification_log_matches_drf(self) -> None:
+        """StrEnum や整数フィールドも DRF と同じ値になること."""
+        # Arrange
+        log = NotificationLog(
+            event_type=EventType.BOOK_CREATED,
+            message="本が登録されました: テスト",
+            status=NotificationStatus.SUCCESS,
+            recipient="discord",
+            channel=NotificationChannel.DISCORD,
+            retry_count=2,
+            created_at=datetime(2026, 1, 1, tzinfo=UTC),
+        )
+        serializer = NotificationLogSerializer(instance=log)
+
+        # Act
+        data = serializer.data
+
+        # Assert
+        assert data == _drf(serializer, log)
+        assert type(data["status"]) is str
+
+    def test_happy_many_matches_drf(self) -> None:
+        # Arrange
+        authors = [Author(name=f"著者{i}") for i in range(3)]
+        serializer = AuthorSerializer(instance=authors, many=True)
+
+        # Act
+        data = serializer.data
+
+        # Assert
+        child = serializer.child  # type: ignore[attr-defined]
+        assert data == [_drf(child, author) for author in authors]
+
+    def test_happy_sparse_fields(self) -> None:
+        """フィールドを pop した状態でも残りだけを出力すること."""
+        # Arrange
+        author = Author(name="太宰治")
+        serializer = AuthorSerializer(instance=author)
+        for name in ("bio", "created_at", "updated_at"):
+            serializer.fields.pop(name)
+
+        # Act
+        data = serializer.data
+
+        # Assert
+        assert data == {"id": str(author.id), "name": "太宰治"}
+
+    def test_happy_single_field(self) -> None:
+        # Arrange
+        author = Author(name="太宰治")
+        serializer = AuthorSerializer(instance=author)
+        for name in ("id", "bio", "created_at", "updated_at"):
+            serializer.fields.pop(name)
+
+        # Act
+        data = serializer.data
+
+        # Assert
+        assert data == {"name": "太宰治"}
+
+    def test_error_unsupported_field(self) -> None:
+        # Arrange
+        class _Serializer(CompiledSerializer):
+            name = serializers.ListField(read_only=True)
+
+        # Act & Assert
+        with pytest.raises(TypeError, match="ListField"):
+            _ = _Serializer(instance=Author(name="太宰治")).data
@@ -0,0 +1,47 @@
+"""keyset ページング位置トークンのテスト."""
+
+import pytest
+
+from common.domain.pagination import Cursor
+from common.interfaces.cursor import decode_cursor
+from common.interfaces.cursor import encode_cursor
+
+
+class TestCursorToken:
+    """encode_cursor / decode_cursor のテスト."""
+
+    @pytest.mark.parametrize(
+        "cursor",
+        [
+            Cursor(key="夏目漱石", tiebreaker="1"),
+            Cursor(key="", tiebreaker="abc", backward=True),
+        ],
+        ids=["forward", "backward"],
+    )
+    def test_happy_round_trip(self, cursor: Cursor) -> None:
+        """トークン化して戻すと同じ位置になること."""
+        # Act
+        decoded = decode_cursor(encode_cursor(cursor))
+
+        # Assert
+        assert decoded == cursor
+
+    def test_happy_token_is_url_safe(self) -> None:
+        """トークンがクエリ文字列にそのまま載せられること."""
+        # Act
+        token = encode_cursor(Cursor(key="a/b+c?", tiebreaker="1"))
+
+        # Assert
+        assert set(token) <= set(
+            "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789-_"
+        )
+
+    @pytest.mark.parametrize(
+        "token",
+        ["!!!", "bm90LWpzb24", "WzFd", "eyJrIjoxLCJ0IjoiMSJ9"],
+        ids=["not_base64", "not_json", "not_object", "wrong_type"],
+    )
+    def test_error_rejects_tampered_token(self, token: str) -> None:
+        """異常系: 改ざんされたトークンは ValueError になること."""
+        with pytest.raises(ValueError, match="cursor"):
+            decode_cursor(token)
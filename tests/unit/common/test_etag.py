@@ -0,0 +1,95 @@
+"""ETag 生成と If-None-Match 照合のテスト."""
+
+import pytest
+
+from common.interfaces.etag import if_match_versions
+from common.interfaces.etag import if_none_match
+from common.interfaces.etag import make_etag
+from common.interfaces.etag import make_version_etag
+
+
+class TestMakeEtag:
+    """make_etag のテスト."""
+
+    def test_happy_is_quoted_and_deterministic(self) -> None:
+        # Act
+        first = make_etag(parts=["a", "b"])
+        second = make_etag(parts=["a", "b"])
+
+        # Assert
+        assert first == second
+        assert first.startswith('"')
+        assert first.endswith('"')
+
+    def test_happy_distinguishes_part_boundaries(self) -> None:
+        """部品の区切りが異なれば別の ETag になること."""
+        # Act
+        joined = make_etag(parts=["ab", "c"])
+        split = make_etag(parts=["a", "bc"])
+
+        # Assert
+        assert joined != split
+
+
+class TestIfNoneMatch:
+    """if_none_match のテスト."""
+
+    @pytest.mark.parametrize(
+        "header",
+        ['"x"', 'W/"x"', '"y", "x"', "*"],
+        ids=["strong", "weak", "list", "wildcard"],
+    )
+    def test_happy_matches(self, header: str) -> None:
+        # Act & Assert
+        assert if_none_match(header, etag='"x"')
+
+    @pytest.mark.parametrize(
+        "header",
+        [None, '"y"', "x"],
+        ids=["absent", "other", "unquoted"],
+    )
+    def test_error_does_not_match(self, header: str | None) -> None:
+        # Act & Assert
+        assert not if_none_match(header, etag='"x"')
+
+
+class TestIfMatchVersions:
+    """make_version_etag / if_match_versions のテスト."""
+
+    def test_happy_extracts_versions_of_variant(self) -> None:
+        # Arrange
+        header = ", ".join(
+            [
+                make_version_etag(version=3, variant="*"),
+                make_version_etag(version=4, variant="*"),
+            ]
+        )
+
+        # Act
+        versions = if_match_versions(header, variant="*")
+
+        # Assert
+        assert versions == frozenset({3, 4})
+
+    @pytest.mark.parametrize(
+        "header",
+        [None, "*"],
+        ids=["absent", "wildcard"],
+    )
+    def test_happy_unconditional(self, header: str | None) -> None:
+        # Act & Assert
+        assert if_match_versions(header, variant="*") is None
+
+    @pytest.mark.parametrize(
+        "header",
+        [
+            f"W/{make_version_etag(version=3, variant='*')}",
+            make_version_etag(version=3, variant="name"),
+            '"3-00000000000000000000000000000000"',
+            '"garbage"',
+        ],
+        ids=["weak", "other_variant", "forged", "malformed"],
+    )
+    def test_error_rejects_non_matching_tags(self, header: str) -> None:
+        # Act & Assert
+        assert if_match_versions(header, variant="*") == frozenset()
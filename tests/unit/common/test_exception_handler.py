@@ -11,6 +11,7 @@ from rest_framework.test import APIRequestFactory
 
 from common.domain.entities.exceptions import EntityDoesNotExistError
 from common.domain.entities.exceptions import EntityError
+from common.domain.entities.exceptions import EntityVersionConflictError
 from common.domain.entities.exceptions import GenerateRepositoryError
 from common.domain.exceptions import AppError
 from common.infrastructure.adapters.exceptions import AdapterError
@@ -33,6 +34,10 @@ class TestCustomExceptionHandler:
         ("exc", "expected_status"),
         [
             (EntityDoesNotExistError(), http.HTTPStatus.NOT_FOUND),
+            (
+                EntityVersionConflictError("版不一致"),
+                http.HTTPStatus.PRECONDITION_FAILED,
+            ),
             (EntityError("不正"), http.HTTPStatus.UNPROCESSABLE_ENTITY),
             (
                 GenerateRepositoryError("不正"),
@@ -48,6 +53,7 @@ class TestCustomExceptionHandler:
         ],
         ids=[
             "not_found",
+            "version_conflict",
             "entity_error",
             "generate_repository_error",
             "adapter_error",
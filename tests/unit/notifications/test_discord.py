@@ -1,17 +1,36 @@
+import json
+import threading
+import time
+from collections.abc import Callable
 from http import HTTPStatus
-from unittest.mock import patch
+from typing import Any
 
 import httpx
 import pytest
 
 from common.infrastructure.factories.logger import LoggerFactoryImpl
+from notifications.infrastructure.adapters.discord import DiscordClientConfig
 from notifications.infrastructure.adapters.discord import (
     DiscordWebhookNotifierImpl,
 )
+from notifications.infrastructure.adapters.discord import build_discord_client
+from notifications.infrastructure.adapters.failure_classifier import (
+    HttpxDeliveryFailureClassifierImpl,
+)
 
 _TEST_URL = "https://discord.com/api/webhooks/test"
 _factory = LoggerFactoryImpl()
 
+type _Handler = Callable[[httpx.Request], httpx.Response]
+
+
+def _notifier(handler: _Handler) -> DiscordWebhookNotifierImpl:
+    return DiscordWebhookNotifierImpl(
+        webhook_url=_TEST_URL,
+        client=httpx.Client(transport=httpx.MockTransport(handler)),
+        logger_factory=_factory,
+    )
+
 
 class TestDiscordWebhookNotifierImpl:
     """DiscordWebhookNotifierImpl の送信テスト."""
@@ -19,32 +38,22 @@ class TestDiscordWebhookNotifierImpl:
     def test_happy_sends_post_request(self) -> None:
         """Discord Webhook に POST リクエストが送信されること."""
         # Arrange
-        notifier = DiscordWebhookNotifierImpl(
-            webhook_url=_TEST_URL,
-            logger_factory=_factory,
-        )
-        mock_response = httpx.Response(
-            status_code=HTTPStatus.NO_CONTENT,
-            request=httpx.Request(
-                method="POST",
-                url=_TEST_URL,
-            ),
-        )
+        requests: list[httpx.Request] = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            requests.append(request)
+            return httpx.Response(status_code=HTTPStatus.NO_CONTENT)
+
+        notifier = _notifier(handler)
 
         # Act
-        with patch.object(
-            httpx,
-            "post",
-            return_value=mock_response,
-        ) as mock_post:
-            notifier.send(message="テスト通知")
+        notifier.send(message="テスト通知")
+        notifier.send(message="2 件目")
 
         # Assert
-        mock_post.assert_called_once_with(
-            url=_TEST_URL,
-            json={"content": "テスト通知"},
-            timeout=10.0,
-        )
+        assert [request.method for request in requests] == ["POST", "POST"]
+        assert str(requests[0].url) == _TEST_URL
+        assert json.loads(requests[0].content) == {"content": "テスト通知"}
 
     @pytest.mark.parametrize(
         ("exception_cls", "side_effect"),
@@ -55,7 +64,7 @@ class TestDiscordWebhookNotifierImpl:
             ),
             (
                 httpx.TimeoutException,
-                httpx.TimeoutException("タイムアウト"),
+                httpx.ReadTimeout("タイムアウト"),
             ),
             (
                 httpx.ConnectError,
@@ -74,32 +83,161 @@ class TestDiscordWebhookNotifierImpl:
         side_effect: Exception | None,
     ) -> None:
         """通信障害時に例外が発生すること."""
-        # Arrange
-        notifier = DiscordWebhookNotifierImpl(
-            webhook_url=_TEST_URL,
-            logger_factory=_factory,
-        )
 
-        if side_effect is not None:
-            ctx = patch.object(
-                httpx,
-                "post",
-                side_effect=side_effect,
-            )
-        else:
-            mock_response = httpx.Response(
+        # Arrange
+        def handler(request: httpx.Request) -> httpx.Response:
+            if side_effect is not None:
+                raise side_effect
+            return httpx.Response(
                 status_code=HTTPStatus.INTERNAL_SERVER_ERROR,
-                request=httpx.Request(
-                    method="POST",
-                    url=_TEST_URL,
-                ),
-            )
-            ctx = patch.object(
-                httpx,
-                "post",
-                return_value=mock_response,
             )
 
+        notifier = _notifier(handler)
+
         # Act & Assert
-        with ctx, pytest.raises(exception_cls):
+        with pytest.raises(exception_cls):
             notifier.send(message="テスト通知")
+
+
+class TestBuildDiscordClient:
+    """build_discord_client の設定テスト."""
+
+    def test_happy_applies_split_timeouts(self) -> None:
+        """接続と読み込みのタイムアウトを分けて設定すること."""
+        # Arrange
+        config = DiscordClientConfig(
+            max_connections=4,
+            max_keepalive_connections=2,
+            keepalive_expiry=15.0,
+            http2=False,
+            connect_timeout=1.5,
+            read_timeout=8.0,
+        )
+
+        # Act
+        with build_discord_client(config=config) as client:
+            timeout = client.timeout
+
+        # Assert
+        assert timeout.connect == 1.5
+        assert timeout.read == 8.0
+        assert timeout.pool == 1.5
+
+
+def _limited(
+    *,
+    remaining: int,
+    reset_after: float,
+) -> httpx.Response:
+    return httpx.Response(
+        status_code=HTTPStatus.NO_CONTENT,
+        headers={
+            "X-RateLimit-Remaining": str(remaining),
+            "X-RateLimit-Reset-After": str(reset_after),
+        },
+    )
+
+
+class TestDiscordWebhookRateLimit:
+    """DiscordWebhookNotifierImpl のレート制限への追従テスト."""
+
+    def test_happy_waits_for_reset(self) -> None:
+        """残り回数を使い切ったらリセットまで待って送ること."""
+        # Arrange
+        sent_at: list[float] = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            sent_at.append(time.monotonic())
+            return _limited(remaining=0, reset_after=0.3)
+
+        notifier = _notifier(handler)
+
+        # Act
+        notifier.send(message="1 件目")
+        notifier.send(message="2 件目")
+
+        # Assert
+        assert sent_at[1] - sent_at[0] >= 0.25
+
+    def test_happy_packs_waiting_messages(self) -> None:
+        """制限で待つ間に来たメッセージを 1 回の POST に詰めること."""
+        # Arrange
+        bodies: list[dict[str, Any]] = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            bodies.append(json.loads(request.content))
+            return _limited(remaining=0, reset_after=0.5)
+
+        notifier = _notifier(handler)
+        notifier.send(message="先頭")
+        messages = [f"{number:04d}" + "あ" * 1496 for number in range(5)]
+        threads = [
+            threading.Thread(target=notifier.send, args=(message,))
+            for message in messages
+        ]
+
+        # Act
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        # Assert
+        packed = bodies[1:]
+        assert len(packed) == 2
+        posted = [
+            message
+            for body in packed
+            for text in [
+                body["content"],
+                *(embed["description"] for embed in body.get("embeds", [])),
+            ]
+            for message in text.split("\n")
+        ]
+        assert sorted(posted) == messages
+        assert all(len(body["content"]) <= 2000 for body in packed)
+
+    def test_happy_send_many_packs_batch(self) -> None:
+        """send_many に渡した分を詰めて送り、1 件ごとに成功を返すこと."""
+        # Arrange
+        bodies: list[dict[str, Any]] = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            bodies.append(json.loads(request.content))
+            return httpx.Response(status_code=HTTPStatus.NO_CONTENT)
+
+        notifier = _notifier(handler)
+        messages = [f"{number:04d}" + "あ" * 1496 for number in range(5)]
+
+        # Act
+        errors = notifier.send_many(messages=messages)
+
+        # Assert
+        assert errors == [None] * 5
+        assert len(bodies) == 2
+        assert bodies[0]["content"] == messages[0]
+
+    def test_error_too_many_requests_is_not_resent(self) -> None:
+        """429 は送り直さず再試行できる失敗で返し、次は Retry-After 待つ."""
+        # Arrange
+        sent_at: list[float] = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            sent_at.append(time.monotonic())
+            return httpx.Response(
+                status_code=HTTPStatus.TOO_MANY_REQUESTS,
+                headers={"Retry-After": "0.3"},
+            )
+
+        notifier = _notifier(handler)
+
+        # Act
+        (error,) = notifier.send_many(messages=["テスト通知"])
+        with pytest.raises(httpx.HTTPStatusError):
+            notifier.send(message="2 件目")
+
+        # Assert
+        assert len(sent_at) == 2
+        assert sent_at[1] - sent_at[0] >= 0.25
+        assert isinstance(error, httpx.HTTPStatusError)
+        assert HttpxDeliveryFailureClassifierImpl().is_retryable(error=error)
@@ -0,0 +1,269 @@
+import json
+import threading
+import time
+from collections.abc import Callable
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+
+from common.infrastructure.factories.logger import LoggerFactoryImpl
+from notifications.domain.events import AuthorCreated
+from notifications.domain.events import AuthorsBulkCreated
+from notifications.domain.events import BookCreated
+from notifications.domain.notification_channel import NotificationChannel
+from notifications.domain.overflow_policy import OverflowPolicy
+from notifications.infrastructure.adapters.dispatcher import DispatcherConfig
+from notifications.infrastructure.adapters.dispatcher import (
+    ThreadedNotificationDispatcherImpl,
+)
+from notifications.infrastructure.adapters.failure_classifier import (
+    HttpxDeliveryFailureClassifierImpl,
+)
+from notifications.infrastructure.adapters.fake import (
+    FakeNotificationLogWriter,
+)
+from notifications.infrastructure.adapters.fake import FakeNotifier
+from notifications.usecases.notify import DeliverNotificationUseCaseImpl
+from notifications.usecases.notify import NotifyAuthorCreatedUseCaseImpl
+from notifications.usecases.notify import NotifyAuthorsBulkCreatedUseCaseImpl
+from notifications.usecases.notify import NotifyBookCreatedUseCaseImpl
+
+_factory = LoggerFactoryImpl()
+
+
+class _GatedNotifier(FakeNotifier):
+    """gate が開くまで send を止めるテスト用 Notifier."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.started = threading.Event()
+        self.gate = threading.Event()
+
+    def send(self, message: str) -> None:
+        self.started.set()
+        self.gate.wait()
+        super().send(message=message)
+
+
+def _build(
+    notifier: FakeNotifier,
+    *,
+    spill_path: Path,
+    workers: int = 1,
+    queue_size: int = 10,
+    overflow: OverflowPolicy = OverflowPolicy.SPILL,
+) -> ThreadedNotificationDispatcherImpl:
+    writer = FakeNotificationLogWriter()
+    use_case_args = {
+        "notifier": notifier,
+        "logger_factory": _factory,
+        "log_writer": writer,
+        "channel": NotificationChannel.FAKE,
+        "classifier": HttpxDeliveryFailureClassifierImpl(),
+    }
+    return ThreadedNotificationDispatcherImpl(
+        config=DispatcherConfig(
+            queue_size=queue_size,
+            workers=workers,
+            overflow=overflow,
+            spill_path=spill_path,
+            block_timeout=0.1,
+            drain_timeout=5.0,
+        ),
+        deliver=DeliverNotificationUseCaseImpl(
+            book_created=NotifyBookCreatedUseCaseImpl(**use_case_args),
+            author_created=NotifyAuthorCreatedUseCaseImpl(**use_case_args),
+            authors_bulk_created=NotifyAuthorsBulkCreatedUseCaseImpl(
+                **use_case_args,
+            ),
+        ),
+        logger_factory=_factory,
+    )
+
+
+def _author(name: str) -> AuthorCreated:
+    return AuthorCreated(name=name)
+
+
+def _wait_until(predicate: Callable[[], bool]) -> None:
+    deadline = time.monotonic() + 5.0
+    while not predicate():
+        assert time.monotonic() < deadline, "待ち切れませんでした"
+        time.sleep(0.01)
+
+
+@pytest.fixture
+def gated() -> Iterator[_GatedNotifier]:
+    notifier = _GatedNotifier()
+    yield notifier
+    # 止めたままのスレッドを残さない。
+    notifier.gate.set()
+
+
+@pytest.fixture
+def spill_path(tmp_path: Path) -> Path:
+    return tmp_path / "spill.jsonl"
+
+
+class TestThreadedNotificationDispatcherImpl:
+    """ThreadedNotificationDispatcherImpl の配送テスト."""
+
+    def test_happy_dispatch_returns_before_delivery(
+        self,
+        gated: _GatedNotifier,
+        spill_path: Path,
+    ) -> None:
+        """送信が終わるのを待たずに戻り、後で配られること."""
+        # Arrange
+        dispatcher = _build(gated, spill_path=spill_path)
+
+        # Act
+        dispatcher.dispatch(event=_author("夏目漱石"))
+        dispatcher.dispatch(event=_author("森鴎外"))
+        gated.started.wait(timeout=5.0)
+        in_flight = dispatcher.stats()
+        gated.gate.set()
+        dispatcher.shutdown()
+
+        # Assert
+        assert gated.messages == (
+            "著者が登録されました: 夏目漱石",
+            "著者が登録されました: 森鴎外",
+        )
+        assert in_flight.depth == 1
+        assert in_flight.delivered == 0
+        stats = dispatcher.stats()
+        assert stats.enqueued == 2
+        assert stats.delivered == 2
+        assert stats.depth == 0
+
+    def test_happy_routes_each_event_type(self, spill_path: Path) -> None:
+        """イベントの型ごとに対応するユースケースで配ること."""
+        # Arrange
+        notifier = FakeNotifier()
+        dispatcher = _build(notifier, spill_path=spill_path, workers=0)
+
+        # Act
+        dispatcher.dispatch(
+            event=BookCreated(
+                title="吾輩は猫である",
+                isbn="9784003101018",
+                author_name="夏目漱石",
+            )
+        )
+        dispatcher.dispatch(event=_author("森鴎外"))
+        dispatcher.dispatch(
+            event=AuthorsBulkCreated(names=("芥川龍之介", "太宰治")),
+        )
+
+        # Assert
+        book, author, bulk = notifier.messages
+        assert "吾輩は猫である" in book
+        assert "森鴎外" in author
+        assert "芥川龍之介" in bulk
+        assert dispatcher.stats().delivered == 3
+
+    def test_happy_drop_oldest_keeps_newest(
+        self,
+        gated: _GatedNotifier,
+        spill_path: Path,
+    ) -> None:
+        """満杯なら最も古い待ちイベントを捨てて積むこと."""
+        # Arrange
+        dispatcher = _build(
+            gated,
+            spill_path=spill_path,
+            queue_size=1,
+            overflow=OverflowPolicy.DROP_OLDEST,
+        )
+        dispatcher.dispatch(event=_author("送信中"))
+        gated.started.wait(timeout=5.0)
+        dispatcher.dispatch(event=_author("古い"))
+
+        # Act
+        dispatcher.dispatch(event=_author("新しい"))
+        gated.gate.set()
+        dispatcher.shutdown()
+
+        # Assert
+        assert gated.messages == (
+            "著者が登録されました: 送信中",
+            "著者が登録されました: 新しい",
+        )
+        assert dispatcher.stats().dropped == 1
+
+    def test_happy_block_gives_up_after_timeout(
+        self,
+        gated: _GatedNotifier,
+        spill_path: Path,
+    ) -> None:
+        """BLOCK は block_timeout まで待ち、空かなければ捨てること."""
+        # Arrange
+        dispatcher = _build(
+            gated,
+            spill_path=spill_path,
+            queue_size=1,
+            overflow=OverflowPolicy.BLOCK,
+        )
+        dispatcher.dispatch(event=_author("送信中"))
+        gated.started.wait(timeout=5.0)
+        dispatcher.dispatch(event=_author("待ち"))
+
+        # Act
+        dispatcher.dispatch(event=_author("溢れ"))
+
+        # Assert
+        stats = dispatcher.stats()
+        assert stats.dropped == 1
+        assert stats.high_water == 1
+
+    def test_happy_spilled_events_survive_restart(
+        self,
+        gated: _GatedNotifier,
+        spill_path: Path,
+    ) -> None:
+        """退避したイベントは次に起動したディスパッチャが配ること."""
+        # Arrange
+        dispatcher = _build(gated, spill_path=spill_path, queue_size=1)
+        dispatcher.dispatch(event=_author("送信中"))
+        gated.started.wait(timeout=5.0)
+        dispatcher.dispatch(event=_author("待ち"))
+        dispatcher.dispatch(event=_author("退避"))
+        spilled = dispatcher.stats().spilled
+        gated.gate.set()
+        dispatcher.shutdown()
+
+        # Act
+        notifier = FakeNotifier()
+        restarted = _build(notifier, spill_path=spill_path)
+        _wait_until(lambda: restarted.stats().delivered == 1)
+        restarted.shutdown()
+
+        # Assert
+        assert spilled == 1
+        assert notifier.messages == ("著者が登録されました: 退避",)
+        assert not spill_path.exists()
+
+    def test_happy_shutdown_spills_undelivered(
+        self,
+        gated: _GatedNotifier,
+        spill_path: Path,
+    ) -> None:
+        """時間内に配り切れなかったイベントを退避ファイルに残すこと."""
+        # Arrange
+        dispatcher = _build(gated, spill_path=spill_path)
+        dispatcher.dispatch(event=_author("送信中"))
+        gated.started.wait(timeout=5.0)
+        dispatcher.dispatch(event=_author("待ち"))
+
+        # Act
+        dispatcher.shutdown(timeout=0.1)
+        dispatcher.dispatch(event=_author("停止後"))
+
+        # Assert
+        lines = spill_path.read_text(encoding="utf-8").splitlines()
+        assert [json.loads(line)["event"]["name"] for line in lines] == [
+            "待ち",
+            "停止後",
+        ]
@@ -0,0 +1,60 @@
+from http import HTTPStatus
+
+import httpx
+import pytest
+
+from notifications.infrastructure.adapters.failure_classifier import (
+    HttpxDeliveryFailureClassifierImpl,
+)
+
+_classifier = HttpxDeliveryFailureClassifierImpl()
+
+
+def _status_error(status: HTTPStatus) -> httpx.HTTPStatusError:
+    request = httpx.Request(method="POST", url="https://example.com")
+    return httpx.HTTPStatusError(
+        "HTTP エラー",
+        request=request,
+        response=httpx.Response(status_code=status, request=request),
+    )
+
+
+class TestHttpxDeliveryFailureClassifierImpl:
+    """HttpxDeliveryFailureClassifierImpl の分類テスト."""
+
+    @pytest.mark.parametrize(
+        ("error", "expected"),
+        [
+            (httpx.ConnectTimeout("タイムアウト"), True),
+            (httpx.ConnectError("接続失敗"), True),
+            (httpx.RemoteProtocolError("切断"), True),
+            (_status_error(HTTPStatus.SERVICE_UNAVAILABLE), True),
+            (_status_error(HTTPStatus.TOO_MANY_REQUESTS), True),
+            (_status_error(HTTPStatus.BAD_REQUEST), False),
+            (_status_error(HTTPStatus.NOT_FOUND), False),
+            (httpx.UnsupportedProtocol("ftp"), False),
+            (RuntimeError("バグ"), False),
+        ],
+        ids=[
+            "connect_timeout",
+            "connect_error",
+            "remote_protocol_error",
+            "service_unavailable",
+            "too_many_requests",
+            "bad_request",
+            "not_found",
+            "unsupported_protocol",
+            "runtime_error",
+        ],
+    )
+    def test_happy_classifies_error(
+        self,
+        error: Exception,
+        expected: bool,
+    ) -> None:
+        """一時的な失敗だけを再試行の対象とすること."""
+        # Act
+        result = _classifier.is_retryable(error=error)
+
+        # Assert
+        assert result is expected
@@ -1,23 +1,32 @@
+from collections.abc import Sequence
 from http import HTTPStatus
 
+import httpx
 from hypothesis import given
 from hypothesis import strategies as st
 
 from common.infrastructure.factories.logger import LoggerFactoryImpl
 from notifications.domain.events import AuthorCreated
+from notifications.domain.events import AuthorsBulkCreated
 from notifications.domain.events import BookCreated
 from notifications.domain.notification_channel import NotificationChannel
 from notifications.domain.results import NotificationProblem
 from notifications.domain.results import NotificationSuccess
+from notifications.infrastructure.adapters.failure_classifier import (
+    HttpxDeliveryFailureClassifierImpl,
+)
 from notifications.infrastructure.adapters.fake import (
     FakeNotificationLogWriter,
 )
 from notifications.infrastructure.adapters.fake import FakeNotifier
+from notifications.usecases.notify import DeliverNotificationUseCaseImpl
 from notifications.usecases.notify import NotifyAuthorCreatedUseCaseImpl
+from notifications.usecases.notify import NotifyAuthorsBulkCreatedUseCaseImpl
 from notifications.usecases.notify import NotifyBookCreatedUseCaseImpl
 
 _non_empty_text = st.text(min_size=1).filter(lambda s: s.strip())
 _real_factory = LoggerFactoryImpl()
+_classifier = HttpxDeliveryFailureClassifierImpl()
 
 
 class _FailingNotifier:
@@ -28,6 +37,31 @@ class _FailingNotifier:
         raise RuntimeError(msg)
 
 
+class _TimeoutNotifier:
+    """send 時にタイムアウトするテスト用 Notifier."""
+
+    def send(self, message: str) -> None:
+        msg = "タイムアウト"
+        raise httpx.ReadTimeout(msg)
+
+
+class _BatchRecordingNotifier(FakeNotifier):
+    """send_many の呼び出しごとの件数を記録し、"失敗" を含む分を失敗させる."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.batches: list[int] = []
+
+    def send(self, message: str) -> None:
+        if "失敗" in message:
+            raise httpx.ReadTimeout(message)
+        super().send(message=message)
+
+    def send_many(self, messages: Sequence[str]) -> list[Exception | None]:
+        self.batches.append(len(messages))
+        return super().send_many(messages=messages)
+
+
 class _FailingLogWriter:
     """save 時に例外を投げるテスト用 Writer."""
 
@@ -61,6 +95,7 @@ class TestNotifyBookCreatedUseCaseImpl:
             logger_factory=_real_factory,
             log_writer=writer,
             channel=NotificationChannel.FAKE,
+            classifier=_classifier,
         )
         event = BookCreated(
             title="吾輩は猫である",
@@ -98,6 +133,7 @@ class TestNotifyBookCreatedUseCaseImpl:
             logger_factory=_real_factory,
             log_writer=writer,
             channel=NotificationChannel.FAKE,
+            classifier=_classifier,
         )
         event = BookCreated(
             title=title,
@@ -126,6 +162,7 @@ class TestNotifyBookCreatedUseCaseImpl:
             logger_factory=_real_factory,
             log_writer=writer,
             channel=NotificationChannel.FAKE,
+            classifier=_classifier,
         )
         event = BookCreated(
             title="テスト本",
@@ -154,6 +191,7 @@ class TestNotifyBookCreatedUseCaseImpl:
             logger_factory=_real_factory,
             log_writer=writer,
             channel=NotificationChannel.FAKE,
+            classifier=_classifier,
         )
         event = BookCreated(
             title="テスト",
@@ -180,6 +218,7 @@ class TestNotifyBookCreatedUseCaseImpl:
             logger_factory=_real_factory,
             log_writer=_FailingLogWriter(),
             channel=NotificationChannel.FAKE,
+            classifier=_classifier,
         )
         event = BookCreated(
             title="テスト",
@@ -204,6 +243,7 @@ class TestNotifyBookCreatedUseCaseImpl:
             logger_factory=_real_factory,
             log_writer=writer,
             channel=NotificationChannel.FAKE,
+            classifier=_classifier,
         )
         event = BookCreated(
             title="テスト",
@@ -218,6 +258,34 @@ class TestNotifyBookCreatedUseCaseImpl:
         assert isinstance(result, NotificationProblem)
         assert result.status == HTTPStatus.BAD_GATEWAY
         assert "テスト" in result.detail
+        assert not result.retryable
+
+    def test_error_marks_timeout_retryable(self) -> None:
+        """タイムアウトは再試行できる失敗とし、試行回数を履歴に残すこと."""
+        # Arrange
+        writer = FakeNotificationLogWriter()
+        use_case = NotifyBookCreatedUseCaseImpl(
+            notifier=_TimeoutNotifier(),
+            logger_factory=_real_factory,
+            log_writer=writer,
+            channel=NotificationChannel.FAKE,
+            classifier=_classifier,
+        )
+        event = BookCreated(
+            title="テスト",
+            isbn="9784003101018",
+            author_name="テスト著者",
+        )
+
+        # Act
+        result = use_case.execute(event=event, retry_count=2)
+
+        # Assert
+        assert isinstance(result, NotificationProblem)
+        assert result.retryable
+        (log,) = writer.logs
+        assert log["status"] == "failure"
+        assert log["retry_count"] == 2
 
 
 class TestNotifyAuthorCreatedUseCaseImpl:
@@ -235,6 +303,7 @@ class TestNotifyAuthorCreatedUseCaseImpl:
             logger_factory=_real_factory,
             log_writer=writer,
             channel=NotificationChannel.FAKE,
+            classifier=_classifier,
         )
         event = AuthorCreated(name="太宰治")
 
@@ -258,6 +327,7 @@ class TestNotifyAuthorCreatedUseCaseImpl:
             logger_factory=_real_factory,
             log_writer=writer,
             channel=NotificationChannel.FAKE,
+            classifier=_classifier,
         )
         event = AuthorCreated(name=name)
 
@@ -281,6 +351,7 @@ class TestNotifyAuthorCreatedUseCaseImpl:
             logger_factory=_real_factory,
             log_writer=writer,
             channel=NotificationChannel.FAKE,
+            classifier=_classifier,
         )
         event = AuthorCreated(name="テスト著者")
 
@@ -304,6 +375,7 @@ class TestNotifyAuthorCreatedUseCaseImpl:
             logger_factory=_real_factory,
             log_writer=writer,
             channel=NotificationChannel.FAKE,
+            classifier=_classifier,
         )
         event = AuthorCreated(name="テスト著者")
 
@@ -314,3 +386,145 @@ class TestNotifyAuthorCreatedUseCaseImpl:
         assert isinstance(result, NotificationProblem)
         assert result.status == HTTPStatus.BAD_GATEWAY
         assert "テスト著者" in result.detail
+
+
+class TestNotifyAuthorsBulkCreatedUseCaseImpl:
+    """著者一括作成通知ユースケースのテスト."""
+
+    def test_happy_sends_single_aggregated_message(
+        self,
+    ) -> None:
+        """件数によらず 1 通に集約して送信し、履歴も 1 件であること."""
+        # Arrange
+        fake = FakeNotifier()
+        writer = FakeNotificationLogWriter()
+        use_case = NotifyAuthorsBulkCreatedUseCaseImpl(
+            notifier=fake,
+            logger_factory=_real_factory,
+            log_writer=writer,
+            channel=NotificationChannel.FAKE,
+            classifier=_classifier,
+        )
+        names = tuple(f"著者{index}" for index in range(12))
+        event = AuthorsBulkCreated(names=names)
+
+        # Act
+        result = use_case.execute(event=event)
+
+        # Assert
+        assert isinstance(result, NotificationSuccess)
+        (msg,) = fake.messages
+        assert "12件" in msg
+        assert "著者0" in msg
+        assert "著者11" not in msg
+        assert "ほか2件" in msg
+        (log,) = writer.logs
+        assert log["event_type"] == "authors_bulk_created"
+
+    def test_error_returns_problem_on_notifier_failure(
+        self,
+    ) -> None:
+        """Notifier 失敗時に NotificationProblem が返ること."""
+        # Arrange
+        writer = FakeNotificationLogWriter()
+        use_case = NotifyAuthorsBulkCreatedUseCaseImpl(
+            notifier=_FailingNotifier(),
+            logger_factory=_real_factory,
+            log_writer=writer,
+            channel=NotificationChannel.FAKE,
+            classifier=_classifier,
+        )
+        event = AuthorsBulkCreated(names=("著者A", "著者B"))
+
+        # Act
+        result = use_case.execute(event=event)
+
+        # Assert
+        assert isinstance(result, NotificationProblem)
+        assert result.status == HTTPStatus.BAD_GATEWAY
+        assert writer.logs[0]["status"] == "failure"
+
+
+def _deliver(
+    notifier: FakeNotifier,
+    writer: FakeNotificationLogWriter,
+) -> DeliverNotificationUseCaseImpl:
+    use_case_args = {
+        "notifier": notifier,
+        "logger_factory": _real_factory,
+        "log_writer": writer,
+        "channel": NotificationChannel.FAKE,
+        "classifier": _classifier,
+    }
+    return DeliverNotificationUseCaseImpl(
+        book_created=NotifyBookCreatedUseCaseImpl(**use_case_args),
+        author_created=NotifyAuthorCreatedUseCaseImpl(**use_case_args),
+        authors_bulk_created=NotifyAuthorsBulkCreatedUseCaseImpl(
+            **use_case_args,
+        ),
+    )
+
+
+class TestDeliverNotificationUseCaseImpl:
+    """DeliverNotificationUseCaseImpl のまとめ送りのテスト."""
+
+    def test_happy_execute_many_sends_runs_together(self) -> None:
+        """同じ種類が続く分を 1 回の send_many で送り、順序を保つこと."""
+        # Arrange
+        notifier = _BatchRecordingNotifier()
+        writer = FakeNotificationLogWriter()
+        deliver = _deliver(notifier=notifier, writer=writer)
+        events = [
+            AuthorCreated(name="夏目漱石"),
+            AuthorCreated(name="森鴎外"),
+            BookCreated(
+                title="舞姫",
+                isbn="9784003100608",
+                author_name="森鴎外",
+            ),
+            AuthorCreated(name="樋口一葉"),
+        ]
+
+        # Act
+        results = deliver.execute_many(
+            events=events,
+            retry_counts=[0, 1, 0, 2],
+        )
+
+        # Assert
+        assert all(
+            isinstance(result, NotificationSuccess) for result in results
+        )
+        assert notifier.batches == [2, 1, 1]
+        assert notifier.messages == (
+            "著者が登録されました: 夏目漱石",
+            "著者が登録されました: 森鴎外",
+            "本が登録されました: 舞姫 (著者: 森鴎外)",
+            "著者が登録されました: 樋口一葉",
+        )
+        assert [log["retry_count"] for log in writer.logs] == [0, 1, 0, 2]
+
+    def test_error_execute_many_reports_each_failure(self) -> None:
+        """まとめて送っても、失敗した分だけを失敗の結果で返すこと."""
+        # Arrange
+        writer = FakeNotificationLogWriter()
+        deliver = _deliver(notifier=_BatchRecordingNotifier(), writer=writer)
+        events = [
+            AuthorCreated(name="失敗する著者"),
+            AuthorCreated(name="太宰治"),
+        ]
+
+        # Act
+        failed, sent = deliver.execute_many(
+            events=events,
+            retry_counts=[0, 0],
+        )
+
+        # Assert
+        assert isinstance(failed, NotificationProblem)
+        assert failed.retryable
+        assert isinstance(sent, NotificationSuccess)
+        assert [log["status"] for log in writer.logs] == [
+            "failure",
+            "success",
+        ]
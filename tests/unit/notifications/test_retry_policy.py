@@ -0,0 +1,42 @@
+import pytest
+
+from notifications.domain.retry_policy import RetryPolicy
+
+_policy = RetryPolicy(max_attempts=3, base_delay=2.0, max_delay=10.0)
+
+
+class TestRetryPolicy:
+    """RetryPolicy の再試行判定と待ち時間のテスト."""
+
+    @pytest.mark.parametrize(
+        ("attempts", "expected"),
+        [(1, True), (2, True), (3, False)],
+    )
+    def test_happy_retries_until_max_attempts(
+        self,
+        attempts: int,
+        expected: bool,
+    ) -> None:
+        """試行回数が上限に達するまで再試行すること."""
+        # Act
+        result = _policy.should_retry(attempts=attempts)
+
+        # Assert
+        assert result is expected
+
+    @pytest.mark.parametrize(
+        ("attempts", "ceiling"),
+        [(1, 2.0), (2, 4.0), (3, 8.0), (4, 10.0), (20, 10.0)],
+    )
+    def test_happy_backoff_doubles_up_to_max_delay(
+        self,
+        attempts: int,
+        ceiling: float,
+    ) -> None:
+        """待ち時間は倍々で伸び、上限の半分から上限の間に揺れること."""
+        # Act
+        delays = [_policy.backoff(attempts=attempts) for _ in range(100)]
+
+        # Assert
+        assert all(ceiling / 2 <= delay <= ceiling for delay in delays)
+        assert len(set(delays)) > 1